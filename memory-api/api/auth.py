@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from fastapi.security import HTTPAuthorizationCredentials
 from typing import List, Optional
 from datetime import datetime
+from uuid import UUID
 import structlog
 
 from models.auth import (
@@ -294,13 +295,38 @@ async def revoke_api_key(
     api_key_id: str,
     current_user: CurrentUser = Depends(require_authentication)
 ) -> dict:
-    """Revoke an API key"""
+    """Revoke an API key
+    
+    Users revoke their own keys; admins may revoke any key.
+    """
     try:
-        # TODO: Implement API key revocation
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="API key revocation not implemented yet"
+        try:
+            key_uuid = UUID(api_key_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid API key ID format"
+            )
+        
+        revoked = await auth_service.revoke_api_key(
+            key_uuid,
+            revoked_by=current_user.user_id,
+            owner_user_id=None if current_user.role == UserRole.ADMIN else current_user.user_id
         )
+        if not revoked:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Active API key not found"
+            )
+        
+        logger.info("API key revoked", 
+                   api_key_id=api_key_id,
+                   revoked_by=str(current_user.user_id))
+        
+        return {
+            "message": "API key revoked successfully",
+            "api_key_id": api_key_id
+        }
         
     except HTTPException:
         raise
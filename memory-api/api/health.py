@@ -265,4 +265,20 @@ async def redis_health_check(
             "database": "redis",
             "timestamp": datetime.utcnow().isoformat(),
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+
+@router.get("/embeddings")
+async def embeddings_health_check() -> Dict[str, Any]:
+    """Embedding engine throughput and embedding cache hit/miss counters"""
+    from services.embedding_engine import get_embedding_engine
+    from services.embedding_cache import get_embedding_cache
+    
+    engine_stats = get_embedding_engine().get_stats()
+    
+    return {
+        "status": "healthy" if engine_stats["started"] else "idle",
+        "timestamp": datetime.utcnow().isoformat(),
+        "engine": engine_stats,
+        "cache": get_embedding_cache().get_stats()
+    }
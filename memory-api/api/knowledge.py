@@ -23,6 +23,7 @@ from core.dependencies import DatabaseDependencies, get_all_databases, get_core_
 from core.security import get_current_user, SecurityManager
 from models.auth import CurrentUser
 from services.knowledge_service import KnowledgeService
+from services.content_fingerprint import DuplicateContentError
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -66,6 +67,11 @@ async def create_knowledge_item(
             data=created_item
         )
         
+    except DuplicateContentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error("Failed to create knowledge item", error=str(e))
         raise HTTPException(
@@ -177,6 +183,11 @@ async def update_knowledge_item(
         
     except HTTPException:
         raise
+    except DuplicateContentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error("Failed to update knowledge item", item_id=str(item_id), error=str(e))
         raise HTTPException(
@@ -1,7 +1,7 @@
 # ABOUTME: Session management API endpoints for BETTY Memory System  
 # ABOUTME: Handles chat sessions, messages, and conversation context management
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from typing import List, Optional
 from uuid import UUID
 import structlog
@@ -27,6 +27,7 @@ from models.base import PaginationParams
 from core.dependencies import DatabaseDependencies, get_all_databases
 from core.security import get_current_user, SecurityManager
 from services.session_service import SessionService
+from services.keyset_pagination import decode_cursor, encode_cursor
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -181,14 +182,21 @@ async def delete_session(
 
 @router.get("/", response_model=SessionListResponse)
 async def list_sessions(
+    http_response: Response,
     pagination: PaginationParams = Depends(),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     tags: Optional[List[str]] = Query(None, description="Filter by tags"),
     project_id: Optional[UUID] = Query(None, description="Filter by project"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
+    count_mode: str = Query("exact", regex="^(exact|approximate)$", description="Exact total or planner estimate"),
     databases: DatabaseDependencies = Depends(get_all_databases),
     current_user: dict = Depends(get_current_user)
 ) -> SessionListResponse:
-    """List sessions with filtering and pagination"""
+    """List sessions with filtering and pagination
+    
+    Pass the X-Next-Cursor response header back as ``cursor`` to page with
+    an index seek instead of OFFSET.
+    """
     try:
         session_service = SessionService(databases)
         
@@ -203,11 +211,25 @@ async def list_sessions(
         # Filter by current user
         filters["user_id"] = current_user.user_id
         
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+        
         sessions, total_count = await session_service.list_sessions(
             pagination=pagination,
-            filters=filters
+            filters=filters,
+            cursor=cursor,
+            approximate_count=count_mode == "approximate"
         )
         
+        if len(sessions) == pagination.limit:
+            http_response.headers["X-Next-Cursor"] = encode_cursor(sessions[-1].updated_at, sessions[-1].id)
+        
         response = SessionListResponse.create(
             items=sessions,
             total_items=total_count,
@@ -225,6 +247,8 @@ async def list_sessions(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to list sessions", error=str(e))
         raise HTTPException(
@@ -277,21 +301,40 @@ async def create_message(
 @router.get("/{session_id}/messages", response_model=MessageListResponse)
 async def get_session_messages(
     session_id: UUID,
+    http_response: Response,
     pagination: PaginationParams = Depends(),
     include_context: bool = Query(False, description="Include message context"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
     databases: DatabaseDependencies = Depends(get_all_databases),
     current_user: dict = Depends(get_current_user)
 ) -> MessageListResponse:
-    """Get messages for a specific session"""
+    """Get messages for a specific session
+    
+    Pass the X-Next-Cursor response header back as ``cursor`` to page with
+    an index seek instead of OFFSET.
+    """
     try:
         session_service = SessionService(databases)
         
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+        
         messages, total_count = await session_service.get_session_messages(
             session_id=session_id,
             pagination=pagination,
-            include_context=include_context
+            include_context=include_context,
+            cursor=cursor
         )
         
+        if len(messages) == pagination.limit:
+            http_response.headers["X-Next-Cursor"] = encode_cursor(messages[-1].created_at, messages[-1].id)
+        
         response = MessageListResponse.create(
             items=messages,
             total_items=total_count,
@@ -308,6 +351,8 @@ async def get_session_messages(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to get session messages", session_id=str(session_id), error=str(e))
         raise HTTPException(
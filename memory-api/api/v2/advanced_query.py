@@ -2,6 +2,7 @@
 # ABOUTME: Supports semantic search, filters, pattern matching, and cross-project intelligence
 
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any, Union
 from uuid import UUID
 import structlog
@@ -362,6 +363,7 @@ async def time_series_analysis(
 @router.post("/similarity-matrix", response_model=SimilarityMatrixResponse)
 async def similarity_matrix(
     query: SimilarityMatrixQuery,
+    top_k: Optional[int] = Query(None, ge=1, le=1000, description="Keep only each item's k most similar items"),
     databases: DatabaseDependencies = Depends(get_all_databases),
     current_user: dict = Depends(get_optional_user)
 ) -> SimilarityMatrixResponse:
@@ -375,12 +377,16 @@ async def similarity_matrix(
     - Collaborative filtering similarity
     - Custom similarity metrics
     - Sparse matrix optimization for large datasets
+    - Top-k nearest neighbours per item
+    
+    Cosine, euclidean (1 / (1 + distance)) and dot product metrics are
+    supported; sparse formats need a threshold or top_k.
     """
     start_time = time.time()
     
     try:
         service = AdvancedQueryService(databases)
-        matrix_data = await service.generate_similarity_matrix(query)
+        matrix_data = await service.generate_similarity_matrix(query, top_k=top_k)
         
         execution_time = (time.time() - start_time) * 1000
         
@@ -399,6 +405,11 @@ async def similarity_matrix(
             matrix_dimensions=matrix_data.get("dimensions", [0, 0])
         )
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error("Similarity matrix generation failed", error=str(e))
         raise HTTPException(
@@ -406,6 +417,51 @@ async def similarity_matrix(
             detail=f"Similarity matrix generation failed: {str(e)}"
         )
 
+@router.post("/similarity-matrix/stream")
+async def stream_similarity_matrix(
+    query: SimilarityMatrixQuery,
+    top_k: Optional[int] = Query(None, ge=1, le=1000, description="Keep only each item's k most similar items"),
+    stream_format: str = Query(default="ndjson", regex="^(ndjson|arrow)$", description="ndjson lines or an Arrow IPC stream"),
+    databases: DatabaseDependencies = Depends(get_all_databases),
+    current_user: dict = Depends(get_optional_user)
+) -> StreamingResponse:
+    """
+    Stream similar item pairs as they are computed
+    
+    Pairs at or above the query threshold (or each item's top_k
+    neighbours) are produced one row block at a time, so memory stays
+    bounded by the block size regardless of max_items. NDJSON streams a
+    header line, one {source, target, score} line per pair and a summary
+    line; Arrow streams one record batch per block. A threshold or top_k
+    is required.
+    """
+    try:
+        service = AdvancedQueryService(databases)
+        stream = await service.open_similarity_stream(query, top_k=top_k, stream_format=stream_format)
+        
+        logger.info(
+            "Similarity matrix stream started",
+            similarity_metric=query.similarity_metric,
+            threshold=query.threshold,
+            top_k=top_k,
+            stream_format=stream_format
+        )
+        
+        media_type = "application/vnd.apache.arrow.stream" if stream_format == "arrow" else "application/x-ndjson"
+        return StreamingResponse(stream, media_type=media_type)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Similarity matrix stream failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Similarity matrix stream failed: {str(e)}"
+        )
+
 # Performance monitoring endpoint
 @router.get("/performance/stats")
 async def query_performance_stats(
@@ -1,7 +1,7 @@
 # ABOUTME: Batch operations API for bulk data processing with progress tracking
 # ABOUTME: Handles large-scale operations with background tasks and real-time progress updates
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, status
 from typing import List, Optional, Dict, Any, Union
 from uuid import UUID, uuid4
 import structlog
@@ -317,6 +317,8 @@ async def bulk_project_migration(
 async def bulk_vector_recompute(
     request: BulkVectorRecomputeRequest,
     background_tasks: BackgroundTasks,
+    collection_name: str = Query("knowledge_items", description="Qdrant collection to migrate"),
+    force_reembed: bool = Query(False, description="Re-embed every point instead of reusing stored vectors"),
     databases: DatabaseDependencies = Depends(get_all_databases),
     current_user: dict = Depends(require_authentication)
 ) -> BatchOperationResponse:
@@ -335,15 +337,27 @@ async def bulk_vector_recompute(
         service = BatchOperationsService(databases)
         operation_id = uuid4()
         
+        try:
+            service.validate_vector_recompute_request(request)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
         # Estimate items to recompute
-        estimated_items = await service.estimate_vector_recompute_scope(request)
+        estimated_items = await service.estimate_vector_recompute_scope(request, collection_name)
         
         operation = BatchOperation(
             id=operation_id,
             operation_type=BatchOperationType.VECTOR_RECOMPUTE,
             status=BatchOperationStatus.QUEUED,
             user_id=current_user.get("user_id"),
-            request_data=request.dict(),
+            request_data={
+                **request.dict(),
+                "collection_name": collection_name,
+                "force_reembed": force_reembed
+            },
             total_items=estimated_items,
             created_at=datetime.utcnow()
         )
@@ -354,7 +368,9 @@ async def bulk_vector_recompute(
         background_tasks.add_task(
             service.execute_bulk_vector_recompute,
             operation_id,
-            request
+            request,
+            collection_name,
+            force_reembed
         )
         
         logger.info(
@@ -371,11 +387,13 @@ async def bulk_vector_recompute(
                 "status": operation.status,
                 "estimated_items": estimated_items,
                 "embedding_model": request.embedding_model,
-                "estimated_duration": service.estimate_recompute_duration(request),
+                "estimated_duration": await service.estimate_recompute_duration(request, collection_name),
                 "progress_endpoint": f"/v2/batch/operations/{operation_id}/progress"
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to queue bulk vector recompute", error=str(e))
         raise HTTPException(
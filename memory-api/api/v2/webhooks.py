@@ -234,9 +234,9 @@ class WebhookService:
             
             # Clean up delivery history
             delivery_pattern = f"betty:delivery:webhook:{webhook_id}:*"
-            delivery_keys = await self.redis.keys(delivery_pattern)
-            if delivery_keys:
-                await self.redis.delete(*delivery_keys)
+            delivery_keys = [key async for key in self.redis.scan_iter(match=delivery_pattern, count=1000)]
+            for start in range(0, len(delivery_keys), 500):
+                await self.redis.unlink(*delivery_keys[start:start + 500])
             
             logger.info("Webhook deleted", webhook_id=str(webhook_id))
             return True
@@ -0,0 +1,213 @@
+# ABOUTME: Recall@k versus latency and memory benchmark for quantized Qdrant collection profiles
+# ABOUTME: Compares every collection/search profile pair against an exact brute-force baseline on a local Qdrant
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+# Add the parent directory to the path so we can import from the memory-api
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.vector_profiles import COLLECTION_PROFILES, SEARCH_PROFILES, CollectionProfile
+
+VECTOR_NAME = "bench"
+
+@dataclass
+class QuantizationResult:
+    """One collection profile searched with one search profile"""
+    collection_profile: str
+    search_profile: str
+    recall_at_k: float
+    p50_latency_ms: float
+    p95_latency_ms: float
+    estimated_ram_mb: float
+
+class QuantizationBenchmark:
+    """Measures what each quantization profile costs in recall and buys in latency/memory"""
+
+    def __init__(self, client: QdrantClient, points: int, dimension: int, queries: int, k: int, seed: int = 42):
+        self.client = client
+        self.points = points
+        self.dimension = dimension
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.results: List[QuantizationResult] = []
+
+        self.vectors = self._clustered_vectors(points)
+        # Queries are perturbed corpus points, like real paraphrased lookups
+        picks = self.rng.choice(points, size=queries, replace=False)
+        self.queries = self._normalize(
+            self.vectors[picks] + self.rng.normal(0, 0.05, (queries, dimension)).astype(np.float32)
+        )
+        self.ground_truth = self._exact_top_k()
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    def _clustered_vectors(self, count: int, clusters: int = 64) -> np.ndarray:
+        """Unit vectors drawn around random topic centroids"""
+        centroids = self._normalize(self.rng.normal(size=(clusters, self.dimension)).astype(np.float32))
+        labels = self.rng.integers(0, clusters, size=count)
+        noise = self.rng.normal(0, 1 / np.sqrt(self.dimension), (count, self.dimension)).astype(np.float32)
+        return self._normalize(centroids[labels] + noise)
+
+    def _exact_top_k(self) -> np.ndarray:
+        """Brute-force cosine top-k for every query"""
+        scores = self.queries @ self.vectors.T
+        top = np.argpartition(-scores, self.k, axis=1)[:, :self.k]
+        return top
+
+    def _load_collection(self, name: str, profile: CollectionProfile, batch_size: int = 512) -> None:
+        """Create a collection with the profile and load the corpus into it"""
+        if self.client.collection_exists(name):
+            self.client.delete_collection(name)
+
+        self.client.create_collection(
+            collection_name=name,
+            vectors_config={
+                VECTOR_NAME: VectorParams(
+                    size=self.dimension,
+                    distance=Distance.COSINE,
+                    on_disk=profile.originals_on_disk,
+                    hnsw_config=profile.hnsw_config(),
+                    quantization_config=profile.quantization_config()
+                )
+            }
+        )
+
+        for start in range(0, self.points, batch_size):
+            chunk = self.vectors[start:start + batch_size]
+            self.client.upsert(
+                collection_name=name,
+                points=[
+                    PointStruct(id=start + i, vector={VECTOR_NAME: vector.tolist()})
+                    for i, vector in enumerate(chunk)
+                ],
+                wait=True
+            )
+
+        # Wait for the optimizer to finish indexing and quantizing (yellow
+        # while it runs, green once idle)
+        deadline = time.monotonic() + 600
+        while time.monotonic() < deadline:
+            time.sleep(1)
+            if self.client.get_collection(name).status.value == "green":
+                return
+        print(f"⚠️  {name} still indexing after 10 minutes; results may reflect partial indexes")
+
+    def _search(self, name: str, search_profile: str) -> QuantizationResult:
+        profile = SEARCH_PROFILES[search_profile]
+        params = profile.search_params()
+        latencies = []
+        hits = 0
+
+        for query, truth in zip(self.queries, self.ground_truth):
+            start_time = time.perf_counter()
+            found = self.client.search(
+                collection_name=name,
+                query_vector=(VECTOR_NAME, query.tolist()),
+                limit=self.k,
+                search_params=params,
+                with_payload=False
+            )
+            latencies.append((time.perf_counter() - start_time) * 1000)
+            hits += len({point.id for point in found} & set(truth.tolist()))
+
+        latencies.sort()
+        return QuantizationResult(
+            collection_profile=name,
+            search_profile=search_profile,
+            recall_at_k=round(hits / (len(self.queries) * self.k), 4),
+            p50_latency_ms=round(statistics.median(latencies), 2),
+            p95_latency_ms=round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+            estimated_ram_mb=0.0
+        )
+
+    def run(self, collection_profiles: List[str], search_profiles: List[str], keep: bool = False) -> List[QuantizationResult]:
+        """Benchmark every collection profile against every search profile"""
+        for profile_name in collection_profiles:
+            profile = COLLECTION_PROFILES[profile_name]
+            name = f"bench_quantization_{profile_name}"
+
+            print(f"🔧 Loading {self.points} x {self.dimension}d vectors into {name}...")
+            self._load_collection(name, profile)
+
+            ram_mb = profile.estimated_ram_bytes(self.points, self.dimension) / (1024 * 1024)
+            for search_profile in search_profiles:
+                result = self._search(name, search_profile)
+                result.collection_profile = profile_name
+                result.estimated_ram_mb = round(ram_mb, 1)
+                self.results.append(result)
+                print(
+                    f"   {profile_name:<8} {search_profile:<12} recall@{self.k}={result.recall_at_k:.4f} "
+                    f"p50={result.p50_latency_ms:.2f}ms p95={result.p95_latency_ms:.2f}ms ram≈{result.estimated_ram_mb}MB"
+                )
+
+            if not keep:
+                self.client.delete_collection(name)
+
+        return self.results
+
+    def report(self) -> Dict[str, Any]:
+        """Benchmark report suitable for JSON output"""
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "points": self.points,
+            "dimension": self.dimension,
+            "queries": len(self.queries),
+            "k": self.k,
+            "baseline": "numpy brute-force cosine",
+            "results": [asdict(result) for result in self.results]
+        }
+
+def main(argv: Optional[List[str]] = None):
+    """Main benchmark execution"""
+    parser = argparse.ArgumentParser(description="Quantized collection recall/latency/memory benchmark")
+    parser.add_argument("--url", default="http://localhost:6333", help="Qdrant URL (or :memory: for a smoke run)")
+    parser.add_argument("--points", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--collection-profiles", default=",".join(COLLECTION_PROFILES))
+    parser.add_argument("--search-profiles", default=",".join(SEARCH_PROFILES))
+    parser.add_argument("--keep", action="store_true", help="Keep benchmark collections afterwards")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    benchmark = QuantizationBenchmark(
+        QdrantClient(location=args.url, timeout=120),
+        points=args.points,
+        dimension=args.dimension,
+        queries=args.queries,
+        k=args.k
+    )
+
+    print("🚀 Quantization benchmark: recall@k vs latency and memory")
+    print("=" * 60)
+    benchmark.run(
+        [name.strip() for name in args.collection_profiles.split(",") if name.strip()],
+        [name.strip() for name in args.search_profiles.split(",") if name.strip()],
+        keep=args.keep
+    )
+
+    report = benchmark.report()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to: {args.output}")
+
+    return report
+
+if __name__ == "__main__":
+    main()
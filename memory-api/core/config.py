@@ -2,7 +2,7 @@
 # ABOUTME: Handles environment variables and settings using Pydantic Settings
 
 from functools import lru_cache
-from typing import Optional
+from typing import List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -59,10 +59,81 @@ class Settings(BaseSettings):
     default_embedding_model: str = Field(default="all-MiniLM-L6-v2", description="Default embedding model")
     vector_dimension: int = Field(default=384, description="Vector embedding dimension")
     similarity_threshold: float = Field(default=0.7, description="Similarity threshold for vector search")
+    vector_quantization: str = Field(default="scalar", description="Collection quantization profile (scalar, product, none)")
+    vector_product_quantization_collections: str = Field(default="", description="Comma-separated collections stored with PQ and on-disk originals")
+    
+    # Hybrid search settings
+    hybrid_candidate_pool: int = Field(default=50, description="Candidates fetched from each hybrid search leg before fusion")
+    hybrid_fusion_method: str = Field(default="rrf", description="Hybrid fusion method (rrf or weighted)")
+    hybrid_rrf_k: int = Field(default=60, description="Reciprocal rank fusion damping constant")
+    hybrid_vector_weight: float = Field(default=0.5, description="Weight of the vector leg in hybrid fusion (keyword gets the rest)")
+    
+    # Embedding engine settings
+    embedding_model_name: str = Field(default="sentence-transformers/all-mpnet-base-v2", description="Primary sentence transformer model")
+    embedding_fallback_model_name: str = Field(default="all-MiniLM-L6-v2", description="Model used if the primary model fails to load")
+    embedding_workers: int = Field(default=2, description="Embedding process pool size (0 encodes on a thread in-process)")
+    embedding_batch_size: int = Field(default=64, description="Max texts per embedding micro-batch")
+    embedding_batch_wait_ms: float = Field(default=5.0, description="Max wait for a micro-batch to fill (milliseconds)")
+    embedding_cache_max_entries: int = Field(default=10000, description="Max embeddings held in the in-process cache")
+    embedding_cache_ttl: int = Field(default=86400, description="In-process embedding cache TTL (seconds)")
+    embedding_cache_redis_enabled: bool = Field(default=True, description="Share cached embeddings through Redis")
+    embedding_cache_redis_ttl: int = Field(default=604800, description="Redis embedding cache TTL (seconds)")
+    
+    # Bulk import settings
+    bulk_import_copy_threshold: int = Field(default=100, description="Bulk imports at least this large use the COPY pipeline")
+    bulk_import_chunk_size: int = Field(default=1000, description="Rows staged, embedded and graphed per bulk import chunk")
+    
+    # Clustering settings
+    clustering_workers: int = Field(default=2, description="Clustering process pool size (0 fits on a thread in-process)")
+    clustering_max_items: int = Field(default=20000, description="Most recent knowledge items considered by semantic clustering")
+    clustering_large_threshold: int = Field(default=5000, description="Item count from which clustering switches to mini-batch and sparse-graph algorithms")
+    clustering_pca_components: int = Field(default=50, description="Dimensions features are PCA-reduced to before clustering")
+    clustering_cache_ttl: int = Field(default=3600, description="Seconds clustering results stay cached")
+    
+    # Graph analytics settings
+    graph_load_batch_size: int = Field(default=5000, description="Knowledge graph nodes or edges read from Neo4j per page")
+    graph_refresh_interval: float = Field(default=30.0, description="Min seconds between incremental knowledge graph refreshes")
+    graph_full_reload_interval: float = Field(default=3600.0, description="Seconds between full knowledge graph reloads")
+    graph_view_cache_size: int = Field(default=32, description="Filtered knowledge subgraphs cached per process")
+    graph_metrics_workers: int = Field(default=1, description="Graph metrics process pool size (0 computes on a thread in-process)")
+    graph_exact_metrics_nodes: int = Field(default=2000, description="Node count above which betweenness, closeness and path lengths are estimated from sampled sources")
+    graph_betweenness_samples: int = Field(default=64, description="Sampled sources for approximate betweenness, closeness and path lengths")
+    
+    # API key authentication settings
+    api_key_hmac_secret: str = Field(default="", description="Server-side secret for the API key lookup HMAC (required unless debug)")
+    api_key_hmac_previous_secrets: List[str] = Field(default_factory=list, description="Former lookup HMAC secrets still accepted, and rehashed on use, while rotating")
+    api_key_cache_ttl: float = Field(default=60.0, description="Seconds a verified API key stays cached in-process")
+    api_key_cache_max_entries: int = Field(default=10000, description="Max verified API keys cached in-process")
+    dev_api_key_cache_ttl: float = Field(default=5.0, description="Seconds a verified dev API key stays cached; dev_api_keys rows are edited out of band")
+    auth_write_flush_interval: float = Field(default=5.0, description="Seconds between batched API key usage/audit writes")
+    auth_write_buffer_max_events: int = Field(default=5000, description="Max buffered audit events before new ones are dropped")
+    
+    # Rate limiting settings
+    rate_limit_user: str = Field(default="300/60", description="Requests per seconds for each authenticated user")
+    rate_limit_api_key: str = Field(default="1000/60", description="Requests per seconds for each verified API key")
+    rate_limit_routes: str = Field(default="", description="Per-route quotas, e.g. 'POST /api/knowledge/bulk=10/60,/api/auth/login=5/60'")
+    rate_limit_lease_size: int = Field(default=5, description="Max tokens a worker leases from Redis per round trip")
+    rate_limit_lease_ttl: float = Field(default=1.0, description="Seconds a worker may hold leased tokens")
+    
+    # Ingestion scheduler settings
+    ingestion_max_concurrent_items: int = Field(default=8, description="Ingestion items processed at once across all batches")
+    ingestion_interactive_reserved: int = Field(default=2, description="Slots per budget that batch work may not take")
+    ingestion_postgres_concurrency: int = Field(default=8, description="Concurrent ingestion PostgreSQL operations")
+    ingestion_qdrant_concurrency: int = Field(default=8, description="Concurrent ingestion Qdrant operations")
+    ingestion_neo4j_concurrency: int = Field(default=4, description="Concurrent ingestion Neo4j operations")
+    ingestion_embedder_concurrency: int = Field(default=4, description="Concurrent ingestion embedding jobs")
+    ingestion_progress_interval: float = Field(default=2.0, description="Min seconds between batch progress writes")
     
     # Cache settings
     cache_ttl: int = Field(default=3600, description="Default cache TTL (seconds)")
     cache_max_entries: int = Field(default=10000, description="Max cache entries")
+    cache_l1_max_entries: int = Field(default=2000, description="Max entries in the in-process read-through cache")
+    cache_l1_ttl: float = Field(default=5.0, description="Seconds an entry stays in the in-process cache")
+    cache_stale_ttl: int = Field(default=60, description="Seconds an expired entry is still served while it refreshes")
+    cache_max_entries_per_type: int = Field(default=1000, description="Max intelligent cache entries per context type")
+    cache_telemetry_sample_rate: float = Field(default=0.1, description="Share of cache reads recorded in access history")
+    cache_telemetry_flush_interval: float = Field(default=5.0, description="Seconds between cache telemetry flushes")
+    cache_maintenance_interval: float = Field(default=60.0, description="Seconds between intelligent cache eviction passes")
     
     # Graphiti settings
     graphiti_embedding_model: str = Field(default="all-MiniLM-L6-v2", description="Graphiti embedding model")
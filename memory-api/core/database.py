@@ -150,6 +150,20 @@ class DatabaseManager:
                 await session.rollback()
                 raise
     
+    @asynccontextmanager
+    async def get_postgres_raw_connection(self):
+        """Check out a pooled connection as the raw asyncpg connection
+        
+        For driver-level operations SQLAlchemy does not expose, such as
+        COPY. The connection returns to the pool on exit.
+        """
+        if not self.postgres_engine:
+            raise RuntimeError("PostgreSQL not initialized")
+        
+        async with self.postgres_engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            yield raw.driver_connection
+    
     @asynccontextmanager
     async def get_neo4j_session(self):
         """Get Neo4j session with automatic cleanup"""
@@ -31,6 +31,10 @@ class DatabaseSessionWrapper:
                 result = await session.execute(stmt, parameters)
             return result
     
+    def raw_connection(self):
+        """Raw asyncpg connection context for COPY and other driver-level operations"""
+        return self.db_manager.get_postgres_raw_connection()
+    
     async def commit(self):
         """Commit current transaction (no-op as sessions are auto-committed)"""
         # Sessions created via get_postgres_session() auto-commit on exit
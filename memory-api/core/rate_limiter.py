@@ -0,0 +1,266 @@
+# ABOUTME: Distributed GCRA rate limiting for BETTY Memory System
+# ABOUTME: Redis Lua limiter shared by all workers, with local token leases and an in-process fallback
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+
+from core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = "betty:ratelimit:"
+
+# GCRA over a single "theoretical arrival time" (TAT) per key, in milliseconds.
+# Grants up to ARGV[3] tokens at once (fewer if fewer are available) so callers
+# can lease a handful of tokens per round trip.
+# Returns {granted, remaining, retry_after_ms, reset_after_ms}.
+GCRA_LUA = """
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local quantity = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+
+local available = math.floor((now + emission * burst - tat) / emission)
+if available < 1 then
+    return {0, 0, tat + emission - emission * burst - now, tat - now}
+end
+
+local granted = math.min(quantity, available)
+local new_tat = tat + granted * emission
+redis.call('SET', KEYS[1], new_tat, 'PX', math.max(1, math.ceil(new_tat - now)))
+return {granted, available - granted, 0, new_tat - now}
+"""
+
+@dataclass(frozen=True)
+class Quota:
+    """``limit`` requests per ``period`` seconds, all of which may arrive as a burst"""
+    limit: int
+    period: float
+
+    @property
+    def emission_ms(self) -> float:
+        return self.period * 1000.0 / self.limit
+
+    @classmethod
+    def parse(cls, spec: str) -> "Quota":
+        """Parse ``"100/60"`` (limit per seconds)"""
+        limit, _, period = spec.strip().partition("/")
+        return cls(limit=int(limit), period=float(period or 60))
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check, rendered as ``X-RateLimit-*`` headers"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(0, self.remaining)),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after))
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+def gcra(tat: float, now: float, quota: Quota, quantity: int = 1) -> Tuple[float, int, int, float, float]:
+    """In-process GCRA step mirroring GCRA_LUA (times in milliseconds)
+
+    Returns (new_tat, granted, remaining, retry_after_ms, reset_after_ms).
+    """
+    emission = quota.emission_ms
+    tat = max(tat, now)
+    available = math.floor((now + emission * quota.limit - tat) / emission)
+    if available < 1:
+        return tat, 0, 0, tat + emission - emission * quota.limit - now, tat - now
+
+    granted = min(quantity, available)
+    new_tat = tat + granted * emission
+    return new_tat, granted, available - granted, 0.0, new_tat - now
+
+class LocalRateLimiter:
+    """GCRA limiter for a single process: one float per key, O(1) per check
+
+    Used where a limit is naturally per-process (a WebSocket connection)
+    and as the fallback while Redis is unavailable.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+
+    def check(self, key: str, quota: Quota, quantity: int = 1) -> RateLimitResult:
+        now = time.monotonic() * 1000.0
+        new_tat, granted, remaining, retry_after, reset_after = gcra(self._tats.get(key, now), now, quota, quantity)
+
+        self._tats[key] = new_tat
+        self._tats.move_to_end(key)
+        while len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+
+        return RateLimitResult(
+            allowed=granted > 0,
+            limit=quota.limit,
+            remaining=remaining,
+            reset_after=reset_after / 1000.0,
+            retry_after=retry_after / 1000.0
+        )
+
+    def forget(self, key: str) -> None:
+        self._tats.pop(key, None)
+
+@dataclass
+class _Lease:
+    tokens: int
+    remaining: int
+    expires_at: float
+    reset_after: float
+
+class RateLimiter:
+    """Rate limits shared by every worker and replica through Redis
+
+    Allowed requests are served from small token leases taken from Redis,
+    so most checks never leave the process; leased tokens are already
+    spent globally, so leasing never raises the effective limit. A denial
+    is remembered locally until its retry time. Without Redis the limiter
+    enforces the same quotas per process.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        lease_size: int = 5,
+        lease_ttl: float = 1.0,
+        max_keys: int = 100000
+    ):
+        self.redis_client = redis_client
+        self.lease_size = lease_size
+        self.lease_ttl = lease_ttl
+        self.max_keys = max_keys
+        self.local = LocalRateLimiter(max_keys)
+        self._leases: "OrderedDict[str, _Lease]" = OrderedDict()
+        self._denied_until: Dict[str, float] = {}
+        self._script = None
+        self._redis_failed = False
+
+    def bind_redis(self, redis_client) -> None:
+        self.redis_client = redis_client
+        self._script = None
+        self._leases.clear()
+        self._denied_until.clear()
+
+    def _lease_size(self, quota: Quota) -> int:
+        # Keep leases to a small share of the quota so idle workers strand little of it
+        return max(1, min(self.lease_size, quota.limit // 20))
+
+    async def check(self, key: str, quota: Quota) -> RateLimitResult:
+        """Spend one token from ``key`` under ``quota``"""
+        now = time.monotonic()
+
+        denied_until = self._denied_until.get(key)
+        if denied_until is not None:
+            if denied_until > now:
+                return RateLimitResult(False, quota.limit, 0, denied_until - now, denied_until - now)
+            del self._denied_until[key]
+
+        lease = self._leases.get(key)
+        if lease is not None and lease.tokens > 0 and lease.expires_at > now:
+            lease.tokens -= 1
+            return RateLimitResult(True, quota.limit, lease.remaining + lease.tokens, lease.reset_after)
+
+        if self.redis_client is None:
+            return self.local.check(key, quota)
+
+        try:
+            if self._script is None:
+                self._script = self.redis_client.register_script(GCRA_LUA)
+            granted, remaining, retry_after, reset_after = await self._script(
+                keys=[KEY_PREFIX + key],
+                args=[quota.emission_ms, quota.limit, self._lease_size(quota)]
+            )
+            if self._redis_failed:
+                logger.info("Rate limiter reconnected to Redis")
+                self._redis_failed = False
+        except Exception as e:
+            if not self._redis_failed:
+                logger.warning("Rate limiter falling back to per-process limits", error=str(e))
+                self._redis_failed = True
+            return self.local.check(key, quota)
+
+        granted, remaining = int(granted), int(remaining)
+        if granted < 1:
+            retry = float(retry_after) / 1000.0
+            self._denied_until[key] = now + retry
+            if len(self._denied_until) > self.max_keys:
+                self._denied_until = {k: t for k, t in self._denied_until.items() if t > now}
+            return RateLimitResult(False, quota.limit, 0, float(reset_after) / 1000.0, retry)
+
+        self._leases[key] = _Lease(
+            tokens=granted - 1,
+            remaining=remaining,
+            expires_at=now + self.lease_ttl,
+            reset_after=float(reset_after) / 1000.0
+        )
+        self._leases.move_to_end(key)
+        while len(self._leases) > self.max_keys:
+            self._leases.popitem(last=False)
+
+        return RateLimitResult(True, quota.limit, remaining + granted - 1, float(reset_after) / 1000.0)
+
+    async def check_all(self, checks: List[Tuple[str, Quota]]) -> RateLimitResult:
+        """Check several quotas; the request passes only if all of them allow it
+
+        Returns the denial if any, otherwise the most constrained result.
+        """
+        results = await asyncio.gather(*(self.check(key, quota) for key, quota in checks))
+        denied = [result for result in results if not result.allowed]
+        if denied:
+            return max(denied, key=lambda result: result.retry_after)
+        return min(results, key=lambda result: result.remaining)
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Quotas applied to requests whose path starts with ``prefix``"""
+    method: Optional[str]
+    prefix: str
+    quota: Quota
+
+def parse_route_policies(spec: str) -> List[RoutePolicy]:
+    """Parse ``"POST /api/knowledge/bulk=10/60,/api/auth/login=5/60"``
+
+    Longer prefixes are matched first.
+    """
+    policies = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, quota = entry.rpartition("=")
+        method, _, prefix = route.strip().rpartition(" ")
+        policies.append(RoutePolicy(method.upper() or None, prefix, Quota.parse(quota)))
+    return sorted(policies, key=lambda policy: -len(policy.prefix))
+
+_rate_limiter_instance: Optional[RateLimiter] = None
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        settings = get_settings()
+        _rate_limiter_instance = RateLimiter(
+            lease_size=settings.rate_limit_lease_size,
+            lease_ttl=settings.rate_limit_lease_ttl
+        )
+    return _rate_limiter_instance
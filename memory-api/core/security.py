@@ -1,7 +1,7 @@
 # ABOUTME: JWT-based authentication and security for BETTY Memory System
 # ABOUTME: Production-ready authentication with RBAC, rate limiting and security middleware
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import HTTPException, Security, status, Request, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
 from fastapi.responses import JSONResponse
@@ -15,6 +15,8 @@ import json
 from models.auth import CurrentUser, UserRole, PermissionLevel, AuthEventType
 from services.jwt_service import jwt_service
 from services.auth_service import auth_service
+from core.config import get_settings
+from core.rate_limiter import LocalRateLimiter, Quota, get_rate_limiter, parse_route_policies
 
 logger = structlog.get_logger(__name__)
 
@@ -129,10 +131,18 @@ async def get_current_user(
     client_ip = SecurityManager.get_client_ip(request)
     
     try:
+        # Development API keys resolve against their own table; skip the
+        # production lookup for them
+        if api_key and api_key.startswith('betty_dev_test_'):
+            dev_user = await _authenticate_dev_api_key(api_key)
+            if dev_user:
+                logger.debug("Development API key authentication successful", user_id=str(dev_user.user_id))
+                return dev_user
+        
         # Try API key authentication first
-        if api_key:
+        elif api_key:
             logger.debug("Attempting API key authentication", key_prefix=api_key[:10])
-            current_user = await auth_service.authenticate_api_key(api_key)
+            current_user = await auth_service.authenticate_api_key(api_key, ip_address=client_ip)
             if current_user:
                 logger.debug("API key authentication successful", 
                            user_id=str(current_user.user_id),
@@ -154,13 +164,6 @@ async def get_current_user(
             logger.debug("JWT authentication successful", user_id=str(current_user.user_id))
             return current_user
         
-        # Development fallback: Check for development API keys
-        if api_key and api_key.startswith('betty_dev_test_'):
-            dev_user = await _authenticate_dev_api_key(api_key)
-            if dev_user:
-                logger.info("Development API key authentication successful", user_id=str(dev_user.user_id))
-                return dev_user
-        
         # No authentication provided
         logger.debug("No authentication credentials provided")
         return None
@@ -299,34 +302,16 @@ def require_role(min_role: UserRole):
     return role_checker
 
 class RateLimiter:
-    """Simple rate limiter for API endpoints"""
+    """Per-process rate limiter for API endpoints (requests share limits through core.rate_limiter)"""
     
     def __init__(self, requests_per_minute: int = 60):
         self.requests_per_minute = requests_per_minute
-        self.requests = {}
+        self.quota = Quota(limit=requests_per_minute, period=60)
+        self.limiter = LocalRateLimiter()
     
     def is_allowed(self, client_ip: str) -> bool:
         """Check if request is allowed based on rate limit"""
-        now = datetime.utcnow()
-        minute_ago = now - timedelta(minutes=1)
-        
-        # Clean old entries
-        self.requests = {
-            ip: [req_time for req_time in req_times if req_time > minute_ago]
-            for ip, req_times in self.requests.items()
-        }
-        
-        # Check current client
-        client_requests = self.requests.get(client_ip, [])
-        
-        if len(client_requests) >= self.requests_per_minute:
-            return False
-        
-        # Add current request
-        client_requests.append(now)
-        self.requests[client_ip] = client_requests
-        
-        return True
+        return self.limiter.check(client_ip, self.quota).allowed
 
 # Global rate limiter instance
 rate_limiter = RateLimiter()
@@ -361,30 +346,81 @@ class AuthenticationMiddleware:
 
 # Rate limiting middleware
 class RateLimitingMiddleware:
-    """Middleware for API rate limiting"""
+    """Middleware for API rate limiting
+    
+    Limits are enforced across all workers through the shared rate limiter:
+    per verified API key, per authenticated user, otherwise per client IP,
+    plus any per-route quotas. Every response carries X-RateLimit-* headers.
+    """
     
     def __init__(self, app, requests_per_minute: int = 60):
         self.app = app
-        self.rate_limiter = RateLimiter(requests_per_minute)
+        settings = get_settings()
+        self.rate_limiter = get_rate_limiter()
+        self.ip_quota = Quota(limit=requests_per_minute, period=60)
+        self.user_quota = Quota.parse(settings.rate_limit_user)
+        self.api_key_quota = Quota.parse(settings.rate_limit_api_key)
+        self.route_policies = parse_route_policies(settings.rate_limit_routes)
+    
+    def _subject(self, request: Request) -> Tuple[str, Quota]:
+        """Who the request is charged to, and their quota"""
+        api_key = request.headers.get("X-API-Key")
+        if api_key:
+            # Only keys that already verified get a key quota, so random keys
+            # cannot each mint a fresh bucket
+            lookup_hash = jwt_service.api_key_lookup_hash(api_key)
+            if auth_service.key_cache.get(lookup_hash) is not None:
+                return f"key:{lookup_hash}", self.api_key_quota
+        
+        authorization = request.headers.get("Authorization", "")
+        if authorization[:7].lower() == "bearer ":
+            try:
+                payload = jwt_service.validate_token(authorization[7:])
+                subject = payload.get("sub") or payload.get("owner_id")
+                if subject:
+                    return f"user:{subject}", self.user_quota
+            except ValueError:
+                pass
+        
+        return f"ip:{SecurityManager.get_client_ip(request)}", self.ip_quota
     
     async def __call__(self, scope, receive, send):
-        if scope["type"] == "http":
-            request = Request(scope, receive)
-            client_ip = SecurityManager.get_client_ip(request)
-            
-            if not self.rate_limiter.is_allowed(client_ip):
-                response = JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "message": "Too many requests. Please try again later.",
-                        "retry_after": 60
-                    }
-                )
-                await response(scope, receive, send)
-                return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope, receive)
+        subject, quota = self._subject(request)
+        checks = [(subject, quota)]
+        for policy in self.route_policies:
+            if request.url.path.startswith(policy.prefix) and policy.method in (None, request.method):
+                checks.append((f"route:{policy.method or '*'}:{policy.prefix}:{subject}", policy.quota))
+                break
         
-        await self.app(scope, receive, send)
+        result = await self.rate_limiter.check_all(checks)
+        rate_headers = result.headers()
+        
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "error": "Rate limit exceeded",
+                    "message": "Too many requests. Please try again later.",
+                    "retry_after": int(rate_headers["Retry-After"])
+                },
+                headers=rate_headers
+            )
+            await response(scope, receive, send)
+            return
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (key.lower().encode(), value.encode()) for key, value in rate_headers.items()
+                ]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
 
 # Optional authentication (for endpoints that work with or without auth)
 async def get_optional_user(
@@ -408,56 +444,9 @@ async def _authenticate_dev_api_key(api_key: str) -> Optional[CurrentUser]:
     Returns CurrentUser object for authentication
     """
     try:
-        # For development, we'll connect directly to the database
-        import os
-        import asyncpg
-        
-        # Use environment variables or defaults matching docker-compose
-        postgres_host = os.getenv('POSTGRES_HOST', 'postgres')
-        postgres_port = int(os.getenv('POSTGRES_PORT', '5432'))
-        postgres_db = os.getenv('POSTGRES_DB', 'betty_memory')
-        postgres_user = os.getenv('POSTGRES_USER', 'betty')
-        postgres_password = os.getenv('POSTGRES_PASSWORD', 'bettypassword')
-        
-        # Connect to database
-        conn = await asyncpg.connect(
-            host=postgres_host,
-            port=postgres_port,
-            database=postgres_db,
-            user=postgres_user,
-            password=postgres_password
-        )
-        
-        try:
-            # Query development API key
-            query = """
-                SELECT u.user_id, u.email, u.full_name, u.role, k.scopes, k.api_key_id
-                FROM dev_users u
-                JOIN dev_api_keys k ON u.user_id = k.owner_user_id
-                WHERE k.api_key = $1 AND k.is_active = true 
-                AND (k.expires_at IS NULL OR k.expires_at > NOW())
-            """
-            
-            row = await conn.fetchrow(query, api_key)
-            
-            if row:
-                # Return CurrentUser object for proper authentication
-                from uuid import UUID
-                return CurrentUser(
-                    user_id=UUID(str(row['user_id'])),
-                    email=row['email'],
-                    role=UserRole(row['role']),
-                    permissions=row['scopes'] or [],
-                    project_access={},  # Dev keys have default access
-                    is_api_key=True,
-                    api_key_id=UUID(str(row['api_key_id'])) if row['api_key_id'] else None
-                )
-                
-        finally:
-            await conn.close()
-            
-        return None
+        # Resolved through the pooled connection and the verified-key cache
+        return await auth_service.authenticate_dev_api_key(api_key)
         
     except Exception as e:
         logger.warning("Development API key authentication failed", error=str(e))
-        return None
\ No newline at end of file
+        return None
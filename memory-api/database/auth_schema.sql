@@ -65,6 +65,8 @@ CREATE TABLE IF NOT EXISTS auth_api_keys (
     key_name VARCHAR(255) NOT NULL,
     key_hash VARCHAR(255) NOT NULL UNIQUE, -- Hashed API key
     key_prefix VARCHAR(10) NOT NULL, -- First few chars for identification (e.g., "betty_")
+    key_id VARCHAR(32) UNIQUE, -- Non-secret per-key segment of betty_<key_id>_<secret>
+    key_lookup_hash VARCHAR(64) UNIQUE, -- HMAC-SHA256 of the full key for O(1) verification
     owner_user_id UUID NOT NULL REFERENCES auth_users(user_id) ON DELETE CASCADE,
     scopes TEXT[] NOT NULL DEFAULT '{}', -- Array of permission scopes
     project_access TEXT[] NOT NULL DEFAULT '{}', -- Array of accessible project IDs
@@ -80,6 +82,8 @@ CREATE TABLE IF NOT EXISTS auth_api_keys (
     -- Indexes
     INDEX idx_api_keys_key_hash (key_hash),
     INDEX idx_api_keys_key_prefix (key_prefix),
+    INDEX idx_api_keys_key_id (key_id),
+    INDEX idx_api_keys_key_lookup_hash (key_lookup_hash),
     INDEX idx_api_keys_owner_user_id (owner_user_id),
     INDEX idx_api_keys_is_active (is_active),
     INDEX idx_api_keys_expires_at (expires_at),
@@ -0,0 +1,23 @@
+-- ABOUTME: API key lookup index migration v4 for BETTY authentication
+-- ABOUTME: Adds key id and HMAC lookup columns so API keys verify with one index probe instead of bcrypt scans
+
+-- =============================================================================
+-- API KEY LOOKUP COLUMNS
+-- =============================================================================
+
+-- New keys are betty_<key_id>_<secret>; legacy keys get key_lookup_hash
+-- backfilled on their first successful (bcrypt) authentication
+ALTER TABLE auth_api_keys ADD COLUMN IF NOT EXISTS key_id VARCHAR(32);
+ALTER TABLE auth_api_keys ADD COLUMN IF NOT EXISTS key_lookup_hash VARCHAR(64);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_api_keys_key_id ON auth_api_keys(key_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_api_keys_key_lookup_hash ON auth_api_keys(key_lookup_hash);
+
+-- =============================================================================
+-- COMPLETION MESSAGE
+-- =============================================================================
+
+DO $$
+BEGIN
+    RAISE NOTICE 'API key lookup migration complete (schema version 4.0.0)';
+END $$;
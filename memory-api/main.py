@@ -74,6 +74,14 @@ async def lifespan(app: FastAPI):
         set_database_manager(db_manager)
         logger.info("Database manager set for auth service")
         
+        # Share rate limits across workers through Redis
+        from core.rate_limiter import get_rate_limiter
+        get_rate_limiter().bind_redis(db_manager.redis_client)
+        
+        # Start API key revocation listening and batched auth writes
+        from services.auth_service import auth_service
+        await auth_service.start()
+        
         # Initialize enhanced error monitoring service
         # monitoring_service = get_monitoring_service()
         # await monitoring_service.start_monitoring()
@@ -106,6 +114,20 @@ async def lifespan(app: FastAPI):
         #     await app.state.monitoring_service.stop_monitoring()
         #     logger.info("Enhanced error monitoring service stopped")  # Temporarily disabled
         
+        from services.auth_service import auth_service
+        await auth_service.stop()
+        
+        from services.embedding_engine import shutdown_embedding_engine
+        from services.embedding_cache import shutdown_embedding_cache
+        from services.cache_telemetry import shutdown_cache_telemetry
+        from services.clustering_engine import shutdown_clustering_engine
+        from services.graph_metrics_engine import shutdown_graph_metrics_engine
+        await shutdown_embedding_engine()
+        await shutdown_embedding_cache()
+        await shutdown_cache_telemetry()
+        await shutdown_clustering_engine()
+        await shutdown_graph_metrics_engine()
+        
         if db_manager:
             await db_manager.close()
             logger.info("Database connections closed")
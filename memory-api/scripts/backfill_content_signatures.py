@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Content Signature Backfill for BETTY Memory System
+Fills content_fingerprint, minhash_signature and knowledge_lsh_buckets for
+knowledge items stored before fingerprint-based duplicate detection.
+
+Live items whose fingerprint collides with an earlier live item are exact
+duplicates; they keep a NULL fingerprint (the unique index only covers one
+live item per fingerprint) and are reported so they can be reviewed.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add the parent directory to the path so we can import from the memory-api
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import get_settings
+from core.database import DatabaseManager
+from services.content_fingerprint import compute_content_signature
+
+async def backfill_content_signatures(batch_size: int = 500):
+    """Backfill signatures in id order, one transaction per batch."""
+
+    print("🔧 BETTY Content Signature Backfill")
+    print("=" * 50)
+
+    db_manager = DatabaseManager(get_settings())
+    await db_manager.initialize()
+
+    last_id = None
+    updated = 0
+    duplicates = []
+
+    try:
+        while True:
+            async with db_manager.get_postgres_raw_connection() as conn:
+                rows = await conn.fetch("""
+                    SELECT id, project_id, title, content, system_time_until IS NULL AS live
+                    FROM knowledge_items
+                    WHERE minhash_signature IS NULL
+                      AND ($1::uuid IS NULL OR id > $1)
+                    ORDER BY id
+                    LIMIT $2
+                """, last_id, batch_size)
+
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+
+                signatures = {row["id"]: compute_content_signature(row["title"], row["content"]) for row in rows}
+                taken = {
+                    (record["project_id"], record["content_fingerprint"])
+                    for record in await conn.fetch("""
+                        SELECT project_id, content_fingerprint FROM knowledge_items
+                        WHERE content_fingerprint = ANY($1::varchar[]) AND system_time_until IS NULL
+                    """, [signature.fingerprint for signature in signatures.values()])
+                }
+
+                updates = []
+                for row in rows:
+                    signature = signatures[row["id"]]
+                    key = (row["project_id"], signature.fingerprint)
+                    fingerprint = signature.fingerprint
+                    if row["live"]:
+                        if key in taken:
+                            duplicates.append(row["id"])
+                            fingerprint = None
+                        else:
+                            taken.add(key)
+                    updates.append((row["id"], fingerprint, signature.minhash))
+
+                async with conn.transaction():
+                    await conn.executemany("""
+                        UPDATE knowledge_items
+                        SET content_fingerprint = $2, minhash_signature = $3
+                        WHERE id = $1
+                    """, updates)
+                    await conn.copy_records_to_table(
+                        "knowledge_lsh_buckets",
+                        records=[
+                            (band, bucket, row["id"], row["project_id"])
+                            for row in rows
+                            for band, bucket in zip(signatures[row["id"]].bands, signatures[row["id"]].buckets)
+                        ],
+                        columns=["band", "bucket", "knowledge_item_id", "project_id"]
+                    )
+
+                updated += len(rows)
+                print(f"   {updated} items backfilled")
+
+        print(f"✅ Backfilled {updated} knowledge items")
+        if duplicates:
+            print(f"⚠️  {len(duplicates)} live exact duplicates left without a fingerprint:")
+            for item_id in duplicates:
+                print(f"   {item_id}")
+
+    finally:
+        await db_manager.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill knowledge item content signatures")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(backfill_content_signatures(args.batch_size))
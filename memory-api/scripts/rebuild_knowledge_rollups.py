@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Knowledge Rollup Rebuild for BETTY Memory System
+Recomputes knowledge_daily_rollup and knowledge_pattern_daily_rollup from
+knowledge_items.
+
+Triggers keep the rollups current on every write, so this is a maintenance
+job: run it after manual data fixes or to reconcile floating point drift in
+the score sums. rebuild_knowledge_rollups() holds a SHARE lock on
+knowledge_items, which blocks knowledge writes until it finishes, so
+schedule it outside busy hours.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import from the memory-api
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import get_settings
+from core.database import DatabaseManager
+
+async def rebuild_knowledge_rollups(lock_timeout: str = "30s"):
+    """Rebuild both rollup tables in one transaction."""
+
+    print("🔧 BETTY Knowledge Rollup Rebuild")
+    print("=" * 50)
+
+    db_manager = DatabaseManager(get_settings())
+    await db_manager.initialize()
+
+    try:
+        async with db_manager.get_postgres_raw_connection() as conn:
+            async with conn.transaction():
+                # Give up rather than queue behind long-running writers while holding up new ones
+                await conn.execute("SELECT set_config('lock_timeout', $1, true)", lock_timeout)
+                started = time.perf_counter()
+                item_count = await conn.fetchval("SELECT rebuild_knowledge_rollups()")
+
+        print(f"✅ Rebuilt rollups for {item_count} knowledge items in {time.perf_counter() - started:.1f}s")
+
+    finally:
+        await db_manager.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the knowledge analytics rollups")
+    parser.add_argument("--lock-timeout", default="30s", help="Postgres lock_timeout while acquiring the table locks")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild_knowledge_rollups(args.lock_timeout))
@@ -2,14 +2,19 @@
 # ABOUTME: Implements semantic search, pattern matching, clustering, and cross-project analysis
 
 import asyncio
+import hashlib
+import io
 import time
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import AsyncIterator, Dict, Iterator, List, Any, Optional, Union, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
 import numpy as np
 from collections import defaultdict
 import json
+import orjson
 import structlog
+from scipy.sparse import csr_matrix
+from sqlalchemy import text
 
 from models.advanced_query import (
     AdvancedSearchQuery,
@@ -30,9 +35,23 @@ from core.dependencies import DatabaseDependencies
 from services.base_service import BaseService
 from services.vector_service import VectorService
 from services.cache_intelligence import CacheIntelligence
+from services.clustering_engine import ClusteringResult, get_clustering_engine
+from services.similarity_blocks import SIMILARITY_METRICS, iter_similar_pairs, iter_top_k, pairs_to_csr, prepare_vectors
 
 logger = structlog.get_logger(__name__)
 
+# Clustering engine algorithm for each requested algorithm
+CLUSTERING_ALGORITHMS = {
+    ClusteringAlgorithm.KMEANS: "kmeans",
+    ClusteringAlgorithm.HIERARCHICAL: "hierarchical",
+    ClusteringAlgorithm.DBSCAN: "dbscan",
+    ClusteringAlgorithm.SPECTRAL: "spectral",
+    ClusteringAlgorithm.GAUSSIAN_MIXTURE: "gaussian_mixture"
+}
+
+# Items embedded per call when no stored vector can be reused
+FEATURE_EMBED_BATCH = 256
+
 class AdvancedQueryService(BaseService):
     """Service for advanced query operations"""
     
@@ -40,6 +59,7 @@ class AdvancedQueryService(BaseService):
         super().__init__(databases)
         self.vector_service = VectorService(databases)
         self.cache = CacheIntelligence(databases)
+        self.clustering_engine = get_clustering_engine()
         
     async def advanced_search(self, query: AdvancedSearchQuery) -> Dict[str, Any]:
         """
@@ -162,79 +182,106 @@ class AdvancedQueryService(BaseService):
         """
         Perform semantic clustering of knowledge items
         
+        Results are cached per query and knowledge corpus version, so repeat
+        requests are served without refitting until the items change.
+        
         Returns:
             Dict containing clusters and analysis
         """
         start_time = time.time()
         
         try:
-            # Get items for clustering
-            items = await self._get_items_for_clustering(query)
-            
-            if len(items) < query.min_cluster_size:
-                return {
-                    "clusters": [],
-                    "analysis": {"error": "Insufficient items for clustering"},
-                    "metadata": {"total_items": len(items)}
-                }
-            
-            # Extract features for clustering
-            features = await self._extract_clustering_features(items, query)
-            
-            # Perform clustering based on algorithm
-            clusters = []
-            if query.algorithm == ClusteringAlgorithm.KMEANS:
-                clusters = await self._kmeans_clustering(features, items, query)
-            elif query.algorithm == ClusteringAlgorithm.HIERARCHICAL:
-                clusters = await self._hierarchical_clustering(features, items, query)
-            elif query.algorithm == ClusteringAlgorithm.DBSCAN:
-                clusters = await self._dbscan_clustering(features, items, query)
-            elif query.algorithm == ClusteringAlgorithm.SPECTRAL:
-                clusters = await self._spectral_clustering(features, items, query)
-            elif query.algorithm == ClusteringAlgorithm.GAUSSIAN_MIXTURE:
-                clusters = await self._gaussian_mixture_clustering(features, items, query)
-            
-            # Generate cluster analysis
-            analysis = await self._analyze_clusters(clusters, query)
-            
-            # Generate visualization data if requested
-            visualization_data = None
-            if query.include_visualization:
-                visualization_data = await self._generate_cluster_visualization(clusters, features)
-            
-            # Generate topics if requested
-            topics = None
-            if query.include_topics:
-                topics = await self._generate_cluster_topics(clusters)
+            corpus_version = await self._knowledge_corpus_version(query.knowledge_types)
+            query_hash = hashlib.sha256(
+                json.dumps(query.dict(), sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            cache_key = self.generate_cache_key("advanced_query", "clusters", query_hash, corpus_version)
+            
+            result = await self.execute_with_cache(
+                cache_key,
+                lambda: self._compute_semantic_clusters(query),
+                ttl=self.settings.clustering_cache_ttl
+            )
             
             logger.info(
                 "Semantic clustering completed",
                 algorithm=query.algorithm,
-                clusters_generated=len(clusters),
-                total_items=len(items),
+                clusters_generated=result["metadata"].get("clusters_generated", 0),
+                total_items=result["metadata"].get("total_items", 0),
                 execution_time_ms=(time.time() - start_time) * 1000
             )
             
-            result = {
-                "clusters": clusters,
-                "analysis": analysis,
-                "metadata": {
-                    "algorithm": query.algorithm,
-                    "total_items": len(items),
-                    "clusters_generated": len(clusters)
-                }
+            return result
+        
+        except Exception as e:
+            logger.error("Semantic clustering failed", error=str(e))
+            raise
+    
+    async def _compute_semantic_clusters(self, query: SemanticClusterQuery) -> Dict[str, Any]:
+        """Load items and their vectors, fit in the clustering engine and build the response"""
+        algorithm = CLUSTERING_ALGORITHMS.get(query.algorithm)
+        if algorithm is None:
+            raise ValueError(f"Unsupported clustering algorithm: {query.algorithm}")
+        
+        # Get items for clustering
+        items = await self._get_items_for_clustering(query)
+        
+        if len(items) < query.min_cluster_size:
+            return {
+                "clusters": [],
+                "analysis": {"error": "Insufficient items for clustering"},
+                "metadata": {"total_items": len(items)}
             }
-            
+        
+        # Extract features for clustering
+        features = await self._extract_clustering_features(items, query)
+        if features.size == 0:
+            return {
+                "clusters": [],
+                "analysis": {"error": "No features extracted for clustering"},
+                "metadata": {"total_items": len(items)}
+            }
+        
+        # Reduce and fit off the event loop
+        fit = await self.clustering_engine.cluster(
+            algorithm,
+            features,
+            {
+                "n_clusters": query.num_clusters,
+                "auto_clusters": query.auto_clusters,
+                "min_cluster_size": query.min_cluster_size
+            }
+        )
+        clusters, members = await self._build_clusters(fit, items, features, query)
+        
+        # Generate cluster analysis
+        analysis = await self._analyze_clusters(clusters, query)
+        
+        result = {
+            "clusters": clusters,
+            "analysis": analysis,
+            "metadata": {
+                "algorithm": query.algorithm,
+                "method": fit.method,
+                "reduced_dimensions": fit.reduced_dimensions,
+                "total_items": len(items),
+                "clusters_generated": len(clusters)
+            }
+        }
+        
+        # Generate visualization data if requested
+        if query.include_visualization:
+            visualization_data = await self._generate_cluster_visualization(clusters, members, fit)
             if visualization_data:
                 result["visualization"] = visualization_data
+        
+        # Generate topics if requested
+        if query.include_topics:
+            topics = await self._generate_cluster_topics(clusters)
             if topics:
                 result["topics"] = topics
-                
-            return result
-            
-        except Exception as e:
-            logger.error("Semantic clustering failed", error=str(e))
-            raise
+        
+        return result
     
     async def cross_project_analysis(self, query: ProjectCrossReferenceQuery) -> Dict[str, Any]:
         """
@@ -417,16 +464,26 @@ class AdvancedQueryService(BaseService):
             logger.error("Time series analysis failed", error=str(e))
             raise
     
-    async def generate_similarity_matrix(self, query: SimilarityMatrixQuery) -> Dict[str, Any]:
+    async def generate_similarity_matrix(self, query: SimilarityMatrixQuery, top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Generate similarity matrices for knowledge items
         
+        Similarities are computed one row block at a time and only pairs at
+        or above query.threshold (or each item's top_k neighbours) are kept,
+        as a sparse matrix; only the dense format expands it to n x n, so
+        the sparse formats require a threshold or top_k.
+        
+        Raises:
+            ValueError: For an unsupported metric or an unbounded sparse request
+        
         Returns:
             Dict containing similarity matrix and metadata
         """
         start_time = time.time()
         
         try:
+            metric = self._similarity_metric(query, top_k, dense=getattr(query.format, "value", query.format) == "dense")
+            
             # Get items for similarity calculation
             items = await self._get_items_for_similarity(query)
             
@@ -442,16 +499,15 @@ class AdvancedQueryService(BaseService):
             if len(items) > query.max_items:
                 items = items[:query.max_items]
             
-            # Compute similarity matrix
-            similarity_matrix = await self._compute_similarity_matrix(items, query.similarity_metric)
-            
-            # Apply threshold for sparse matrix
-            if query.threshold is not None:
-                similarity_matrix = await self._apply_threshold(similarity_matrix, query.threshold)
+            # Compute the sparse similarity matrix off the event loop
+            vectors = await self._similarity_vectors(items, metric)
+            similarity_matrix = await asyncio.to_thread(
+                self._compute_similarity_matrix, vectors, query.threshold, top_k, metric
+            )
             
             # Format matrix based on requested format
             formatted_matrix = await self._format_similarity_matrix(
-                similarity_matrix, query.format
+                similarity_matrix, query.format, self._self_similarity(vectors, metric)
             )
             
             # Compute matrix statistics
@@ -467,7 +523,8 @@ class AdvancedQueryService(BaseService):
             logger.info(
                 "Similarity matrix generated",
                 matrix_size=f"{len(items)}x{len(items)}",
-                similarity_metric=query.similarity_metric,
+                stored_pairs=similarity_matrix.nnz,
+                similarity_metric=metric,
                 format=query.format,
                 execution_time_ms=(time.time() - start_time) * 1000
             )
@@ -478,17 +535,43 @@ class AdvancedQueryService(BaseService):
                 "dimensions": [len(items), len(items)],
                 "statistics": statistics,
                 "metadata": {
-                    "similarity_metric": query.similarity_metric,
+                    "similarity_metric": metric,
                     "format": query.format,
                     "threshold": query.threshold,
+                    "top_k": top_k,
                     "total_items": len(items)
                 }
             }
-            
+        
         except Exception as e:
             logger.error("Similarity matrix generation failed", error=str(e))
             raise
     
+    async def open_similarity_stream(
+        self,
+        query: SimilarityMatrixQuery,
+        top_k: Optional[int] = None,
+        stream_format: str = "ndjson"
+    ) -> AsyncIterator[bytes]:
+        """Load items and vectors now and return an iterator streaming the similar pairs
+        
+        All database work happens before this returns, so the iterator can
+        outlive the request's connections. Pairs are produced one row block
+        at a time, as NDJSON lines or as an Arrow IPC stream with one record
+        batch per block.
+        
+        Raises:
+            ValueError: For an unsupported metric or without a threshold or top_k
+        """
+        metric = self._similarity_metric(query, top_k, dense=False)
+        items = (await self._get_items_for_similarity(query))[:query.max_items]
+        vectors = await self._similarity_vectors(items, metric) if len(items) >= 2 else None
+        ids = np.array([item["id"] for item in items], dtype=object)
+        
+        if stream_format == "arrow":
+            return self._stream_pairs_arrow(ids, vectors, query.threshold, top_k, metric)
+        return self._stream_pairs_ndjson(ids, vectors, query, top_k, metric)
+    
     async def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics for query operations"""
         try:
@@ -505,6 +588,7 @@ class AdvancedQueryService(BaseService):
                 "cache_performance": cache_stats,
                 "database_performance": db_stats,
                 "query_execution": query_stats,
+                "clustering_engine": self.clustering_engine.get_stats(),
                 "system_health": await self._check_system_health(),
                 "timestamp": datetime.utcnow().isoformat()
             }
@@ -902,349 +986,180 @@ class AdvancedQueryService(BaseService):
     
     # Semantic clustering helper methods
     async def _get_items_for_clustering(self, query: SemanticClusterQuery) -> List[Dict[str, Any]]:
-        """Get knowledge items for clustering based on query filters"""
-        try:
-            # Use the existing KnowledgeService to get items
-            from services.knowledge_service import KnowledgeService
-            from models.knowledge import SearchQuery
-            
-            knowledge_service = KnowledgeService(self.databases)
-            
-            # Try to get all items - use a broad query instead of empty query
-            search_query = SearchQuery(
-                query="the",  # Broad query that should match most items
-                k=1000,  # Get up to 1000 items for clustering
-                search_type="hybrid",  # Use hybrid to get more results
-                include_metadata=True
-            )
-            
-            items = await knowledge_service.search_knowledge(search_query)
-            
-            # If that doesn't work, try getting items directly from database
-            if not items:
-                logger.info("No items from search, trying direct database query")
-                items = await knowledge_service.list_knowledge_items(limit=1000)
-            
-            # Convert to dict format expected by clustering
-            items_dict = []
-            for item in items:
-                # Apply knowledge type filters if specified
-                if query.knowledge_types and item.knowledge_type not in query.knowledge_types:
-                    continue
-                    
-                item_dict = {
-                    "id": str(item.id),
-                    "title": item.title,
-                    "content": item.content,
-                    "knowledge_type": item.knowledge_type,
-                    "source_type": item.source_type,
-                    "tags": item.tags or [],
-                    "metadata": item.metadata or {},
-                    "created_at": item.created_at.isoformat() if item.created_at else None
-                }
-                items_dict.append(item_dict)
-            
-            logger.info(f"Retrieved {len(items_dict)} items for clustering")
-            return items_dict
-            
-        except Exception as e:
-            logger.error("Failed to get items for clustering", error=str(e))
-            # Try one more fallback approach - direct database access
-            try:
-                logger.info("Trying direct database access")
-                from sqlalchemy import text
-                async with self.databases.postgres.get_postgres_session() as session:
-                    result = await session.execute(
-                        text("SELECT id, title, content, knowledge_type, source_type, tags, metadata, created_at FROM knowledge_items LIMIT 1000")
-                    )
-                    rows = result.fetchall()
-                    
-                    items_dict = []
-                    for row in rows:
-                        item_dict = {
-                            "id": str(row.id),
-                            "title": row.title,
-                            "content": row.content,
-                            "knowledge_type": row.knowledge_type,
-                            "source_type": row.source_type,
-                            "tags": row.tags or [],
-                            "metadata": row.metadata or {},
-                            "created_at": row.created_at.isoformat() if row.created_at else None
-                        }
-                        items_dict.append(item_dict)
-                    
-                    logger.info(f"Retrieved {len(items_dict)} items via direct DB access")
-                    return items_dict
-                    
-            except Exception as db_error:
-                logger.error("Direct database access also failed", error=str(db_error))
-                return []
+        """Get current knowledge items for clustering, filtered by knowledge type"""
+        return await self._load_knowledge_items(
+            knowledge_types=query.knowledge_types,
+            limit=self.settings.clustering_max_items
+        )
+    
+    def _knowledge_item_filter(self, knowledge_types: Optional[List[Any]] = None) -> Tuple[str, Dict[str, Any]]:
+        """WHERE clause and params selecting current knowledge items of the given types"""
+        where_conditions = ["system_time_until IS NULL"]
+        params: Dict[str, Any] = {}
+        
+        if knowledge_types:
+            where_conditions.append("knowledge_type = ANY(:knowledge_types)")
+            params["knowledge_types"] = [getattr(kt, "value", kt) for kt in knowledge_types]
+        
+        return " AND ".join(where_conditions), params
+    
+    async def _knowledge_corpus_version(self, knowledge_types: Optional[List[Any]] = None) -> str:
+        """Version stamp of the current knowledge items of the given types
+        
+        Any insert, update or removal changes the item count or the latest
+        updated_at, so a corpus change moves cached results to a new key.
+        """
+        where_clause, params = self._knowledge_item_filter(knowledge_types)
+        result = await self.postgres.execute(
+            text(f"""
+                SELECT COUNT(*) AS item_count, MAX(updated_at) AS last_updated
+                FROM knowledge_items
+                WHERE {where_clause}
+            """),
+            params
+        )
+        row = result.fetchone()
+        last_updated = int(row.last_updated.timestamp() * 1_000_000) if row.last_updated else 0
+        return f"{row.item_count}-{last_updated}"
+    
+    async def _load_knowledge_items(
+        self,
+        knowledge_types: Optional[List[Any]] = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """Read current knowledge items straight from PostgreSQL, newest first
+        
+        Each item keeps its embedding_id so its stored vector can be reused.
+        """
+        where_clause, params = self._knowledge_item_filter(knowledge_types)
+        params["limit"] = limit
+        
+        result = await self.postgres.execute(
+            text(f"""
+                SELECT id, title, content, knowledge_type, metadata, embedding_id, created_at
+                FROM knowledge_items
+                WHERE {where_clause}
+                ORDER BY created_at DESC
+                LIMIT :limit
+            """),
+            params
+        )
+        
+        items = []
+        for row in result.fetchall():
+            metadata = row.metadata or {}
+            items.append({
+                "id": str(row.id),
+                "title": row.title,
+                "content": row.content,
+                "knowledge_type": row.knowledge_type,
+                "source_type": metadata.get("source_type", "conversation"),
+                "tags": metadata.get("tags", []),
+                "metadata": metadata,
+                "embedding_id": row.embedding_id,
+                "created_at": row.created_at.isoformat() if row.created_at else None
+            })
+        
+        logger.info("Retrieved knowledge items", count=len(items), knowledge_types=params.get("knowledge_types"))
+        return items
     
     async def _extract_clustering_features(self, items: List[Dict[str, Any]], query: SemanticClusterQuery) -> np.ndarray:
-        """Extract features from items for clustering"""
+        """Extract one float32 feature row per item for clustering
+        
+        With use_content the items' stored content vectors are reused and
+        only items without one are embedded; otherwise every item is
+        embedded from its title (plus tags with use_metadata).
+        """
         try:
-            # Use the vector service to get embeddings
-            features = []
+            if query.use_content:
+                texts = [item.get("content") or item.get("title") or "" for item in items]
+                return await self._load_item_vectors(items, texts)
             
+            texts = []
             for item in items:
-                # Create text for embedding based on query preferences
-                text_parts = []
-                
-                if query.use_content and item.get("content"):
-                    text_parts.append(item["content"])
-                
-                if item.get("title"):
-                    text_parts.append(item["title"])
-                
+                text_parts = [item["title"]] if item.get("title") else []
                 if query.use_metadata and item.get("tags"):
                     text_parts.extend(item["tags"])
-                
-                # Combine text
-                combined_text = " ".join(text_parts)
-                
-                # Get embedding using vector service
-                try:
-                    embedding = await self.vector_service.get_embedding(combined_text)
-                    features.append(embedding)
-                except Exception as e:
-                    logger.warning(f"Failed to get embedding for item {item.get('id')}", error=str(e))
-                    # Use a zero vector as fallback
-                    features.append(np.zeros(384))  # Default embedding dimension
-            
-            if not features:
-                return np.array([])
-            
-            features_array = np.array(features)
-            logger.info(f"Extracted features with shape {features_array.shape}")
-            return features_array
-            
-        except Exception as e:
-            logger.error("Failed to extract clustering features", error=str(e))
-            return np.array([])
-    
-    async def _kmeans_clustering(self, features: np.ndarray, items: List[Dict[str, Any]], query: SemanticClusterQuery) -> List[Dict[str, Any]]:
-        """Perform K-means clustering"""
-        try:
-            from sklearn.cluster import KMeans
-            from sklearn.metrics import silhouette_score
-            
-            if features.size == 0:
-                return []
-            
-            # Determine number of clusters
-            n_clusters = query.num_clusters
-            if query.auto_clusters or not n_clusters:
-                # Use elbow method to find optimal clusters
-                max_k = min(10, len(items) // query.min_cluster_size)
-                if max_k < 2:
-                    n_clusters = 2
-                else:
-                    scores = []
-                    for k in range(2, max_k + 1):
-                        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-                        cluster_labels = kmeans.fit_predict(features)
-                        score = silhouette_score(features, cluster_labels)
-                        scores.append((k, score))
-                    
-                    # Choose k with highest silhouette score
-                    n_clusters = max(scores, key=lambda x: x[1])[0]
-            
-            # Perform clustering
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-            cluster_labels = kmeans.fit_predict(features)
-            
-            # Group items by cluster
-            clusters = []
-            for cluster_id in range(n_clusters):
-                cluster_items = [
-                    items[i] for i, label in enumerate(cluster_labels) 
-                    if label == cluster_id
-                ]
-                
-                if len(cluster_items) >= query.min_cluster_size:
-                    cluster = {
-                        "id": f"cluster_{cluster_id}",
-                        "size": len(cluster_items),
-                        "items": cluster_items[:query.max_items_per_cluster],
-                        "centroid": kmeans.cluster_centers_[cluster_id].tolist(),
-                        "metadata": {
-                            "algorithm": "kmeans",
-                            "cluster_id": cluster_id
-                        }
-                    }
-                    clusters.append(cluster)
-            
-            return clusters
-            
-        except Exception as e:
-            logger.error("K-means clustering failed", error=str(e))
-            return []
-    
-    async def _hierarchical_clustering(self, features: np.ndarray, items: List[Dict[str, Any]], query: SemanticClusterQuery) -> List[Dict[str, Any]]:
-        """Perform hierarchical clustering"""
-        try:
-            from sklearn.cluster import AgglomerativeClustering
-            
-            if features.size == 0:
-                return []
-            
-            n_clusters = query.num_clusters or min(5, len(items) // query.min_cluster_size)
-            n_clusters = max(2, n_clusters)
-            
-            clustering = AgglomerativeClustering(n_clusters=n_clusters)
-            cluster_labels = clustering.fit_predict(features)
-            
-            # Group items by cluster
-            clusters = []
-            for cluster_id in range(n_clusters):
-                cluster_items = [
-                    items[i] for i, label in enumerate(cluster_labels) 
-                    if label == cluster_id
-                ]
-                
-                if len(cluster_items) >= query.min_cluster_size:
-                    cluster = {
-                        "id": f"cluster_{cluster_id}",
-                        "size": len(cluster_items),
-                        "items": cluster_items[:query.max_items_per_cluster],
-                        "metadata": {
-                            "algorithm": "hierarchical",
-                            "cluster_id": cluster_id
-                        }
-                    }
-                    clusters.append(cluster)
-            
-            return clusters
-            
-        except Exception as e:
-            logger.error("Hierarchical clustering failed", error=str(e))
-            return []
-    
-    async def _dbscan_clustering(self, features: np.ndarray, items: List[Dict[str, Any]], query: SemanticClusterQuery) -> List[Dict[str, Any]]:
-        """Perform DBSCAN clustering"""
-        try:
-            from sklearn.cluster import DBSCAN
-            
-            if features.size == 0:
-                return []
-            
-            # DBSCAN parameters
-            eps = 0.5  # Distance threshold
-            min_samples = max(2, query.min_cluster_size)
-            
-            clustering = DBSCAN(eps=eps, min_samples=min_samples)
-            cluster_labels = clustering.fit_predict(features)
-            
-            # Group items by cluster (exclude noise points with label -1)
-            clusters = []
-            unique_labels = set(cluster_labels)
-            unique_labels.discard(-1)  # Remove noise label
-            
-            for cluster_id in unique_labels:
-                cluster_items = [
-                    items[i] for i, label in enumerate(cluster_labels) 
-                    if label == cluster_id
-                ]
-                
-                if len(cluster_items) >= query.min_cluster_size:
-                    cluster = {
-                        "id": f"cluster_{cluster_id}",
-                        "size": len(cluster_items),
-                        "items": cluster_items[:query.max_items_per_cluster],
-                        "metadata": {
-                            "algorithm": "dbscan",
-                            "cluster_id": cluster_id,
-                            "eps": eps,
-                            "min_samples": min_samples
-                        }
-                    }
-                    clusters.append(cluster)
-            
-            return clusters
-            
+                texts.append(" ".join(text_parts))
+            return await self._load_item_vectors(items, texts, reuse_stored=False)
+        
         except Exception as e:
-            logger.error("DBSCAN clustering failed", error=str(e))
-            return []
+            # Embedding and retrieval failures already degrade below; anything
+            # reaching here is a real fault, not an empty feature set
+            logger.error("Failed to extract clustering features", item_count=len(items), error=str(e))
+            raise
     
-    async def _spectral_clustering(self, features: np.ndarray, items: List[Dict[str, Any]], query: SemanticClusterQuery) -> List[Dict[str, Any]]:
-        """Perform spectral clustering"""
-        try:
-            from sklearn.cluster import SpectralClustering
-            
-            if features.size == 0:
-                return []
-            
-            n_clusters = query.num_clusters or min(5, len(items) // query.min_cluster_size)
-            n_clusters = max(2, n_clusters)
-            
-            clustering = SpectralClustering(n_clusters=n_clusters, random_state=42)
-            cluster_labels = clustering.fit_predict(features)
-            
-            # Group items by cluster
-            clusters = []
-            for cluster_id in range(n_clusters):
-                cluster_items = [
-                    items[i] for i, label in enumerate(cluster_labels) 
-                    if label == cluster_id
-                ]
-                
-                if len(cluster_items) >= query.min_cluster_size:
-                    cluster = {
-                        "id": f"cluster_{cluster_id}",
-                        "size": len(cluster_items),
-                        "items": cluster_items[:query.max_items_per_cluster],
-                        "metadata": {
-                            "algorithm": "spectral",
-                            "cluster_id": cluster_id
-                        }
-                    }
-                    clusters.append(cluster)
-            
-            return clusters
-            
-        except Exception as e:
-            logger.error("Spectral clustering failed", error=str(e))
-            return []
+    async def _load_item_vectors(
+        self,
+        items: List[Dict[str, Any]],
+        texts: List[str],
+        reuse_stored: bool = True
+    ) -> np.ndarray:
+        """Contiguous float32 matrix of item vectors, one row per item
+        
+        Stored vectors are bulk-retrieved from Qdrant by embedding_id; rows
+        still missing are embedded from texts FEATURE_EMBED_BATCH at a time.
+        """
+        point_ids = [item.get("embedding_id") if reuse_stored else None for item in items]
+        features, found = await self.vector_service.fetch_stored_vectors(point_ids)
+        
+        missing = np.flatnonzero(~found)
+        for start in range(0, len(missing), FEATURE_EMBED_BATCH):
+            rows = missing[start:start + FEATURE_EMBED_BATCH]
+            embeddings = await self.vector_service.get_embeddings([texts[row] for row in rows])
+            features[rows] = np.asarray(embeddings, dtype=np.float32)
+        
+        logger.info(
+            "Loaded item vectors",
+            shape=features.shape,
+            stored=int(found.sum()),
+            embedded=len(missing)
+        )
+        return features
     
-    async def _gaussian_mixture_clustering(self, features: np.ndarray, items: List[Dict[str, Any]], query: SemanticClusterQuery) -> List[Dict[str, Any]]:
-        """Perform Gaussian Mixture Model clustering"""
-        try:
-            from sklearn.mixture import GaussianMixture
-            
-            if features.size == 0:
-                return []
-            
-            n_clusters = query.num_clusters or min(5, len(items) // query.min_cluster_size)
-            n_clusters = max(2, n_clusters)
-            
-            clustering = GaussianMixture(n_components=n_clusters, random_state=42)
-            cluster_labels = clustering.fit_predict(features)
-            
-            # Group items by cluster
-            clusters = []
-            for cluster_id in range(n_clusters):
-                cluster_items = [
-                    items[i] for i, label in enumerate(cluster_labels) 
-                    if label == cluster_id
-                ]
-                
-                if len(cluster_items) >= query.min_cluster_size:
-                    cluster = {
-                        "id": f"cluster_{cluster_id}",
-                        "size": len(cluster_items),
-                        "items": cluster_items[:query.max_items_per_cluster],
-                        "metadata": {
-                            "algorithm": "gaussian_mixture",
-                            "cluster_id": cluster_id
-                        }
-                    }
-                    clusters.append(cluster)
-            
-            return clusters
+    async def _build_clusters(
+        self,
+        fit: ClusteringResult,
+        items: List[Dict[str, Any]],
+        features: np.ndarray,
+        query: SemanticClusterQuery
+    ) -> Tuple[List[Dict[str, Any]], List[np.ndarray]]:
+        """Group items by fitted label, returning clusters and the feature rows of their listed items
+        
+        Noise (label -1) and clusters smaller than min_cluster_size are dropped.
+        """
+        clusters = []
+        members = []
+        if not len(fit.labels):
+            return clusters, members
+        
+        order = np.argsort(fit.labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(fit.labels[order])) + 1
+        
+        for rows in np.split(order, boundaries):
+            cluster_id = int(fit.labels[rows[0]])
+            if cluster_id < 0 or len(rows) < query.min_cluster_size:
+                continue
+            
+            listed = rows[:query.max_items_per_cluster]
+            cluster = {
+                "id": f"cluster_{cluster_id}",
+                "size": len(rows),
+                "items": [items[row] for row in listed],
+                "metadata": {
+                    "algorithm": fit.method,
+                    "cluster_id": cluster_id,
+                    **fit.params
+                }
+            }
+            if fit.method in ("kmeans", "minibatch_kmeans"):
+                # Centroids are reported in embedding space, not the reduced space
+                cluster["centroid"] = features[rows].mean(axis=0).tolist()
             
-        except Exception as e:
-            logger.error("Gaussian mixture clustering failed", error=str(e))
-            return []
+            clusters.append(cluster)
+            members.append(listed)
+        
+        return clusters, members
     
     async def _analyze_clusters(self, clusters: List[Dict[str, Any]], query: SemanticClusterQuery) -> Dict[str, Any]:
         """Analyze clustering results"""
@@ -1274,43 +1189,32 @@ class AdvancedQueryService(BaseService):
             logger.error("Cluster analysis failed", error=str(e))
             return {"error": str(e)}
     
-    async def _generate_cluster_visualization(self, clusters: List[Dict[str, Any]], features: np.ndarray) -> Dict[str, Any]:
-        """Generate visualization data for clusters"""
+    async def _generate_cluster_visualization(
+        self,
+        clusters: List[Dict[str, Any]],
+        members: List[np.ndarray],
+        fit: ClusteringResult
+    ) -> Dict[str, Any]:
+        """Scatter plot of clustered items from the PCA projection the fit already computed"""
         try:
-            from sklearn.decomposition import PCA
-            
-            if features.size == 0:
-                return {}
+            points = []
+            for cluster, rows in zip(clusters, members):
+                for item, row in zip(cluster["items"], rows):
+                    points.append({
+                        "x": float(fit.projection[row, 0]),
+                        "y": float(fit.projection[row, 1]),
+                        "cluster_id": cluster["id"],
+                        "item_id": item.get("id"),
+                        "title": item.get("title", "")
+                    })
             
-            # Reduce dimensionality for visualization
-            pca = PCA(n_components=2)
-            features_2d = pca.fit_transform(features)
-            
-            # Create visualization data
-            visualization_data = {
+            return {
                 "scatter_plot": {
-                    "points": [],
-                    "explained_variance": pca.explained_variance_ratio_.tolist()
+                    "points": points,
+                    "explained_variance": fit.explained_variance
                 }
             }
-            
-            # Add points for each cluster
-            item_index = 0
-            for cluster in clusters:
-                for item in cluster["items"]:
-                    if item_index < len(features_2d):
-                        point = {
-                            "x": float(features_2d[item_index][0]),
-                            "y": float(features_2d[item_index][1]),
-                            "cluster_id": cluster["id"],
-                            "item_id": item.get("id"),
-                            "title": item.get("title", "")
-                        }
-                        visualization_data["scatter_plot"]["points"].append(point)
-                        item_index += 1
-            
-            return visualization_data
-            
+        
         except Exception as e:
             logger.error("Visualization generation failed", error=str(e))
             return {}
@@ -1358,6 +1262,193 @@ class AdvancedQueryService(BaseService):
             logger.error("Topic generation failed", error=str(e))
             return []
 
+    # Similarity matrix helper methods
+    async def _get_items_for_similarity(self, query: SimilarityMatrixQuery) -> List[Dict[str, Any]]:
+        """Get current knowledge items for a similarity matrix"""
+        return await self._load_knowledge_items(limit=query.max_items)
+    
+    def _similarity_metric(self, query: SimilarityMatrixQuery, top_k: Optional[int], dense: bool) -> str:
+        """The requested metric, checked to be computable and the output bounded
+        
+        Only the dense format may keep every pair; sparse matrices and
+        streams need a threshold or top_k so they stay below n x n.
+        """
+        metric = getattr(query.similarity_metric, "value", query.similarity_metric) or "cosine"
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(
+                f"Unsupported similarity metric '{metric}'; expected one of {', '.join(SIMILARITY_METRICS)}"
+            )
+        if not dense and query.threshold is None and not top_k:
+            raise ValueError("A threshold or top_k is required unless the dense format is requested")
+        return metric
+    
+    async def _similarity_vectors(self, items: List[Dict[str, Any]], metric: str) -> np.ndarray:
+        """Content vectors of the items prepared for metric (unit length except for dot product)"""
+        texts = [item.get("content") or item.get("title") or "" for item in items]
+        return prepare_vectors(await self._load_item_vectors(items, texts), metric)
+    
+    def _self_similarity(self, vectors: np.ndarray, metric: str) -> Union[float, np.ndarray]:
+        """Diagonal of the dense matrix: 1 for cosine and euclidean, squared norms for dot product"""
+        if metric == "dot_product":
+            return np.einsum("ij,ij->i", vectors, vectors)
+        return 1.0
+    
+    def _similarity_pair_blocks(
+        self,
+        vectors: np.ndarray,
+        threshold: Optional[float],
+        top_k: Optional[int],
+        metric: str
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Row blocks of (rows, cols, scores): each row's top_k neighbours, or all i < j pairs at or above threshold"""
+        if top_k:
+            return iter_top_k(vectors, top_k, threshold, metric=metric)
+        return iter_similar_pairs(vectors, -np.inf if threshold is None else threshold, metric=metric)
+    
+    def _compute_similarity_matrix(
+        self,
+        vectors: np.ndarray,
+        threshold: Optional[float],
+        top_k: Optional[int],
+        metric: str
+    ) -> csr_matrix:
+        """Sparse n x n similarity matrix without its diagonal (runs on a worker thread)"""
+        blocks = list(self._similarity_pair_blocks(vectors, threshold, top_k, metric))
+        size = vectors.shape[0]
+        if not blocks:
+            return csr_matrix((size, size), dtype=np.float32)
+        
+        rows, cols, scores = (np.concatenate(parts) for parts in zip(*blocks))
+        # Threshold pairs cover i < j only; top-k rows are already complete
+        return pairs_to_csr(rows, cols, scores, size, symmetric=not top_k)
+    
+    async def _format_similarity_matrix(
+        self,
+        matrix: csr_matrix,
+        matrix_format: Any,
+        diagonal: Union[float, np.ndarray] = 1.0
+    ) -> Any:
+        """Dense nested lists, CSR arrays for 'csr', otherwise COO triples of the stored pairs"""
+        matrix_format = getattr(matrix_format, "value", matrix_format)
+        
+        if matrix_format == "dense":
+            dense = matrix.toarray()
+            np.fill_diagonal(dense, diagonal)
+            return dense.tolist()
+        
+        if matrix_format == "csr":
+            return {
+                "indptr": matrix.indptr.tolist(),
+                "indices": matrix.indices.tolist(),
+                "data": matrix.data.tolist()
+            }
+        
+        coo = matrix.tocoo()
+        return {
+            "rows": coo.row.tolist(),
+            "cols": coo.col.tolist(),
+            "values": coo.data.tolist()
+        }
+    
+    async def _compute_matrix_statistics(self, matrix: csr_matrix) -> Dict[str, Any]:
+        """Summary statistics of the stored off-diagonal similarities"""
+        size = matrix.shape[0]
+        if not matrix.nnz:
+            return {"stored_pairs": 0, "density": 0.0}
+        return {
+            "stored_pairs": int(matrix.nnz),
+            "mean": float(matrix.data.mean()),
+            "std": float(matrix.data.std()),
+            "min": float(matrix.data.min()),
+            "max": float(matrix.data.max()),
+            "density": float(matrix.nnz / (size * (size - 1)))
+        }
+    
+    async def _prepare_item_metadata(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Row/column labels for the matrix"""
+        return [
+            {
+                "id": item["id"],
+                "title": item.get("title"),
+                "knowledge_type": item.get("knowledge_type"),
+                "created_at": item.get("created_at")
+            }
+            for item in items
+        ]
+    
+    async def _next_pair_block(self, blocks: Iterator) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Compute the next row block on a worker thread (None when exhausted)"""
+        return await asyncio.to_thread(next, blocks, None)
+    
+    async def _stream_pairs_ndjson(
+        self,
+        ids: np.ndarray,
+        vectors: Optional[np.ndarray],
+        query: SimilarityMatrixQuery,
+        top_k: Optional[int],
+        metric: str
+    ) -> AsyncIterator[bytes]:
+        """Header line, one line per pair, then a summary line"""
+        yield orjson.dumps({
+            "type": "header",
+            "dimensions": [len(ids), len(ids)],
+            "similarity_metric": metric,
+            "threshold": query.threshold,
+            "top_k": top_k
+        }) + b"\n"
+        
+        pairs = 0
+        if vectors is not None:
+            blocks = self._similarity_pair_blocks(vectors, query.threshold, top_k, metric)
+            while (block := await self._next_pair_block(blocks)) is not None:
+                rows, cols, scores = block
+                yield b"".join(
+                    orjson.dumps({"source": source, "target": target, "score": score}) + b"\n"
+                    for source, target, score in zip(ids[rows], ids[cols], scores.tolist())
+                )
+                pairs += len(rows)
+        
+        yield orjson.dumps({"type": "summary", "pairs": pairs}) + b"\n"
+    
+    async def _stream_pairs_arrow(
+        self,
+        ids: np.ndarray,
+        vectors: Optional[np.ndarray],
+        threshold: Optional[float],
+        top_k: Optional[int],
+        metric: str
+    ) -> AsyncIterator[bytes]:
+        """Arrow IPC stream of (source, target, score) with one record batch per row block"""
+        import pyarrow as pa
+        
+        schema = pa.schema([
+            ("source", pa.string()),
+            ("target", pa.string()),
+            ("score", pa.float32())
+        ])
+        sink = io.BytesIO()
+        
+        def drain() -> bytes:
+            data = sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+            return data
+        
+        with pa.ipc.new_stream(sink, schema) as writer:
+            yield drain()
+            
+            if vectors is not None:
+                blocks = self._similarity_pair_blocks(vectors, threshold, top_k, metric)
+                while (block := await self._next_pair_block(blocks)) is not None:
+                    rows, cols, scores = block
+                    writer.write_batch(pa.record_batch(
+                        [pa.array(ids[rows], pa.string()), pa.array(ids[cols], pa.string()), pa.array(scores, pa.float32())],
+                        schema=schema
+                    ))
+                    yield drain()
+        
+        yield drain()
+    
     # More helper methods would be implemented...
     async def _analyze_results_distribution(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze the distribution of search results"""
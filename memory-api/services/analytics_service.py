@@ -57,17 +57,21 @@ class AnalyticsService:
                     metadata={"daily_increment": 0}
                 ))
             
-            # Get REAL knowledge by type
-            type_query = text("SELECT knowledge_type, COUNT(*) as count FROM knowledge_items GROUP BY knowledge_type")
+            # Get REAL knowledge by type from the trigger-maintained daily rollup
+            type_query = text("""
+                SELECT knowledge_type, SUM(item_count)::bigint as count
+                FROM knowledge_daily_rollup
+                GROUP BY knowledge_type
+            """)
             result = await self.postgres.execute(type_query)
             type_rows = result.fetchall()
             knowledge_by_type = {row.knowledge_type: row.count for row in type_rows}
             
             # Get REAL knowledge by project
             project_query = text("""
-                SELECT p.name, COUNT(ki.id) as count
+                SELECT p.name, COALESCE(SUM(r.item_count), 0)::bigint as count
                 FROM projects p
-                LEFT JOIN knowledge_items ki ON p.id = ki.project_id
+                LEFT JOIN knowledge_daily_rollup r ON p.id = r.project_id
                 GROUP BY p.id, p.name
             """)
             result = await self.postgres.execute(project_query)
@@ -101,9 +105,9 @@ class AnalyticsService:
                     p.name,
                     p.description,
                     p.technology_stack,
-                    COUNT(ki.id) as knowledge_count
+                    COALESCE(SUM(r.item_count), 0)::bigint as knowledge_count
                 FROM projects p
-                LEFT JOIN knowledge_items ki ON p.id = ki.project_id
+                LEFT JOIN knowledge_daily_rollup r ON p.id = r.project_id
                 GROUP BY p.id, p.name, p.description, p.technology_stack
                 ORDER BY knowledge_count DESC
             """)
@@ -219,12 +223,11 @@ class AnalyticsService:
             # Get REAL knowledge quality metrics
             quality_query = text("""
                 SELECT 
-                    AVG(quality_score) as avg_quality,
-                    AVG(reusability_score) as avg_reusability,
-                    AVG(success_rate) as avg_success_rate,
-                    COUNT(*) as total_items
-                FROM knowledge_items
-                WHERE quality_score > 0
+                    SUM(quality_sum) / NULLIF(SUM(scored_count), 0) as avg_quality,
+                    SUM(reusability_sum) / NULLIF(SUM(reusability_count), 0) as avg_reusability,
+                    SUM(success_sum) / NULLIF(SUM(success_count), 0) as avg_success_rate,
+                    COALESCE(SUM(scored_count), 0)::bigint as total_items
+                FROM knowledge_daily_rollup
             """)
             result = await self.postgres.execute(quality_query)
             quality_row = result.fetchone()
@@ -282,10 +285,14 @@ class AnalyticsService:
         )
     
     async def refresh_analytics_cache(self) -> None:
-        """Refresh analytics cache (placeholder for now)"""
-        # For now, just log the cache refresh request
-        logger.info("Analytics cache refresh requested")
-        pass
+        """Drop cached knowledge aggregates so the next reads hit the rollups
+        
+        Triggers keep the rollups current. Reconciling them with a full
+        rebuild locks knowledge writes, so it is left to the
+        scripts/rebuild_knowledge_rollups.py maintenance job.
+        """
+        invalidated = await self.knowledge_service.cache_invalidate_tags("knowledge:aggregates")
+        logger.info("Analytics cache refreshed", invalidated=invalidated)
     
     async def get_dashboard_summary(self) -> DashboardSummaryData:
         """Generate REAL dashboard summary"""
@@ -48,16 +48,16 @@ class AnalyticsService:
             total_items = stats.total_items
             
             # Get REAL daily growth data from database
-            async with self.databases.postgres_pool.acquire() as conn:
-                # Query actual daily knowledge creation
+            async with self.databases.postgres.raw_connection() as conn:
+                # Query actual daily knowledge creation from the trigger-maintained rollup
                 daily_growth_query = """
-                    SELECT DATE(created_at) as date, COUNT(*) as count
-                    FROM knowledge_items 
-                    WHERE created_at >= $1 AND created_at <= $2
-                    GROUP BY DATE(created_at)
+                    SELECT day as date, SUM(item_count)::bigint as count
+                    FROM knowledge_daily_rollup
+                    WHERE day >= $1 AND day <= $2
+                    GROUP BY day
                     ORDER BY date
                 """
-                daily_rows = await conn.fetch(daily_growth_query, start_date, end_date)
+                daily_rows = await conn.fetch(daily_growth_query, start_date.date(), end_date.date())
                 
                 # Build complete daily series (fill in zeros for missing days)
                 daily_growth = []
@@ -91,8 +91,8 @@ class AnalyticsService:
                 
                 # Get REAL knowledge by type
                 type_query = """
-                    SELECT knowledge_type, COUNT(*) as count
-                    FROM knowledge_items 
+                    SELECT knowledge_type, SUM(item_count)::bigint as count
+                    FROM knowledge_daily_rollup
                     GROUP BY knowledge_type
                 """
                 type_rows = await conn.fetch(type_query)
@@ -100,9 +100,9 @@ class AnalyticsService:
                 
                 # Get REAL knowledge by project
                 project_query = """
-                    SELECT p.name, COUNT(ki.id) as count
+                    SELECT p.name, COALESCE(SUM(r.item_count), 0)::bigint as count
                     FROM projects p
-                    LEFT JOIN knowledge_items ki ON p.id = ki.project_id
+                    LEFT JOIN knowledge_daily_rollup r ON p.id = r.project_id
                     GROUP BY p.id, p.name
                 """
                 project_rows = await conn.fetch(project_query)
@@ -144,7 +144,7 @@ class AnalyticsService:
     async def get_cross_project_connections(self) -> CrossProjectIntelligenceData:
         """Generate REAL cross-project intelligence from actual database"""
         try:
-            async with self.databases.postgres_pool.acquire() as conn:
+            async with self.databases.postgres.raw_connection() as conn:
                 # Get REAL projects with actual knowledge counts
                 projects_query = """
                     SELECT 
@@ -152,9 +152,9 @@ class AnalyticsService:
                         p.name,
                         p.description,
                         p.technology_stack,
-                        COUNT(ki.id) as knowledge_count
+                        COALESCE(SUM(r.item_count), 0)::bigint as knowledge_count
                     FROM projects p
-                    LEFT JOIN knowledge_items ki ON p.id = ki.project_id
+                    LEFT JOIN knowledge_daily_rollup r ON p.id = r.project_id
                     GROUP BY p.id, p.name, p.description, p.technology_stack
                     ORDER BY knowledge_count DESC
                 """
@@ -231,20 +231,18 @@ class AnalyticsService:
     async def get_pattern_usage_data(self, limit: int = 10) -> PatternUsageData:
         """Generate REAL pattern usage data from actual database"""
         try:
-            async with self.databases.postgres_pool.acquire() as conn:
+            async with self.databases.postgres.raw_connection() as conn:
                 # Get REAL patterns from knowledge items
                 patterns_query = """
                     SELECT 
-                        jsonb_array_elements_text(patterns) as pattern_name,
-                        COUNT(*) as usage_count,
-                        AVG(success_rate) as avg_success_rate,
-                        AVG(quality_score) as avg_quality,
+                        r.pattern as pattern_name,
+                        SUM(r.item_count)::bigint as usage_count,
+                        SUM(r.success_sum) / NULLIF(SUM(r.success_count), 0) as avg_success_rate,
                         ARRAY_AGG(DISTINCT p.name) as projects_used
-                    FROM knowledge_items ki
-                    JOIN projects p ON ki.project_id = p.id
-                    WHERE jsonb_array_length(patterns) > 0
-                    GROUP BY jsonb_array_elements_text(patterns)
-                    ORDER BY usage_count DESC, avg_success_rate DESC
+                    FROM knowledge_pattern_daily_rollup r
+                    JOIN projects p ON r.project_id = p.id
+                    GROUP BY r.pattern
+                    ORDER BY usage_count DESC, avg_success_rate DESC NULLS LAST
                     LIMIT $1
                 """
                 pattern_rows = await conn.fetch(patterns_query, limit)
@@ -289,7 +287,7 @@ class AnalyticsService:
     async def get_real_time_activity(self, limit: int = 20) -> RealTimeActivityData:
         """Get REAL recent activity from actual database"""
         try:
-            async with self.databases.postgres_pool.acquire() as conn:
+            async with self.databases.postgres.raw_connection() as conn:
                 # Get REAL recent knowledge items
                 activity_query = """
                     SELECT 
@@ -338,16 +336,15 @@ class AnalyticsService:
     async def get_intelligence_metrics(self) -> IntelligenceMetricsData:
         """Generate REAL intelligence metrics from actual data"""
         try:
-            async with self.databases.postgres_pool.acquire() as conn:
+            async with self.databases.postgres.raw_connection() as conn:
                 # Get REAL knowledge quality metrics
                 quality_query = """
                     SELECT 
-                        AVG(quality_score) as avg_quality,
-                        AVG(reusability_score) as avg_reusability,
-                        AVG(success_rate) as avg_success_rate,
-                        COUNT(*) as total_items
-                    FROM knowledge_items
-                    WHERE quality_score > 0
+                        SUM(quality_sum) / NULLIF(SUM(scored_count), 0) as avg_quality,
+                        SUM(reusability_sum) / NULLIF(SUM(reusability_count), 0) as avg_reusability,
+                        SUM(success_sum) / NULLIF(SUM(success_count), 0) as avg_success_rate,
+                        COALESCE(SUM(scored_count), 0)::bigint as total_items
+                    FROM knowledge_daily_rollup
                 """
                 quality_row = await conn.fetchrow(quality_query)
                 
@@ -363,13 +360,13 @@ class AnalyticsService:
                 
                 # Growth trend (simplified - last 7 days)
                 growth_query = """
-                    SELECT DATE(created_at) as date, COUNT(*) as items
-                    FROM knowledge_items
-                    WHERE created_at >= $1
-                    GROUP BY DATE(created_at)
+                    SELECT day as date, SUM(item_count)::bigint as items
+                    FROM knowledge_daily_rollup
+                    WHERE day >= $1
+                    GROUP BY day
                     ORDER BY date
                 """
-                growth_rows = await conn.fetch(growth_query, datetime.utcnow() - timedelta(days=7))
+                growth_rows = await conn.fetch(growth_query, (datetime.utcnow() - timedelta(days=7)).date())
                 
                 intelligence_growth_trend = []
                 for row in growth_rows:
@@ -423,31 +420,30 @@ class AnalyticsService:
             growth_data = await self.get_knowledge_growth_metrics(7)  # Last 7 days
             intelligence_data = await self.get_intelligence_metrics()
             
-            async with self.databases.postgres_pool.acquire() as conn:
+            async with self.databases.postgres.raw_connection() as conn:
                 # Get REAL trending patterns (most recent)
                 trending_query = """
-                    SELECT jsonb_array_elements_text(patterns) as pattern
-                    FROM knowledge_items
-                    WHERE jsonb_array_length(patterns) > 0
-                    AND created_at >= $1
-                    GROUP BY jsonb_array_elements_text(patterns)
-                    ORDER BY COUNT(*) DESC
+                    SELECT pattern
+                    FROM knowledge_pattern_daily_rollup
+                    WHERE day >= $1
+                    GROUP BY pattern
+                    ORDER BY SUM(item_count) DESC
                     LIMIT 3
                 """
-                trending_rows = await conn.fetch(trending_query, datetime.utcnow() - timedelta(days=7))
+                trending_rows = await conn.fetch(trending_query, (datetime.utcnow() - timedelta(days=7)).date())
                 trending_patterns = [row['pattern'] for row in trending_rows]
                 
                 # Get most active project
                 active_project_query = """
-                    SELECT p.name, COUNT(ki.id) as activity_count
+                    SELECT p.name, SUM(r.item_count)::bigint as activity_count
                     FROM projects p
-                    LEFT JOIN knowledge_items ki ON p.id = ki.project_id
-                    WHERE ki.created_at >= $1
+                    JOIN knowledge_daily_rollup r ON p.id = r.project_id
+                    WHERE r.day >= $1
                     GROUP BY p.name
                     ORDER BY activity_count DESC
                     LIMIT 1
                 """
-                active_project_row = await conn.fetchrow(active_project_query, datetime.utcnow() - timedelta(days=7))
+                active_project_row = await conn.fetchrow(active_project_query, (datetime.utcnow() - timedelta(days=7)).date())
                 most_active_project = active_project_row['name'] if active_project_row else "None"
                 
                 return DashboardSummaryData(
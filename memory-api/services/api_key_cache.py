@@ -0,0 +1,167 @@
+# ABOUTME: Verified API key cache and buffered authentication writes for BETTY Memory System
+# ABOUTME: Short-TTL in-process key cache with Redis pub/sub revocation, plus batched usage and audit rows
+
+import asyncio
+import ipaddress
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+REVOCATION_CHANNEL = "betty:auth:api_key_revoked"
+
+@dataclass
+class _CachedKey:
+    user: Any
+    api_key_id: str
+    expires_at: float
+
+class VerifiedKeyCache:
+    """In-process cache of successfully verified API keys
+
+    Entries are keyed by the key's lookup HMAC, never the raw key, live for
+    at most ``ttl`` seconds (or until the key itself expires) and are evicted
+    on every instance as soon as a revocation is published.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _CachedKey]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, lookup_hash: str) -> Optional[Any]:
+        entry = self._entries.get(lookup_hash)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                del self._entries[lookup_hash]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(lookup_hash)
+        self.hits += 1
+        return entry.user
+
+    def put(
+        self,
+        lookup_hash: str,
+        user: Any,
+        api_key_id: str,
+        key_expires_at: Optional[datetime] = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        if key_expires_at is not None:
+            remaining = (key_expires_at - datetime.now(timezone.utc)).total_seconds()
+            expires_at = min(expires_at, time.monotonic() + max(0.0, remaining))
+
+        self._entries[lookup_hash] = _CachedKey(user=user, api_key_id=str(api_key_id), expires_at=expires_at)
+        self._entries.move_to_end(lookup_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def evict_key(self, api_key_id: str) -> int:
+        """Drop every cached entry for an API key id"""
+        stale = [lookup for lookup, entry in self._entries.items() if entry.api_key_id == str(api_key_id)]
+        for lookup in stale:
+            del self._entries[lookup]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def start(self, redis_client) -> None:
+        """Listen for revocations published by any API instance"""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(redis_client))
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self, redis_client) -> None:
+        while True:
+            try:
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                # Anything cached before the subscription may have missed a revocation
+                self.clear()
+
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        evicted = self.evict_key(message["data"])
+                        logger.debug("API key revoked", api_key_id=message["data"], evicted=evicted)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("API key revocation listener failed", error=str(e))
+                self.clear()
+                await asyncio.sleep(5)
+
+    @staticmethod
+    async def publish_revocation(redis_client, api_key_id: str) -> None:
+        await redis_client.publish(REVOCATION_CHANNEL, str(api_key_id))
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+def _inet(value: Optional[str]) -> Optional[str]:
+    """The address if Postgres INET accepts it ("testclient", "unknown" do not)"""
+    try:
+        return str(ipaddress.ip_address(value)) if value else None
+    except ValueError:
+        return None
+
+@dataclass
+class AuthWriteBuffer:
+    """Coalesces per-request API key usage updates and audit events
+
+    Usage collapses to the latest timestamp and IP per key; audit events
+    are kept in order. Callers drain the buffer and write each part with
+    one statement.
+    """
+    max_events: int = 1000
+    usage: Dict[str, Tuple[datetime, Optional[str]]] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    dropped_events: int = 0
+
+    def record_usage(self, api_key_id: str, ip_address: Optional[str] = None) -> None:
+        self.usage[str(api_key_id)] = (datetime.now(timezone.utc), _inet(ip_address))
+
+    def record_event(self, event: Dict[str, Any]) -> None:
+        if len(self.events) >= self.max_events:
+            # Never let a stalled database grow the buffer without bound
+            self.dropped_events += 1
+            return
+        self.events.append({
+            **event,
+            "ip_address": _inet(event.get("ip_address")),
+            "created_at": datetime.now(timezone.utc)
+        })
+
+    @property
+    def pending(self) -> int:
+        return len(self.usage) + len(self.events)
+
+    def drain(self) -> Tuple[Dict[str, Tuple[datetime, Optional[str]]], List[Dict[str, Any]]]:
+        usage, events = self.usage, self.events
+        self.usage, self.events = {}, []
+        return usage, events
@@ -1,6 +1,9 @@
 # ABOUTME: Authentication service for BETTY Memory System
 # ABOUTME: User management, API key operations, and authentication logic with database integration
 
+import asyncio
+import hmac
+import json
 import structlog
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any, Tuple
@@ -16,7 +19,10 @@ from models.auth import (
     ProjectPermission, RefreshToken, AuthAuditLog, CurrentUser,
     UserRole, PermissionLevel, AuthEventType, RateLimit
 )
+from core.config import get_settings
 from core.database import DatabaseManager
+from core.rate_limiter import Quota, get_rate_limiter
+from services.api_key_cache import AuthWriteBuffer, VerifiedKeyCache
 
 logger = structlog.get_logger(__name__)
 
@@ -45,6 +51,42 @@ class AuthService:
         # Import here to avoid circular imports
         from .jwt_service import jwt_service
         self.jwt_service = jwt_service
+        
+        settings = get_settings()
+        self.key_cache = VerifiedKeyCache(
+            ttl=settings.api_key_cache_ttl,
+            max_entries=settings.api_key_cache_max_entries
+        )
+        self.dev_key_cache_ttl = settings.dev_api_key_cache_ttl
+        self.write_buffer = AuthWriteBuffer(max_events=settings.auth_write_buffer_max_events)
+        self.flush_interval = settings.auth_write_flush_interval
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Start revocation listening and the batched usage/audit writer
+        
+        Refuses to start outside debug without an API key lookup secret,
+        which would leave the stored lookup hashes plain SHA-256 digests.
+        """
+        settings = get_settings()
+        if not settings.api_key_hmac_secret and not settings.debug:
+            raise RuntimeError("API_KEY_HMAC_SECRET must be set unless DEBUG is enabled")
+        if _db_manager and _db_manager.redis_client:
+            await self.key_cache.start(_db_manager.redis_client)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self) -> None:
+        """Stop background work and write anything still buffered"""
+        await self.key_cache.stop()
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush_auth_writes()
     
     async def authenticate_user(self, email: str, password: str, ip_address: str = None) -> Optional[User]:
         """Authenticate user with email and password"""
@@ -296,16 +338,18 @@ class AuthService:
                 # Generate API key
                 api_key, key_prefix = self.jwt_service.generate_api_key()
                 key_hash = self.jwt_service.hash_api_key(api_key)
+                key_id = self.jwt_service.parse_api_key_id(api_key)
+                key_lookup_hash = self.jwt_service.api_key_lookup_hash(api_key)
                 
                 # Create API key record
                 api_key_id = uuid4()
                 insert_query = text("""
                     INSERT INTO auth_api_keys (
-                        api_key_id, key_name, key_hash, key_prefix, owner_user_id,
-                        scopes, project_access, rate_limit_per_hour, expires_at
+                        api_key_id, key_name, key_hash, key_prefix, key_id, key_lookup_hash,
+                        owner_user_id, scopes, project_access, rate_limit_per_hour, expires_at
                     ) VALUES (
-                        :api_key_id, :key_name, :key_hash, :key_prefix, :owner_user_id,
-                        :scopes, :project_access, :rate_limit_per_hour, :expires_at
+                        :api_key_id, :key_name, :key_hash, :key_prefix, :key_id, :key_lookup_hash,
+                        :owner_user_id, :scopes, :project_access, :rate_limit_per_hour, :expires_at
                     ) RETURNING *
                 """)
                 
@@ -314,6 +358,8 @@ class AuthService:
                     "key_name": key_data.name,
                     "key_hash": key_hash,
                     "key_prefix": key_prefix,
+                    "key_id": key_id,
+                    "key_lookup_hash": key_lookup_hash,
                     "owner_user_id": owner_id,
                     "scopes": key_data.scopes,
                     "project_access": key_data.project_access,
@@ -344,67 +390,314 @@ class AuthService:
             logger.error("API key creation error", owner_id=str(owner_id), error=str(e))
             raise
     
-    async def authenticate_api_key(self, api_key: str) -> Optional[CurrentUser]:
-        """Authenticate using API key"""
+    async def authenticate_api_key(self, api_key: str, ip_address: str = None) -> Optional[CurrentUser]:
+        """Authenticate using API key
+        
+        Verified keys are served from the in-process cache; otherwise the
+        key row is found by its key id (or lookup HMAC) with one index probe
+        and checked with a constant-time HMAC comparison. Usage and audit
+        rows are buffered and written in batches.
+        """
         try:
-            async with get_database_session() as db:
-                # Find API key by prefix first for efficiency
-                key_prefix = api_key.split('_')[0] + '_' if '_' in api_key else api_key[:10]
-                
-                query = text("""
-                    SELECT ak.*, u.email, u.role 
-                    FROM auth_api_keys ak
-                    JOIN auth_users u ON ak.owner_user_id = u.user_id
-                    WHERE ak.key_prefix = :key_prefix AND ak.is_active = true
-                    AND (ak.expires_at IS NULL OR ak.expires_at > NOW())
-                """)
-                
-                result = await db.execute(query, {"key_prefix": key_prefix})
-                
-                for api_key_row in result.fetchall():
-                    api_key_data = dict(api_key_row._mapping)
-                    
-                    # Verify the full API key
-                    if self.jwt_service.verify_api_key(api_key, api_key_data["key_hash"]):
-                        # Update last used timestamp
-                        await self._update_api_key_usage(api_key_data["api_key_id"], db)
-                        
-                        # Log API access
-                        await self._log_auth_event(
-                            user_id=api_key_data["owner_user_id"],
-                            api_key_id=api_key_data["api_key_id"],
-                            event_type=AuthEventType.API_ACCESS,
-                            success=True
-                        )
-                        
-                        # Create CurrentUser from API key data
-                        project_access = {
-                            proj: PermissionLevel.WRITE 
-                            for proj in api_key_data["project_access"]
+            lookup_hash = self.jwt_service.api_key_lookup_hash(api_key)
+            
+            current_user = self.key_cache.get(lookup_hash)
+            if current_user is None:
+                api_key_data = await self._find_api_key(api_key, lookup_hash)
+                
+                if not api_key_data:
+                    # No matching API key found
+                    self.write_buffer.record_event({
+                        "event_type": AuthEventType.API_ACCESS.value,
+                        "success": False,
+                        "ip_address": ip_address,
+                        "details": {
+                            "reason": "invalid_api_key",
+                            "key_id": self.jwt_service.parse_api_key_id(api_key)
                         }
-                        
-                        return CurrentUser(
-                            user_id=UUID(api_key_data["owner_user_id"]),
-                            email=api_key_data["email"],
-                            role=UserRole(api_key_data["role"]),
-                            permissions=api_key_data["scopes"],
-                            project_access=project_access,
-                            is_api_key=True,
-                            api_key_id=UUID(api_key_data["api_key_id"])
-                        )
+                    })
+                    return None
                 
-                # No matching API key found
-                await self._log_auth_event(
-                    event_type=AuthEventType.API_ACCESS,
-                    success=False,
-                    details={"reason": "invalid_api_key", "key_prefix": key_prefix}
+                current_user = self._api_key_current_user(api_key_data)
+                self.key_cache.put(
+                    lookup_hash,
+                    current_user,
+                    str(api_key_data["api_key_id"]),
+                    api_key_data["expires_at"]
                 )
-                return None
+            
+            # Update last used timestamp and log API access
+            self.write_buffer.record_usage(str(current_user.api_key_id), ip_address)
+            self.write_buffer.record_event({
+                "user_id": current_user.user_id,
+                "api_key_id": current_user.api_key_id,
+                "event_type": AuthEventType.API_ACCESS.value,
+                "success": True,
+                "ip_address": ip_address
+            })
+            
+            return current_user
                 
         except Exception as e:
             logger.error("API key authentication error", error=str(e))
             return None
     
+    async def authenticate_dev_api_key(self, api_key: str) -> Optional[CurrentUser]:
+        """Authenticate a development API key from dev_api_keys
+        
+        Uses the shared connection pool, and the resolved CurrentUser is
+        memoized in the verified-key cache like production keys. Revoking the
+        key through revoke_api_key evicts it at once; rows deactivated
+        directly in dev_api_keys stop working within dev_api_key_cache_ttl.
+        """
+        lookup_hash = self.jwt_service.api_key_lookup_hash(api_key)
+        
+        current_user = self.key_cache.get(lookup_hash)
+        if current_user is not None:
+            return current_user
+        
+        async with get_database_session() as db:
+            query = text("""
+                SELECT u.user_id, u.email, u.full_name, u.role, k.scopes, k.api_key_id, k.expires_at
+                FROM dev_users u
+                JOIN dev_api_keys k ON u.user_id = k.owner_user_id
+                WHERE k.api_key = :api_key AND k.is_active = true 
+                AND (k.expires_at IS NULL OR k.expires_at > NOW())
+            """)
+            result = await db.execute(query, {"api_key": api_key})
+            row = result.fetchone()
+        
+        if not row:
+            return None
+        
+        current_user = CurrentUser(
+            user_id=UUID(str(row.user_id)),
+            email=row.email,
+            role=UserRole(row.role),
+            permissions=row.scopes or [],
+            project_access={},  # Dev keys have default access
+            is_api_key=True,
+            api_key_id=UUID(str(row.api_key_id)) if row.api_key_id else None
+        )
+        self.key_cache.put(
+            lookup_hash,
+            current_user,
+            str(row.api_key_id or lookup_hash),
+            row.expires_at,
+            ttl=self.dev_key_cache_ttl
+        )
+        
+        return current_user
+    
+    async def _find_api_key(self, api_key: str, lookup_hash: str) -> Optional[Dict[str, Any]]:
+        """Load the active key row matching api_key, or None
+        
+        Rows hashed under a previous lookup secret still match and are
+        rehashed under the current one.
+        """
+        key_id = self.jwt_service.parse_api_key_id(api_key)
+        lookup_hashes = self.jwt_service.api_key_lookup_hashes(api_key)
+        columns = """
+            SELECT ak.api_key_id, ak.key_lookup_hash, ak.key_hash, ak.owner_user_id,
+                   ak.scopes, ak.project_access, ak.expires_at, u.email, u.role
+            FROM auth_api_keys ak
+            JOIN auth_users u ON ak.owner_user_id = u.user_id
+        """
+        active = "ak.is_active = true AND (ak.expires_at IS NULL OR ak.expires_at > NOW())"
+        
+        async with get_database_session() as db:
+            if key_id:
+                result = await db.execute(
+                    text(f"{columns} WHERE ak.key_id = :key_id AND {active}"),
+                    {"key_id": key_id}
+                )
+            else:
+                result = await db.execute(
+                    text(f"{columns} WHERE ak.key_lookup_hash = ANY(:lookup_hashes) AND {active}"),
+                    {"lookup_hashes": lookup_hashes}
+                )
+            
+            row = result.fetchone()
+            if row:
+                api_key_data = dict(row._mapping)
+                stored = api_key_data["key_lookup_hash"] or ""
+                if hmac.compare_digest(stored, lookup_hash):
+                    return api_key_data
+                if any(hmac.compare_digest(stored, previous) for previous in lookup_hashes[1:]):
+                    await self._store_lookup_hash(db, api_key_data["api_key_id"], lookup_hash)
+                    return api_key_data
+                return None
+            
+            if key_id:
+                return None
+            
+            # Keys issued before lookup hashes existed: verify with bcrypt off
+            # the event loop once, then backfill the lookup hash
+            key_prefix = api_key.split('_')[0] + '_' if '_' in api_key else api_key[:10]
+            result = await db.execute(
+                text(f"{columns} WHERE ak.key_prefix = :key_prefix AND ak.key_lookup_hash IS NULL AND {active}"),
+                {"key_prefix": key_prefix}
+            )
+            
+            for row in result.fetchall():
+                api_key_data = dict(row._mapping)
+                if await asyncio.to_thread(self.jwt_service.verify_api_key, api_key, api_key_data["key_hash"]):
+                    await self._store_lookup_hash(db, api_key_data["api_key_id"], lookup_hash)
+                    return api_key_data
+        
+        return None
+    
+    async def _store_lookup_hash(self, db, api_key_id: UUID, lookup_hash: str) -> None:
+        """Record a key's lookup hash under the current secret"""
+        await db.execute(
+            text("UPDATE auth_api_keys SET key_lookup_hash = :lookup_hash WHERE api_key_id = :api_key_id"),
+            {"lookup_hash": lookup_hash, "api_key_id": api_key_id}
+        )
+        await db.commit()
+    
+    def _api_key_current_user(self, api_key_data: Dict[str, Any]) -> CurrentUser:
+        """Create CurrentUser from API key data"""
+        project_access = {
+            proj: PermissionLevel.WRITE 
+            for proj in api_key_data["project_access"]
+        }
+        
+        return CurrentUser(
+            user_id=UUID(str(api_key_data["owner_user_id"])),
+            email=api_key_data["email"],
+            role=UserRole(api_key_data["role"]),
+            permissions=api_key_data["scopes"],
+            project_access=project_access,
+            is_api_key=True,
+            api_key_id=UUID(str(api_key_data["api_key_id"]))
+        )
+    
+    async def revoke_api_key(
+        self,
+        api_key_id: UUID,
+        revoked_by: UUID = None,
+        owner_user_id: Optional[UUID] = None
+    ) -> bool:
+        """Deactivate an API key and evict it from every instance's key cache
+        
+        With owner_user_id, only a key owned by that user is revoked.
+        Returns whether an active key was revoked.
+        """
+        try:
+            async with get_database_session() as db:
+                result = await db.execute(
+                    text("""
+                        UPDATE auth_api_keys SET is_active = false, updated_at = NOW()
+                        WHERE api_key_id = :api_key_id AND is_active = true
+                          AND (CAST(:owner_user_id AS uuid) IS NULL OR owner_user_id = :owner_user_id)
+                        RETURNING api_key_id
+                    """),
+                    {"api_key_id": api_key_id, "owner_user_id": owner_user_id}
+                )
+                revoked = result.fetchone() is not None
+                await db.commit()
+            
+            if not revoked:
+                revoked = await self._revoke_dev_api_key(api_key_id, owner_user_id)
+            
+            self.key_cache.evict_key(str(api_key_id))
+            if _db_manager and _db_manager.redis_client:
+                await self.key_cache.publish_revocation(_db_manager.redis_client, str(api_key_id))
+            
+            if revoked:
+                await self._log_auth_event(
+                    user_id=revoked_by,
+                    api_key_id=api_key_id,
+                    event_type=AuthEventType.API_KEY_REVOKE,
+                    success=True
+                )
+                logger.info("API key revoked", api_key_id=str(api_key_id))
+            
+            return revoked
+            
+        except Exception as e:
+            logger.error("API key revocation error", api_key_id=str(api_key_id), error=str(e))
+            raise
+    
+    async def _revoke_dev_api_key(self, api_key_id: UUID, owner_user_id: Optional[UUID]) -> bool:
+        """Deactivate a development API key, if the dev tables exist"""
+        try:
+            async with get_database_session() as db:
+                result = await db.execute(
+                    text("""
+                        UPDATE dev_api_keys SET is_active = false
+                        WHERE api_key_id = :api_key_id AND is_active = true
+                          AND (CAST(:owner_user_id AS uuid) IS NULL OR owner_user_id = :owner_user_id)
+                        RETURNING api_key_id
+                    """),
+                    {"api_key_id": api_key_id, "owner_user_id": owner_user_id}
+                )
+                revoked = result.fetchone() is not None
+                await db.commit()
+            return revoked
+        except Exception as e:
+            logger.debug("Development API key revocation skipped", api_key_id=str(api_key_id), error=str(e))
+            return False
+    
+    async def _flush_loop(self) -> None:
+        """Write buffered usage and audit rows every flush interval"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush_auth_writes()
+    
+    async def flush_auth_writes(self) -> None:
+        """Write buffered API key usage and audit events, one statement each"""
+        if not self.write_buffer.pending or not _db_manager:
+            return
+        
+        usage, events = self.write_buffer.drain()
+        try:
+            async with get_database_session() as db:
+                if usage:
+                    await db.execute(
+                        text("""
+                            UPDATE auth_api_keys
+                            SET last_used_at = GREATEST(COALESCE(last_used_at, :used_at), :used_at),
+                                last_used_ip = COALESCE(CAST(:ip_address AS inet), last_used_ip)
+                            WHERE api_key_id = :api_key_id
+                        """),
+                        [
+                            {"api_key_id": UUID(api_key_id), "used_at": used_at, "ip_address": ip_address}
+                            for api_key_id, (used_at, ip_address) in usage.items()
+                        ]
+                    )
+                
+                if events:
+                    await db.execute(
+                        text("""
+                            INSERT INTO auth_audit_log (
+                                user_id, api_key_id, event_type, success,
+                                ip_address, user_agent, details, created_at
+                            ) VALUES (
+                                :user_id, :api_key_id, :event_type, :success,
+                                CAST(:ip_address AS inet), :user_agent, CAST(:details AS jsonb), :created_at
+                            )
+                        """),
+                        [
+                            {
+                                "user_id": event.get("user_id"),
+                                "api_key_id": event.get("api_key_id"),
+                                "event_type": event["event_type"],
+                                "success": event["success"],
+                                "ip_address": event.get("ip_address"),
+                                "user_agent": event.get("user_agent"),
+                                "details": json.dumps(event.get("details") or {}, default=str),
+                                "created_at": event["created_at"]
+                            }
+                            for event in events
+                        ]
+                    )
+                
+                await db.commit()
+            
+        except Exception as e:
+            logger.error("Failed to flush auth writes", usage=len(usage), events=len(events), error=str(e))
+    
     async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID"""
         try:
@@ -460,10 +753,10 @@ class AuthService:
             logger.error("Get user permissions error", user_id=str(user_id), error=str(e))
             return [], {}
     
-    async def _is_rate_limited(self, limit_type: str, identifier: str, limit: int = 5) -> bool:
-        """Check if identifier is rate limited"""
-        # TODO: Implement rate limiting logic
-        return False
+    async def _is_rate_limited(self, limit_type: str, identifier: str, limit: int = 5, period: float = 60) -> bool:
+        """Check if identifier is rate limited (shared across workers)"""
+        result = await get_rate_limiter().check(f"auth:{limit_type}:{identifier}", Quota(limit=limit, period=period))
+        return not result.allowed
     
     async def _log_auth_event(
         self,
@@ -1,16 +1,27 @@
 # ABOUTME: Base service class for BETTY Memory System
 # ABOUTME: Common service functionality and database operation utilities
 
+import json
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Type, TypeVar
-from uuid import UUID
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Type, TypeVar, Union
+from uuid import UUID, uuid4
 import structlog
+from redis.exceptions import ResponseError
+from sqlalchemy import text
 
 from core.dependencies import DatabaseDependencies
+from services.service_cache import CacheEntry, dumps, get_service_cache, loads
 
 logger = structlog.get_logger(__name__)
 T = TypeVar('T')
 
+# Tag sets index cache keys by what they were computed from (an item, a
+# project, a user), so invalidation never has to enumerate the keyspace
+CACHE_TAG_PREFIX = "betty:cache:tag:"
+CACHE_SCAN_COUNT = 1000
+CACHE_UNLINK_BATCH = 500
+
 class BaseService:
     """Base service class with common database operations"""
     
@@ -43,71 +54,227 @@ class BaseService:
         try:
             value = await self.redis.get(key)
             if value:
-                import json
-                return json.loads(value)
+                return loads(value)
             return None
         except Exception as e:
             logger.warning("Cache get failed", key=key, error=str(e))
             return None
     
+    async def cache_get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values from Redis cache in one MGET"""
+        if not keys:
+            return []
+        try:
+            values = await self.redis.mget(keys)
+            return [loads(value) if value else None for value in values]
+        except Exception as e:
+            logger.warning("Cache multi-get failed", keys=len(keys), error=str(e))
+            return [None] * len(keys)
+    
     async def cache_set(
         self,
         key: str,
         value: Any,
-        ttl: int = None
-    ) -> None:
-        """Set value in Redis cache"""
+        ttl: int = None,
+        tags: Iterable[str] = ()
+    ) -> bool:
+        """Set value in Redis cache, registering the key under each tag"""
         try:
-            import json
             ttl = ttl or self.settings.cache_ttl
-            await self.redis.setex(
-                key,
-                ttl,
-                json.dumps(value, default=str)  # Handle datetime serialization
-            )
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl, dumps(value))
+                for tag in tags:
+                    tag_key = CACHE_TAG_PREFIX + tag
+                    pipe.sadd(tag_key, key)
+                    # A tag set lives as long as its longest-lived member
+                    pipe.expire(tag_key, ttl, nx=True)
+                    pipe.expire(tag_key, ttl, gt=True)
+                await pipe.execute()
+            return True
         except Exception as e:
             logger.warning("Cache set failed", key=key, error=str(e))
+            return False
     
     async def cache_delete(self, key: str) -> None:
         """Delete key from Redis cache"""
+        self._invalidate_local(keys=[key])
         try:
-            await self.redis.delete(key)
+            await self.redis.unlink(key)
         except Exception as e:
             logger.warning("Cache delete failed", key=key, error=str(e))
     
-    async def cache_delete_pattern(self, pattern: str) -> None:
-        """Delete all keys matching pattern"""
+    async def _cache_unlink(self, keys: List[str]) -> int:
+        """UNLINK keys in pipelined batches; returns how many existed"""
+        if not keys:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for start in range(0, len(keys), CACHE_UNLINK_BATCH):
+                pipe.unlink(*keys[start:start + CACHE_UNLINK_BATCH])
+            return sum(await pipe.execute())
+    
+    async def cache_scan_keys(self, pattern: str) -> AsyncIterator[str]:
+        """Iterate keys matching pattern with SCAN (never KEYS)"""
+        async for key in self.redis.scan_iter(match=pattern, count=CACHE_SCAN_COUNT):
+            yield key
+    
+    async def cache_delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching pattern
+        
+        Prefer cache_invalidate_tags; this walks the keyspace with SCAN.
+        """
+        self._invalidate_local(pattern=pattern)
+        deleted = 0
         try:
-            keys = await self.redis.keys(pattern)
-            if keys:
-                await self.redis.delete(*keys)
+            batch = []
+            async for key in self.cache_scan_keys(pattern):
+                batch.append(key)
+                if len(batch) >= CACHE_UNLINK_BATCH:
+                    deleted += await self._cache_unlink(batch)
+                    batch = []
+            deleted += await self._cache_unlink(batch)
         except Exception as e:
             logger.warning("Cache pattern delete failed", pattern=pattern, error=str(e))
+        return deleted
+    
+    async def cache_invalidate_tags(self, *tags: str) -> int:
+        """Delete every cache entry registered under any of the tags"""
+        self._invalidate_local(tags=tags)
+        deleted = 0
+        for tag in tags:
+            tag_key = CACHE_TAG_PREFIX + tag
+            # Detach the tag set first so entries cached meanwhile start a new one
+            detached = f"{tag_key}:invalidating:{uuid4().hex}"
+            try:
+                await self.redis.rename(tag_key, detached)
+            except ResponseError:
+                continue  # No entries carry this tag
+            except Exception as e:
+                logger.warning("Cache tag invalidation failed", tag=tag, error=str(e))
+                continue
+            
+            try:
+                batch = []
+                async for key in self.redis.sscan_iter(detached, count=CACHE_SCAN_COUNT):
+                    batch.append(key)
+                    if len(batch) >= CACHE_UNLINK_BATCH:
+                        deleted += await self._cache_unlink(batch)
+                        batch = []
+                deleted += await self._cache_unlink(batch)
+                await self.redis.unlink(detached)
+            except Exception as e:
+                logger.warning("Cache tag invalidation failed", tag=tag, error=str(e))
+        return deleted
     
     def generate_cache_key(self, *parts: str) -> str:
         """Generate cache key from parts"""
         return ":".join(str(part) for part in parts)
     
+    def _invalidate_local(
+        self,
+        keys: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        pattern: Optional[str] = None
+    ) -> None:
+        """Drop in-process entries and void the fetches in flight they cover"""
+        service_cache = get_service_cache()
+        keys, tags = list(keys), list(tags)
+        service_cache.invalidations.record(keys, tags, pattern)
+        for key in keys:
+            service_cache.local.invalidate(key)
+        service_cache.local.invalidate_tags(tags)
+        if pattern:
+            service_cache.local.invalidate_matching(pattern)
+    
     async def execute_with_cache(
         self,
         cache_key: str,
         fetch_func,
         ttl: int = None,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]]] = (),
+        model: Optional[Type[Any]] = None
     ) -> Any:
-        """Execute function with caching"""
-        if not force_refresh:
-            cached_value = await self.cache_get(cache_key)
-            if cached_value is not None:
-                return cached_value
+        """Execute function with two-tier read-through caching
         
-        # Fetch fresh data
-        value = await fetch_func()
+        Reads check the in-process LRU, then Redis. Concurrent misses on a
+        key share one fetch. Entries past their TTL are still served for
+        cache_stale_ttl seconds while a single background fetch refreshes
+        them. tags may be a callable that derives the tags from the fetched
+        value; model rebuilds pydantic values read back from Redis.
+        """
+        ttl = ttl or self.settings.cache_ttl
+        service_cache = get_service_cache()
         
-        # Cache the result
-        await self.cache_set(cache_key, value, ttl)
+        async def fetch_and_store():
+            generation = service_cache.invalidations.generation
+            value = await fetch_func()
+            if value is not None:
+                await self._cache_store_entry(cache_key, value, ttl, tags, service_cache, generation)
+            return value
         
-        return value
+        if not force_refresh:
+            entry = service_cache.local.get(cache_key)
+            if entry is None:
+                entry = await self._cache_load_entry(cache_key, model)
+                if entry is not None:
+                    service_cache.local.put(cache_key, entry)
+            
+            if entry is not None:
+                if not entry.is_fresh:
+                    service_cache.flights.refresh(cache_key, fetch_and_store)
+                return entry.value
+        
+        return await service_cache.flights.do(cache_key, fetch_and_store)
+    
+    async def _cache_load_entry(self, cache_key: str, model: Optional[Type[Any]]) -> Optional[CacheEntry]:
+        """Read an execute_with_cache entry from Redis"""
+        envelope = await self.cache_get(cache_key)
+        if not isinstance(envelope, dict) or "fresh_until" not in envelope:
+            # Missing, or written by plain cache_set
+            return None
+        
+        value = envelope["value"]
+        if model is not None and value is not None:
+            value = model.model_validate(value)
+        return CacheEntry(
+            value=value,
+            fresh_until=envelope["fresh_until"],
+            stale_until=envelope["stale_until"],
+            tags=frozenset(envelope.get("tags", ()))
+        )
+    
+    async def _cache_store_entry(
+        self,
+        cache_key: str,
+        value: Any,
+        ttl: int,
+        tags,
+        service_cache,
+        generation: int
+    ) -> None:
+        """Write a value fetched at generation to both tiers, unless an invalidation since made it stale"""
+        tags = frozenset(tags(value) if callable(tags) else tags)
+        if not service_cache.invalidations.unchanged_since(generation, cache_key, tags):
+            return
+        now = time.time()
+        entry = CacheEntry(
+            value=value,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + service_cache.stale_ttl,
+            tags=tags
+        )
+        service_cache.local.put(cache_key, entry)
+        await self.cache_set(
+            cache_key,
+            {
+                "value": value,
+                "fresh_until": entry.fresh_until,
+                "stale_until": entry.stale_until,
+                "tags": sorted(tags)
+            },
+            ttl=int(ttl + service_cache.stale_ttl),
+            tags=tags
+        )
     
     def serialize_for_cache(self, obj: Any) -> Dict[str, Any]:
         """Serialize object for cache storage"""
@@ -141,7 +308,7 @@ class BaseService:
             return value
     
     async def invalidate_related_cache(self, *patterns: str) -> None:
-        """Invalidate cache entries matching patterns"""
+        """Invalidate cache entries matching patterns (SCAN-based; prefer tags)"""
         for pattern in patterns:
             await self.cache_delete_pattern(pattern)
     
@@ -187,6 +354,38 @@ class BaseService:
         
         return items, total_count
     
+    async def count_rows(
+        self,
+        from_clause: str,
+        where_clause: str,
+        params: Dict[str, Any],
+        approximate: bool = False,
+        exact_below: int = 1000
+    ) -> int:
+        """Count matching rows, optionally from the planner's row estimate
+        
+        Approximate counts come from EXPLAIN and cost no more than planning
+        the query; estimates under ``exact_below`` are replaced by an exact
+        count, which is cheap at that size.
+        """
+        if approximate:
+            result = await self.postgres.execute(
+                text(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {from_clause} WHERE {where_clause}"),
+                params
+            )
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            if estimate >= exact_below:
+                return estimate
+        
+        result = await self.postgres.execute(
+            text(f"SELECT COUNT(*) FROM {from_clause} WHERE {where_clause}"),
+            params
+        )
+        return result.scalar() or 0
+    
     async def bulk_insert(
         self,
         model_class: Type[T],
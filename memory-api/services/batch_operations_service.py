@@ -256,50 +256,105 @@ class BatchOperationsService(BaseService):
             logger.error("Bulk project migration failed", operation_id=str(operation_id), error=str(e))
             raise
     
+    def validate_vector_recompute_request(self, request: BulkVectorRecomputeRequest):
+        """Reject recompute options the collection migration cannot honor
+        
+        The migration copies every point of a collection and embeds with the
+        engine's configured model, so a different model, filters or a model
+        config would otherwise be silently ignored.
+        """
+        engine = self.vector_service.embedding_engine
+        supported_models = {engine.model_name, engine.fallback_model_name, engine.loaded_model_name}
+        if request.embedding_model and request.embedding_model not in supported_models:
+            raise ValueError(
+                f"Embedding model '{request.embedding_model}' is not the configured model "
+                f"'{engine.model_name}'; change the embedding model setting to migrate to it"
+            )
+        if getattr(request, "filters", None):
+            raise ValueError("Vector recompute migrates whole collections; filters are not supported")
+        if request.model_config:
+            raise ValueError("model_config is not supported; use the collection_name and force_reembed options")
+    
     async def execute_bulk_vector_recompute(
         self,
         operation_id: UUID,
-        request: BulkVectorRecomputeRequest
+        request: BulkVectorRecomputeRequest,
+        collection_name: str = "knowledge_items",
+        force_reembed: bool = False
     ):
-        """Execute bulk vector recomputation operation"""
+        """Execute bulk vector recomputation as an online collection migration
+        
+        Points are copied from the live collection into a collection sized to
+        the model's native dimension under a named per-model vector slot.
+        Live writes go to both collections for the whole copy, and reads
+        switch over only once every point has been copied, so search stays
+        available throughout. With force_reembed every point is re-embedded
+        from its stored text instead of reusing vectors of the right size.
+        """
         try:
             await self._update_operation_status(operation_id, BatchOperationStatus.RUNNING)
             
-            # Get items for recomputation
-            items = await self._get_vector_recompute_items(request)
-            
-            # Process items in batches
-            recomputed_count = 0
-            failed_count = 0
-            
-            for i in range(0, len(items), request.batch_size):
-                batch = items[i:i + request.batch_size]
+            route = await self.vector_service.begin_collection_migration(collection_name)
+            if route.target is None:
+                # Nothing to copy; bring the storage profile up to date in place
+                profile = await self.vector_service.apply_collection_profile(route.active)
+                await self._update_operation_result(operation_id, {
+                    "collection_name": collection_name,
+                    "active_collection": route.active,
+                    "quantization_profile": profile.name,
+                    "message": "Collection already uses native-dimension named vectors"
+                })
+                await self._update_operation_status(operation_id, BatchOperationStatus.COMPLETED)
+                return
+            
+            total_points = await self.vector_service.count_points(route.active)
+            totals = {"copied": 0, "reembedded": 0, "skipped": 0, "failed": 0}
+            processed = 0
+            offset = None
+            
+            while True:
+                records, offset = await self.vector_service.scroll_points(
+                    route.active, offset, request.batch_size
+                )
+                if not records:
+                    break
                 
                 try:
-                    # Recompute vectors for batch
-                    batch_results = await self.vector_service.recompute_embeddings(
-                        batch, 
-                        request.embedding_model,
-                        request.model_config or {}
-                    )
-                    
-                    recomputed_count += batch_results.get("success_count", 0)
-                    failed_count += batch_results.get("failed_count", 0)
-                    
-                    # Update progress
-                    progress = (i + len(batch)) / len(items) * 100
-                    await self._update_operation_progress(operation_id, progress, i + len(batch), failed_count)
+                    batch_results = await self.vector_service.copy_points(records, route, force_reembed)
+                    for key, value in batch_results.items():
+                        totals[key] += value
                     
                 except Exception as batch_error:
-                    logger.error(f"Batch recompute failed", batch_size=len(batch), error=str(batch_error))
-                    failed_count += len(batch)
+                    logger.error(f"Batch recompute failed", batch_size=len(records), error=str(batch_error))
+                    totals["failed"] += len(records)
+                
+                # Update progress
+                processed += len(records)
+                progress = processed / total_points * 100 if total_points else 100.0
+                await self._update_operation_progress(operation_id, progress, processed, totals["failed"])
+                
+                if offset is None:
+                    break
+            
+            # Only cut reads over when nothing was lost; otherwise stay in
+            # dual-write so a re-run resumes and fills the gaps
+            cutover = totals["failed"] == 0
+            if cutover:
+                route = await self.vector_service.complete_collection_migration(route)
             
             await self._update_operation_result(operation_id, {
-                "total_items": len(items),
-                "recomputed_items": recomputed_count,
-                "failed_items": failed_count,
-                "embedding_model": request.embedding_model,
-                "success_rate": recomputed_count / len(items) if items else 0
+                "collection_name": collection_name,
+                "total_items": total_points,
+                "recomputed_items": totals["copied"],
+                "reembedded_items": totals["reembedded"],
+                "skipped_items": totals["skipped"],
+                "failed_items": totals["failed"],
+                "embedding_model": self.vector_service.embedding_engine.loaded_model_name,
+                "vector_name": self.vector_service.vector_slot,
+                "vector_size": self.vector_service.embedding_dimension,
+                "active_collection": route.active,
+                "cutover": cutover,
+                "success_rate": totals["copied"] / total_points if total_points else 0
             })
             
             await self._update_operation_status(operation_id, BatchOperationStatus.COMPLETED)
@@ -307,8 +362,9 @@ class BatchOperationsService(BaseService):
             logger.info(
                 "Bulk vector recompute completed",
                 operation_id=str(operation_id),
-                recomputed_items=recomputed_count,
-                failed_items=failed_count
+                recomputed_items=totals["copied"],
+                failed_items=totals["failed"],
+                cutover=cutover
             )
             
         except Exception as e:
@@ -571,14 +627,26 @@ class BatchOperationsService(BaseService):
         # Implementation would query source project
         return 50  # Placeholder
     
-    async def estimate_vector_recompute_scope(self, request: BulkVectorRecomputeRequest) -> int:
+    async def estimate_vector_recompute_scope(
+        self,
+        request: BulkVectorRecomputeRequest,
+        collection_name: str = "knowledge_items"
+    ) -> int:
         """Estimate number of items for vector recomputation"""
-        # Implementation would query with filters
-        return 200  # Placeholder
+        try:
+            route = await self.vector_service.get_collection_route(collection_name)
+            return await self.vector_service.count_points(route.active)
+        except Exception as e:
+            logger.warning("Failed to count vectors for recompute", collection=collection_name, error=str(e))
+            return 0
     
-    async def estimate_recompute_duration(self, request: BulkVectorRecomputeRequest) -> float:
+    async def estimate_recompute_duration(
+        self,
+        request: BulkVectorRecomputeRequest,
+        collection_name: str = "knowledge_items"
+    ) -> float:
         """Estimate recompute duration in seconds"""
-        item_count = await self.estimate_vector_recompute_scope(request)
+        item_count = await self.estimate_vector_recompute_scope(request, collection_name)
         time_per_item = 0.5  # seconds per embedding computation
         return item_count * time_per_item / request.parallel_workers
     
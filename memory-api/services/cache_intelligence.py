@@ -12,6 +12,7 @@ import pickle
 import hashlib
 
 from services.base_service import BaseService
+from services.cache_telemetry import FREQUENCY_PREFIX, get_cache_telemetry
 
 logger = structlog.get_logger(__name__)
 
@@ -50,33 +51,32 @@ class CacheIntelligence(BaseService):
         self.default_ttl = 3600  # 1 hour
         self.hot_cache_ttl = 7200  # 2 hours for frequently accessed items
         self.cold_cache_ttl = 1800  # 30 minutes for rarely accessed items
-        self.max_cache_size = 1000  # Maximum number of cached items per type
+        self.max_cache_size = 1000  # Maximum number of cached items per type (enforced by telemetry maintenance)
+        
+        # Access tracking is aggregated in-process and flushed in the background
+        self.telemetry = get_cache_telemetry()
         
     async def get_cached_context(self, cache_key: str, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get cached context with access tracking"""
+        """Get cached context with access tracking
+        
+        One Redis round trip; tracking is recorded locally and flushed later.
+        """
         try:
-            # Track access
-            await self._track_cache_access(cache_key, user_id, "request")
-            
-            # Get from cache
             cached_data = await self.cache_get(cache_key)
+            hit = bool(cached_data)
+            self.telemetry.record_access(
+                self.redis, cache_key, user_id, hit, context_type=self._context_type_of(cache_key)
+            )
             
-            if cached_data:
-                # Track cache hit
-                await self._track_cache_access(cache_key, user_id, "hit")
+            if hit:
+                # Trigger predictive loading, at most once per user per interval
+                if self.telemetry.should_preload(user_id):
+                    asyncio.create_task(self._predictive_preload(user_id, cache_key))
                 
-                # Update access frequency for intelligent TTL
-                await self._update_access_frequency(cache_key, user_id)
-                
-                # Trigger predictive loading if needed
-                asyncio.create_task(self._predictive_preload(user_id, cache_key))
-                
-                logger.info("Cache hit", cache_key=cache_key, user_id=user_id)
+                logger.debug("Cache hit", cache_key=cache_key, user_id=user_id)
                 return json.loads(cached_data)
             else:
-                # Track cache miss
-                await self._track_cache_access(cache_key, user_id, "miss")
-                logger.info("Cache miss", cache_key=cache_key, user_id=user_id)
+                logger.debug("Cache miss", cache_key=cache_key, user_id=user_id)
                 return None
                 
         except Exception as e:
@@ -90,7 +90,11 @@ class CacheIntelligence(BaseService):
         user_id: str,
         context_type: str = "general"
     ) -> bool:
-        """Set cached context with intelligent TTL"""
+        """Set cached context with intelligent TTL
+        
+        Size limits are enforced by the background maintenance task, which
+        evicts the least recently used entries of each context type.
+        """
         try:
             # Determine intelligent TTL based on access patterns
             ttl = await self._calculate_intelligent_ttl(cache_key, user_id, context_type)
@@ -98,20 +102,13 @@ class CacheIntelligence(BaseService):
             # Serialize data
             serialized_data = json.dumps(data, default=str)
             
-            # Check cache size limits
-            await self._enforce_cache_limits(context_type)
-            
             # Set cache with TTL
             success = await self.cache_set(cache_key, serialized_data, ttl)
             
             if success:
-                # Track cache set
-                await self._track_cache_operation(cache_key, user_id, "set", len(serialized_data))
-                
-                # Update cache metadata
-                await self._update_cache_metadata(cache_key, user_id, context_type, ttl)
+                self.telemetry.record_set(self.redis, cache_key, user_id, context_type)
                 
-                logger.info(
+                logger.debug(
                     "Cache set", 
                     cache_key=cache_key, 
                     user_id=user_id, 
@@ -178,15 +175,11 @@ class CacheIntelligence(BaseService):
             # Get basic cache stats
             stats_key = f"{self.stats_prefix}global" if not user_id else f"{self.stats_prefix}user:{user_id}"
             
-            stats_data = await self.cache_get(stats_key)
-            if stats_data:
-                base_stats = json.loads(stats_data)
-            else:
-                base_stats = {"total_requests": 0, "cache_hits": 0, "cache_misses": 0}
+            base_stats = await self._get_counters(stats_key)
             
             # Calculate hit rate
-            total_requests = base_stats["total_requests"]
-            cache_hits = base_stats["cache_hits"]
+            total_requests = base_stats.get("cache_requests", 0)
+            cache_hits = base_stats.get("cache_hits", 0)
             hit_rate = (cache_hits / total_requests) if total_requests > 0 else 0.0
             
             # Get popular queries
@@ -201,7 +194,7 @@ class CacheIntelligence(BaseService):
             return CacheStats(
                 total_requests=total_requests,
                 cache_hits=cache_hits,
-                cache_misses=base_stats["cache_misses"],
+                cache_misses=base_stats.get("cache_misses", 0),
                 hit_rate=hit_rate,
                 avg_response_time_ms=avg_response_time,
                 popular_queries=popular_queries,
@@ -265,16 +258,11 @@ class CacheIntelligence(BaseService):
                 else:
                     cache_pattern = f"{self.cache_prefix}*:{pattern}"
                 
-                # Get matching keys (implementation depends on Redis)
-                matching_keys = await self._get_matching_cache_keys(cache_pattern)
-                
-                # Invalidate matching keys
-                for key in matching_keys:
-                    await self.cache_delete(key)
-                    invalidated_count += 1
-                
-                # Track invalidation
-                await self._track_cache_operation(pattern, user_id or "system", "invalidate", invalidated_count)
+                # SCAN for matching keys and UNLINK them in pipelined batches
+                invalidated_count += await self.cache_delete_pattern(cache_pattern)
+            
+            # Track invalidation
+            self.telemetry.record_operation(self.redis, user_id or "system", "invalidation", invalidated_count)
             
             logger.info(
                 "Intelligent cache invalidation completed",
@@ -291,31 +279,17 @@ class CacheIntelligence(BaseService):
     
     # Private helper methods
     
-    async def _track_cache_access(self, cache_key: str, user_id: str, access_type: str) -> None:
-        """Track cache access for analytics"""
-        try:
-            timestamp = datetime.utcnow()
-            
-            # Update global stats
-            global_stats_key = f"{self.stats_prefix}global"
-            await self._increment_counter(global_stats_key, f"cache_{access_type}s")
-            
-            # Update user-specific stats
-            user_stats_key = f"{self.stats_prefix}user:{user_id}"
-            await self._increment_counter(user_stats_key, f"cache_{access_type}s")
-            
-            # Track access pattern
-            pattern_key = f"{self.pattern_prefix}user:{user_id}"
-            pattern_data = {
-                "cache_key": cache_key,
-                "access_type": access_type,
-                "timestamp": timestamp.isoformat()
-            }
-            
-            await self._add_to_access_history(pattern_key, pattern_data)
-            
-        except Exception as e:
-            logger.warning("Failed to track cache access", error=str(e))
+    def _context_type_of(self, cache_key: str) -> Optional[str]:
+        """Context type of a key built by _generate_cache_key"""
+        if not cache_key.startswith(self.cache_prefix):
+            return None
+        parts = cache_key[len(self.cache_prefix):].split(":", 2)
+        return parts[1] if len(parts) == 3 else None
+    
+    async def _get_counters(self, key: str) -> Dict[str, int]:
+        """Read a telemetry counter hash"""
+        counters = await self.redis.hgetall(key)
+        return {field: int(value) for field, value in counters.items() if value.lstrip("-").isdigit()}
     
     async def _calculate_intelligent_ttl(self, cache_key: str, user_id: str, context_type: str) -> int:
         """Calculate intelligent TTL based on access patterns"""
@@ -345,26 +319,11 @@ class CacheIntelligence(BaseService):
             logger.warning("Failed to calculate intelligent TTL", error=str(e))
             return self.default_ttl
     
-    async def _update_access_frequency(self, cache_key: str, user_id: str) -> None:
-        """Update access frequency counter"""
-        try:
-            frequency_key = f"{self.cache_prefix}frequency:{user_id}:{cache_key}"
-            await self._increment_counter(frequency_key, "count", ttl=86400)  # 24 hour window
-            
-        except Exception as e:
-            logger.warning("Failed to update access frequency", error=str(e))
-    
     async def _get_access_frequency(self, cache_key: str, user_id: str) -> int:
         """Get access frequency for cache key"""
         try:
-            frequency_key = f"{self.cache_prefix}frequency:{user_id}:{cache_key}"
-            frequency_data = await self.cache_get(frequency_key)
-            
-            if frequency_data:
-                data = json.loads(frequency_data)
-                return data.get("count", 0)
-            
-            return 0
+            count = await self.redis.hget(f"{FREQUENCY_PREFIX}{user_id}", cache_key)
+            return int(count) if count else 0
             
         except Exception as e:
             logger.warning("Failed to get access frequency", error=str(e))
@@ -394,38 +353,20 @@ class CacheIntelligence(BaseService):
         except Exception as e:
             logger.warning("Failed to predictive preload", error=str(e))
     
-    async def _enforce_cache_limits(self, context_type: str) -> None:
-        """Enforce cache size limits"""
-        try:
-            # Get current cache size for this type
-            type_pattern = f"{self.cache_prefix}*:{context_type}:*"
-            current_keys = await self._get_matching_cache_keys(type_pattern)
-            
-            if len(current_keys) >= self.max_cache_size:
-                # Remove least recently used entries
-                lru_keys = await self._get_lru_keys(current_keys, len(current_keys) - self.max_cache_size + 10)
-                
-                for key in lru_keys:
-                    await self.cache_delete(key)
-                
-                logger.info(f"Removed {len(lru_keys)} LRU cache entries for {context_type}")
-            
-        except Exception as e:
-            logger.warning("Failed to enforce cache limits", error=str(e))
-    
     async def _get_user_access_patterns(self, user_id: str) -> Optional[AccessPattern]:
         """Get user access patterns for predictive caching"""
         try:
             pattern_key = f"{self.pattern_prefix}user:{user_id}"
-            history_data = await self.cache_get(pattern_key)
+            history_data = await self.redis.lrange(pattern_key, 0, -1)
             
             if not history_data:
                 return None
             
-            history = json.loads(history_data)
+            # Sampled access history, one JSON entry per recorded request
+            history = [json.loads(entry) for entry in history_data]
             
             # Analyze patterns
-            queries = [item.get("cache_key", "") for item in history if item.get("access_type") == "request"]
+            queries = [item.get("cache_key", "") for item in history]
             query_counter = Counter(queries)
             
             # Extract projects and technologies from cache keys
@@ -467,67 +408,18 @@ class CacheIntelligence(BaseService):
     # - _generate_cache_recommendations
     # - _measure_performance_gains
     # - _get_matching_cache_keys
-    # - _increment_counter
-    # - _add_to_access_history
     # - _generate_predictive_keys
     # - _generate_predictive_content
-    # - _get_lru_keys
-    
-    async def _increment_counter(self, key: str, field: str, ttl: Optional[int] = None) -> None:
-        """Increment a counter in cache"""
-        try:
-            current_data = await self.cache_get(key)
-            
-            if current_data:
-                data = json.loads(current_data)
-            else:
-                data = {}
-            
-            data[field] = data.get(field, 0) + 1
-            data["last_updated"] = datetime.utcnow().isoformat()
-            
-            await self.cache_set(key, json.dumps(data), ttl or 86400)
-            
-        except Exception as e:
-            logger.warning("Failed to increment counter", key=key, field=field, error=str(e))
     
-    async def _add_to_access_history(self, key: str, data: Dict[str, Any]) -> None:
-        """Add to access history (keeping last 1000 entries)"""
-        try:
-            history_data = await self.cache_get(key)
-            
-            if history_data:
-                history = json.loads(history_data)
-            else:
-                history = []
-            
-            history.append(data)
-            
-            # Keep only last 1000 entries
-            if len(history) > 1000:
-                history = history[-1000:]
-            
-            await self.cache_set(key, json.dumps(history), 86400 * 7)  # 7 days
-            
-        except Exception as e:
-            logger.warning("Failed to add to access history", error=str(e))
+    async def _get_matching_cache_keys(self, pattern: str) -> List[str]:
+        """Cache keys matching pattern, enumerated with SCAN"""
+        return [key async for key in self.cache_scan_keys(pattern)]
     
     async def get_performance_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
         try:
             # Get global cache stats
-            global_stats_key = f"{self.stats_prefix}global"
-            global_stats_data = await self.cache_get(global_stats_key)
-            
-            if global_stats_data:
-                global_stats = json.loads(global_stats_data)
-            else:
-                global_stats = {
-                    "cache_hits": 0,
-                    "cache_misses": 0,
-                    "cache_sets": 0,
-                    "cache_invalidations": 0
-                }
+            global_stats = await self._get_counters(f"{self.stats_prefix}global")
             
             # Calculate hit ratio
             total_requests = global_stats.get("cache_hits", 0) + global_stats.get("cache_misses", 0)
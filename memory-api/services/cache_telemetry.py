@@ -0,0 +1,223 @@
+# ABOUTME: Locally aggregated cache telemetry and background eviction for intelligent caching
+# ABOUTME: Counters and sampled access history flush to Redis in one pipeline; recency indexes bound cache size
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+STATS_PREFIX = "betty:stats:"
+PATTERN_PREFIX = "betty:patterns:"
+FREQUENCY_PREFIX = "betty:intelligent:frequency:"
+RECENCY_PREFIX = "betty:intelligent:recency:"
+
+HISTORY_LENGTH = 1000
+HISTORY_TTL = 86400 * 7
+COUNTER_TTL = 86400
+
+class CacheTelemetry:
+    """Process-wide aggregator for intelligent cache telemetry
+
+    Recording is a local dict update; ``flush`` writes everything gathered
+    since the last flush with one pipelined round trip: HINCRBY counters,
+    sampled access history as capped lists, and ZADD recency scores. A
+    maintenance pass trims each context type's recency index to its size
+    limit and unlinks the evicted entries.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.1,
+        flush_interval: float = 5.0,
+        maintenance_interval: float = 60.0,
+        max_entries_per_type: int = 1000,
+        max_entry_age: float = 21600.0
+    ):
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.maintenance_interval = maintenance_interval
+        self.max_entries_per_type = max_entries_per_type
+        self.max_entry_age = max_entry_age
+
+        self._counters: Dict[str, Counter] = defaultdict(Counter)
+        self._frequency: Dict[str, Counter] = defaultdict(Counter)
+        self._history: Dict[str, List[str]] = defaultdict(list)
+        self._recency: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._last_preload: Dict[str, float] = {}
+
+        self._redis = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_started(self, redis_client) -> None:
+        if self._redis is None:
+            self._redis = redis_client
+        if not self._tasks and redis_client is not None:
+            self._tasks = [
+                asyncio.create_task(self._run_periodically(self.flush, self.flush_interval)),
+                asyncio.create_task(self._run_periodically(self.enforce_limits, self.maintenance_interval))
+            ]
+
+    def record_access(
+        self,
+        redis_client,
+        cache_key: str,
+        user_id: str,
+        hit: bool,
+        context_type: Optional[str] = None
+    ) -> None:
+        """Count a cache read; hits also refresh recency and access frequency"""
+        self._ensure_started(redis_client)
+        access_type = "hit" if hit else "miss"
+        for stats_key in (f"{STATS_PREFIX}global", f"{STATS_PREFIX}user:{user_id}"):
+            self._counters[stats_key]["cache_requests"] += 1
+            self._counters[stats_key]["cache_hits" if hit else "cache_misses"] += 1
+
+        if hit:
+            self._frequency[user_id][cache_key] += 1
+            if context_type:
+                self._recency[context_type][cache_key] = time.time()
+
+        if random.random() < self.sample_rate:
+            self._history[f"{PATTERN_PREFIX}user:{user_id}"].append(json.dumps({
+                "cache_key": cache_key,
+                "access_type": access_type,
+                "timestamp": datetime.utcnow().isoformat()
+            }))
+
+    def record_set(self, redis_client, cache_key: str, user_id: str, context_type: str) -> None:
+        """Count a cache write and index the key for size-based eviction"""
+        self._ensure_started(redis_client)
+        for stats_key in (f"{STATS_PREFIX}global", f"{STATS_PREFIX}user:{user_id}"):
+            self._counters[stats_key]["cache_sets"] += 1
+        self._recency[context_type][cache_key] = time.time()
+
+    def record_operation(self, redis_client, user_id: str, operation: str, count: int = 1) -> None:
+        self._ensure_started(redis_client)
+        for stats_key in (f"{STATS_PREFIX}global", f"{STATS_PREFIX}user:{user_id}"):
+            self._counters[stats_key][f"cache_{operation}s"] += count
+
+    def should_preload(self, user_id: str, interval: float = 60.0) -> bool:
+        """Predictive preloading runs at most once per user per interval"""
+        now = time.monotonic()
+        if now - self._last_preload.get(user_id, float("-inf")) < interval:
+            return False
+        self._last_preload[user_id] = now
+        if len(self._last_preload) > 10000:
+            self._last_preload = {user: at for user, at in self._last_preload.items() if now - at < interval}
+        return True
+
+    def _drain(self) -> Tuple[Dict[str, Counter], Dict[str, Counter], Dict[str, List[str]], Dict[str, Dict[str, float]]]:
+        drained = (self._counters, self._frequency, self._history, self._recency)
+        self._counters = defaultdict(Counter)
+        self._frequency = defaultdict(Counter)
+        self._history = defaultdict(list)
+        self._recency = defaultdict(dict)
+        return drained
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._counters or self._frequency or self._history or self._recency)
+
+    async def flush(self) -> None:
+        """Write everything recorded since the last flush in one pipeline"""
+        if self._redis is None or not self.pending:
+            return
+
+        counters, frequency, history, recency = self._drain()
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, fields in counters.items():
+                    for field, amount in fields.items():
+                        pipe.hincrby(key, field, amount)
+                    pipe.expire(key, COUNTER_TTL)
+                for user_id, counts in frequency.items():
+                    key = f"{FREQUENCY_PREFIX}{user_id}"
+                    for cache_key, amount in counts.items():
+                        pipe.hincrby(key, cache_key, amount)
+                    pipe.expire(key, COUNTER_TTL)
+                for key, entries in history.items():
+                    pipe.rpush(key, *entries)
+                    pipe.ltrim(key, -HISTORY_LENGTH, -1)
+                    pipe.expire(key, HISTORY_TTL)
+                for context_type, scores in recency.items():
+                    pipe.zadd(f"{RECENCY_PREFIX}{context_type}", scores)
+                await pipe.execute()
+        except Exception as e:
+            # Telemetry is best-effort; a lost interval is not worth retrying
+            logger.warning("Failed to flush cache telemetry", error=str(e))
+
+    async def enforce_limits(self) -> int:
+        """Evict the least recently used entries beyond each type's limit"""
+        if self._redis is None:
+            return 0
+
+        evicted = 0
+        try:
+            async for index_key in self._redis.scan_iter(match=f"{RECENCY_PREFIX}*", count=100):
+                # Entries older than the longest TTL have expired on their own
+                await self._redis.zremrangebyscore(index_key, "-inf", time.time() - self.max_entry_age)
+
+                excess = await self._redis.zcard(index_key) - self.max_entries_per_type
+                if excess <= 0:
+                    continue
+
+                stale = await self._redis.zrange(index_key, 0, excess - 1)
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.unlink(*stale)
+                    pipe.zrem(index_key, *stale)
+                    await pipe.execute()
+                evicted += len(stale)
+                logger.info("Evicted LRU cache entries", index=index_key, evicted=len(stale))
+        except Exception as e:
+            logger.warning("Failed to enforce cache limits", error=str(e))
+        return evicted
+
+    async def _run_periodically(self, operation, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await operation()
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        await self.flush()
+
+_cache_telemetry_instance: Optional[CacheTelemetry] = None
+
+def get_cache_telemetry() -> CacheTelemetry:
+    """Get the process-wide cache telemetry aggregator"""
+    global _cache_telemetry_instance
+
+    if _cache_telemetry_instance is None:
+        settings = get_settings()
+        _cache_telemetry_instance = CacheTelemetry(
+            sample_rate=settings.cache_telemetry_sample_rate,
+            flush_interval=settings.cache_telemetry_flush_interval,
+            maintenance_interval=settings.cache_maintenance_interval,
+            max_entries_per_type=settings.cache_max_entries_per_type
+        )
+
+    return _cache_telemetry_instance
+
+async def shutdown_cache_telemetry() -> None:
+    """Flush and stop the process-wide cache telemetry if it was created"""
+    global _cache_telemetry_instance
+
+    if _cache_telemetry_instance is not None:
+        await _cache_telemetry_instance.close()
+        _cache_telemetry_instance = None
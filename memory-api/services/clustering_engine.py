@@ -0,0 +1,295 @@
+# ABOUTME: Clustering engine for BETTY Memory System
+# ABOUTME: Runs PCA reduction and scikit-learn fits in a process pool, switching to scalable algorithms for large inputs
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+import numpy as np
+
+from core.config import Settings, get_settings
+
+logger = structlog.get_logger(__name__)
+
+ALGORITHMS = ("kmeans", "hierarchical", "dbscan", "spectral", "gaussian_mixture")
+
+# Silhouette scores for automatic k are computed on a sample this large
+SILHOUETTE_SAMPLE_SIZE = 2000
+MINI_BATCH_SIZE = 1024
+# Neighbours in the sparse connectivity/affinity graphs used for large inputs
+GRAPH_NEIGHBORS = 10
+# HDBSCAN's tree building degrades quickly with dimension; it uses only the
+# leading principal components
+DENSITY_COMPONENTS = 10
+RANDOM_STATE = 42
+
+@dataclass
+class ClusteringResult:
+    """Labels for each input row plus the shared 2-d projection"""
+    labels: np.ndarray
+    method: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    # PCA projection of every row; the first two components drive visualizations
+    projection: Optional[np.ndarray] = None
+    explained_variance: List[float] = field(default_factory=list)
+    reduced_dimensions: int = 0
+    fit_seconds: float = 0.0
+
+def reduce_features(features: np.ndarray, n_components: int) -> Tuple[np.ndarray, np.ndarray]:
+    """PCA-reduce features to at most n_components, returning (reduced, explained_variance_ratio)
+
+    Components are ordered by variance, so the first two columns are the
+    2-d projection used for visualization.
+    """
+    from sklearn.decomposition import PCA
+
+    n_components = min(n_components, features.shape[0], features.shape[1])
+    if n_components < 2:
+        return features.astype(np.float32, copy=False), np.zeros(0)
+
+    solver = "randomized" if n_components < min(features.shape) else "full"
+    pca = PCA(n_components=n_components, svd_solver=solver, random_state=RANDOM_STATE)
+    reduced = pca.fit_transform(features).astype(np.float32, copy=False)
+    return reduced, pca.explained_variance_ratio_
+
+def default_cluster_count(n_rows: int, min_cluster_size: int) -> int:
+    """Cluster count used when none was requested"""
+    return max(2, min(5, n_rows // max(1, min_cluster_size)))
+
+def _kmeans(features: np.ndarray, n_clusters: int, large: bool):
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if large:
+        return MiniBatchKMeans(
+            n_clusters=n_clusters, batch_size=MINI_BATCH_SIZE, n_init=3, random_state=RANDOM_STATE
+        ).fit(features)
+    return KMeans(n_clusters=n_clusters, n_init=10, random_state=RANDOM_STATE).fit(features)
+
+def _choose_kmeans(features: np.ndarray, min_cluster_size: int, large: bool):
+    """Fit k in 2..10 and keep the model with the best silhouette score on a bounded sample"""
+    from sklearn.metrics import silhouette_score
+
+    max_k = min(10, features.shape[0] // max(1, min_cluster_size))
+    if max_k < 2:
+        return _kmeans(features, 2, large)
+
+    sample_size = min(features.shape[0], SILHOUETTE_SAMPLE_SIZE)
+    best_model, best_score = None, None
+    for k in range(2, max_k + 1):
+        model = _kmeans(features, k, large)
+        if len(set(model.labels_)) < 2:
+            continue
+        score = silhouette_score(features, model.labels_, sample_size=sample_size, random_state=RANDOM_STATE)
+        if best_score is None or score > best_score:
+            best_model, best_score = model, score
+
+    return best_model or _kmeans(features, 2, large)
+
+def run_clustering(
+    algorithm: str,
+    features: np.ndarray,
+    params: Dict[str, Any],
+    large_threshold: int,
+    reduce_components: int
+) -> ClusteringResult:
+    """Reduce features once and fit one clustering algorithm (runs in a pool worker)
+
+    params: n_clusters (None to derive), auto_clusters, min_cluster_size.
+    Inputs with at least large_threshold rows use algorithms whose memory
+    grows linearly: MiniBatchKMeans, HDBSCAN instead of DBSCAN, and sparse
+    nearest-neighbour graphs for hierarchical and spectral clustering.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown clustering algorithm: {algorithm}")
+
+    start_time = time.perf_counter()
+    n_rows = features.shape[0]
+    large = n_rows >= large_threshold
+    min_cluster_size = max(1, int(params.get("min_cluster_size") or 1))
+
+    reduced, variance_ratio = reduce_features(features, reduce_components)
+
+    n_clusters = params.get("n_clusters")
+    n_clusters = min(n_rows, int(n_clusters or default_cluster_count(n_rows, min_cluster_size)))
+    fit_params: Dict[str, Any] = {"n_clusters": n_clusters}
+
+    if algorithm == "kmeans":
+        if params.get("auto_clusters") or not params.get("n_clusters"):
+            model = _choose_kmeans(reduced, min_cluster_size, large)
+        else:
+            model = _kmeans(reduced, n_clusters, large)
+        labels = model.labels_
+        method = "minibatch_kmeans" if large else "kmeans"
+        fit_params["n_clusters"] = int(model.n_clusters)
+
+    elif algorithm == "dbscan":
+        min_samples = max(2, min_cluster_size)
+        if large:
+            from sklearn.cluster import HDBSCAN
+
+            labels = HDBSCAN(min_cluster_size=min_samples, copy=True).fit_predict(reduced[:, :DENSITY_COMPONENTS])
+            method = "hdbscan"
+            fit_params = {"min_cluster_size": min_samples, "dimensions": min(DENSITY_COMPONENTS, reduced.shape[1])}
+        else:
+            from sklearn.cluster import DBSCAN
+
+            eps = 0.5
+            labels = DBSCAN(eps=eps, min_samples=min_samples).fit_predict(reduced)
+            method = "dbscan"
+            fit_params = {"eps": eps, "min_samples": min_samples}
+
+    elif algorithm == "hierarchical":
+        from sklearn.cluster import AgglomerativeClustering
+
+        connectivity = None
+        if large:
+            from sklearn.neighbors import kneighbors_graph
+
+            connectivity = kneighbors_graph(reduced, n_neighbors=GRAPH_NEIGHBORS, include_self=False)
+        labels = AgglomerativeClustering(n_clusters=n_clusters, connectivity=connectivity).fit_predict(reduced)
+        method = "hierarchical"
+
+    elif algorithm == "spectral":
+        from sklearn.cluster import SpectralClustering
+
+        if large:
+            model = SpectralClustering(
+                n_clusters=n_clusters,
+                affinity="nearest_neighbors",
+                n_neighbors=GRAPH_NEIGHBORS,
+                assign_labels="cluster_qr",
+                random_state=RANDOM_STATE
+            )
+        else:
+            model = SpectralClustering(n_clusters=n_clusters, random_state=RANDOM_STATE)
+        labels = model.fit_predict(reduced)
+        method = "spectral"
+
+    else:
+        from sklearn.mixture import GaussianMixture
+
+        covariance_type = "diag" if large else "full"
+        labels = GaussianMixture(
+            n_components=n_clusters, covariance_type=covariance_type, random_state=RANDOM_STATE
+        ).fit_predict(reduced)
+        method = "gaussian_mixture"
+        fit_params["covariance_type"] = covariance_type
+
+    projection = np.zeros((n_rows, 2), dtype=np.float32)
+    columns = min(2, reduced.shape[1])
+    projection[:, :columns] = reduced[:, :columns]
+
+    return ClusteringResult(
+        labels=np.asarray(labels, dtype=np.int64),
+        method=method,
+        params=fit_params,
+        projection=projection,
+        explained_variance=[float(value) for value in variance_ratio[:2]],
+        reduced_dimensions=int(reduced.shape[1]),
+        fit_seconds=time.perf_counter() - start_time
+    )
+
+class ClusteringEngine:
+    """Runs clustering fits off the event loop in a dedicated process pool
+
+    Fits are CPU-bound and hold the GIL for seconds at a time, so each one
+    is shipped with its feature matrix to a worker process. With
+    ``workers=0`` fits run on a single background thread instead.
+    """
+
+    def __init__(self, workers: int = 2, large_threshold: int = 5000, reduce_components: int = 50):
+        self.workers = max(0, workers)
+        self.large_threshold = max(1, large_threshold)
+        self.reduce_components = max(2, reduce_components)
+
+        self._executor: Optional[Executor] = None
+
+        # Statistics
+        self._fits = 0
+        self._rows = 0
+        self._fit_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                # Spawn (not fork) so workers never inherit asyncio state
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clustering")
+        return self._executor
+
+    async def cluster(self, algorithm: str, features: np.ndarray, params: Dict[str, Any]) -> ClusteringResult:
+        """Fit one algorithm over features in the pool"""
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(),
+            run_clustering,
+            algorithm,
+            features,
+            params,
+            self.large_threshold,
+            self.reduce_components
+        )
+
+        self._fits += 1
+        self._rows += features.shape[0]
+        self._fit_seconds += result.fit_seconds
+
+        logger.info(
+            "Clustering fit completed",
+            algorithm=algorithm,
+            method=result.method,
+            rows=features.shape[0],
+            reduced_dimensions=result.reduced_dimensions,
+            fit_ms=round(result.fit_seconds * 1000, 2)
+        )
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine throughput statistics"""
+        return {
+            "workers": self.workers,
+            "large_threshold": self.large_threshold,
+            "reduce_components": self.reduce_components,
+            "fits": self._fits,
+            "rows": self._rows,
+            "avg_fit_ms": round(self._fit_seconds * 1000 / self._fits, 2) if self._fits else 0.0
+        }
+
+    async def close(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        logger.info("Clustering engine stopped")
+
+# Engine instance shared by all AdvancedQueryService instances in this process
+_clustering_engine_instance: Optional[ClusteringEngine] = None
+
+def get_clustering_engine(settings: Settings = None) -> ClusteringEngine:
+    """Get or create the process-wide clustering engine"""
+    global _clustering_engine_instance
+
+    if _clustering_engine_instance is None:
+        settings = settings or get_settings()
+        _clustering_engine_instance = ClusteringEngine(
+            workers=settings.clustering_workers,
+            large_threshold=settings.clustering_large_threshold,
+            reduce_components=settings.clustering_pca_components
+        )
+
+    return _clustering_engine_instance
+
+async def shutdown_clustering_engine() -> None:
+    """Shut down the process-wide clustering engine if it was created"""
+    global _clustering_engine_instance
+
+    if _clustering_engine_instance is not None:
+        await _clustering_engine_instance.close()
+        _clustering_engine_instance = None
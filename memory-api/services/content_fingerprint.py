@@ -0,0 +1,227 @@
+# ABOUTME: Content fingerprints and MinHash/LSH signatures for knowledge item deduplication
+# ABOUTME: Exact duplicates probe a unique fingerprint index; near-duplicates probe LSH band buckets
+
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+# 16 bands x 4 rows: items with Jaccard >= ~0.5 share a bucket with high
+# probability, and at 0.9 a match is all but certain
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# Mersenne prime keeps (a * x + b) inside uint64 for 32-bit shingle hashes,
+# and signature values inside a Postgres INTEGER
+_PRIME = (1 << 31) - 1
+_WORD_RE = re.compile(r"\w+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _hash32(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=4).digest(), "little")
+
+def _permutation_coefficients() -> Tuple[np.ndarray, np.ndarray]:
+    """Hash permutation coefficients derived from fixed seeds, so signatures
+    stay comparable across processes and numpy versions"""
+    a = [_hash32(f"minhash-a-{i}".encode()) % (_PRIME - 1) + 1 for i in range(MINHASH_PERMUTATIONS)]
+    b = [_hash32(f"minhash-b-{i}".encode()) % _PRIME for i in range(MINHASH_PERMUTATIONS)]
+    return np.array(a, dtype=np.uint64), np.array(b, dtype=np.uint64)
+
+_PERM_A, _PERM_B = _permutation_coefficients()
+
+def normalize_text(text: Optional[str]) -> str:
+    """Case-fold, NFKC-normalize and collapse whitespace"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+def content_fingerprint(title: Optional[str], content: Optional[str]) -> str:
+    """SHA-256 of the normalized title and content
+
+    Unlike content_hash, re-imports that differ only in case or whitespace
+    produce the same fingerprint.
+    """
+    normalized = f"{normalize_text(title)}\n{normalize_text(content)}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Word n-grams of normalized text (the words themselves for short texts)"""
+    words = _WORD_RE.findall(normalize_text(text))
+    if len(words) < size:
+        return words
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+def minhash_signature(tokens: Iterable[str]) -> List[int]:
+    """MinHash signature over a set of shingles"""
+    hashes = np.array(
+        sorted({_hash32(token.encode("utf-8")) for token in tokens}),
+        dtype=np.uint64
+    )
+    if hashes.size == 0:
+        return [_PRIME] * MINHASH_PERMUTATIONS
+
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.int64).tolist()
+
+def lsh_buckets(signature: Sequence[int]) -> List[int]:
+    """One signed 64-bit bucket key per band"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(
+            np.asarray(rows, dtype=np.int64).tobytes(), digest_size=8
+        ).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+def estimate_similarity(signature_a: Sequence[int], signature_b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    a = np.asarray(signature_a)
+    b = np.asarray(signature_b)
+    if a.shape != b.shape or a.size == 0:
+        return 0.0
+    return float(np.mean(a == b))
+
+@dataclass(frozen=True)
+class ContentSignature:
+    """Everything stored per knowledge item for duplicate detection"""
+    fingerprint: str
+    minhash: List[int]
+    buckets: List[int]
+
+    @property
+    def bands(self) -> List[int]:
+        return list(range(LSH_BANDS))
+
+def compute_content_signature(title: Optional[str], content: Optional[str]) -> ContentSignature:
+    """Fingerprint, MinHash signature and LSH buckets for one item"""
+    signature = minhash_signature(shingles(f"{title or ''}\n{content or ''}"))
+    return ContentSignature(
+        fingerprint=content_fingerprint(title, content),
+        minhash=signature,
+        buckets=lsh_buckets(signature)
+    )
+
+# asyncpg statements shared by the knowledge service and the processing pipeline
+
+EXACT_DUPLICATE_SQL = """
+    SELECT id FROM knowledge_items
+    WHERE content_fingerprint = $2
+      AND ($1::uuid IS NULL OR project_id = $1)
+      AND system_time_until IS NULL
+    LIMIT 1
+"""
+
+NEAR_DUPLICATE_CANDIDATES_SQL = """
+    SELECT k.id, k.minhash_signature
+    FROM unnest($2::smallint[], $3::bigint[]) AS probe(band, bucket)
+    JOIN knowledge_lsh_buckets b ON b.band = probe.band AND b.bucket = probe.bucket
+    JOIN knowledge_items k ON k.id = b.knowledge_item_id
+    WHERE ($1::uuid IS NULL OR b.project_id = $1)
+      AND k.system_time_until IS NULL
+      AND NOT (k.id = ANY($4::uuid[]))
+    GROUP BY k.id, k.minhash_signature
+    ORDER BY count(*) DESC
+    LIMIT $5
+"""
+
+STORE_SIGNATURE_SQL = """
+    UPDATE knowledge_items
+    SET content_fingerprint = $2, minhash_signature = $3
+    WHERE id = $1
+"""
+
+DELETE_LSH_BUCKETS_SQL = """
+    DELETE FROM knowledge_lsh_buckets WHERE knowledge_item_id = $1
+"""
+
+INSERT_LSH_BUCKETS_SQL = """
+    INSERT INTO knowledge_lsh_buckets (band, bucket, knowledge_item_id, project_id)
+    SELECT lsh.band, lsh.bucket, $1, $2
+    FROM unnest($3::smallint[], $4::bigint[]) AS lsh(band, bucket)
+"""
+
+CONFLICTING_ITEM_SQL = """
+    SELECT id FROM knowledge_items
+    WHERE project_id = $1
+      AND ($4::uuid IS NULL OR id <> $4)
+      AND (content_hash = $2 OR (content_fingerprint = $3 AND system_time_until IS NULL))
+    LIMIT 1
+"""
+
+class DuplicateContentError(Exception):
+    """A write collided with the content hash or live fingerprint of another item"""
+
+    def __init__(self, existing_id: UUID):
+        self.existing_id = existing_id
+        super().__init__(f"Duplicate of knowledge item {existing_id}")
+
+async def store_content_signature(
+    conn,
+    item_id: UUID,
+    project_id: UUID,
+    title: Optional[str],
+    content: Optional[str]
+) -> ContentSignature:
+    """Recompute an edited item's signature and rewrite its fingerprint,
+    MinHash signature and LSH bucket rows
+
+    Call inside the transaction that changed the title or content, so
+    duplicate probes never see the old text's fingerprint or buckets.
+    """
+    signature = compute_content_signature(title, content)
+    await conn.execute(STORE_SIGNATURE_SQL, item_id, signature.fingerprint, signature.minhash)
+    await conn.execute(DELETE_LSH_BUCKETS_SQL, item_id)
+    await conn.execute(INSERT_LSH_BUCKETS_SQL, item_id, project_id, signature.bands, signature.buckets)
+    return signature
+
+async def find_exact_duplicate(conn, signature: ContentSignature, project_id: Optional[UUID] = None) -> Optional[UUID]:
+    """Probe the unique fingerprint index for a live item with the same content"""
+    return await conn.fetchval(EXACT_DUPLICATE_SQL, project_id, signature.fingerprint)
+
+async def find_conflicting_item(
+    conn,
+    project_id: UUID,
+    content_hash: str,
+    fingerprint: str,
+    exclude: Optional[UUID] = None
+) -> Optional[UUID]:
+    """The item holding a content hash or live fingerprint a write collided with"""
+    return await conn.fetchval(CONFLICTING_ITEM_SQL, project_id, content_hash, fingerprint, exclude)
+
+async def find_near_duplicates(
+    conn,
+    signature: ContentSignature,
+    project_id: Optional[UUID] = None,
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    exclude: Sequence[UUID] = (),
+    limit: int = 50
+) -> List[Tuple[UUID, float]]:
+    """Live items sharing an LSH bucket whose estimated Jaccard similarity
+    reaches threshold, most similar first"""
+    rows = await conn.fetch(
+        NEAR_DUPLICATE_CANDIDATES_SQL,
+        project_id,
+        signature.bands,
+        signature.buckets,
+        list(exclude),
+        limit
+    )
+
+    matches = []
+    for row in rows:
+        if row["minhash_signature"] is None:
+            continue
+        similarity = estimate_similarity(signature.minhash, row["minhash_signature"])
+        if similarity >= threshold:
+            matches.append((row["id"], similarity))
+
+    return sorted(matches, key=lambda match: -match[1])
@@ -0,0 +1,188 @@
+# ABOUTME: Content-addressed embedding cache for BETTY Memory System
+# ABOUTME: Bounded in-process LRU/TTL tier backed by an optional Redis tier of packed float32 vectors
+
+import hashlib
+import unicodedata
+from typing import Any, Dict, List, Optional
+import structlog
+import numpy as np
+import redis.asyncio as redis
+from cachetools import TTLCache
+
+from core.config import Settings, get_settings
+
+logger = structlog.get_logger(__name__)
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different strings share one embedding"""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def make_embedding_key(model_name: str, text: str) -> str:
+    """Content address for an embedding: hash of model name plus normalized text"""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+def pack_vector(vector: np.ndarray) -> bytes:
+    """Pack a vector as little-endian float32 bytes"""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+def unpack_vector(data: bytes) -> np.ndarray:
+    """Unpack little-endian float32 bytes into a vector"""
+    return np.frombuffer(data, dtype="<f4").astype(np.float32)
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by content address
+
+    The in-process tier is a bounded LRU with per-entry TTL. The optional
+    Redis tier is shared by all workers and replicas and stores raw float32
+    bytes (3 KB for a 768-d vector) rather than JSON lists.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 86400,
+        redis_url: Optional[str] = None,
+        redis_ttl_seconds: int = 604800,
+        key_prefix: str = "betty:embedding:"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = key_prefix
+
+        self._local: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self._redis: Optional[redis.Redis] = None
+
+        # Statistics
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._redis_errors = 0
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        """Lazily create a binary-safe Redis client for the shared tier"""
+        if self.redis_url and self._redis is None:
+            # The application client decodes responses to str; vectors need raw bytes
+            self._redis = redis.from_url(self.redis_url, decode_responses=False)
+        return self._redis
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up embeddings by key, local tier first, then one Redis MGET"""
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        for key in keys:
+            vector = self._local.get(key)
+            if vector is not None:
+                found[key] = vector
+                self._local_hits += 1
+            else:
+                missing.append(key)
+
+        client = self._get_redis()
+        if missing and client is not None:
+            try:
+                values = await client.mget([self.key_prefix + key for key in missing])
+                still_missing = []
+                for key, value in zip(missing, values):
+                    if value is None:
+                        still_missing.append(key)
+                        continue
+                    vector = unpack_vector(value)
+                    self._local[key] = vector
+                    found[key] = vector
+                    self._redis_hits += 1
+                missing = still_missing
+            except Exception as e:
+                self._redis_errors += 1
+                logger.warning("Embedding cache Redis get failed", keys=len(missing), error=str(e))
+
+        self._misses += len(missing)
+        return found
+
+    async def get(self, key: str) -> Optional[np.ndarray]:
+        """Look up a single embedding by key"""
+        return (await self.get_many([key])).get(key)
+
+    async def set_many(self, entries: Dict[str, np.ndarray]) -> None:
+        """Store embeddings in both tiers"""
+        if not entries:
+            return
+
+        for key, vector in entries.items():
+            self._local[key] = vector
+        self._writes += len(entries)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for key, vector in entries.items():
+                    pipe.setex(self.key_prefix + key, self.redis_ttl_seconds, pack_vector(vector))
+                await pipe.execute()
+            except Exception as e:
+                self._redis_errors += 1
+                logger.warning("Embedding cache Redis set failed", keys=len(entries), error=str(e))
+
+    async def set(self, key: str, vector: np.ndarray) -> None:
+        """Store a single embedding"""
+        await self.set_many({key: vector})
+
+    def clear_local(self) -> None:
+        """Drop the in-process tier"""
+        self._local.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for both tiers"""
+        lookups = self._local_hits + self._redis_hits + self._misses
+        return {
+            "local_entries": len(self._local),
+            "local_max_entries": self.max_entries,
+            "local_hits": self._local_hits,
+            "redis_enabled": bool(self.redis_url),
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "writes": self._writes,
+            "redis_errors": self._redis_errors,
+            "hit_rate": round((self._local_hits + self._redis_hits) / lookups, 4) if lookups else 0.0
+        }
+
+    async def close(self) -> None:
+        """Close the Redis tier connection"""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+# Cache instance shared by all VectorService instances in this process
+_embedding_cache_instance: Optional[EmbeddingCache] = None
+
+def get_embedding_cache(settings: Settings = None) -> EmbeddingCache:
+    """Get or create the process-wide embedding cache"""
+    global _embedding_cache_instance
+
+    if _embedding_cache_instance is None:
+        settings = settings or get_settings()
+        _embedding_cache_instance = EmbeddingCache(
+            max_entries=settings.embedding_cache_max_entries,
+            ttl_seconds=settings.embedding_cache_ttl,
+            redis_url=settings.redis_url if settings.embedding_cache_redis_enabled else None,
+            redis_ttl_seconds=settings.embedding_cache_redis_ttl
+        )
+
+    return _embedding_cache_instance
+
+async def shutdown_embedding_cache() -> None:
+    """Close the process-wide embedding cache if it was created"""
+    global _embedding_cache_instance
+
+    if _embedding_cache_instance is not None:
+        await _embedding_cache_instance.close()
+        _embedding_cache_instance = None
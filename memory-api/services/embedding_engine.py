@@ -0,0 +1,290 @@
+# ABOUTME: Batched embedding engine for BETTY Memory System
+# ABOUTME: Coalesces concurrent embedding requests into micro-batches encoded in a process pool
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+import numpy as np
+
+from core.config import Settings, get_settings
+
+logger = structlog.get_logger(__name__)
+
+# Per-process model state. Populated by _init_worker inside each pool worker
+# (or inside the API process itself when running without a process pool).
+_worker_model = None
+_worker_model_name: Optional[str] = None
+
+def _init_worker(model_name: str, fallback_model_name: str) -> None:
+    """Load the sentence transformer model once per worker process"""
+    global _worker_model, _worker_model_name
+
+    if _worker_model is not None:
+        return
+
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        _worker_model = SentenceTransformer(model_name)
+        _worker_model_name = model_name
+    except Exception:
+        # Fallback to smaller model
+        _worker_model = SentenceTransformer(fallback_model_name)
+        _worker_model_name = fallback_model_name
+
+def _describe_worker() -> Tuple[str, int]:
+    """Return the loaded model name and its embedding dimension"""
+    return _worker_model_name, int(_worker_model.get_sentence_embedding_dimension())
+
+def _encode_batch(texts: List[str]) -> np.ndarray:
+    """Encode a batch of texts in a single forward pass"""
+    embeddings = _worker_model.encode(
+        texts,
+        batch_size=len(texts),
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+        show_progress_bar=False
+    )
+    return np.asarray(embeddings, dtype=np.float32)
+
+class EmbeddingEngine:
+    """Micro-batching embedding engine backed by a dedicated process pool
+
+    Concurrent ``embed`` callers are queued and flushed as one batch once
+    ``max_batch_size`` texts are waiting or ``max_wait_ms`` has elapsed since
+    the first text arrived. Each batch is encoded by a single ``encode`` call
+    in a worker process, so neither the GIL nor the event loop is held by the
+    model. With ``workers=0`` batches are encoded on a thread in-process.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        fallback_model_name: str,
+        workers: int = 2,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        self.model_name = model_name
+        self.fallback_model_name = fallback_model_name
+        self.workers = max(0, workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        # Resolved once the model has been loaded
+        self.loaded_model_name: Optional[str] = None
+        self.dimension: Optional[int] = None
+
+        self._executor: Optional[Executor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._running_batches: set = set()
+        self._start_lock = asyncio.Lock()
+        self._started = False
+
+        # Statistics
+        self._batches = 0
+        self._items = 0
+        self._encode_seconds = 0.0
+
+    async def start(self) -> None:
+        """Start the worker pool and the batch collector"""
+        if self._started:
+            return
+
+        async with self._start_lock:
+            if self._started:
+                return
+
+            loop = asyncio.get_running_loop()
+
+            try:
+                if self.workers > 0:
+                    # Spawn (not fork) so workers never inherit torch/asyncio state
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(self.model_name, self.fallback_model_name)
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+                    await loop.run_in_executor(
+                        self._executor, _init_worker, self.model_name, self.fallback_model_name
+                    )
+
+                self.loaded_model_name, self.dimension = await loop.run_in_executor(
+                    self._executor, _describe_worker
+                )
+            except Exception as e:
+                # A failed model load must not leave worker processes behind;
+                # the next start() retries from scratch
+                logger.error("Embedding engine failed to start", error=str(e))
+                if self._executor:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                raise
+
+            self._queue = asyncio.Queue()
+            self._inflight = asyncio.Semaphore(max(1, self.workers))
+            self._batch_task = asyncio.create_task(self._collect_batches())
+            self._started = True
+
+            logger.info(
+                "Embedding engine started",
+                model=self.loaded_model_name,
+                dimensions=self.dimension,
+                workers=self.workers,
+                max_batch_size=self.max_batch_size,
+                max_wait_ms=self.max_wait * 1000
+            )
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed a single text, sharing a forward pass with concurrent callers"""
+        await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed a known list of texts, chunked directly into full batches"""
+        if not texts:
+            return []
+
+        await self.start()
+
+        chunks = [
+            texts[i:i + self.max_batch_size]
+            for i in range(0, len(texts), self.max_batch_size)
+        ]
+        encoded = await asyncio.gather(*(self._encode(chunk) for chunk in chunks))
+
+        return [vector for matrix in encoded for vector in matrix]
+
+    def encode_sync(self, texts: List[str]) -> np.ndarray:
+        """Blocking encode for callers outside the event loop"""
+        if self._executor is None:
+            _init_worker(self.model_name, self.fallback_model_name)
+            return _encode_batch(texts)
+        return self._executor.submit(_encode_batch, texts).result()
+
+    async def _collect_batches(self) -> None:
+        """Drain the request queue into size- and time-bounded batches"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                # Anything already queued joins the batch without waiting
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Bound in-flight batches to the pool size; while we wait here the
+            # queue keeps filling, so the next batch is larger under load
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running_batches.add(task)
+            task.add_done_callback(self._running_batches.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Encode one collected batch and resolve its waiting callers"""
+        try:
+            embeddings = await self._encode([text for text, _ in batch])
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        except Exception as e:
+            logger.error("Embedding batch failed", batch_size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._inflight.release()
+
+    async def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run one encode call on the pool"""
+        start_time = time.perf_counter()
+        embeddings = await asyncio.get_running_loop().run_in_executor(
+            self._executor, _encode_batch, texts
+        )
+
+        self._batches += 1
+        self._items += len(texts)
+        self._encode_seconds += time.perf_counter() - start_time
+
+        return embeddings
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine throughput statistics"""
+        return {
+            "model": self.loaded_model_name,
+            "dimensions": self.dimension,
+            "workers": self.workers,
+            "started": self._started,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "avg_batch_ms": round(self._encode_seconds * 1000 / self._batches, 2) if self._batches else 0.0,
+            "queued": self._queue.qsize() if self._queue else 0
+        }
+
+    async def close(self) -> None:
+        """Stop the batch collector and shut down the worker pool"""
+        if self._batch_task:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+            self._batch_task = None
+
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        self._started = False
+        logger.info("Embedding engine stopped")
+
+# Engine instance shared by all VectorService instances in this process
+_embedding_engine_instance: Optional[EmbeddingEngine] = None
+
+def get_embedding_engine(settings: Settings = None) -> EmbeddingEngine:
+    """Get or create the process-wide embedding engine"""
+    global _embedding_engine_instance
+
+    if _embedding_engine_instance is None:
+        settings = settings or get_settings()
+        _embedding_engine_instance = EmbeddingEngine(
+            model_name=settings.embedding_model_name,
+            fallback_model_name=settings.embedding_fallback_model_name,
+            workers=settings.embedding_workers,
+            max_batch_size=settings.embedding_batch_size,
+            max_wait_ms=settings.embedding_batch_wait_ms
+        )
+
+    return _embedding_engine_instance
+
+async def shutdown_embedding_engine() -> None:
+    """Shut down the process-wide embedding engine if it was created"""
+    global _embedding_engine_instance
+
+    if _embedding_engine_instance is not None:
+        await _embedding_engine_instance.close()
+        _embedding_engine_instance = None
@@ -11,6 +11,7 @@ from collections import defaultdict, Counter
 import networkx as nx
 from neo4j import AsyncGraphDatabase, AsyncSession
 from neo4j.exceptions import ServiceUnavailable, TransientError
+from sqlalchemy import text
 
 from core.dependencies import DatabaseDependencies
 from models.advanced_analytics import (
@@ -18,9 +19,14 @@ from models.advanced_analytics import (
     InsightType, PredictionConfidence
 )
 from models.knowledge import KnowledgeItem
+from services.graph_metrics_engine import GraphMetrics, get_graph_metrics_engine
+from services.knowledge_graph_model import GraphView, get_knowledge_graph_loader
 
 logger = structlog.get_logger(__name__)
 
+# Filter key of the unfiltered knowledge graph
+FULL_GRAPH_KEY = "*|*|*"
+
 
 class GraphAnalyticsService:
     """
@@ -32,26 +38,19 @@ class GraphAnalyticsService:
         self.databases = databases
         self.neo4j = databases.neo4j
         
-        # NetworkX graph for complex analysis
-        self._knowledge_graph = nx.MultiDiGraph()
-        self._last_graph_update = None
-        self._graph_cache = {}
+        # Process-wide graph model, kept in step with Neo4j incrementally;
+        # each analysis works on the cached view for its filter
+        self.graph_loader = get_knowledge_graph_loader()
+        self._graph_view: Optional[GraphView] = None
+        self._graph_filter_key = FULL_GRAPH_KEY
+        self._knowledge_graph = nx.DiGraph()
         
-        # Graph analysis parameters
-        self.centrality_algorithms = {
-            'betweenness': nx.betweenness_centrality,
-            'closeness': nx.closeness_centrality,
-            'eigenvector': nx.eigenvector_centrality,
-            'pagerank': nx.pagerank
-        }
+        # Centrality, communities and structure are computed in a worker
+        # pool once per corpus version and read back from there
+        self.metrics_engine = get_graph_metrics_engine()
         
         # Community detection parameters
-        self.community_resolution = 1.0
         self.min_community_size = 3
-        
-        # Performance optimization
-        self.cache_ttl = timedelta(minutes=30)
-        self.max_graph_size = 10000  # Limit for performance
     
     async def analyze_knowledge_network_structure(
         self, 
@@ -83,43 +82,17 @@ class GraphAnalyticsService:
             num_edges = self._knowledge_graph.number_of_edges()
             density = nx.density(self._knowledge_graph)
             
-            # Convert to undirected for some metrics
-            undirected_graph = self._knowledge_graph.to_undirected()
-            
-            # Connectivity analysis
-            is_connected = nx.is_connected(undirected_graph)
-            num_components = nx.number_connected_components(undirected_graph)
-            largest_component_size = len(max(nx.connected_components(undirected_graph), key=len)) if num_components > 0 else 0
-            
-            # Centrality analysis
-            centrality_metrics = await self._calculate_centrality_metrics(undirected_graph)
-            
-            # Clustering analysis
-            clustering_coefficient = nx.average_clustering(undirected_graph)
-            transitivity = nx.transitivity(undirected_graph)
-            
-            # Path analysis
-            if is_connected and num_nodes > 1:
-                avg_path_length = nx.average_shortest_path_length(undirected_graph)
-                diameter = nx.diameter(undirected_graph)
-            else:
-                avg_path_length = float('inf')
-                diameter = float('inf')
-            
-            # Degree distribution analysis
-            degrees = [d for n, d in undirected_graph.degree()]
-            degree_stats = {
-                'mean': np.mean(degrees) if degrees else 0,
-                'std': np.std(degrees) if degrees else 0,
-                'max': max(degrees) if degrees else 0,
-                'min': min(degrees) if degrees else 0
-            }
+            # Connectivity, centrality, clustering, path and community
+            # metrics over the undirected graph, precomputed per corpus version
+            metrics = await self._graph_metrics()
+            structure = metrics.structure
+            centrality_metrics = metrics.centrality_summary()
+            avg_path_length = structure["average_path_length"]
             
             # Identify hub nodes (high degree centrality)
             hub_nodes = await self._identify_hub_nodes(centrality_metrics)
             
-            # Community detection
-            communities = await self._detect_communities(undirected_graph)
+            communities = metrics.community_groups()
             
             # Network evolution analysis
             evolution_metrics = await self._analyze_network_evolution(time_range)
@@ -129,32 +102,34 @@ class GraphAnalyticsService:
                     "total_nodes": num_nodes,
                     "total_edges": num_edges,
                     "network_density": float(density),
-                    "is_connected": is_connected,
-                    "connected_components": num_components,
-                    "largest_component_size": largest_component_size,
-                    "largest_component_ratio": largest_component_size / num_nodes if num_nodes > 0 else 0
+                    "is_connected": structure["is_connected"],
+                    "connected_components": structure["connected_components"],
+                    "largest_component_size": structure["largest_component_size"],
+                    "largest_component_ratio": structure["largest_component_ratio"]
                 },
                 "structural_metrics": {
-                    "average_clustering_coefficient": float(clustering_coefficient),
-                    "transitivity": float(transitivity),
-                    "average_path_length": float(avg_path_length) if avg_path_length != float('inf') else None,
-                    "network_diameter": diameter if diameter != float('inf') else None,
-                    "degree_statistics": {k: float(v) for k, v in degree_stats.items()}
+                    "average_clustering_coefficient": structure["average_clustering_coefficient"],
+                    "transitivity": structure["transitivity"],
+                    "average_path_length": avg_path_length,
+                    "network_diameter": structure["network_diameter"],
+                    "degree_statistics": structure["degree_statistics"],
+                    "approximate": metrics.approximate
                 },
                 "centrality_analysis": centrality_metrics,
                 "hub_nodes": hub_nodes,
                 "community_structure": {
                     "total_communities": len(communities),
                     "communities": communities,
-                    "modularity": await self._calculate_modularity(undirected_graph, communities)
+                    "modularity": metrics.modularity
                 },
                 "network_evolution": evolution_metrics,
                 "network_health_score": self._calculate_network_health_score({
                     "density": density,
-                    "clustering": clustering_coefficient,
-                    "connectivity": largest_component_ratio,
-                    "avg_path_length": avg_path_length if avg_path_length != float('inf') else 10
+                    "clustering": structure["average_clustering_coefficient"],
+                    "connectivity": structure["largest_component_ratio"],
+                    "avg_path_length": avg_path_length if avg_path_length is not None else 10
                 }),
+                "corpus_version": metrics.corpus_version,
                 "analysis_timestamp": datetime.utcnow().isoformat()
             }
             
@@ -430,13 +405,14 @@ class GraphAnalyticsService:
             if self._knowledge_graph.number_of_nodes() < min_community_size:
                 return {"error": "Insufficient nodes for community detection"}
             
-            # Convert to undirected for community detection
-            undirected_graph = self._knowledge_graph.to_undirected()
+            # Undirected copy cached with the graph view
+            undirected_graph = self._graph_view.undirected
             
             # Apply community detection algorithm
             if algorithm == "louvain":
-                import community as community_louvain
-                communities_dict = community_louvain.best_partition(undirected_graph)
+                # Louvain partition precomputed in the metrics worker pool
+                metrics = await self._graph_metrics()
+                communities_dict = metrics.community_map()
             else:
                 # Fallback to connected components
                 communities_raw = list(nx.connected_components(undirected_graph))
@@ -484,7 +460,7 @@ class GraphAnalyticsService:
             
             # Calculate overall modularity
             if algorithm == "louvain":
-                modularity = community_louvain.modularity(communities_dict, undirected_graph)
+                modularity = metrics.modularity
             else:
                 modularity = self._calculate_basic_modularity(filtered_communities, undirected_graph)
             
@@ -526,35 +502,27 @@ class GraphAnalyticsService:
         project_filter: Optional[str] = None,
         time_range: Optional[Tuple[datetime, datetime]] = None
     ):
-        """Build NetworkX graph from Neo4j knowledge data"""
+        """Load the (cached) knowledge subgraph for a project and time range"""
         try:
-            # Check if graph needs updating
-            if (self._last_graph_update and 
-                datetime.utcnow() - self._last_graph_update < self.cache_ttl and
-                not project_filter):  # Don't use cache for filtered queries
-                return
-            
-            self._knowledge_graph.clear()
-            
-            # Query Neo4j for knowledge items and relationships
-            cypher_query = """
-            MATCH (n:KnowledgeItem)
-            OPTIONAL MATCH (n)-[r]->(m:KnowledgeItem)
-            RETURN n, r, m
-            LIMIT $limit
-            """
-            
-            params = {"limit": self.max_graph_size}
-            
-            # Execute query (mock implementation for now)
-            # In actual implementation, would query Neo4j database
-            
-            # Mock graph construction for demonstration
-            await self._build_mock_knowledge_graph()
-            
-            self._last_graph_update = datetime.utcnow()
+            filter_key = "|".join([
+                project_filter or "*",
+                time_range[0].isoformat() if time_range else "*",
+                time_range[1].isoformat() if time_range else "*"
+            ])
+            
+            resolve_nodes = None
+            if project_filter:
+                async def resolve_nodes():
+                    return await self._project_item_ids(project_filter)
+            
+            self._graph_filter_key = filter_key
+            self._graph_view = await self.graph_loader.view(
+                self.neo4j, filter_key, resolve_nodes, time_range
+            )
+            self._knowledge_graph = self._graph_view.graph
             
             logger.info("Knowledge graph built", 
+                       filter=filter_key,
                        nodes=self._knowledge_graph.number_of_nodes(),
                        edges=self._knowledge_graph.number_of_edges())
             
@@ -562,96 +530,33 @@ class GraphAnalyticsService:
             logger.error("Failed to build knowledge graph", error=str(e))
             raise
     
-    async def _build_mock_knowledge_graph(self):
-        """Build a mock knowledge graph for demonstration"""
-        # Create sample nodes and relationships
-        concepts = [
-            "machine_learning", "data_science", "python", "algorithms", "statistics",
-            "neural_networks", "deep_learning", "classification", "regression", "clustering",
-            "feature_engineering", "model_validation", "hyperparameter_tuning", "deployment",
-            "monitoring", "data_preprocessing", "visualization", "pandas", "scikit_learn", "tensorflow"
-        ]
-        
-        # Add nodes
-        for i, concept in enumerate(concepts):
-            self._knowledge_graph.add_node(f"node_{i}", 
-                                         concept=concept,
-                                         created_at=datetime.utcnow() - timedelta(days=np.random.randint(0, 365)),
-                                         quality_score=np.random.uniform(0.3, 1.0))
-        
-        # Add realistic relationships
-        relationships = [
-            (0, 1, 0.9),   # machine_learning -> data_science
-            (1, 2, 0.8),   # data_science -> python
-            (0, 3, 0.85),  # machine_learning -> algorithms
-            (3, 4, 0.7),   # algorithms -> statistics
-            (0, 5, 0.9),   # machine_learning -> neural_networks
-            (5, 6, 0.95),  # neural_networks -> deep_learning
-            (0, 7, 0.8),   # machine_learning -> classification
-            (0, 8, 0.8),   # machine_learning -> regression
-            (0, 9, 0.75),  # machine_learning -> clustering
-            (1, 10, 0.85), # data_science -> feature_engineering
-            (0, 11, 0.9),  # machine_learning -> model_validation
-            (11, 12, 0.8), # model_validation -> hyperparameter_tuning
-            (0, 13, 0.7),  # machine_learning -> deployment
-            (13, 14, 0.8), # deployment -> monitoring
-            (1, 15, 0.9),  # data_science -> data_preprocessing
-            (1, 16, 0.8),  # data_science -> visualization
-            (2, 17, 0.9),  # python -> pandas
-            (2, 18, 0.85), # python -> scikit_learn
-            (6, 19, 0.9),  # deep_learning -> tensorflow
-        ]
-        
-        for source_idx, target_idx, weight in relationships:
-            self._knowledge_graph.add_edge(
-                f"node_{source_idx}", 
-                f"node_{target_idx}",
-                weight=weight,
-                relationship_type="relates_to",
-                strength=weight
-            )
+    async def _project_item_ids(self, project: str) -> Set[str]:
+        """IDs of live knowledge items in a project, given by id or name"""
+        result = await self.databases.postgres.execute(
+            text("""
+                SELECT ki.id::text AS id
+                FROM knowledge_items ki
+                JOIN projects p ON p.id = ki.project_id
+                WHERE (p.id::text = :project OR p.name = :project)
+                  AND ki.system_time_until IS NULL
+            """),
+            {"project": project}
+        )
+        return {row.id for row in result.fetchall()}
     
-    async def _calculate_centrality_metrics(self, graph) -> Dict[str, Dict[str, float]]:
-        """Calculate various centrality metrics for the graph"""
-        centrality_results = {}
+    async def _graph_metrics(self) -> GraphMetrics:
+        """Precomputed metrics for the current graph view
         
-        try:
-            # Calculate different centrality measures
-            for name, algorithm in self.centrality_algorithms.items():
-                try:
-                    if name == 'eigenvector':
-                        # Eigenvector centrality can be sensitive to disconnected graphs
-                        if nx.is_connected(graph):
-                            centrality_results[name] = algorithm(graph, max_iter=1000)
-                        else:
-                            centrality_results[name] = {node: 0.0 for node in graph.nodes()}
-                    elif name == 'pagerank':
-                        centrality_results[name] = algorithm(graph, alpha=0.85, max_iter=1000)
-                    else:
-                        centrality_results[name] = algorithm(graph)
-                except Exception as centrality_error:
-                    logger.warning(f"Centrality calculation failed for {name}", error=str(centrality_error))
-                    centrality_results[name] = {node: 0.0 for node in graph.nodes()}
-            
-            # Summarize centrality metrics
-            centrality_summary = {}
-            for metric_name, values in centrality_results.items():
-                if values:
-                    centrality_summary[metric_name] = {
-                        "mean": float(np.mean(list(values.values()))),
-                        "std": float(np.std(list(values.values()))),
-                        "max": float(max(values.values())),
-                        "top_nodes": sorted([
-                            {"node": node, "score": score} 
-                            for node, score in values.items()
-                        ], key=lambda x: x["score"], reverse=True)[:5]
-                    }
-            
-            return centrality_summary
-            
-        except Exception as e:
-            logger.error("Centrality calculation failed", error=str(e))
-            return {}
+        Whole-graph results are shared through Neo4j node properties;
+        filtered views are cached in-process only.
+        """
+        driver = self.neo4j if self._graph_filter_key == FULL_GRAPH_KEY else None
+        return await self.metrics_engine.metrics(
+            self._graph_view,
+            self.graph_loader.corpus_version,
+            self._graph_filter_key,
+            driver
+        )
     
     def _calculate_network_health_score(self, metrics: Dict[str, float]) -> float:
         """Calculate overall network health score based on multiple metrics"""
@@ -0,0 +1,464 @@
+# ABOUTME: Graph metrics engine for BETTY Memory System knowledge graph analytics
+# ABOUTME: Computes centrality, Louvain communities and structure in a process pool and persists them per corpus version
+
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import structlog
+import numpy as np
+import networkx as nx
+
+from core.config import Settings, get_settings
+from services.knowledge_graph_model import GraphView
+
+logger = structlog.get_logger(__name__)
+
+CENTRALITY_METRICS = ("betweenness", "closeness", "eigenvector", "pagerank")
+PAGERANK_ALPHA = 0.85
+PERSIST_BATCH_SIZE = 1000
+RANDOM_STATE = 42
+# Scope of the summary node holding whole-graph results in Neo4j
+METRICS_SCOPE = "knowledge"
+
+PERSIST_NODES_QUERY = """
+UNWIND $rows AS row
+MATCH (n:KnowledgeItem {id: row.id})
+SET n.betweenness = row.betweenness,
+    n.closeness = row.closeness,
+    n.eigenvector = row.eigenvector,
+    n.pagerank = row.pagerank,
+    n.community = row.community,
+    n.metrics_version = $version
+"""
+
+PERSIST_SUMMARY_QUERY = """
+MERGE (m:GraphMetrics {scope: $scope})
+SET m.version = $version,
+    m.modularity = $modularity,
+    m.structure = $structure,
+    m.approximate = $approximate,
+    m.computed_at = datetime()
+"""
+
+LOAD_SUMMARY_QUERY = """
+MATCH (m:GraphMetrics {scope: $scope})
+RETURN m.version AS version, m.modularity AS modularity,
+       m.structure AS structure, m.approximate AS approximate
+"""
+
+LOAD_NODES_QUERY = """
+MATCH (n:KnowledgeItem)
+WHERE n.metrics_version IS NOT NULL
+RETURN n.id AS id, n.metrics_version AS version, n.betweenness AS betweenness,
+       n.closeness AS closeness, n.eigenvector AS eigenvector,
+       n.pagerank AS pagerank, n.community AS community
+"""
+
+@dataclass
+class GraphMetrics:
+    """Per-node centrality scores and community labels aligned with node_ids"""
+    scores: Dict[str, np.ndarray]
+    communities: np.ndarray
+    modularity: float
+    structure: Dict[str, Any] = field(default_factory=dict)
+    # True when betweenness, closeness and path lengths were estimated from sampled sources
+    approximate: bool = False
+    compute_seconds: float = 0.0
+    node_ids: List[str] = field(default_factory=list)
+    corpus_version: Optional[str] = None
+
+    def centrality_summary(self, top: int = 5) -> Dict[str, Dict[str, Any]]:
+        """Mean, spread and top nodes for each centrality metric"""
+        summary = {}
+        for name, values in self.scores.items():
+            if not len(values):
+                continue
+            best = np.argsort(-values, kind="stable")[:top]
+            summary[name] = {
+                "mean": float(values.mean()),
+                "std": float(values.std()),
+                "max": float(values.max()),
+                "top_nodes": [{"node": self.node_ids[i], "score": float(values[i])} for i in best.tolist()],
+                "approximate": self.approximate and name in ("betweenness", "closeness")
+            }
+        return summary
+
+    def community_map(self) -> Dict[str, int]:
+        """Community label for each node id"""
+        return dict(zip(self.node_ids, self.communities.tolist()))
+
+    def community_groups(self) -> List[List[str]]:
+        """Node ids per community, largest first"""
+        groups: Dict[int, List[str]] = {}
+        for node_id, label in zip(self.node_ids, self.communities.tolist()):
+            groups.setdefault(label, []).append(node_id)
+        return sorted(groups.values(), key=len, reverse=True)
+
+def _sampled_distances(graph: nx.Graph, samples: int):
+    """BFS from sampled sources: per-node distance sums and reach counts plus path statistics"""
+    count = graph.number_of_nodes()
+    rng = np.random.default_rng(RANDOM_STATE)
+    sources = rng.choice(count, size=min(samples, count), replace=False)
+
+    distance_sums = np.zeros(count)
+    reached = np.zeros(count)
+    total = pairs = longest = 0
+    for source in sources.tolist():
+        lengths = nx.single_source_shortest_path_length(graph, source)
+        nodes = np.fromiter(lengths.keys(), dtype=np.int64, count=len(lengths))
+        distances = np.fromiter(lengths.values(), dtype=np.float64, count=len(lengths))
+        distance_sums[nodes] += distances
+        reached[nodes] += distances > 0
+        total += distances.sum()
+        pairs += len(distances) - 1
+        longest = max(longest, int(distances.max()))
+    return distance_sums, reached, len(sources), (total / pairs if pairs else 0.0), longest
+
+def compute_graph_metrics(
+    node_count: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    pagerank_start: Optional[np.ndarray],
+    exact_node_limit: int,
+    samples: int,
+    resolution: float
+) -> GraphMetrics:
+    """Centrality, Louvain communities and structural statistics of the
+    undirected graph over nodes 0..node_count-1 (runs in a pool worker)
+
+    Above exact_node_limit nodes, betweenness uses k-sample approximation
+    and closeness, average path length and diameter are estimated from BFS
+    out of the same number of sampled sources. pagerank_start holds the
+    previous scores per node (NaN for new nodes) to warm-start the power
+    iteration.
+    """
+    start_time = time.perf_counter()
+    graph = nx.Graph()
+    graph.add_nodes_from(range(node_count))
+    graph.add_weighted_edges_from(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+
+    approximate = node_count > exact_node_limit
+    components = list(nx.connected_components(graph)) if node_count else []
+    is_connected = len(components) == 1
+    scores: Dict[str, np.ndarray] = {}
+    avg_path_length = diameter = None
+
+    def as_array(values: Dict[int, float]) -> np.ndarray:
+        array = np.zeros(node_count)
+        array[list(values.keys())] = list(values.values())
+        return array
+
+    if node_count:
+        scores["betweenness"] = as_array(nx.betweenness_centrality(
+            graph, k=min(samples, node_count) if approximate else None, seed=RANDOM_STATE
+        ))
+
+        if approximate:
+            distance_sums, reached, sampled, avg_path_length, diameter = _sampled_distances(graph, samples)
+            # Eppstein-Wang estimate with the Wasserman-Faust scaling nx uses for disconnected graphs
+            closeness = np.zeros(node_count)
+            np.divide(reached * reached, distance_sums * sampled, out=closeness, where=distance_sums > 0)
+            scores["closeness"] = closeness
+        else:
+            scores["closeness"] = as_array(nx.closeness_centrality(graph))
+            avg_path_length = nx.average_shortest_path_length(graph) if is_connected and node_count > 1 else None
+            diameter = nx.diameter(graph) if is_connected and node_count > 1 else None
+
+        # Eigenvector centrality is ill-defined on disconnected graphs
+        scores["eigenvector"] = np.zeros(node_count)
+        if is_connected and node_count > 1:
+            try:
+                scores["eigenvector"] = as_array(nx.eigenvector_centrality_numpy(graph))
+            except Exception as error:
+                logger.warning("Eigenvector centrality failed", error=str(error))
+
+        nstart = None
+        if pagerank_start is not None and np.isfinite(pagerank_start).any():
+            fill = np.nanmean(pagerank_start)
+            nstart = dict(enumerate(np.where(np.isfinite(pagerank_start), pagerank_start, fill).tolist()))
+        scores["pagerank"] = as_array(nx.pagerank(graph, alpha=PAGERANK_ALPHA, max_iter=1000, nstart=nstart))
+
+    communities = np.zeros(node_count, dtype=np.int64)
+    modularity = 0.0
+    if graph.number_of_edges():
+        partition = nx.community.louvain_communities(graph, resolution=resolution, seed=RANDOM_STATE)
+        for label, members in enumerate(sorted(partition, key=len, reverse=True)):
+            communities[list(members)] = label
+        modularity = nx.community.modularity(graph, partition, resolution=resolution)
+    elif node_count:
+        communities = np.arange(node_count)
+
+    degrees = np.fromiter((degree for _, degree in graph.degree()), dtype=np.float64, count=node_count)
+    largest = max((len(component) for component in components), default=0)
+    structure = {
+        "is_connected": is_connected,
+        "connected_components": len(components),
+        "largest_component_size": largest,
+        "largest_component_ratio": largest / node_count if node_count else 0.0,
+        "average_clustering_coefficient": float(nx.average_clustering(graph)) if node_count else 0.0,
+        "transitivity": float(nx.transitivity(graph)),
+        "average_path_length": float(avg_path_length) if is_connected and avg_path_length is not None else None,
+        "network_diameter": int(diameter) if is_connected and diameter is not None else None,
+        "degree_statistics": {
+            "mean": float(degrees.mean()) if node_count else 0.0,
+            "std": float(degrees.std()) if node_count else 0.0,
+            "max": float(degrees.max()) if node_count else 0.0,
+            "min": float(degrees.min()) if node_count else 0.0
+        }
+    }
+
+    return GraphMetrics(
+        scores=scores,
+        communities=communities,
+        modularity=float(modularity),
+        structure=structure,
+        approximate=approximate,
+        compute_seconds=time.perf_counter() - start_time
+    )
+
+class GraphMetricsEngine:
+    """Computes graph metrics off the event loop and serves them per corpus version
+
+    Results are cached per graph filter and reused until the corpus
+    version changes. Whole-graph results are also written back to Neo4j
+    as KnowledgeItem properties tagged with the corpus version, so other
+    processes and restarts read them instead of recomputing. Each new
+    computation warm-starts PageRank from the previous scores.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        exact_node_limit: int = 2000,
+        betweenness_samples: int = 64,
+        resolution: float = 1.0,
+        cache_size: int = 32
+    ):
+        self.workers = max(0, workers)
+        self.exact_node_limit = max(1, exact_node_limit)
+        self.betweenness_samples = max(1, betweenness_samples)
+        self.resolution = resolution
+        self.cache_size = max(1, cache_size)
+
+        self._executor: Optional[Executor] = None
+        self._results: "OrderedDict[str, GraphMetrics]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        # Statistics
+        self._computations = 0
+        self._cache_hits = 0
+        self._persisted_hits = 0
+        self._compute_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                # Spawn (not fork) so workers never inherit asyncio state
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graph-metrics")
+        return self._executor
+
+    async def metrics(self, view: GraphView, corpus_version: str, key: str, driver=None) -> GraphMetrics:
+        """Metrics for a graph view, computed at most once per corpus version
+
+        Pass the Neo4j driver only for the unfiltered graph: its results
+        are read from and persisted to node properties.
+        """
+        cached = self._results.get(key)
+        if cached is not None and cached.corpus_version == corpus_version:
+            self._cache_hits += 1
+            self._results.move_to_end(key)
+            return cached
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._results.get(key)
+            if cached is not None and cached.corpus_version == corpus_version:
+                self._cache_hits += 1
+                return cached
+
+            previous_pagerank = self._pagerank_by_id(cached)
+            if driver is not None:
+                stored, stored_pagerank = await self._load_persisted(driver, view, corpus_version)
+                if stored is not None:
+                    self._persisted_hits += 1
+                    return self._remember(key, stored)
+                previous_pagerank = previous_pagerank or stored_pagerank
+
+            result = await self._compute(view, previous_pagerank)
+            result.node_ids = view.node_ids
+            result.corpus_version = corpus_version
+
+            if driver is not None:
+                try:
+                    await self._persist(driver, result)
+                except Exception as e:
+                    logger.warning("Failed to persist graph metrics", error=str(e))
+
+            return self._remember(key, result)
+
+    async def _compute(self, view: GraphView, previous_pagerank: Optional[Dict[str, float]]) -> GraphMetrics:
+        coo = view.adjacency.tocoo()
+        pagerank_start = None
+        if previous_pagerank:
+            pagerank_start = np.array(
+                [previous_pagerank.get(node_id, np.nan) for node_id in view.node_ids], dtype=np.float64
+            )
+
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(),
+            compute_graph_metrics,
+            len(view.node_ids),
+            coo.row,
+            coo.col,
+            coo.data,
+            pagerank_start,
+            self.exact_node_limit,
+            self.betweenness_samples,
+            self.resolution
+        )
+
+        self._computations += 1
+        self._compute_seconds += result.compute_seconds
+
+        logger.info(
+            "Graph metrics computed",
+            nodes=len(view.node_ids),
+            edges=coo.nnz,
+            approximate=result.approximate,
+            warm_start=pagerank_start is not None,
+            compute_ms=round(result.compute_seconds * 1000, 2)
+        )
+        return result
+
+    def _remember(self, key: str, result: GraphMetrics) -> GraphMetrics:
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.cache_size:
+            evicted, _ = self._results.popitem(last=False)
+            self._locks.pop(evicted, None)
+        return result
+
+    @staticmethod
+    def _pagerank_by_id(result: Optional[GraphMetrics]) -> Optional[Dict[str, float]]:
+        if result is None or "pagerank" not in result.scores:
+            return None
+        return dict(zip(result.node_ids, result.scores["pagerank"].tolist()))
+
+    async def _load_persisted(self, driver, view: GraphView, corpus_version: str):
+        """(metrics, None) when Neo4j holds a full result for corpus_version,
+        else (None, stored pagerank by id) for warm starting"""
+        async with driver.session() as session:
+            result = await session.run(LOAD_SUMMARY_QUERY, scope=METRICS_SCOPE)
+            summary = await result.single()
+
+            result = await session.run(LOAD_NODES_QUERY)
+            rows = {record["id"]: record async for record in result}
+
+        current = summary is not None and summary["version"] == corpus_version
+        if current and all(
+            node_id in rows and rows[node_id]["version"] == corpus_version for node_id in view.node_ids
+        ):
+            ordered = [rows[node_id] for node_id in view.node_ids]
+            metrics = GraphMetrics(
+                scores={
+                    name: np.array([row[name] or 0.0 for row in ordered], dtype=np.float64)
+                    for name in CENTRALITY_METRICS
+                },
+                communities=np.array([row["community"] or 0 for row in ordered], dtype=np.int64),
+                modularity=float(summary["modularity"] or 0.0),
+                structure=json.loads(summary["structure"]) if summary["structure"] else {},
+                approximate=bool(summary["approximate"]),
+                node_ids=view.node_ids,
+                corpus_version=corpus_version
+            )
+            return metrics, None
+
+        stored_pagerank = {
+            node_id: row["pagerank"] for node_id, row in rows.items() if row["pagerank"] is not None
+        }
+        return None, stored_pagerank or None
+
+    async def _persist(self, driver, result: GraphMetrics) -> None:
+        """Write scores as node properties, then the summary that marks the version complete"""
+        columns = {name: result.scores[name].tolist() for name in CENTRALITY_METRICS if name in result.scores}
+        communities = result.communities.tolist()
+
+        async with driver.session() as session:
+            for start in range(0, len(result.node_ids), PERSIST_BATCH_SIZE):
+                stop = start + PERSIST_BATCH_SIZE
+                rows = [
+                    {
+                        "id": node_id,
+                        "community": communities[start + offset],
+                        **{name: values[start + offset] for name, values in columns.items()}
+                    }
+                    for offset, node_id in enumerate(result.node_ids[start:stop])
+                ]
+                write = await session.run(PERSIST_NODES_QUERY, rows=rows, version=result.corpus_version)
+                await write.consume()
+
+            write = await session.run(
+                PERSIST_SUMMARY_QUERY,
+                scope=METRICS_SCOPE,
+                version=result.corpus_version,
+                modularity=result.modularity,
+                structure=json.dumps(result.structure),
+                approximate=result.approximate
+            )
+            await write.consume()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine statistics"""
+        return {
+            "workers": self.workers,
+            "exact_node_limit": self.exact_node_limit,
+            "betweenness_samples": self.betweenness_samples,
+            "computations": self._computations,
+            "cache_hits": self._cache_hits,
+            "persisted_hits": self._persisted_hits,
+            "avg_compute_ms": round(self._compute_seconds * 1000 / self._computations, 2) if self._computations else 0.0
+        }
+
+    async def close(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        logger.info("Graph metrics engine stopped")
+
+# Engine instance shared by all GraphAnalyticsService instances in this process
+_graph_metrics_engine_instance: Optional[GraphMetricsEngine] = None
+
+def get_graph_metrics_engine(settings: Settings = None) -> GraphMetricsEngine:
+    """Get or create the process-wide graph metrics engine"""
+    global _graph_metrics_engine_instance
+
+    if _graph_metrics_engine_instance is None:
+        settings = settings or get_settings()
+        _graph_metrics_engine_instance = GraphMetricsEngine(
+            workers=settings.graph_metrics_workers,
+            exact_node_limit=settings.graph_exact_metrics_nodes,
+            betweenness_samples=settings.graph_betweenness_samples,
+            cache_size=settings.graph_view_cache_size
+        )
+
+    return _graph_metrics_engine_instance
+
+async def shutdown_graph_metrics_engine() -> None:
+    """Shut down the process-wide graph metrics engine if it was created"""
+    global _graph_metrics_engine_instance
+
+    if _graph_metrics_engine_instance is not None:
+        await _graph_metrics_engine_instance.close()
+        _graph_metrics_engine_instance = None
@@ -0,0 +1,74 @@
+# ABOUTME: Result fusion for hybrid (vector + full-text) search in BETTY Memory System
+# ABOUTME: Reciprocal rank fusion and min-max normalized weighted score fusion over ranked legs
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Standard RRF damping constant; larger values flatten the rank curve
+DEFAULT_RRF_K = 60
+
+@dataclass
+class FusedResult:
+    """One candidate after fusion, with per-leg ranks (1-based) and raw scores"""
+    id: str
+    score: float
+    ranks: Dict[str, int] = field(default_factory=dict)
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def best_rank(self) -> int:
+        return min(self.ranks.values()) if self.ranks else 0
+
+def _dedupe(results: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+    """Keep each id's first (best ranked) occurrence"""
+    seen = set()
+    unique = []
+    for item_id, score in results:
+        if item_id not in seen:
+            seen.add(item_id)
+            unique.append((item_id, score))
+    return unique
+
+def _normalize(results: List[Tuple[str, float]]) -> Dict[str, float]:
+    """Min-max normalize one leg's scores into [0, 1]"""
+    if not results:
+        return {}
+    values = [score for _, score in results]
+    low, high = min(values), max(values)
+    if high == low:
+        return {item_id: 1.0 for item_id, _ in results}
+    return {item_id: (score - low) / (high - low) for item_id, score in results}
+
+def fuse_rankings(
+    legs: Dict[str, List[Tuple[str, float]]],
+    method: str = "rrf",
+    weights: Optional[Dict[str, float]] = None,
+    rrf_k: int = DEFAULT_RRF_K
+) -> List[FusedResult]:
+    """Fuse ranked (id, score) lists from several legs into one ranking
+
+    "rrf" scores each id by sum(weight / (rrf_k + rank)) and ignores raw
+    scores, so legs with incomparable scales (cosine vs ts_rank_cd) mix
+    safely. "weighted" min-max normalizes each leg and sums weighted scores.
+    """
+    if method not in ("rrf", "weighted"):
+        raise ValueError(f"Unknown fusion method: {method}")
+
+    weights = weights or {}
+    fused: Dict[str, FusedResult] = {}
+
+    for leg, results in legs.items():
+        weight = weights.get(leg, 1.0)
+        results = _dedupe(results)
+        normalized = _normalize(results) if method == "weighted" else {}
+
+        for rank, (item_id, score) in enumerate(results, start=1):
+            entry = fused.setdefault(item_id, FusedResult(id=item_id, score=0.0))
+            entry.ranks[leg] = rank
+            entry.scores[leg] = score
+            if method == "rrf":
+                entry.score += weight / (rrf_k + rank)
+            else:
+                entry.score += weight * normalized[item_id]
+
+    return sorted(fused.values(), key=lambda entry: (-entry.score, entry.best_rank))
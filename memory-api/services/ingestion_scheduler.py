@@ -0,0 +1,196 @@
+# ABOUTME: Bounded-concurrency scheduler for BETTY ingestion work
+# ABOUTME: Fair per-tenant item slots, per-backend budgets and a priority lane for interactive requests
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import structlog
+
+from core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+BACKENDS = ("postgres", "qdrant", "neo4j", "embedder")
+
+class Priority(IntEnum):
+    """Scheduling lane; lower values are served first"""
+    INTERACTIVE = 0
+    BATCH = 1
+
+@dataclass(frozen=True)
+class JobContext:
+    """Who the current ingestion work is for"""
+    tenant: str
+    priority: Priority
+
+# Work outside a scheduled job (single-item API calls) is interactive
+_job_context: ContextVar[JobContext] = ContextVar(
+    "ingestion_job_context", default=JobContext(tenant="default", priority=Priority.INTERACTIVE)
+)
+
+def current_job() -> JobContext:
+    return _job_context.get()
+
+class FairLimiter:
+    """Semaphore that admits waiters by priority lane, then round-robin by tenant
+
+    Interactive waiters always go first and may use every slot; batch work
+    is admitted only while more than ``reserved`` slots stay free, so a
+    backfill can never fully occupy the resource.
+    """
+
+    def __init__(self, name: str, capacity: int, reserved: int = 0):
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.reserved = min(max(0, reserved), self.capacity - 1)
+        self.in_use = 0
+        self._waiters: Dict[Priority, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+
+    def _admits(self, priority: Priority) -> bool:
+        limit = self.capacity if priority == Priority.INTERACTIVE else self.capacity - self.reserved
+        return self.in_use < limit
+
+    def _has_waiters(self, up_to: Priority) -> bool:
+        return any(self._waiters[priority] for priority in Priority if priority <= up_to)
+
+    async def acquire(self, tenant: str, priority: Priority) -> None:
+        if self._admits(priority) and not self._has_waiters(priority):
+            self.in_use += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].setdefault(tenant, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation
+                self.release()
+            else:
+                self._remove_waiter(priority, tenant, waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def _remove_waiter(self, priority: Priority, tenant: str, waiter: asyncio.Future) -> None:
+        queue = self._waiters[priority].get(tenant)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if not queue:
+            del self._waiters[priority][tenant]
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters: priority lane first, tenants in rotation"""
+        for priority in Priority:
+            tenants = self._waiters[priority]
+            while tenants and self._admits(priority):
+                tenant, queue = next(iter(tenants.items()))
+                waiter = queue.popleft()
+                if queue:
+                    tenants.move_to_end(tenant)
+                else:
+                    del tenants[tenant]
+                if waiter.done():
+                    continue
+                self.in_use += 1
+                waiter.set_result(None)
+            if tenants:
+                # Lower lanes wait until this one drains
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "reserved_for_interactive": self.reserved,
+            "in_use": self.in_use,
+            "waiting": {
+                priority.name.lower(): sum(len(queue) for queue in self._waiters[priority].values())
+                for priority in Priority
+            }
+        }
+
+class IngestionScheduler:
+    """Bounds how much ingestion runs at once and against which backends
+
+    ``run`` takes one item slot for the whole item; inside it, ``backend``
+    takes a slot on each backend only around the calls that use it. Both
+    inherit the tenant and priority of the enclosing job.
+    """
+
+    def __init__(self, max_items: int, backend_limits: Dict[str, int], interactive_reserved: int = 0):
+        self.items = FairLimiter("items", max_items, interactive_reserved)
+        self.backends = {
+            name: FairLimiter(name, backend_limits.get(name, max_items), interactive_reserved)
+            for name in BACKENDS
+        }
+
+    async def run(
+        self,
+        job: Callable[[], Awaitable[T]],
+        tenant: str = "default",
+        priority: Priority = Priority.BATCH
+    ) -> T:
+        """Run one ingestion item once the tenant gets a fair item slot"""
+        await self.items.acquire(tenant, priority)
+        token = _job_context.set(JobContext(tenant=tenant, priority=priority))
+        try:
+            return await job()
+        finally:
+            _job_context.reset(token)
+            self.items.release()
+
+    @asynccontextmanager
+    async def backend(self, *names: str):
+        """Hold a slot on each named backend, acquired in a fixed order"""
+        context = current_job()
+        held = []
+        try:
+            for name in sorted(set(names), key=BACKENDS.index):
+                limiter = self.backends[name]
+                await limiter.acquire(context.tenant, context.priority)
+                held.append(limiter)
+            yield
+        finally:
+            for limiter in reversed(held):
+                limiter.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items": self.items.stats(),
+            "backends": {name: limiter.stats() for name, limiter in self.backends.items()}
+        }
+
+_scheduler_instance: Optional[IngestionScheduler] = None
+
+def get_ingestion_scheduler() -> IngestionScheduler:
+    """Get the process-wide ingestion scheduler"""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        settings = get_settings()
+        _scheduler_instance = IngestionScheduler(
+            max_items=settings.ingestion_max_concurrent_items,
+            backend_limits={
+                "postgres": settings.ingestion_postgres_concurrency,
+                "qdrant": settings.ingestion_qdrant_concurrency,
+                "neo4j": settings.ingestion_neo4j_concurrency,
+                "embedder": settings.ingestion_embedder_concurrency
+            },
+            interactive_reserved=settings.ingestion_interactive_reserved
+        )
+        logger.info("Ingestion scheduler initialized", **_scheduler_instance.stats()["items"])
+    return _scheduler_instance
@@ -26,10 +26,12 @@ from models.ingestion import (
     ToolType
 )
 from models.knowledge import KnowledgeItemCreate, KnowledgeType, SourceType, ConfidenceLevel
+from core.config import get_settings
 from core.dependencies import DatabaseDependencies
 from services.knowledge_service import KnowledgeService
 from services.graphiti_service import GraphitiService
 from services.vector_service import VectorService
+from services.ingestion_scheduler import Priority, get_ingestion_scheduler
 
 logger = structlog.get_logger(__name__)
 
@@ -41,6 +43,23 @@ class IngestionService:
         self.knowledge_service = KnowledgeService(databases)
         self.graphiti_service = GraphitiService(databases)
         self.vector_service = VectorService(databases)
+        self.scheduler = get_ingestion_scheduler()
+        self.progress_interval = get_settings().ingestion_progress_interval
+    
+    async def _create_knowledge_item(self, knowledge_item: KnowledgeItemCreate):
+        """Create a knowledge item within the PostgreSQL, embedder and Qdrant budgets"""
+        async with self.scheduler.backend("postgres", "embedder", "qdrant"):
+            return await self.knowledge_service.create_knowledge_item(knowledge_item)
+    
+    async def _store_embedding(self, *args, **kwargs):
+        """Embed and store within the embedder and Qdrant budgets"""
+        async with self.scheduler.backend("embedder", "qdrant"):
+            return await self.vector_service.generate_and_store_embedding(*args, **kwargs)
+    
+    async def _add_episode(self, episode_data: dict):
+        """Add a Graphiti episode within the Neo4j budget"""
+        async with self.scheduler.backend("neo4j"):
+            return await self.graphiti_service.add_episode(episode_data)
     
     async def ingest_conversation(self, request: ConversationIngestionRequest) -> IngestionResult:
         """Ingest a complete Claude conversation"""
@@ -71,7 +90,7 @@ class IngestionService:
             all_items = [conversation_item] + message_items + decision_items + insight_items
             for item in all_items:
                 if item and item.id:
-                    await self.vector_service.generate_and_store_embedding(
+                    await self._store_embedding(
                         str(item.id),
                         f"{item.title}\n{item.content}",
                         "knowledge",
@@ -85,7 +104,7 @@ class IngestionService:
             
             # 6. Add to Graphiti temporal knowledge graph
             episode_data = self._prepare_conversation_episode_data(request, all_items)
-            graphiti_result = await self.graphiti_service.add_episode(episode_data)
+            graphiti_result = await self._add_episode(episode_data)
             
             if graphiti_result:
                 entities_extracted = len(graphiti_result.get("entities", []))
@@ -149,7 +168,7 @@ class IngestionService:
             all_items = [code_change_item] + file_change_items + pattern_items
             for item in all_items:
                 if item and item.id:
-                    await self.vector_service.generate_and_store_embedding(
+                    await self._store_embedding(
                         str(item.id),
                         f"{item.title}\n{item.content}",
                         "knowledge",
@@ -164,7 +183,7 @@ class IngestionService:
             
             # 5. Add to Graphiti
             episode_data = self._prepare_code_change_episode_data(request, all_items)
-            graphiti_result = await self.graphiti_service.add_episode(episode_data)
+            graphiti_result = await self._add_episode(episode_data)
             
             if graphiti_result:
                 entities_extracted = len(graphiti_result.get("entities", []))
@@ -215,7 +234,7 @@ class IngestionService:
             all_items = [decision_item] + alternative_items
             for item in all_items:
                 if item and item.id:
-                    await self.vector_service.generate_and_store_embedding(
+                    await self._store_embedding(
                         str(item.id),
                         f"{item.title}\n{item.content}",
                         "knowledge",
@@ -229,7 +248,7 @@ class IngestionService:
             
             # 4. Add to Graphiti
             episode_data = self._prepare_decision_episode_data(request, all_items)
-            graphiti_result = await self.graphiti_service.add_episode(episode_data)
+            graphiti_result = await self._add_episode(episode_data)
             
             if graphiti_result:
                 entities_extracted = len(graphiti_result.get("entities", []))
@@ -284,7 +303,7 @@ class IngestionService:
             all_items = [problem_item, solution_item] + verification_items
             for item in all_items:
                 if item and item.id:
-                    await self.vector_service.generate_and_store_embedding(
+                    await self._store_embedding(
                         str(item.id),
                         f"{item.title}\n{item.content}",
                         "knowledge",
@@ -298,7 +317,7 @@ class IngestionService:
             
             # 5. Add to Graphiti
             episode_data = self._prepare_problem_solution_episode_data(request, all_items)
-            graphiti_result = await self.graphiti_service.add_episode(episode_data)
+            graphiti_result = await self._add_episode(episode_data)
             
             if graphiti_result:
                 entities_extracted = len(graphiti_result.get("entities", []))
@@ -343,7 +362,7 @@ class IngestionService:
             
             # 2. Generate embedding
             if tool_item and tool_item.id:
-                await self.vector_service.generate_and_store_embedding(
+                await self._store_embedding(
                     str(tool_item.id),
                     f"{tool_item.title}\n{tool_item.content}",
                     "knowledge",
@@ -360,7 +379,7 @@ class IngestionService:
             # 3. Add to Graphiti (for important tools only)
             if request.tool_usage_data.tool_name in [ToolType.WRITE, ToolType.EDIT, ToolType.MULTIEDIT]:
                 episode_data = self._prepare_tool_usage_episode_data(request, [tool_item])
-                graphiti_result = await self.graphiti_service.add_episode(episode_data)
+                graphiti_result = await self._add_episode(episode_data)
                 
                 if graphiti_result:
                     entities_extracted = len(graphiti_result.get("entities", []))
@@ -394,9 +413,16 @@ class IngestionService:
     async def batch_ingest(
         self, 
         request: BatchIngestionRequest, 
-        batch_id: UUID
+        batch_id: UUID,
+        priority: Priority = Priority.BATCH
     ) -> BatchIngestionResponse:
-        """Process batch ingestion of multiple items"""
+        """Process batch ingestion of multiple items
+        
+        Items run through the shared ingestion scheduler, so a large batch
+        takes its fair share of item and backend slots instead of opening
+        one connection per item. Progress is written to the batch status
+        row as items complete.
+        """
         start_time = time.time()
         
         response = BatchIngestionResponse(
@@ -409,76 +435,85 @@ class IngestionService:
         )
         
         try:
-            # Process all item types concurrently for better performance
-            tasks = []
+            jobs = []
             
             # Conversations
             for conv_req in request.conversations:
-                tasks.append(("conversation", self.ingest_conversation(conv_req)))
+                jobs.append(("conversation", lambda req=conv_req: self.ingest_conversation(req)))
             
             # Code changes
             for code_req in request.code_changes:
-                tasks.append(("code_change", self.ingest_code_change(code_req)))
+                jobs.append(("code_change", lambda req=code_req: self.ingest_code_change(req)))
             
             # Decisions
             for decision_req in request.decisions:
-                tasks.append(("decision", self.ingest_decision(decision_req)))
+                jobs.append(("decision", lambda req=decision_req: self.ingest_decision(req)))
             
             # Problem-solutions
             for ps_req in request.problem_solutions:
-                tasks.append(("problem_solution", self.ingest_problem_solution(ps_req)))
+                jobs.append(("problem_solution", lambda req=ps_req: self.ingest_problem_solution(req)))
             
             # Tool usages
             for tool_req in request.tool_usages:
-                tasks.append(("tool_usage", self.ingest_tool_usage(tool_req)))
+                jobs.append(("tool_usage", lambda req=tool_req: self.ingest_tool_usage(req)))
             
-            response.total_items = len(tasks)
+            response.total_items = len(jobs)
+            await self._store_batch_status(batch_id, request, response, status="processing")
             
-            # Execute all tasks concurrently
-            if tasks:
-                results = await asyncio.gather(
-                    *[task[1] for task in tasks],
-                    return_exceptions=True
-                )
+            tenant = str(request.project_id)
+            outcomes: List[Optional[IngestionResult]] = [None] * len(jobs)
+            progress = {"last_write": time.monotonic(), "writing": False}
+            
+            async def process(index: int, item_type: str, job) -> None:
+                try:
+                    result = await self.scheduler.run(job, tenant=tenant, priority=priority)
+                except Exception as e:
+                    result = IngestionResult(success=False, error_message=str(e))
+                
+                outcomes[index] = result
+                if result.success:
+                    response.successful_items += 1
+                    response.total_knowledge_items_created += result.knowledge_items_created
+                    response.total_entities_extracted += result.entities_extracted
+                    response.total_relationships_created += result.relationships_created
+                    response.total_embeddings_generated += result.embeddings_generated
+                else:
+                    response.failed_items += 1
+                    response.errors.append({
+                        "item_type": item_type,
+                        "index": index,
+                        "error": result.error_message
+                    })
                 
-                # Process results
-                for i, (item_type, result) in enumerate(zip([task[0] for task in tasks], results)):
-                    if isinstance(result, Exception):
-                        response.failed_items += 1
-                        response.errors.append({
-                            "item_type": item_type,
-                            "index": i,
-                            "error": str(result)
-                        })
-                    elif isinstance(result, IngestionResult):
-                        if result.success:
-                            response.successful_items += 1
-                            response.total_knowledge_items_created += result.knowledge_items_created
-                            response.total_entities_extracted += result.entities_extracted
-                            response.total_relationships_created += result.relationships_created
-                            response.total_embeddings_generated += result.embeddings_generated
-                            
-                            # Add to appropriate result list
-                            if item_type == "conversation":
-                                response.conversation_results.append(result)
-                            elif item_type == "code_change":
-                                response.code_change_results.append(result)
-                            elif item_type == "decision":
-                                response.decision_results.append(result)
-                            elif item_type == "problem_solution":
-                                response.problem_solution_results.append(result)
-                            elif item_type == "tool_usage":
-                                response.tool_usage_results.append(result)
-                        else:
-                            response.failed_items += 1
-                            response.errors.append({
-                                "item_type": item_type,
-                                "index": i,
-                                "error": result.error_message
-                            })
-            
-            # Store batch status in PostgreSQL for tracking
-            await self._store_batch_status(batch_id, request, response)
+                # One progress write at a time, at most every progress interval
+                now = time.monotonic()
+                if not progress["writing"] and now - progress["last_write"] >= self.progress_interval:
+                    progress["writing"] = True
+                    progress["last_write"] = now
+                    try:
+                        await self._store_batch_status(batch_id, request, response, status="processing")
+                    finally:
+                        progress["writing"] = False
+            
+            await asyncio.gather(*[
+                process(index, item_type, job) for index, (item_type, job) in enumerate(jobs)
+            ])
+            
+            # Keep per-type results and errors in request order
+            results_by_type = {
+                "conversation": response.conversation_results,
+                "code_change": response.code_change_results,
+                "decision": response.decision_results,
+                "problem_solution": response.problem_solution_results,
+                "tool_usage": response.tool_usage_results
+            }
+            for (item_type, _), result in zip(jobs, outcomes):
+                if result is not None and result.success:
+                    results_by_type[item_type].append(result)
+            response.errors.sort(key=lambda error: error["index"])
+            
+            # Store final batch status in PostgreSQL for tracking
+            await self._store_batch_status(batch_id, request, response, status="completed")
             
             logger.info(
                 "Batch ingestion completed",
@@ -503,6 +538,7 @@ class IngestionService:
                 "item_type": "batch",
                 "error": str(e)
             })
+            await self._store_batch_status(batch_id, request, response, status="failed")
             return response
     
     # Private helper methods for creating knowledge items
@@ -556,7 +592,7 @@ class IngestionService:
             }
         )
         
-        return await self.knowledge_service.create_knowledge_item(knowledge_item)
+        return await self._create_knowledge_item(knowledge_item)
     
     async def _create_message_knowledge_items(self, request: ConversationIngestionRequest):
         """Create knowledge items for important individual messages"""
@@ -596,7 +632,7 @@ class IngestionService:
                     }
                 )
                 
-                item = await self.knowledge_service.create_knowledge_item(knowledge_item)
+                item = await self._create_knowledge_item(knowledge_item)
                 if item:
                     items.append(item)
         
@@ -626,7 +662,7 @@ class IngestionService:
                     }
                 )
                 
-                item = await self.knowledge_service.create_knowledge_item(knowledge_item)
+                item = await self._create_knowledge_item(knowledge_item)
                 if item:
                     items.append(item)
         
@@ -657,7 +693,7 @@ class IngestionService:
                     }
                 )
                 
-                item = await self.knowledge_service.create_knowledge_item(knowledge_item)
+                item = await self._create_knowledge_item(knowledge_item)
                 if item:
                     items.append(item)
         
@@ -734,7 +770,7 @@ class IngestionService:
             }
         )
         
-        return await self.knowledge_service.create_knowledge_item(knowledge_item)
+        return await self._create_knowledge_item(knowledge_item)
     
     async def _create_file_change_knowledge_items(self, request: CodeChangeIngestionRequest):
         """Create knowledge items for individual file changes"""
@@ -797,7 +833,7 @@ class IngestionService:
                 }
             )
             
-            item = await self.knowledge_service.create_knowledge_item(knowledge_item)
+            item = await self._create_knowledge_item(knowledge_item)
             if item:
                 items.append(item)
         
@@ -828,7 +864,7 @@ class IngestionService:
                 }
             )
             
-            item = await self.knowledge_service.create_knowledge_item(knowledge_item)
+            item = await self._create_knowledge_item(knowledge_item)
             if item:
                 items.append(item)
         
@@ -892,7 +928,7 @@ class IngestionService:
             }
         )
         
-        return await self.knowledge_service.create_knowledge_item(knowledge_item)
+        return await self._create_knowledge_item(knowledge_item)
     
     async def _create_alternative_analysis_items(self, request: DecisionIngestionRequest):
         """Create knowledge items for decision alternatives analysis"""
@@ -940,7 +976,7 @@ class IngestionService:
                     }
                 )
                 
-                item = await self.knowledge_service.create_knowledge_item(knowledge_item)
+                item = await self._create_knowledge_item(knowledge_item)
                 if item:
                     items.append(item)
         
@@ -999,7 +1035,7 @@ class IngestionService:
             }
         )
         
-        return await self.knowledge_service.create_knowledge_item(knowledge_item)
+        return await self._create_knowledge_item(knowledge_item)
     
     async def _create_solution_knowledge_item(self, request: ProblemSolutionIngestionRequest):
         """Create solution knowledge item"""
@@ -1060,7 +1096,7 @@ class IngestionService:
             }
         )
         
-        return await self.knowledge_service.create_knowledge_item(knowledge_item)
+        return await self._create_knowledge_item(knowledge_item)
     
     async def _create_verification_knowledge_items(self, request: ProblemSolutionIngestionRequest):
         """Create verification and testing knowledge items"""
@@ -1108,7 +1144,7 @@ class IngestionService:
                 }
             )
             
-            item = await self.knowledge_service.create_knowledge_item(knowledge_item)
+            item = await self._create_knowledge_item(knowledge_item)
             if item:
                 items.append(item)
         
@@ -1192,7 +1228,7 @@ class IngestionService:
             }
         )
         
-        return await self.knowledge_service.create_knowledge_item(knowledge_item)
+        return await self._create_knowledge_item(knowledge_item)
     
     def _prepare_conversation_episode_data(self, request: ConversationIngestionRequest, items: list) -> dict:
         """Prepare episode data for Graphiti from conversation"""
@@ -1277,8 +1313,18 @@ class IngestionService:
             }
         }
     
-    async def _store_batch_status(self, batch_id: UUID, request: BatchIngestionRequest, response: BatchIngestionResponse):
-        """Store batch processing status in PostgreSQL"""
+    async def _store_batch_status(
+        self,
+        batch_id: UUID,
+        request: BatchIngestionRequest,
+        response: BatchIngestionResponse,
+        status: str = "completed"
+    ):
+        """Store or update batch processing status in PostgreSQL
+        
+        Called when a batch starts, periodically while it runs and when it
+        finishes, so get_batch_status shows live progress.
+        """
         try:
             query = """
             INSERT INTO batch_ingestion_status (
@@ -1286,21 +1332,34 @@ class IngestionService:
                 total_items, successful_items, failed_items,
                 status, created_at, metadata
             ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+            ON CONFLICT (batch_id) DO UPDATE SET
+                total_items = EXCLUDED.total_items,
+                successful_items = EXCLUDED.successful_items,
+                failed_items = EXCLUDED.failed_items,
+                status = EXCLUDED.status,
+                metadata = EXCLUDED.metadata
             """
             
-            await self.databases.postgres.execute(
-                query,
-                batch_id,
-                request.session_id,
-                request.project_id,
-                request.user_id,
-                response.total_items,
-                response.successful_items,
-                response.failed_items,
-                "completed",
-                datetime.now(),
-                json.dumps(response.dict(), default=str)
-            )
+            metadata = response.dict() if status != "processing" else {
+                "processed_items": response.successful_items + response.failed_items,
+                "errors": response.errors[-20:]
+            }
+            
+            async with self.scheduler.backend("postgres"):
+                async with self.databases.postgres.raw_connection() as conn:
+                    await conn.execute(
+                        query,
+                        batch_id,
+                        request.session_id,
+                        request.project_id,
+                        request.user_id,
+                        response.total_items,
+                        response.successful_items,
+                        response.failed_items,
+                        status,
+                        datetime.now(),
+                        json.dumps(metadata, default=str)
+                    )
         except Exception as e:
             logger.error("Failed to store batch status", batch_id=str(batch_id), error=str(e))
     
@@ -1315,7 +1374,8 @@ class IngestionService:
             WHERE batch_id = $1
             """
             
-            row = await self.databases.postgres.fetchrow(query, batch_id)
+            async with self.databases.postgres.raw_connection() as conn:
+                row = await conn.fetchrow(query, batch_id)
             if row:
                 return dict(row)
             return None
@@ -1,7 +1,10 @@
 # ABOUTME: JWT token management service for BETTY Memory System
 # ABOUTME: Handles token generation, validation, refresh and blacklisting with Vault integration
 
+import hashlib
+import hmac
 import jwt
+import re
 import secrets
 import structlog
 from datetime import datetime, timedelta, timezone
@@ -18,6 +21,9 @@ from core.config import get_settings
 
 logger = structlog.get_logger(__name__)
 
+API_KEY_ID_BYTES = 8
+_API_KEY_ID_RE = re.compile(rf"^betty_([0-9a-f]{{{API_KEY_ID_BYTES * 2}}})_.+")
+
 class JWTService:
     """JWT token management service with Vault integration"""
     
@@ -288,16 +294,45 @@ class JWTService:
         return self.pwd_context.verify(plain_password, hashed_password)
     
     def generate_api_key(self) -> tuple[str, str]:
-        """Generate API key and return (key, prefix)"""
+        """Generate API key and return (key, prefix)
+        
+        Keys look like betty_<key id>_<secret>; the key id is a unique,
+        non-secret segment used to find the key row with one index probe.
+        """
         # Generate a secure random key
+        key_id = secrets.token_hex(API_KEY_ID_BYTES)
         key_part = secrets.token_urlsafe(48)
         prefix = "betty_"
-        full_key = f"{prefix}{key_part}"
+        full_key = f"{prefix}{key_id}_{key_part}"
         
         return full_key, prefix
     
+    def parse_api_key_id(self, api_key: str) -> Optional[str]:
+        """Extract the key id segment, or None for keys issued without one"""
+        match = _API_KEY_ID_RE.match(api_key or "")
+        return match.group(1) if match else None
+    
+    def api_key_lookup_hash(self, api_key: str, secret: Optional[str] = None) -> str:
+        """Keyed SHA-256 of the full API key, stored as the lookup index
+        
+        Keys carry 48 random bytes, so a fast keyed hash is as strong as
+        bcrypt against guessing and verifies in microseconds.
+        """
+        return hmac.new(
+            (self.settings.api_key_hmac_secret if secret is None else secret).encode("utf-8"),
+            api_key.encode("utf-8"),
+            hashlib.sha256
+        ).hexdigest()
+    
+    def api_key_lookup_hashes(self, api_key: str) -> List[str]:
+        """Lookup hashes under the current secret, then each previous one"""
+        return [self.api_key_lookup_hash(api_key)] + [
+            self.api_key_lookup_hash(api_key, secret)
+            for secret in self.settings.api_key_hmac_previous_secrets
+        ]
+    
     def hash_api_key(self, api_key: str) -> str:
-        """Hash API key for secure storage"""
+        """Hash API key for secure storage (bcrypt, at issuance only)"""
         return self.pwd_context.hash(api_key)
     
     def verify_api_key(self, api_key: str, hashed_key: str) -> bool:
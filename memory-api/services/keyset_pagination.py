@@ -0,0 +1,21 @@
+# ABOUTME: Opaque keyset pagination cursors for listing endpoints
+# ABOUTME: Encodes the (timestamp, id) sort key of the last row so the next page seeks instead of using OFFSET
+
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """Encode the sort key of the last row on a page"""
+    raw = f"{sort_value.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
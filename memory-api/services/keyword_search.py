@@ -0,0 +1,128 @@
+# ABOUTME: Full-text keyword query parsing for BETTY Memory System
+# ABOUTME: Turns search box input into index-backed tsquery and trigram SQL fragments
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+TEXT_SEARCH_CONFIG = "english"
+
+# ts_headline options for result snippets
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MinWords=8, MaxWords=24, FragmentDelimiter= … "
+
+# Tokens stemming would split or mangle: snake_case, dotted/namespaced
+# paths, camelCase and calls, e.g. get_user_by_id, os.path, useEffect, C++
+_IDENTIFIER_RE = re.compile(r"[_./:#+]|[a-z][A-Z]|\w\(|\d[A-Za-z]|[A-Za-z]\d")
+_TOKEN_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+_LEXEME_RE = re.compile(r"[^\w]+")
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so identifiers match literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+@dataclass
+class KeywordQuery:
+    """Parsed keyword query
+
+    websearch holds everything websearch_to_tsquery understands natively:
+    plain terms, "quoted phrases", OR and -negation. Prefix terms (auth*)
+    become to_tsquery prefix matches, and code identifiers are matched
+    literally through the trigram indexes instead of the stemmer.
+    """
+    raw: str
+    websearch: str = ""
+    prefixes: List[str] = field(default_factory=list)
+    identifiers: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.websearch or self.prefixes or self.identifiers)
+
+    @property
+    def has_text_query(self) -> bool:
+        return bool(self.websearch or self.prefixes)
+
+    def tsquery_sql(self, param_prefix: str = "kw") -> Optional[str]:
+        """SQL tsquery expression for the full-text part, or None"""
+        parts = []
+        if self.websearch:
+            parts.append(f"websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :{param_prefix}_websearch)")
+        if self.prefixes:
+            parts.append(f"to_tsquery('{TEXT_SEARCH_CONFIG}', :{param_prefix}_prefix)")
+        return " && ".join(parts) if parts else None
+
+    def identifier_match_sql(self, columns: List[str], param_prefix: str = "kw") -> Optional[str]:
+        """SQL requiring every identifier to appear literally in one of columns"""
+        if not self.identifiers:
+            return None
+        clauses = []
+        for i in range(len(self.identifiers)):
+            clauses.append("(" + " OR ".join(
+                f"{column} ILIKE :{param_prefix}_ident_{i}" for column in columns
+            ) + ")")
+        return " AND ".join(clauses)
+
+    def identifier_rank_sql(self, title_column: str, param_prefix: str = "kw") -> str:
+        """Rank contribution of literal identifier matches (title hits weigh most)"""
+        if not self.identifiers:
+            return "0"
+        return " + ".join(
+            f"CASE WHEN {title_column} ILIKE :{param_prefix}_ident_{i} THEN 0.5 ELSE 0.1 END"
+            for i in range(len(self.identifiers))
+        )
+
+    def params(self, param_prefix: str = "kw") -> Dict[str, Any]:
+        """Bind parameters for the SQL fragments"""
+        params: Dict[str, Any] = {}
+        if self.websearch:
+            params[f"{param_prefix}_websearch"] = self.websearch
+        if self.prefixes:
+            params[f"{param_prefix}_prefix"] = " & ".join(self.prefixes)
+        for i, identifier in enumerate(self.identifiers):
+            params[f"{param_prefix}_ident_{i}"] = f"%{_escape_like(identifier)}%"
+        return params
+
+def parse_keyword_query(raw: str) -> KeywordQuery:
+    """Split raw search input into websearch, prefix and identifier parts"""
+    query = KeywordQuery(raw=raw or "")
+    websearch_parts: List[str] = []
+
+    for match in _TOKEN_RE.finditer(query.raw):
+        negated, phrase, word = match.groups()
+
+        if phrase is not None:
+            if phrase.strip():
+                websearch_parts.append(f'{negated}"{phrase.strip()}"')
+            continue
+
+        if word.upper() == "OR":
+            websearch_parts.append("OR")
+            continue
+
+        is_negated = word.startswith("-") and len(word) > 1
+        term = word[1:] if is_negated else word
+
+        if term.endswith("*") and len(term) > 1:
+            lexemes = [lexeme for lexeme in _LEXEME_RE.split(term.rstrip("*")) if lexeme]
+            if lexemes:
+                # Only the last lexeme is a prefix: "next.rou*" -> next & rou:*
+                pieces = lexemes[:-1] + [f"{lexemes[-1]}:*"]
+                expression = " & ".join(pieces)
+                query.prefixes.append(f"!({expression})" if is_negated else expression)
+            continue
+
+        identifier = term.strip(",;:!?").rstrip(".")
+        if not is_negated and _IDENTIFIER_RE.search(identifier):
+            query.identifiers.append(identifier)
+            continue
+
+        websearch_parts.append(word)
+
+    # A dangling OR would make websearch_to_tsquery drop the whole clause
+    while websearch_parts and websearch_parts[-1] == "OR":
+        websearch_parts.pop()
+    while websearch_parts and websearch_parts[0] == "OR":
+        websearch_parts.pop(0)
+
+    query.websearch = " ".join(websearch_parts)
+    return query
@@ -0,0 +1,497 @@
+# ABOUTME: Process-wide in-memory model of the Neo4j knowledge graph for graph analytics
+# ABOUTME: Pages KnowledgeItem nodes and edges out of Neo4j into CSR adjacency and applies incremental deltas since a watermark
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import structlog
+import numpy as np
+import networkx as nx
+from scipy.sparse import csr_matrix
+
+from core.config import Settings, get_settings
+
+logger = structlog.get_logger(__name__)
+
+# Deltas re-read this far behind the watermark so writes committed out of
+# timestamp order are not missed; re-applying a change is harmless
+DELTA_OVERLAP = timedelta(seconds=60)
+
+FULL_PAGE_QUERY = """
+MATCH (n:KnowledgeItem)
+WHERE $after IS NULL OR n.id > $after
+WITH n ORDER BY n.id LIMIT $limit
+OPTIONAL MATCH (n)-[r]->(m:KnowledgeItem)
+RETURN n.id AS id, n.title AS title, n.knowledge_type AS knowledge_type,
+       n.created_at AS created_at, coalesce(n.updated_at, n.created_at) AS changed_at,
+       collect(CASE WHEN r IS NULL THEN NULL ELSE {
+           key: elementId(r), target: m.id, type: type(r),
+           weight: coalesce(r.strength, r.weight, 0.5),
+           changed_at: coalesce(r.updated_at, r.created_at)
+       } END) AS edges
+ORDER BY id
+"""
+
+DELTA_NODES_QUERY = """
+MATCH (n:KnowledgeItem)
+WITH n, coalesce(n.updated_at, n.created_at) AS changed_at
+WHERE $since IS NULL OR changed_at > $since OR (changed_at = $since AND n.id > $after)
+RETURN n.id AS id, n.title AS title, n.knowledge_type AS knowledge_type,
+       n.created_at AS created_at, changed_at
+ORDER BY changed_at, id
+LIMIT $limit
+"""
+
+DELTA_EDGES_QUERY = """
+MATCH (a:KnowledgeItem)-[r]->(b:KnowledgeItem)
+WITH a, r, b, coalesce(r.updated_at, r.created_at) AS changed_at
+WHERE $since IS NULL OR changed_at > $since OR (changed_at = $since AND elementId(r) > $after)
+RETURN elementId(r) AS key, a.id AS source, b.id AS target, type(r) AS type,
+       coalesce(r.strength, r.weight, 0.5) AS weight, changed_at
+ORDER BY changed_at, key
+LIMIT $limit
+"""
+
+COUNT_QUERY = """
+MATCH (n:KnowledgeItem)
+WITH count(n) AS nodes
+OPTIONAL MATCH (:KnowledgeItem)-[r]->(:KnowledgeItem)
+RETURN nodes, count(r) AS edges
+"""
+
+def _native(value: Any) -> Any:
+    """Neo4j temporal values as Python datetimes"""
+    return value.to_native() if hasattr(value, "to_native") else value
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timezone-aware UTC datetime; naive values are taken to be UTC already"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+class KnowledgeGraphModel:
+    """Compact knowledge graph: a node index with per-node attributes and
+    edges keyed by relationship id, compiled on demand into sorted edge
+    arrays and a CSR adjacency matrix.
+
+    Parallel relationships between the same two nodes collapse to one edge
+    carrying the strongest weight.
+    """
+
+    def __init__(self):
+        self.node_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.titles: List[Optional[str]] = []
+        self.knowledge_types: List[Optional[str]] = []
+        self.created_at: List[Optional[datetime]] = []
+        self._edges: Dict[str, Tuple[int, int, float, str]] = {}
+        self._compiled: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        # Bumped on every change; views and caches compare against it
+        self.version = 0
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self._edges)
+
+    def clear(self) -> None:
+        self.node_ids, self.index = [], {}
+        self.titles, self.knowledge_types, self.created_at = [], [], []
+        self._edges = {}
+        self._changed()
+
+    def _changed(self) -> None:
+        self._compiled = None
+        self.version += 1
+
+    def _node(self, node_id: str) -> int:
+        """Index of a node, adding an attribute-less placeholder if unknown"""
+        position = self.index.get(node_id)
+        if position is None:
+            position = len(self.node_ids)
+            self.index[node_id] = position
+            self.node_ids.append(node_id)
+            self.titles.append(None)
+            self.knowledge_types.append(None)
+            self.created_at.append(None)
+        return position
+
+    def upsert_nodes(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Add or update nodes from rows with id, title, knowledge_type, created_at
+
+        Returns how many nodes were new or changed; unchanged rows leave
+        the version alone so re-read deltas keep cached views valid.
+        """
+        count = 0
+        for row in rows:
+            known = row["id"] in self.index
+            position = self._node(row["id"])
+            values = (row.get("title"), row.get("knowledge_type"), _native(row.get("created_at")))
+            if known and values == (self.titles[position], self.knowledge_types[position], self.created_at[position]):
+                continue
+            self.titles[position], self.knowledge_types[position], self.created_at[position] = values
+            count += 1
+        if count:
+            self._changed()
+        return count
+
+    def upsert_edges(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Add or update edges from rows with key, source, target, type, weight
+
+        Returns how many edges were new or changed.
+        """
+        count = 0
+        for row in rows:
+            edge = (
+                self._node(row["source"]),
+                self._node(row["target"]),
+                float(row.get("weight") if row.get("weight") is not None else 0.5),
+                row.get("type") or "RELATES_TO"
+            )
+            if self._edges.get(row["key"]) == edge:
+                continue
+            self._edges[row["key"]] = edge
+            count += 1
+        if count:
+            self._changed()
+        return count
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(sources, targets, weights, types) sorted by (source, target), one entry per node pair"""
+        if self._compiled is None:
+            if self._edges:
+                sources, targets, weights, types = zip(*self._edges.values())
+                sources = np.asarray(sources, dtype=np.int64)
+                targets = np.asarray(targets, dtype=np.int64)
+                weights = np.asarray(weights, dtype=np.float64)
+                types = np.asarray(types, dtype=object)
+                # Strongest first within each pair, then keep the first of each pair
+                order = np.lexsort((-weights, targets, sources))
+                sources, targets, weights, types = sources[order], targets[order], weights[order], types[order]
+                first = np.ones(len(sources), dtype=bool)
+                first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+                self._compiled = (sources[first], targets[first], weights[first], types[first])
+            else:
+                empty = np.empty(0, dtype=np.int64)
+                self._compiled = (empty, empty, np.empty(0, dtype=np.float64), np.empty(0, dtype=object))
+        return self._compiled
+
+    def adjacency(self, nodes: Optional[np.ndarray] = None) -> Tuple[csr_matrix, np.ndarray]:
+        """Weighted CSR adjacency of the subgraph induced by nodes (all nodes by default)
+
+        Returns the matrix and the model indices of its rows, in order.
+        """
+        sources, targets, weights, _ = self.edge_arrays()
+        size = self.number_of_nodes
+        if nodes is None:
+            nodes = np.arange(size)
+            return csr_matrix((weights, (sources, targets)), shape=(size, size)), nodes
+
+        local = np.full(size, -1, dtype=np.int64)
+        local[nodes] = np.arange(len(nodes))
+        keep = (local[sources] >= 0) & (local[targets] >= 0)
+        matrix = csr_matrix(
+            (weights[keep], (local[sources[keep]], local[targets[keep]])),
+            shape=(len(nodes), len(nodes))
+        )
+        return matrix, nodes
+
+    def select(
+        self,
+        node_ids: Optional[Set[str]] = None,
+        time_range: Optional[Tuple[datetime, datetime]] = None
+    ) -> np.ndarray:
+        """Model indices of nodes in node_ids (all when None) created within time_range
+
+        Naive bounds and creation times are read as UTC, so utcnow()-based
+        ranges compare with the timezone-aware times Neo4j returns.
+        """
+        if node_ids is None:
+            selected = np.arange(self.number_of_nodes)
+        else:
+            selected = np.array(sorted(self.index[node_id] for node_id in node_ids if node_id in self.index), dtype=np.int64)
+
+        if time_range is not None:
+            start, end = _utc(time_range[0]), _utc(time_range[1])
+            selected = np.array([
+                position for position in selected
+                if self.created_at[position] is not None and start <= _utc(self.created_at[position]) <= end
+            ], dtype=np.int64)
+        return selected
+
+    def to_networkx(self, nodes: Optional[np.ndarray] = None) -> nx.DiGraph:
+        """NetworkX view of the subgraph induced by nodes, keyed by knowledge item id"""
+        sources, targets, weights, types = self.edge_arrays()
+        if nodes is None:
+            nodes = np.arange(self.number_of_nodes)
+            keep = np.ones(len(sources), dtype=bool)
+        else:
+            member = np.zeros(self.number_of_nodes, dtype=bool)
+            member[nodes] = True
+            keep = member[sources] & member[targets]
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(
+            (
+                self.node_ids[position],
+                {
+                    "concept": self.titles[position] or "",
+                    "knowledge_type": self.knowledge_types[position],
+                    "created_at": self.created_at[position]
+                }
+            )
+            for position in nodes.tolist()
+        )
+        graph.add_edges_from(
+            (
+                self.node_ids[source],
+                self.node_ids[target],
+                {"weight": weight, "strength": weight, "relationship_type": relationship_type}
+            )
+            for source, target, weight, relationship_type in zip(
+                sources[keep].tolist(), targets[keep].tolist(), weights[keep].tolist(), types[keep].tolist()
+            )
+        )
+        return graph
+
+@dataclass
+class GraphView:
+    """A filtered subgraph materialized for one model version"""
+    version: int
+    nodes: np.ndarray
+    node_ids: List[str]
+    adjacency: csr_matrix
+    graph: nx.DiGraph
+
+    @cached_property
+    def undirected(self) -> nx.Graph:
+        """Undirected copy of graph, built once per view"""
+        return self.graph.to_undirected()
+
+class KnowledgeGraphLoader:
+    """Keeps a KnowledgeGraphModel in step with Neo4j
+
+    The first load pages every KnowledgeItem and its outgoing edges out in
+    batches. Later refreshes (at most every refresh_interval seconds) only
+    read nodes and edges created or updated since the watermark; when the
+    node or edge counts then disagree with Neo4j something was deleted and
+    the graph is reloaded in full, as it also is every full_reload_interval.
+    Filtered views are cached per filter until the model changes.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 5000,
+        refresh_interval: float = 30.0,
+        full_reload_interval: float = 3600.0,
+        view_cache_size: int = 32
+    ):
+        self.model = KnowledgeGraphModel()
+        self.batch_size = max(1, batch_size)
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self.view_cache_size = max(1, view_cache_size)
+
+        self.watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._last_full_load = 0.0
+        self._lock = asyncio.Lock()
+        self._views: "OrderedDict[str, GraphView]" = OrderedDict()
+
+        # Statistics
+        self._full_loads = 0
+        self._delta_loads = 0
+
+    @property
+    def corpus_version(self) -> str:
+        """Identifies the loaded graph state identically in every process"""
+        watermark = int(self.watermark.timestamp() * 1_000_000) if self.watermark else 0
+        return f"{self.model.number_of_nodes}-{self.model.number_of_edges}-{watermark}"
+
+    async def refresh(self, driver, force: bool = False) -> KnowledgeGraphModel:
+        """Bring the model up to date with Neo4j if it is due"""
+        if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return self.model
+
+        async with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return self.model
+
+            if not self._full_loads or now - self._last_full_load >= self.full_reload_interval:
+                await self._load_full(driver)
+            else:
+                await self._load_delta(driver)
+                if not await self._counts_match(driver):
+                    logger.info("Knowledge graph lost nodes or edges, reloading")
+                    await self._load_full(driver)
+
+            self._last_refresh = time.monotonic()
+            return self.model
+
+    async def view(
+        self,
+        driver,
+        filter_key: str,
+        resolve_nodes: Optional[Callable[[], Awaitable[Optional[Set[str]]]]] = None,
+        time_range: Optional[Tuple[datetime, datetime]] = None
+    ) -> GraphView:
+        """Refresh the model and return the (cached) subgraph for a filter
+
+        resolve_nodes is only awaited on a cache miss and returns the node
+        ids the filter admits (None for all).
+        """
+        model = await self.refresh(driver)
+
+        cached = self._views.get(filter_key)
+        if cached is not None and cached.version == model.version:
+            self._views.move_to_end(filter_key)
+            return cached
+
+        node_ids = await resolve_nodes() if resolve_nodes else None
+        nodes = None
+        if node_ids is not None or time_range is not None:
+            nodes = model.select(node_ids, time_range)
+        adjacency, nodes = model.adjacency(nodes)
+        view = GraphView(
+            version=model.version,
+            nodes=nodes,
+            node_ids=[model.node_ids[position] for position in nodes.tolist()],
+            adjacency=adjacency,
+            graph=model.to_networkx(nodes)
+        )
+
+        self._views[filter_key] = view
+        self._views.move_to_end(filter_key)
+        while len(self._views) > self.view_cache_size:
+            self._views.popitem(last=False)
+        return view
+
+    async def _load_full(self, driver) -> None:
+        """Page every node with its outgoing edges into a fresh model"""
+        start_time = time.perf_counter()
+        model = KnowledgeGraphModel()
+        # Views compare versions, so the new model continues the sequence
+        model.version = self.model.version
+        watermark = None
+        after = None
+
+        async with driver.session() as session:
+            while True:
+                result = await session.run(FULL_PAGE_QUERY, after=after, limit=self.batch_size)
+                records = [record.data() async for record in result]
+                if not records:
+                    break
+
+                model.upsert_nodes(records)
+                model.upsert_edges(
+                    {"source": record["id"], **edge}
+                    for record in records
+                    for edge in record["edges"]
+                )
+                for changed_at in [record["changed_at"] for record in records] + [
+                    edge["changed_at"] for record in records for edge in record["edges"]
+                ]:
+                    changed_at = _native(changed_at)
+                    if changed_at is not None and (watermark is None or changed_at > watermark):
+                        watermark = changed_at
+
+                after = records[-1]["id"]
+                if len(records) < self.batch_size:
+                    break
+
+        model._changed()
+        self.model = model
+        self.watermark = watermark
+        self._last_full_load = time.monotonic()
+        self._full_loads += 1
+        self._views.clear()
+
+        logger.info(
+            "Knowledge graph loaded",
+            nodes=model.number_of_nodes,
+            edges=model.number_of_edges,
+            load_ms=round((time.perf_counter() - start_time) * 1000, 2)
+        )
+
+    async def _load_delta(self, driver) -> None:
+        """Apply nodes and edges changed since the watermark"""
+        since = self.watermark - DELTA_OVERLAP if self.watermark else None
+        watermark = self.watermark
+        nodes = edges = 0
+
+        async with driver.session() as session:
+            for query, apply, key in (
+                (DELTA_NODES_QUERY, self.model.upsert_nodes, "id"),
+                (DELTA_EDGES_QUERY, self.model.upsert_edges, "key")
+            ):
+                page_since, after = since, ""
+                while True:
+                    result = await session.run(query, since=page_since, after=after, limit=self.batch_size)
+                    records = [record.data() async for record in result]
+                    if not records:
+                        break
+
+                    applied = apply(records)
+                    if key == "id":
+                        nodes += applied
+                    else:
+                        edges += applied
+
+                    page_since, after = records[-1]["changed_at"], records[-1][key]
+                    last = _native(page_since)
+                    if last is not None and (watermark is None or last > watermark):
+                        watermark = last
+                    if len(records) < self.batch_size:
+                        break
+
+        self.watermark = watermark
+        self._delta_loads += 1
+        if nodes or edges:
+            logger.info("Knowledge graph delta applied", nodes=nodes, edges=edges)
+
+    async def _counts_match(self, driver) -> bool:
+        """Whether Neo4j holds as many nodes and edges as the model"""
+        async with driver.session() as session:
+            result = await session.run(COUNT_QUERY)
+            record = await result.single()
+        return record["nodes"] == self.model.number_of_nodes and record["edges"] == self.model.number_of_edges
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get loader statistics"""
+        return {
+            "nodes": self.model.number_of_nodes,
+            "edges": self.model.number_of_edges,
+            "version": self.model.version,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "full_loads": self._full_loads,
+            "delta_loads": self._delta_loads,
+            "cached_views": len(self._views)
+        }
+
+# Loader shared by all GraphAnalyticsService instances in this process
+_knowledge_graph_loader_instance: Optional[KnowledgeGraphLoader] = None
+
+def get_knowledge_graph_loader(settings: Settings = None) -> KnowledgeGraphLoader:
+    """Get or create the process-wide knowledge graph loader"""
+    global _knowledge_graph_loader_instance
+
+    if _knowledge_graph_loader_instance is None:
+        settings = settings or get_settings()
+        _knowledge_graph_loader_instance = KnowledgeGraphLoader(
+            batch_size=settings.graph_load_batch_size,
+            refresh_interval=settings.graph_refresh_interval,
+            full_reload_interval=settings.graph_full_reload_interval,
+            view_cache_size=settings.graph_view_cache_size
+        )
+
+    return _knowledge_graph_loader_instance
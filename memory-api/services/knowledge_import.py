@@ -0,0 +1,244 @@
+# ABOUTME: Set-based merge of bulk knowledge imports for BETTY Memory System
+# ABOUTME: COPYs a chunk into a temp table and merges it into knowledge_items in one transaction
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from services.content_fingerprint import (
+    DELETE_LSH_BUCKETS_SQL,
+    STORE_SIGNATURE_SQL,
+    compute_content_signature,
+)
+
+IMPORT_COLUMNS = [
+    "ord", "id", "title", "content", "content_hash", "content_fingerprint", "minhash_signature",
+    "knowledge_type", "quality_score", "complexity_level", "session_id", "user_id", "project_id",
+    "metadata"
+]
+
+LSH_BUCKET_COLUMNS = ["band", "bucket", "knowledge_item_id", "project_id"]
+
+CREATE_IMPORT_TABLE_SQL = """
+    CREATE TEMP TABLE knowledge_import (
+        ord INTEGER,
+        id UUID,
+        title TEXT,
+        content TEXT,
+        content_hash VARCHAR(64),
+        content_fingerprint VARCHAR(64),
+        minhash_signature INTEGER[],
+        knowledge_type VARCHAR(100),
+        quality_score REAL,
+        complexity_level VARCHAR(50),
+        session_id UUID,
+        user_id UUID,
+        project_id UUID,
+        metadata JSONB
+    ) ON COMMIT DROP
+"""
+
+# Duplicates within the chunk collapse to their first occurrence
+STAGED_UNIQUE_SQL = """
+    SELECT DISTINCT ON (project_id, content_fingerprint) *
+    FROM (
+        SELECT DISTINCT ON (project_id, content_hash) *
+        FROM knowledge_import
+        ORDER BY project_id, content_hash, ord
+    ) AS by_hash
+    ORDER BY project_id, content_fingerprint, ord
+"""
+
+STAGED_ALL_SQL = "SELECT * FROM knowledge_import ORDER BY ord"
+
+# Existing items are updated with the columns update_knowledge_item writes
+# on the per-item path; tags are stored in metadata
+UPDATE_FINGERPRINT_MATCHES_SQL = f"""
+    UPDATE knowledge_items AS k
+    SET content = i.content,
+        content_hash = i.content_hash,
+        metadata = i.metadata,
+        updated_at = now()
+    FROM ({STAGED_UNIQUE_SQL}) AS i
+    WHERE k.project_id = i.project_id
+      AND k.content_fingerprint = i.content_fingerprint
+      AND k.system_time_until IS NULL
+    RETURNING k.id, k.project_id, k.title, k.content, k.embedding_id
+"""
+
+# Updated items are re-signed and re-embedded from what the merge returns
+_RETURNING = "id, project_id, title, content, embedding_id"
+
+_INSERT_SQL = """
+    INSERT INTO knowledge_items (
+        id, title, content, knowledge_type, quality_score, complexity_level,
+        session_id, user_id, project_id, metadata, content_hash, content_fingerprint,
+        minhash_signature, created_at, updated_at
+    )
+    SELECT
+        i.id, i.title, i.content, i.knowledge_type, i.quality_score, i.complexity_level,
+        i.session_id, i.user_id, i.project_id, i.metadata, i.content_hash, i.content_fingerprint,
+        i.minhash_signature, now(), now()
+    FROM ({staged}) AS i
+    {where}
+    {on_conflict}
+    RETURNING {returning}, (xmax = 0) AS inserted
+"""
+
+_NEW_ONLY = """
+    WHERE NOT EXISTS (
+        SELECT 1 FROM knowledge_items k
+        WHERE k.project_id = i.project_id
+          AND k.content_fingerprint = i.content_fingerprint
+          AND k.system_time_until IS NULL
+    )
+"""
+
+# skip_duplicates without update_existing: existing content is left alone
+INSERT_NEW_SQL = _INSERT_SQL.format(
+    staged=STAGED_UNIQUE_SQL,
+    where=_NEW_ONLY,
+    on_conflict="ON CONFLICT (project_id, content_hash) DO NOTHING",
+    returning=_RETURNING
+)
+
+# skip_duplicates with update_existing: a content_hash collision updates the
+# live item it collided with
+UPSERT_SQL = _INSERT_SQL.format(
+    staged=STAGED_UNIQUE_SQL,
+    where=_NEW_ONLY,
+    on_conflict="""
+        ON CONFLICT (project_id, content_hash) DO UPDATE
+        SET content = EXCLUDED.content,
+            metadata = EXCLUDED.metadata,
+            updated_at = EXCLUDED.updated_at
+        WHERE knowledge_items.system_time_until IS NULL
+    """,
+    returning=_RETURNING
+)
+
+# No duplicate check: every row is attempted, and a row hitting either
+# unique index is reported as failed rather than aborting the chunk
+INSERT_ALL_SQL = _INSERT_SQL.format(
+    staged=STAGED_ALL_SQL,
+    where="",
+    on_conflict="ON CONFLICT DO NOTHING",
+    returning=_RETURNING
+)
+
+REJECTED_ROWS_SQL = """
+    SELECT i.ord, conflict.id AS existing_id
+    FROM knowledge_import i
+    LEFT JOIN LATERAL (
+        SELECT k.id FROM knowledge_items k
+        WHERE k.project_id = i.project_id
+          AND k.id <> i.id
+          AND (k.content_hash = i.content_hash
+               OR (k.content_fingerprint = i.content_fingerprint AND k.system_time_until IS NULL))
+        LIMIT 1
+    ) AS conflict ON true
+    WHERE NOT (i.id = ANY($1::uuid[]))
+    ORDER BY i.ord
+"""
+
+@dataclass
+class ImportMerge:
+    """Outcome of merging one staged chunk"""
+    inserted_ids: Set[UUID]
+    # id, project_id, title, content and embedding_id of existing items updated
+    updated: List[Dict[str, Any]]
+    # (ord, existing item id) of rows rejected as duplicates without skip_duplicates
+    rejected: List[Tuple[int, Optional[UUID]]]
+
+def _import_record(row: Dict[str, Any]) -> Tuple:
+    return (
+        row["ord"], row["id"], row["title"], row["content"], row["content_hash"],
+        row["content_fingerprint"], row["minhash_signature"],
+        row["knowledge_type"], row["quality_score"], row["complexity_level"],
+        UUID(str(row["session_id"])) if row["session_id"] else None,
+        UUID(str(row["user_id"])), UUID(str(row["project_id"])),
+        json.dumps(row["metadata"])
+    )
+
+async def _resign_items(conn, items: List[Dict[str, Any]]) -> None:
+    """Rewrite fingerprint, MinHash signature and LSH buckets of updated items"""
+    if not items:
+        return
+
+    signatures = [compute_content_signature(item["title"], item["content"]) for item in items]
+    await conn.executemany(STORE_SIGNATURE_SQL, [
+        (item["id"], signature.fingerprint, signature.minhash)
+        for item, signature in zip(items, signatures)
+    ])
+    await conn.executemany(DELETE_LSH_BUCKETS_SQL, [(item["id"],) for item in items])
+    await conn.copy_records_to_table(
+        "knowledge_lsh_buckets",
+        records=[
+            (band, bucket, item["id"], item["project_id"])
+            for item, signature in zip(items, signatures)
+            for band, bucket in zip(signature.bands, signature.buckets)
+        ],
+        columns=LSH_BUCKET_COLUMNS
+    )
+
+async def merge_import_chunk(
+    conn,
+    rows: List[Dict[str, Any]],
+    skip_duplicates: bool,
+    update_existing: bool
+) -> ImportMerge:
+    """COPY prepared rows into a temp table and merge them in one transaction
+
+    Follows the per-item path. With skip_duplicates, rows whose normalized
+    fingerprint or (project_id, content_hash) matches a live item are
+    skipped, or with update_existing overwrite that item's content and
+    metadata and have its signature recomputed. Without skip_duplicates
+    every row is inserted, and rows colliding with an existing item or an
+    earlier row of the chunk are rejected individually. LSH buckets of
+    inserted rows are copied in the same transaction.
+    """
+    async with conn.transaction():
+        await conn.execute(CREATE_IMPORT_TABLE_SQL)
+        await conn.copy_records_to_table(
+            "knowledge_import",
+            records=[_import_record(row) for row in rows],
+            columns=IMPORT_COLUMNS
+        )
+
+        updated = []
+        if not skip_duplicates:
+            merged = await conn.fetch(INSERT_ALL_SQL)
+        elif update_existing:
+            # Fingerprint matches are the duplicates the per-item path finds;
+            # update them before the insert skips them
+            updated = [dict(record) for record in await conn.fetch(UPDATE_FINGERPRINT_MATCHES_SQL)]
+            merged = await conn.fetch(UPSERT_SQL)
+        else:
+            merged = await conn.fetch(INSERT_NEW_SQL)
+
+        inserted_ids = {record["id"] for record in merged if record["inserted"]}
+        updated.extend(
+            {key: value for key, value in record.items() if key != "inserted"}
+            for record in merged if not record["inserted"]
+        )
+
+        rejected = []
+        if not skip_duplicates and len(inserted_ids) < len(rows):
+            rejected = [
+                (record["ord"], record["existing_id"])
+                for record in await conn.fetch(REJECTED_ROWS_SQL, list(inserted_ids))
+            ]
+
+        await _resign_items(conn, updated)
+        await conn.copy_records_to_table(
+            "knowledge_lsh_buckets",
+            records=[
+                (band, bucket, row["id"], UUID(str(row["project_id"])))
+                for row in rows if row["id"] in inserted_ids
+                for band, bucket in zip(row["lsh_bands"], row["lsh_buckets"])
+            ],
+            columns=LSH_BUCKET_COLUMNS
+        )
+
+    return ImportMerge(inserted_ids=inserted_ids, updated=updated, rejected=rejected)
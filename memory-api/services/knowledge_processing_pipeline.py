@@ -18,7 +18,6 @@ import re
 # ML imports
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import DBSCAN, KMeans
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import joblib
@@ -27,6 +26,7 @@ from core.database import DatabaseManager
 from models.knowledge import KnowledgeItem
 from models.pattern_quality import PatternContext, QualityScore
 from services.vector_service import VectorService
+from services.content_fingerprint import compute_content_signature, find_exact_duplicate, find_near_duplicates
 from services.pattern_quality_service import AdvancedQualityScorer
 from services.pattern_intelligence_service import PatternIntelligenceEngine
 from services.multi_source_knowledge_extractor import ExtractionResult
@@ -97,7 +97,6 @@ class KnowledgeProcessingPipeline:
         self.scaler = StandardScaler()
         
         # Caches and indexes
-        self._similarity_cache = {}
         self._conflict_rules = []
         self._processing_stats = defaultdict(int)
         
@@ -513,56 +512,62 @@ class KnowledgeProcessingPipeline:
         )
     
     async def _detect_duplicates(self, item: KnowledgeItem) -> List[KnowledgeItem]:
-        """Detect potential duplicate knowledge items"""
+        """Detect potential duplicate knowledge items
+        
+        Exact duplicates come from the fingerprint index and near-duplicates
+        from the LSH bucket table, compared by MinHash signature, so no
+        embedding or vector search is needed.
+        """
         try:
-            # Generate embedding for the item
-            embedding_text = f"{item.title} {item.content[:500]}"
-            embedding = await self.vector_service.generate_embedding(embedding_text)
-            
-            # Search for similar items
-            similar_items = await self.vector_service.search_similar(
-                embedding, limit=20, threshold=0.85
-            )
+            signature = compute_content_signature(item.title, item.content)
+            project_id = getattr(item, 'project_id', None)
+            project_id = UUID(str(project_id)) if project_id else None
+            
+            async with self.db_manager.get_postgres_raw_connection() as conn:
+                matches = {}
+                exact_id = await find_exact_duplicate(conn, signature, project_id)
+                if exact_id and exact_id != item.id:
+                    matches[exact_id] = 1.0
+                
+                # An unsaved item has no id; a NULL in the exclusion list
+                # would filter out every candidate
+                exclude = [item.id] if item.id is not None else []
+                for similar_id, similarity in await find_near_duplicates(
+                    conn, signature, project_id, threshold=0.9, exclude=exclude
+                ):
+                    matches.setdefault(similar_id, similarity)
+                
+                if not matches:
+                    return []
+                
+                rows = await conn.fetch("""
+                    SELECT id, title, content, knowledge_type, metadata, created_at, updated_at
+                    FROM knowledge_items
+                    WHERE id = ANY($1::uuid[])
+                """, list(matches))
             
             duplicates = []
-            for similar_item in similar_items:
-                if similar_item.id != item.id:
-                    # Check for high content similarity
-                    similarity = await self._calculate_content_similarity(item, similar_item)
-                    if similarity > 0.9:
-                        duplicates.append(similar_item)
-            
-            return duplicates
+            for row in rows:
+                metadata = row['metadata'] if isinstance(row['metadata'], dict) else json.loads(row['metadata'] or '{}')
+                duplicates.append(KnowledgeItem(
+                    id=row['id'],
+                    title=row['title'],
+                    content=row['content'],
+                    knowledge_type=row['knowledge_type'],
+                    source_type=metadata.get('source_type', 'conversation'),
+                    tags=metadata.get('tags', []),
+                    summary=metadata.get('summary'),
+                    metadata=metadata,
+                    created_at=row['created_at'],
+                    updated_at=row['updated_at']
+                ))
+            
+            return sorted(duplicates, key=lambda duplicate: -matches[duplicate.id])
             
         except Exception as e:
             logger.warning("Failed to detect duplicates", error=str(e))
             return []
     
-    async def _calculate_content_similarity(self, item1: KnowledgeItem, item2: KnowledgeItem) -> float:
-        """Calculate content similarity between two items"""
-        # Create cache key
-        cache_key = f"{item1.id}:{item2.id}"
-        if cache_key in self._similarity_cache:
-            return self._similarity_cache[cache_key]
-        
-        # Simple text similarity using TF-IDF
-        texts = [
-            f"{item1.title} {item1.content}",
-            f"{item2.title} {item2.content}"
-        ]
-        
-        try:
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(texts)
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0, 0]
-        except:
-            # Fallback to simple word overlap
-            words1 = set(f"{item1.title} {item1.content}".lower().split())
-            words2 = set(f"{item2.title} {item2.content}".lower().split())
-            similarity = len(words1 & words2) / len(words1 | words2) if words1 | words2 else 0.0
-        
-        self._similarity_cache[cache_key] = similarity
-        return similarity
-    
     async def _detect_relationships(self, item: KnowledgeItem) -> List[Dict[str, Any]]:
         """Detect relationships with existing knowledge items"""
         try:
@@ -2,12 +2,15 @@
 # ABOUTME: Business logic for knowledge item management, search, and vector operations
 
 import asyncio
+import hashlib
 import json
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID, uuid4
 import structlog
+from asyncpg.exceptions import UniqueViolationError
 from sqlalchemy import select, update, delete, func, text, or_, and_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from models.knowledge import (
@@ -23,6 +26,17 @@ from models.knowledge import (
 from models.base import PaginationParams
 from services.base_service import BaseService
 from services.vector_service import VectorService
+from services.keyword_search import HEADLINE_OPTIONS, TEXT_SEARCH_CONFIG, KeywordQuery, parse_keyword_query
+from services.hybrid_search import fuse_rankings
+from services.knowledge_import import merge_import_chunk
+from services.content_fingerprint import (
+    DuplicateContentError,
+    compute_content_signature,
+    content_fingerprint,
+    find_conflicting_item,
+    find_exact_duplicate,
+    store_content_signature
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -140,8 +154,11 @@ class KnowledgeService(BaseService):
             #         error=str(e)
             #     )
             
-            # Invalidate cache
-            await self.invalidate_related_cache("knowledge:*")
+            # Invalidate cache: aggregates, and the parent's children count
+            tags = ["knowledge:aggregates"]
+            if item_data.parent_id:
+                tags.append(f"knowledge:item:{item_data.parent_id}")
+            await self.cache_invalidate_tags(*tags)
             
             await self.log_operation(
                 "create_knowledge_item",
@@ -151,6 +168,8 @@ class KnowledgeService(BaseService):
             
             return db_item
             
+        except DuplicateContentError:
+            raise
         except Exception as e:
             logger.error("Failed to create knowledge item", error=str(e))
             raise
@@ -163,20 +182,66 @@ class KnowledgeService(BaseService):
         """Insert knowledge item into PostgreSQL"""
         from sqlalchemy import insert
         
-        # This would use SQLAlchemy models - creating placeholder for now
+        # The item row and its LSH bucket rows are written in one statement
         stmt = text("""
-            INSERT INTO knowledge_items (
-                id, title, content, knowledge_type, quality_score, complexity_level, 
-                session_id, user_id, project_id, metadata, content_hash, created_at, updated_at
-            ) VALUES (
-                :id, :title, :content, :knowledge_type, :quality_score, :complexity_level,
-                :session_id, :user_id, :project_id, :metadata, :content_hash, :created_at, :updated_at
+            WITH item AS (
+                INSERT INTO knowledge_items (
+                    id, title, content, knowledge_type, quality_score, complexity_level, 
+                    session_id, user_id, project_id, metadata, content_hash, content_fingerprint,
+                    minhash_signature, created_at, updated_at
+                ) VALUES (
+                    :id, :title, :content, :knowledge_type, :quality_score, :complexity_level,
+                    :session_id, :user_id, :project_id, :metadata, :content_hash, :content_fingerprint,
+                    :minhash_signature, :created_at, :updated_at
+                )
+                RETURNING *
+            ), buckets AS (
+                INSERT INTO knowledge_lsh_buckets (band, bucket, knowledge_item_id, project_id)
+                SELECT lsh.band, lsh.bucket, item.id, item.project_id
+                FROM item, unnest(CAST(:lsh_bands AS smallint[]), CAST(:lsh_buckets AS bigint[])) AS lsh(band, bucket)
             )
-            RETURNING *
+            SELECT * FROM item
         """)
         
         now = datetime.utcnow()
         
+        params = self._prepare_item_row(item_id, item_data)
+        params["metadata"] = json.dumps(params["metadata"])  # Convert dict to JSON string
+        params.update({"created_at": now, "updated_at": now})
+        
+        try:
+            result = await self.postgres.execute(stmt, params)
+        except IntegrityError:
+            await self._raise_if_duplicate(
+                params["project_id"], params["content_hash"], params["content_fingerprint"]
+            )
+            raise
+        
+        await self.postgres.commit()
+        row = result.fetchone()
+        
+        # Convert to Pydantic model
+        return self._row_to_knowledge_item(row)
+    
+    async def _raise_if_duplicate(
+        self,
+        project_id: Any,
+        content_hash: str,
+        fingerprint: str,
+        item_id: Optional[UUID] = None
+    ) -> None:
+        """Turn a unique-index violation into DuplicateContentError naming the other item"""
+        async with self.postgres.raw_connection() as conn:
+            existing_id = await find_conflicting_item(
+                conn, UUID(str(project_id)), content_hash, fingerprint, item_id
+            )
+        if existing_id:
+            raise DuplicateContentError(existing_id)
+    
+    def _prepare_item_row(self, item_id: UUID, item_data: KnowledgeItemCreate) -> Dict[str, Any]:
+        """Column values for a new knowledge_items row"""
+        import hashlib
+        
         # Build metadata including missing fields
         metadata = item_data.metadata or {}
         metadata.update({
@@ -186,13 +251,11 @@ class KnowledgeService(BaseService):
             "parent_id": str(item_data.parent_id) if item_data.parent_id else None
         })
         
-        import json
-        import hashlib
-        
-        # Generate content hash for deduplication
+        # Generate content hash, normalized fingerprint and MinHash signature for deduplication
         content_hash = hashlib.sha256(item_data.content.encode('utf-8')).hexdigest()
+        signature = compute_content_signature(item_data.title, item_data.content)
         
-        result = await self.postgres.execute(stmt, {
+        return {
             "id": item_id,
             "title": item_data.title,
             "content": item_data.content,
@@ -203,16 +266,12 @@ class KnowledgeService(BaseService):
             "user_id": item_data.user_id or "95fd614f-7da8-4650-bf23-ed53acba34c2",  # Default system user
             "project_id": item_data.project_id or "c5d0c92a-d609-4a9d-bb59-473b7dc12d3a",  # Use default BETTY project
             "content_hash": content_hash,
-            "metadata": json.dumps(metadata),  # Convert dict to JSON string
-            "created_at": now,
-            "updated_at": now
-        })
-        
-        await self.postgres.commit()
-        row = result.fetchone()
-        
-        # Convert to Pydantic model
-        return self._row_to_knowledge_item(row)
+            "content_fingerprint": signature.fingerprint,
+            "minhash_signature": signature.minhash,
+            "lsh_bands": signature.bands,
+            "lsh_buckets": signature.buckets,
+            "metadata": metadata
+        }
     
     async def _update_embedding_id(self, item_id: UUID, embedding_id: str) -> None:
         """Update embedding_id in database"""
@@ -303,7 +362,14 @@ class KnowledgeService(BaseService):
             # Convert to knowledge item with computed fields
             return self._row_to_knowledge_item(row, children_count=children_count, related_count=related_count)
         
-        return await self.execute_with_cache(cache_key, fetch_item)
+        return await self.execute_with_cache(
+            cache_key,
+            fetch_item,
+            tags=lambda item: [f"knowledge:item:{item_id}"] + (
+                [f"knowledge:project:{item.project_id}"] if item and item.project_id else []
+            ),
+            model=KnowledgeItem
+        )
     
     async def _get_children_count(self, item_id: UUID) -> int:
         """Get count of child knowledge items"""
@@ -328,59 +394,81 @@ class KnowledgeService(BaseService):
     ) -> Optional[KnowledgeItem]:
         """Update knowledge item"""
         try:
-            # Build update statement
-            update_fields = []
-            params = {"id": item_id, "updated_at": datetime.utcnow()}
+            # Build update assignments
+            assignments = []
             
             if updates.title is not None:
-                update_fields.append("title = :title")
-                params["title"] = updates.title
+                assignments.append(("title", updates.title))
             
             if updates.content is not None:
-                update_fields.append("content = :content")
-                params["content"] = updates.content
+                assignments.append(("content", updates.content))
+                assignments.append(("content_hash", hashlib.sha256(updates.content.encode('utf-8')).hexdigest()))
             
             if updates.tags is not None:
-                update_fields.append("tags = :tags")
-                params["tags"] = updates.tags
+                assignments.append(("tags", updates.tags))
             
             if updates.summary is not None:
-                update_fields.append("summary = :summary")
-                params["summary"] = updates.summary
+                assignments.append(("summary", updates.summary))
             
             if updates.confidence is not None:
-                update_fields.append("quality_score = :quality_score")
-                update_fields.append("complexity_level = :complexity_level")
-                params["quality_score"] = self._confidence_to_quality_score(updates.confidence)
-                params["complexity_level"] = self._confidence_to_complexity_level(updates.confidence)
+                assignments.append(("quality_score", self._confidence_to_quality_score(updates.confidence)))
+                assignments.append(("complexity_level", self._confidence_to_complexity_level(updates.confidence)))
             
             if updates.metadata is not None:
-                update_fields.append("metadata = :metadata")
-                params["metadata"] = updates.metadata
+                assignments.append(("metadata", json.dumps(updates.metadata)))
             
-            if not update_fields:
+            if not assignments:
                 # No updates provided
                 return await self.get_knowledge_item(item_id)
             
-            stmt = text(f"""
-                UPDATE knowledge_items 
-                SET {', '.join(update_fields)}, updated_at = :updated_at
-                WHERE id = :id AND system_time_until IS NULL
-                RETURNING *
-            """)
-            
-            result = await self.postgres.execute(stmt, params)
-            await self.postgres.commit()
+            set_clause = ", ".join(
+                f"{column} = ${position}" for position, (column, _) in enumerate(assignments, start=3)
+            )
             
-            row = result.fetchone()
-            if not row:
-                return None
+            # The edit and the duplicate-detection signature of the new text
+            # commit together, so probes never match text the item lost
+            async with self.postgres.raw_connection() as conn:
+                try:
+                    async with conn.transaction():
+                        row = await conn.fetchrow(f"""
+                            UPDATE knowledge_items 
+                            SET {set_clause}, updated_at = $2
+                            WHERE id = $1 AND system_time_until IS NULL
+                            RETURNING id, title, content, project_id, embedding_id
+                        """, item_id, datetime.utcnow(), *(value for _, value in assignments))
+                        
+                        if not row:
+                            return None
+                        
+                        if updates.title is not None or updates.content is not None:
+                            await store_content_signature(
+                                conn, row["id"], row["project_id"], row["title"], row["content"]
+                            )
+                except UniqueViolationError:
+                    # The new text collides with another item's content hash
+                    # or live fingerprint
+                    current = await conn.fetchrow(
+                        "SELECT project_id, title, content FROM knowledge_items WHERE id = $1", item_id
+                    )
+                    if current:
+                        title = updates.title if updates.title is not None else current["title"]
+                        content = updates.content if updates.content is not None else current["content"]
+                        existing_id = await find_conflicting_item(
+                            conn,
+                            current["project_id"],
+                            hashlib.sha256(content.encode('utf-8')).hexdigest(),
+                            content_fingerprint(title, content),
+                            item_id
+                        )
+                        if existing_id:
+                            raise DuplicateContentError(existing_id)
+                    raise
             
             # Update vector embedding if content changed
-            if updates.content is not None and row.embedding_id:
+            if updates.content is not None and row["embedding_id"]:
                 try:
                     await self.vector_service.update_embedding(
-                        row.embedding_id,
+                        row["embedding_id"],
                         updates.content,
                         collection_name="knowledge_items"
                     )
@@ -388,13 +476,14 @@ class KnowledgeService(BaseService):
                     logger.warning("Failed to update vector embedding", error=str(e))
             
             # Invalidate cache
-            await self.cache_delete(self.generate_cache_key("knowledge", "item", str(item_id)))
-            await self.invalidate_related_cache("knowledge:*")
+            await self.cache_invalidate_tags(f"knowledge:item:{item_id}", "knowledge:aggregates")
             
             await self.log_operation("update_knowledge_item", "knowledge_items", str(item_id))
             
             return await self.get_knowledge_item(item_id)
             
+        except DuplicateContentError:
+            raise
         except Exception as e:
             logger.error("Failed to update knowledge item", item_id=str(item_id), error=str(e))
             raise
@@ -406,6 +495,7 @@ class KnowledgeService(BaseService):
                 UPDATE knowledge_items 
                 SET system_time_until = :system_time_until, updated_at = :updated_at
                 WHERE id = :id AND system_time_until IS NULL
+                RETURNING metadata->>'parent_id' AS parent_id
             """)
             
             result = await self.postgres.execute(stmt, {
@@ -415,7 +505,8 @@ class KnowledgeService(BaseService):
             })
             await self.postgres.commit()
             
-            if result.rowcount == 0:
+            deleted = result.fetchone()
+            if not deleted:
                 return False
             
             # Delete vector embedding
@@ -445,8 +536,10 @@ class KnowledgeService(BaseService):
             #     logger.warning("Failed to delete graph relationships", error=str(e))
             
             # Invalidate cache
-            await self.cache_delete(self.generate_cache_key("knowledge", "item", str(item_id)))
-            await self.invalidate_related_cache("knowledge:*")
+            tags = [f"knowledge:item:{item_id}", "knowledge:aggregates"]
+            if deleted.parent_id:
+                tags.append(f"knowledge:item:{deleted.parent_id}")
+            await self.cache_invalidate_tags(*tags)
             
             await self.log_operation("delete_knowledge_item", "knowledge_items", str(item_id))
             
@@ -553,33 +646,27 @@ class KnowledgeService(BaseService):
         
         # Temporarily disable cache to debug serialization issue
         return await fetch_items()
-        # return await self.execute_with_cache(cache_key, fetch_items, ttl=300)  # 5 minute cache
+        # return await self.execute_with_cache(cache_key, fetch_items, ttl=300, tags=["knowledge:aggregates"])  # 5 minute cache
     
     async def search_knowledge(self, query: SearchQuery) -> List[KnowledgeItem]:
         """Search knowledge items using hybrid semantic + keyword search"""
         try:
-            if query.search_type == "semantic" or query.search_type == "hybrid":
+            if query.search_type == "hybrid":
+                return await self._hybrid_search(query)
+            
+            if query.search_type == "semantic":
                 # Vector similarity search
                 vector_results = await self.vector_service.search_similar(
                     query=query.query,
                     collection_name="knowledge_items",
                     limit=query.limit,
-                    similarity_threshold=query.similarity_threshold
+                    similarity_threshold=query.similarity_threshold,
+                    profile="interactive"
                 )
-                
-                if query.search_type == "semantic":
-                    # Return only vector results
-                    return await self._build_search_results(vector_results, query)
+                return await self._build_search_results(vector_results, query)
             
-            # Combine with keyword search for hybrid approach
-            if query.search_type == "keyword" or query.search_type == "hybrid":
-                keyword_results = await self._keyword_search(query)
-                
-                if query.search_type == "keyword":
-                    return keyword_results
-                
-                # Merge results for hybrid search
-                return await self._merge_search_results(vector_results, keyword_results, query)
+            if query.search_type == "keyword":
+                return await self._keyword_search(query)
             
             return []
             
@@ -587,18 +674,103 @@ class KnowledgeService(BaseService):
             logger.error("Knowledge search failed", error=str(e))
             raise
     
+    async def _hybrid_search(self, query: SearchQuery) -> List[KnowledgeItem]:
+        """Run the vector and full-text legs concurrently and fuse their rankings
+        
+        Each leg over-fetches a candidate pool of ids and scores only; the
+        fused top-k is then hydrated with a single query.
+        """
+        pool_size = max(query.limit, self.settings.hybrid_candidate_pool)
+        keyword_query = parse_keyword_query(query.query)
+        
+        vector_leg, keyword_leg = await asyncio.gather(
+            self.vector_service.search_similar(
+                query=query.query,
+                collection_name="knowledge_items",
+                limit=pool_size,
+                similarity_threshold=query.similarity_threshold,
+                profile="interactive"
+            ),
+            self._keyword_candidates(query, keyword_query, pool_size),
+            return_exceptions=True
+        )
+        
+        # One failed leg degrades to the other rather than failing the search
+        if isinstance(vector_leg, Exception) and isinstance(keyword_leg, Exception):
+            raise vector_leg
+        if isinstance(vector_leg, Exception):
+            logger.warning("Hybrid search vector leg failed", error=str(vector_leg))
+            vector_leg = []
+        if isinstance(keyword_leg, Exception):
+            logger.warning("Hybrid search keyword leg failed", error=str(keyword_leg))
+            keyword_leg = []
+        
+        return await self._merge_search_results(vector_leg, keyword_leg, query, keyword_query)
+    
     async def _keyword_search(self, query: SearchQuery) -> List[KnowledgeItem]:
-        """Perform keyword search in PostgreSQL"""
-        where_conditions = ["system_time_until IS NULL"]
-        params = {"limit": query.limit}
+        """Perform full-text keyword search in PostgreSQL
         
-        # Full text search - using actual database columns
-        where_conditions.append("""
-            (title ILIKE :search_term OR content ILIKE :search_term 
-             OR problem_description ILIKE :search_term OR solution_description ILIKE :search_term
-             OR metadata->>'summary' ILIKE :search_term)
+        Matches the weighted search_vector column (GIN) with a websearch
+        tsquery, ranks with ts_rank_cd and builds ts_headline snippets for
+        the returned page only. Code identifiers are matched literally
+        through the trigram indexes on title and content.
+        """
+        keyword_query = parse_keyword_query(query.query)
+        if keyword_query.is_empty:
+            return []
+        
+        tsquery, text_rank, where_clause, params = self._keyword_match_sql(query, keyword_query)
+        params.update({"limit": query.limit, "headline_options": HEADLINE_OPTIONS})
+        
+        # Rank and limit first so ts_headline only runs on the page returned
+        stmt = text(f"""
+            WITH q AS (SELECT {tsquery} AS tsq),
+            ranked AS (
+                SELECT knowledge_items.*,
+                       {text_rank} + {keyword_query.identifier_rank_sql("title")} AS search_rank,
+                       q.tsq
+                FROM knowledge_items, q
+                WHERE {where_clause}
+                ORDER BY search_rank DESC, updated_at DESC
+                LIMIT :limit
+            )
+            SELECT ranked.*,
+                   COALESCE(
+                       ts_headline('{TEXT_SEARCH_CONFIG}', content, tsq, :headline_options),
+                       left(content, 200)
+                   ) AS search_headline
+            FROM ranked
+            ORDER BY search_rank DESC, updated_at DESC
         """)
-        params["search_term"] = f"%{query.query}%"
+        
+        result = await self.postgres.execute(stmt, params)
+        rows = result.fetchall()
+        
+        return [
+            self._search_row_to_item(row, query, search_rank=float(row.search_rank or 0.0))
+            for row in rows
+        ]
+    
+    def _keyword_match_sql(
+        self,
+        query: SearchQuery,
+        keyword_query: KeywordQuery
+    ) -> Tuple[str, str, str, Dict[str, Any]]:
+        """Build the tsquery, rank expression, WHERE clause and params for a keyword query"""
+        where_conditions = ["system_time_until IS NULL"]
+        params = keyword_query.params()
+        
+        tsquery = keyword_query.tsquery_sql()
+        if tsquery:
+            where_conditions.append("search_vector @@ q.tsq")
+            text_rank = "ts_rank_cd(search_vector, q.tsq, 32)"
+        else:
+            tsquery = "NULL::tsquery"
+            text_rank = "0"
+        
+        identifier_match = keyword_query.identifier_match_sql(["title", "content"])
+        if identifier_match:
+            where_conditions.append(identifier_match)
         
         # Apply filters
         if query.knowledge_types:
@@ -606,8 +778,8 @@ class KnowledgeService(BaseService):
             params["knowledge_types"] = query.knowledge_types
         
         if query.tags:
-            where_conditions.append("metadata->'tags' @> :tags::jsonb")
-            params["tags"] = query.tags
+            where_conditions.append("metadata->'tags' @> CAST(:tags AS jsonb)")
+            params["tags"] = json.dumps(query.tags)
         
         if query.session_id:
             where_conditions.append("session_id = :session_id")
@@ -625,55 +797,74 @@ class KnowledgeService(BaseService):
             where_conditions.append("created_at <= :date_to")
             params["date_to"] = query.date_to
         
-        where_clause = " AND ".join(where_conditions)
+        return tsquery, text_rank, " AND ".join(where_conditions), params
+    
+    async def _keyword_candidates(
+        self,
+        query: SearchQuery,
+        keyword_query: KeywordQuery,
+        limit: int
+    ) -> List[Tuple[str, float]]:
+        """Ranked (id, rank) candidates from the full-text indexes, without hydrating rows"""
+        if keyword_query.is_empty:
+            return []
+        
+        tsquery, text_rank, where_clause, params = self._keyword_match_sql(query, keyword_query)
+        params["limit"] = limit
         
         stmt = text(f"""
-            SELECT * FROM knowledge_items 
+            WITH q AS (SELECT {tsquery} AS tsq)
+            SELECT id, {text_rank} + {keyword_query.identifier_rank_sql("title")} AS search_rank
+            FROM knowledge_items, q
             WHERE {where_clause}
-            ORDER BY 
-                CASE 
-                    WHEN title ILIKE :search_term THEN 1
-                    WHEN problem_description ILIKE :search_term THEN 2
-                    WHEN solution_description ILIKE :search_term THEN 3
-                    WHEN metadata->>'summary' ILIKE :search_term THEN 4
-                    ELSE 5
-                END, 
-                updated_at DESC
+            ORDER BY search_rank DESC, updated_at DESC
             LIMIT :limit
         """)
         
         result = await self.postgres.execute(stmt, params)
-        rows = result.fetchall()
-        
-        items = []
-        for row in rows:
-            # Extract values from metadata for fields that are stored there
-            metadata = row.metadata or {}
-            item = KnowledgeItem(
-                id=row.id,
-                title=row.title,
-                content=row.content if query.include_content else None,
-                knowledge_type=row.knowledge_type,
-                source_type=metadata.get("source_type", "conversation"),
-                tags=metadata.get("tags", []),
-                summary=metadata.get("summary"),
-                confidence=self._quality_score_to_confidence(row.quality_score or 0.5),
-                session_id=row.session_id,
-                user_id=str(row.user_id) if row.user_id else None,
-                project_id=str(row.project_id) if row.project_id else None,
-                parent_id=UUID(metadata["parent_id"]) if metadata.get("parent_id") else None,
-                metadata=metadata,
-                created_at=row.created_at,
-                updated_at=row.updated_at,
-                embedding_id=row.embedding_id,
-                access_count=getattr(row, 'access_count', 0) or getattr(row, 'usage_count', 0),
-                last_accessed_at=getattr(row, 'last_accessed_at', None) or getattr(row, 'last_used_at', None),
-                children_count=0,
-                related_count=0
-            )
-            items.append(item)
+        return [(str(row.id), float(row.search_rank or 0.0)) for row in result.fetchall()]
+    
+    def _search_row_to_item(
+        self,
+        row,
+        query: SearchQuery,
+        similarity_score: Optional[float] = None,
+        search_rank: Optional[float] = None,
+        extra_metadata: Optional[Dict[str, Any]] = None
+    ) -> KnowledgeItem:
+        """Convert a search result row to a KnowledgeItem carrying its scores"""
+        # Extract values from metadata for fields that are stored there
+        metadata = dict(row.metadata or {})
+        if search_rank is not None:
+            metadata["search_rank"] = search_rank
+        if getattr(row, "search_headline", None) is not None:
+            metadata["search_headline"] = row.search_headline
+        if extra_metadata:
+            metadata.update(extra_metadata)
         
-        return items
+        return KnowledgeItem(
+            id=row.id,
+            title=row.title,
+            content=row.content if query.include_content else None,
+            knowledge_type=row.knowledge_type,
+            source_type=metadata.get("source_type", "conversation"),
+            tags=metadata.get("tags", []),
+            summary=metadata.get("summary"),
+            confidence=self._quality_score_to_confidence(row.quality_score or 0.5),
+            session_id=row.session_id,
+            user_id=str(row.user_id) if row.user_id else None,
+            project_id=str(row.project_id) if row.project_id else None,
+            parent_id=UUID(metadata["parent_id"]) if metadata.get("parent_id") else None,
+            metadata=metadata,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            embedding_id=row.embedding_id,
+            similarity_score=similarity_score,
+            access_count=getattr(row, 'access_count', 0) or getattr(row, 'usage_count', 0),
+            last_accessed_at=getattr(row, 'last_accessed_at', None) or getattr(row, 'last_used_at', None),
+            children_count=0,
+            related_count=0
+        )
     
     async def _build_search_results(
         self, 
@@ -738,34 +929,57 @@ class KnowledgeService(BaseService):
     async def _merge_search_results(
         self,
         vector_results: List[Dict],
-        keyword_results: List[KnowledgeItem],
-        query: SearchQuery
+        keyword_candidates: List[Tuple[str, float]],
+        query: SearchQuery,
+        keyword_query: Optional[KeywordQuery] = None
     ) -> List[KnowledgeItem]:
-        """Merge vector and keyword search results"""
-        # Convert vector results to KnowledgeItems
-        vector_items = await self._build_search_results(vector_results, query)
+        """Fuse vector and keyword rankings and hydrate the top-k in one query"""
+        vector_weight = self.settings.hybrid_vector_weight
+        fused = fuse_rankings(
+            {
+                "vector": [(str(result["payload"]["item_id"]), result["score"]) for result in vector_results],
+                "keyword": keyword_candidates
+            },
+            method=self.settings.hybrid_fusion_method,
+            weights={"vector": vector_weight, "keyword": 1.0 - vector_weight},
+            rrf_k=self.settings.hybrid_rrf_k
+        )[:query.limit]
         
-        # Combine and deduplicate results
-        seen_ids = set()
-        merged_results = []
+        if not fused:
+            return []
         
-        # Add vector results first (higher priority)
-        for item in vector_items:
-            if item.id not in seen_ids:
-                merged_results.append(item)
-                seen_ids.add(item.id)
+        params: Dict[str, Any] = {"ids": [entry.id for entry in fused]}
+        headline = "NULL"
+        tsquery = keyword_query.tsquery_sql() if keyword_query else None
+        if tsquery:
+            # Snippets only for the final page
+            headline = f"ts_headline('{TEXT_SEARCH_CONFIG}', content, {tsquery}, :headline_options)"
+            params.update(keyword_query.params())
+            params["headline_options"] = HEADLINE_OPTIONS
         
-        # Add keyword results
-        for item in keyword_results:
-            if item.id not in seen_ids:
-                merged_results.append(item)
-                seen_ids.add(item.id)
+        stmt = text(f"""
+            SELECT knowledge_items.*, {headline} AS search_headline
+            FROM knowledge_items
+            WHERE id = ANY(CAST(:ids AS uuid[])) AND system_time_until IS NULL
+        """)
         
-        # Limit results
-        if len(merged_results) > query.limit:
-            merged_results = merged_results[:query.limit]
+        result = await self.postgres.execute(stmt, params)
+        rows = {str(row.id): row for row in result.fetchall()}
         
-        return merged_results
+        items = []
+        for entry in fused:
+            row = rows.get(entry.id)
+            if row is None:
+                continue
+            items.append(self._search_row_to_item(
+                row,
+                query,
+                similarity_score=entry.scores.get("vector"),
+                search_rank=entry.scores.get("keyword"),
+                extra_metadata={"hybrid_score": entry.score, "hybrid_ranks": entry.ranks}
+            ))
+        
+        return items
     
     async def get_knowledge_stats(self) -> KnowledgeStats:
         """Get knowledge base statistics"""
@@ -862,8 +1076,212 @@ class KnowledgeService(BaseService):
         return await fetch_stats()
     
     async def bulk_import_knowledge(self, request: BulkImportRequest) -> BulkImportResponse:
-        """Bulk import knowledge items"""
+        """Bulk import knowledge items
+        
+        Large imports go through the set-based COPY pipeline; small ones use
+        the per-item path.
+        """
         batch_id = uuid4()
+        
+        if len(request.items) >= self.settings.bulk_import_copy_threshold:
+            return await self._bulk_import_copy(request, batch_id)
+        
+        return await self._bulk_import_serial(request, batch_id)
+    
+    async def _bulk_import_copy(self, request: BulkImportRequest, batch_id: UUID) -> BulkImportResponse:
+        """Import items in chunks: COPY into a temp table, one merging
+        INSERT ... SELECT per chunk, then one embedding batch, one Qdrant
+        upsert and one UNWIND graph write per chunk
+        
+        Indexing of a chunk overlaps with staging of the next.
+        """
+        total_items = len(request.items)
+        chunk_size = self.settings.bulk_import_chunk_size
+        imported_items = 0
+        skipped_items = 0
+        failed_items = 0
+        errors = []
+        indexing: Optional[asyncio.Task] = None
+        touched_projects = set()
+        
+        try:
+            for start in range(0, total_items, chunk_size):
+                chunk = request.items[start:start + chunk_size]
+                
+                try:
+                    rows = []
+                    for offset, item_data in enumerate(chunk):
+                        # Set project_id if provided
+                        if request.project_id and not item_data.project_id:
+                            item_data.project_id = request.project_id
+                        row = self._prepare_item_row(uuid4(), item_data)
+                        row["ord"] = start + offset
+                        rows.append(row)
+                    
+                    async with self.postgres.raw_connection() as conn:
+                        merge = await merge_import_chunk(
+                            conn, rows, request.skip_duplicates, request.update_existing
+                        )
+                    
+                except Exception as e:
+                    failed_items += len(chunk)
+                    errors.append({"index": start, "count": len(chunk), "error": str(e)})
+                    logger.warning("Failed to import knowledge chunk", index=start, count=len(chunk), error=str(e))
+                    continue
+                
+                # Rows rejected as duplicates fail one by one, as on the per-item path
+                for index, existing_id in merge.rejected:
+                    errors.append({
+                        "index": index,
+                        "title": request.items[index].title,
+                        "error": str(DuplicateContentError(existing_id)) if existing_id else "Duplicate content"
+                    })
+                
+                inserted = [row for row in rows if row["id"] in merge.inserted_ids]
+                touched_projects.update(str(item["project_id"]) for item in merge.updated)
+                imported_items += len(inserted) + len(merge.updated)
+                failed_items += len(merge.rejected)
+                skipped_items += len(chunk) - len(inserted) - len(merge.updated) - len(merge.rejected)
+                
+                if indexing is not None:
+                    await indexing
+                indexing = asyncio.create_task(self._index_import_chunk(inserted, merge.updated))
+            
+            if indexing is not None:
+                await indexing
+            
+            # Updated rows may belong to any cached item in their projects
+            tags = ["knowledge:aggregates"]
+            tags.extend(f"knowledge:project:{project_id}" for project_id in touched_projects)
+            await self.cache_invalidate_tags(*tags)
+            await self.log_operation(
+                "bulk_import_knowledge",
+                "knowledge_items",
+                str(batch_id),
+                imported=imported_items,
+                skipped=skipped_items,
+                failed=failed_items
+            )
+            
+            return BulkImportResponse(
+                message=f"Bulk import completed: {imported_items} imported, {skipped_items} skipped, {failed_items} failed",
+                total_items=total_items,
+                imported_items=imported_items,
+                skipped_items=skipped_items,
+                failed_items=failed_items,
+                errors=errors,
+                batch_id=batch_id
+            )
+            
+        except Exception as e:
+            if indexing is not None and not indexing.done():
+                indexing.cancel()
+            logger.error("Bulk import failed", error=str(e))
+            raise
+    
+    async def _index_import_chunk(
+        self,
+        rows: List[Dict[str, Any]],
+        updated: List[Dict[str, Any]]
+    ) -> None:
+        """Embed, upsert and graph-link one chunk of newly imported rows, and
+        re-embed the existing items it updated"""
+        if self.vector_service and updated:
+            # Concurrent updates share embedding engine batches
+            results = await asyncio.gather(*(
+                self.vector_service.update_embedding(
+                    item["embedding_id"],
+                    item["content"],
+                    collection_name="knowledge_items"
+                )
+                for item in updated if item["embedding_id"]
+            ), return_exceptions=True)
+            failures = [result for result in results if isinstance(result, Exception)]
+            if failures:
+                logger.warning(
+                    "Failed to update vector embeddings for import chunk",
+                    count=len(failures),
+                    error=str(failures[0])
+                )
+        
+        if not rows:
+            return
+        
+        if self.vector_service:
+            try:
+                embedding_ids = await self.vector_service.batch_create_embeddings(
+                    [
+                        {
+                            "item_id": str(row["id"]),
+                            "content": row["content"],
+                            "metadata": {
+                                "title": row["title"],
+                                "knowledge_type": row["knowledge_type"],
+                                "source_type": row["metadata"].get("source_type"),
+                                "tags": row["metadata"].get("tags", []),
+                                "session_id": str(row["session_id"]) if row["session_id"] else None
+                            }
+                        }
+                        for row in rows
+                    ],
+                    collection_name="knowledge_items",
+                    batch_size=len(rows)
+                )
+                
+                async with self.postgres.raw_connection() as conn:
+                    await conn.execute(
+                        """
+                        UPDATE knowledge_items AS k
+                        SET embedding_id = v.embedding_id
+                        FROM unnest($1::uuid[], $2::text[]) AS v(id, embedding_id)
+                        WHERE k.id = v.id
+                        """,
+                        [row["id"] for row in rows],
+                        embedding_ids
+                    )
+                
+            except Exception as e:
+                logger.warning("Failed to create vector embeddings for import chunk", count=len(rows), error=str(e))
+        
+        if self.neo4j:
+            try:
+                await self._create_graph_nodes_bulk(rows)
+            except Exception as e:
+                logger.warning("Failed to create graph nodes for import chunk", count=len(rows), error=str(e))
+    
+    async def _create_graph_nodes_bulk(self, rows: List[Dict[str, Any]]) -> None:
+        """Create knowledge nodes and their session/parent links in one UNWIND write"""
+        query = """
+        UNWIND $rows AS row
+        MERGE (k:KnowledgeItem {id: row.id})
+        ON CREATE SET k.title = row.title,
+                      k.knowledge_type = row.knowledge_type,
+                      k.source_type = row.source_type,
+                      k.created_at = datetime()
+        WITH k, row
+        OPTIONAL MATCH (s:Session {id: row.session_id})
+        OPTIONAL MATCH (p:KnowledgeItem {id: row.parent_id})
+        FOREACH (_ IN CASE WHEN s IS NULL THEN [] ELSE [1] END |
+            MERGE (k)-[:BELONGS_TO {created_at: datetime()}]->(s))
+        FOREACH (_ IN CASE WHEN p IS NULL THEN [] ELSE [1] END |
+            MERGE (k)-[:CHILD_OF {created_at: datetime()}]->(p))
+        """
+        
+        async with self.neo4j.session() as session:
+            await session.run(query, rows=[
+                {
+                    "id": str(row["id"]),
+                    "title": row["title"],
+                    "knowledge_type": row["knowledge_type"],
+                    "source_type": row["metadata"].get("source_type"),
+                    "session_id": str(row["session_id"]) if row["session_id"] else None,
+                    "parent_id": row["metadata"].get("parent_id")
+                }
+                for row in rows
+            ])
+    
+    async def _bulk_import_serial(self, request: BulkImportRequest, batch_id: UUID) -> BulkImportResponse:
+        """Import items one at a time through create_knowledge_item"""
         total_items = len(request.items)
         imported_items = 0
         skipped_items = 0
@@ -873,6 +1291,10 @@ class KnowledgeService(BaseService):
         try:
             for i, item_data in enumerate(request.items):
                 try:
+                    # Set project_id if provided
+                    if request.project_id and not item_data.project_id:
+                        item_data.project_id = request.project_id
+                    
                     # Check for duplicates if requested
                     if request.skip_duplicates:
                         existing = await self._check_duplicate(item_data)
@@ -889,10 +1311,6 @@ class KnowledgeService(BaseService):
                                 skipped_items += 1
                             continue
                     
-                    # Set project_id if provided
-                    if request.project_id and not item_data.project_id:
-                        item_data.project_id = request.project_id
-                    
                     # Create knowledge item
                     await self.create_knowledge_item(item_data)
                     imported_items += 1
@@ -927,20 +1345,14 @@ class KnowledgeService(BaseService):
             raise
     
     async def _check_duplicate(self, item_data: KnowledgeItemCreate) -> Optional[KnowledgeItem]:
-        """Check for duplicate knowledge item"""
-        stmt = text("""
-            SELECT id FROM knowledge_items 
-            WHERE title = :title AND content = :content AND system_time_until IS NULL
-            LIMIT 1
-        """)
+        """Check for duplicate knowledge item with a fingerprint index probe"""
+        signature = compute_content_signature(item_data.title, item_data.content)
+        project_id = UUID(str(item_data.project_id)) if item_data.project_id else None
         
-        result = await self.postgres.execute(stmt, {
-            "title": item_data.title,
-            "content": item_data.content
-        })
+        async with self.postgres.raw_connection() as conn:
+            existing_id = await find_exact_duplicate(conn, signature, project_id)
         
-        row = result.fetchone()
-        if row:
-            return await self.get_knowledge_item(row.id)
+        if existing_id:
+            return await self.get_knowledge_item(existing_id)
         
         return None
\ No newline at end of file
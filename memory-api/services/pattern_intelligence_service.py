@@ -9,7 +9,6 @@ from uuid import UUID, uuid4
 import structlog
 from collections import defaultdict, Counter
 from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.decomposition import PCA
 import networkx as nx
 
@@ -21,9 +20,13 @@ from models.pattern_quality import (
 from models.knowledge import KnowledgeItem
 from services.vector_service import VectorService
 from services.pattern_quality_service import AdvancedQualityScorer
+from services.similarity_blocks import DEFAULT_BLOCK_SIZE, normalize_rows, similar_pairs
 
 logger = structlog.get_logger(__name__)
 
+# Relationships written to Neo4j per UNWIND statement
+RELATIONSHIP_WRITE_BATCH = 5000
+
 class PatternIntelligenceEngine:
     """
     Advanced Pattern Intelligence Engine with semantic analysis,
@@ -52,6 +55,7 @@ class PatternIntelligenceEngine:
         # ML models for intelligence
         self._clustering_model = None
         self._similarity_threshold = 0.75
+        self._similarity_block_size = DEFAULT_BLOCK_SIZE
         self._last_model_training = None
         
     async def detect_semantic_relationships(
@@ -76,50 +80,38 @@ class PatternIntelligenceEngine:
         relationships = []
         
         try:
-            # Generate embeddings for all patterns
-            embeddings_map = {}
-            for pattern in patterns:
-                embedding = await self.vector_service.generate_embedding(
-                    f"{pattern.title} {pattern.content}"
-                )
-                embeddings_map[pattern.id] = embedding
-            
-            # Calculate pairwise similarities
-            pattern_ids = list(embeddings_map.keys())
-            embeddings_matrix = np.array([embeddings_map[pid] for pid in pattern_ids])
-            
-            # Compute cosine similarity matrix
-            similarity_matrix = cosine_similarity(embeddings_matrix)
-            
-            # Detect relationships based on similarity scores
-            for i, pattern_1 in enumerate(patterns):
-                for j, pattern_2 in enumerate(patterns):
-                    if i >= j:  # Avoid duplicate pairs and self-comparison
-                        continue
-                    
-                    similarity_score = similarity_matrix[i][j]
-                    
-                    if similarity_score >= min_similarity:
-                        # Determine relationship type
-                        relationship_type = await self._classify_relationship_type(
-                            pattern_1, pattern_2, similarity_score
-                        )
-                        
-                        # Generate evidence for the relationship
-                        evidence = await self._generate_relationship_evidence(
-                            pattern_1, pattern_2, relationship_type, similarity_score
-                        )
-                        
-                        relationship = SemanticRelationship(
-                            from_pattern_id=pattern_1.id,
-                            to_pattern_id=pattern_2.id,
-                            relationship_type=relationship_type,
-                            strength=similarity_score,
-                            evidence=evidence,
-                            discovered_at=datetime.utcnow()
-                        )
-                        
-                        relationships.append(relationship)
+            if len(patterns) < 2:
+                return relationships
+            
+            # Embed all patterns in one batch
+            embeddings = await self.vector_service.get_embeddings(
+                [f"{pattern.title} {pattern.content}" for pattern in patterns]
+            )
+            
+            # Candidate pairs above the threshold, computed block by block
+            rows, cols, scores = similar_pairs(
+                normalize_rows(embeddings),
+                min_similarity,
+                block_size=self._similarity_block_size
+            )
+            
+            if len(scores):
+                relationship_types = await self._classify_relationship_types(patterns, rows, cols, scores)
+                evidence = await self._generate_relationship_evidence(patterns, rows, cols, relationship_types, scores)
+                
+                discovered_at = datetime.utcnow()
+                relationships = [
+                    SemanticRelationship(
+                        from_pattern_id=patterns[i].id,
+                        to_pattern_id=patterns[j].id,
+                        relationship_type=relationship_type,
+                        strength=float(score),
+                        evidence=pair_evidence,
+                        discovered_at=discovered_at
+                    )
+                    for i, j, score, relationship_type, pair_evidence
+                    in zip(rows.tolist(), cols.tolist(), scores, relationship_types, evidence)
+                ]
             
             # Store relationships in database
             await self._store_semantic_relationships(relationships)
@@ -369,62 +361,83 @@ class PatternIntelligenceEngine:
             raise
     
     # Helper methods for relationship detection
-    async def _classify_relationship_type(
+    async def _classify_relationship_types(
         self, 
-        pattern_1: KnowledgeItem, 
-        pattern_2: KnowledgeItem, 
-        similarity_score: float
-    ) -> str:
-        """Classify the type of relationship between two patterns"""
+        patterns: List[KnowledgeItem], 
+        rows: np.ndarray, 
+        cols: np.ndarray, 
+        scores: np.ndarray
+    ) -> List[str]:
+        """Classify the relationship of every candidate pair (patterns[rows[k]], patterns[cols[k]]) at once"""
         
         # Analyze content overlap and differences
-        title_similarity = await self._calculate_text_similarity(pattern_1.title, pattern_2.title)
-        content_similarity = await self._calculate_text_similarity(pattern_1.content, pattern_2.content)
+        title_similarity = await self._calculate_text_similarities(
+            [patterns[i].title for i in rows], [patterns[j].title for j in cols]
+        )
+        content_similarity = await self._calculate_text_similarities(
+            [patterns[i].content for i in rows], [patterns[j].content for j in cols]
+        )
         
         # Check for code similarity
-        code_similarity = await self._calculate_code_similarity(pattern_1.content, pattern_2.content)
-        
-        # Determine relationship type based on various factors
-        if similarity_score > 0.9 and title_similarity > 0.8:
-            return "duplicate"
-        elif code_similarity > 0.8:
-            return "implementation_variant"
-        elif similarity_score > 0.8:
-            return "very_similar"
-        elif self._are_complementary_patterns(pattern_1, pattern_2):
-            return "complementary"
-        elif self._are_alternative_patterns(pattern_1, pattern_2):
-            return "alternative"
-        elif content_similarity > 0.6:
-            return "related"
-        else:
-            return "similar"
+        code_similarity = await self._calculate_code_similarities(
+            [patterns[i].content for i in rows], [patterns[j].content for j in cols]
+        )
+        
+        complementary = np.fromiter(
+            (self._are_complementary_patterns(patterns[i], patterns[j]) for i, j in zip(rows, cols)),
+            dtype=bool, count=len(rows)
+        )
+        alternative = np.fromiter(
+            (self._are_alternative_patterns(patterns[i], patterns[j]) for i, j in zip(rows, cols)),
+            dtype=bool, count=len(rows)
+        )
+        
+        # First matching rule wins, in order of precedence
+        return np.select(
+            [
+                (scores > 0.9) & (title_similarity > 0.8),
+                code_similarity > 0.8,
+                scores > 0.8,
+                complementary,
+                alternative,
+                content_similarity > 0.6
+            ],
+            ["duplicate", "implementation_variant", "very_similar", "complementary", "alternative", "related"],
+            default="similar"
+        ).tolist()
     
     async def _generate_relationship_evidence(
         self, 
-        pattern_1: KnowledgeItem, 
-        pattern_2: KnowledgeItem, 
-        relationship_type: str, 
-        similarity_score: float
-    ) -> List[str]:
-        """Generate evidence supporting the relationship"""
-        evidence = []
-        
-        evidence.append(f"Semantic similarity score: {similarity_score:.3f}")
-        
-        # Check for shared concepts
-        shared_concepts = await self._find_shared_concepts(pattern_1, pattern_2)
-        if shared_concepts:
-            evidence.append(f"Shared concepts: {', '.join(shared_concepts[:3])}")
-        
-        # Check for shared tags
-        shared_tags = set(pattern_1.tags) & set(pattern_2.tags)
-        if shared_tags:
-            evidence.append(f"Shared tags: {', '.join(list(shared_tags)[:3])}")
+        patterns: List[KnowledgeItem], 
+        rows: np.ndarray, 
+        cols: np.ndarray, 
+        relationship_types: List[str], 
+        scores: np.ndarray
+    ) -> List[List[str]]:
+        """Generate evidence supporting each candidate pair's relationship"""
+        # Concepts and tags are extracted once per pattern, not once per pair
+        concepts = [await self._extract_pattern_concepts(pattern) for pattern in patterns]
+        tags = [set(pattern.tags or []) for pattern in patterns]
         
-        # Check for similar code patterns
-        if relationship_type == "implementation_variant":
-            evidence.append("Similar code implementation patterns detected")
+        evidence = []
+        for i, j, relationship_type, score in zip(rows.tolist(), cols.tolist(), relationship_types, scores.tolist()):
+            pair_evidence = [f"Semantic similarity score: {score:.3f}"]
+            
+            # Check for shared concepts
+            shared_concepts = concepts[i] & concepts[j]
+            if shared_concepts:
+                pair_evidence.append(f"Shared concepts: {', '.join(sorted(shared_concepts)[:3])}")
+            
+            # Check for shared tags
+            shared_tags = tags[i] & tags[j]
+            if shared_tags:
+                pair_evidence.append(f"Shared tags: {', '.join(list(shared_tags)[:3])}")
+            
+            # Check for similar code patterns
+            if relationship_type == "implementation_variant":
+                pair_evidence.append("Similar code implementation patterns detected")
+            
+            evidence.append(pair_evidence)
         
         return evidence
     
@@ -539,23 +552,60 @@ class PatternIntelligenceEngine:
     
     # Database integration methods
     async def _store_semantic_relationships(self, relationships: List[SemanticRelationship]) -> None:
-        """Store semantic relationships in Neo4j"""
-        async with self.db_manager.get_neo4j_session() as session:
-            for rel in relationships:
-                query = """
-                MATCH (a:Pattern {id: $from_id}), (b:Pattern {id: $to_id})
-                MERGE (a)-[r:SEMANTIC_RELATIONSHIP {type: $rel_type}]->(b)
-                SET r.strength = $strength,
-                    r.evidence = $evidence,
-                    r.discovered_at = $discovered_at
+        """Store semantic relationships in PostgreSQL and Neo4j
+        
+        PostgreSQL gets one upsert over unnested arrays; Neo4j gets one
+        UNWIND write per RELATIONSHIP_WRITE_BATCH relationships.
+        """
+        if not relationships:
+            return
+        
+        async with self.db_manager.get_postgres_raw_connection() as conn:
+            await conn.execute(
                 """
+                INSERT INTO knowledge_relationships (
+                    source_knowledge_id, target_knowledge_id, relationship_type,
+                    strength, confidence, description, detected_by
+                )
+                SELECT rel.source_id, rel.target_id, rel.relationship_type,
+                       rel.strength, rel.strength, rel.description, 'semantic_similarity'
+                FROM unnest($1::uuid[], $2::uuid[], $3::text[], $4::real[], $5::text[])
+                    AS rel(source_id, target_id, relationship_type, strength, description)
+                ON CONFLICT (source_knowledge_id, target_knowledge_id, relationship_type) DO UPDATE
+                SET strength = EXCLUDED.strength,
+                    confidence = EXCLUDED.confidence,
+                    description = EXCLUDED.description,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                [rel.from_pattern_id for rel in relationships],
+                [rel.to_pattern_id for rel in relationships],
+                [rel.relationship_type for rel in relationships],
+                [rel.strength for rel in relationships],
+                ["; ".join(rel.evidence) for rel in relationships]
+            )
+        
+        query = """
+        UNWIND $relationships AS rel
+        MATCH (a:Pattern {id: rel.from_id}), (b:Pattern {id: rel.to_id})
+        MERGE (a)-[r:SEMANTIC_RELATIONSHIP {type: rel.rel_type}]->(b)
+        SET r.strength = rel.strength,
+            r.evidence = rel.evidence,
+            r.discovered_at = rel.discovered_at
+        """
+        async with self.db_manager.get_neo4j_session() as session:
+            for start in range(0, len(relationships), RELATIONSHIP_WRITE_BATCH):
                 await session.run(query, {
-                    'from_id': str(rel.from_pattern_id),
-                    'to_id': str(rel.to_pattern_id),
-                    'rel_type': rel.relationship_type,
-                    'strength': rel.strength,
-                    'evidence': rel.evidence,
-                    'discovered_at': rel.discovered_at.isoformat()
+                    'relationships': [
+                        {
+                            'from_id': str(rel.from_pattern_id),
+                            'to_id': str(rel.to_pattern_id),
+                            'rel_type': rel.relationship_type,
+                            'strength': rel.strength,
+                            'evidence': rel.evidence,
+                            'discovered_at': rel.discovered_at.isoformat()
+                        }
+                        for rel in relationships[start:start + RELATIONSHIP_WRITE_BATCH]
+                    ]
                 })
     
     async def _update_pattern_graph(self, relationships: List[SemanticRelationship]) -> None:
@@ -571,15 +621,15 @@ class PatternIntelligenceEngine:
         self._graph_last_updated = datetime.utcnow()
     
     # Placeholder implementations for complex methods
-    async def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate semantic similarity between texts"""
+    async def _calculate_text_similarities(self, texts_1: List[str], texts_2: List[str]) -> np.ndarray:
+        """Calculate semantic similarity between aligned pairs of texts"""
         # Would use advanced NLP models like BERT
-        return 0.5  # Placeholder
+        return np.full(len(texts_1), 0.5)  # Placeholder
     
-    async def _calculate_code_similarity(self, content1: str, content2: str) -> float:
-        """Calculate code similarity using AST analysis"""
+    async def _calculate_code_similarities(self, contents_1: List[str], contents_2: List[str]) -> np.ndarray:
+        """Calculate code similarity between aligned pairs of contents using AST analysis"""
         # Would use AST comparison and code structure analysis
-        return 0.5  # Placeholder
+        return np.full(len(contents_1), 0.5)  # Placeholder
     
     def _are_complementary_patterns(self, p1: KnowledgeItem, p2: KnowledgeItem) -> bool:
         """Check if patterns are complementary"""
@@ -591,10 +641,10 @@ class PatternIntelligenceEngine:
         # Would analyze if patterns solve the same problem differently
         return False  # Placeholder
     
-    async def _find_shared_concepts(self, p1: KnowledgeItem, p2: KnowledgeItem) -> List[str]:
-        """Find shared concepts between patterns"""
+    async def _extract_pattern_concepts(self, pattern: KnowledgeItem) -> Set[str]:
+        """Extract the concepts of a pattern; pairs share the intersection"""
         # Would use NLP concept extraction
-        return []  # Placeholder
+        return set()  # Placeholder
     
     # Additional placeholder methods for full implementation...
     async def _semantic_pattern_search(self, query: str, context: PatternContext) -> List[KnowledgeItem]:
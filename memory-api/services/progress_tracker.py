@@ -4,7 +4,7 @@
 import json
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 from uuid import UUID
 import asyncio
 import redis.asyncio as redis
@@ -19,6 +19,7 @@ class ProgressTracker:
         self.redis = redis_client
         self.progress_key_prefix = "betty:progress:"
         self.progress_ttl = 3600  # 1 hour TTL for progress data
+        self.scan_batch_size = 500
     
     async def start_progress(self, operation_id: UUID, initial_message: str = "Starting operation"):
         """Start tracking progress for an operation"""
@@ -217,31 +218,35 @@ class ProgressTracker:
     async def get_multiple_progress(self, operation_ids: List[UUID]) -> Dict[str, Optional[Dict[str, Any]]]:
         """Get progress for multiple operations"""
         try:
-            results = {}
+            if not operation_ids:
+                return {}
             
-            for operation_id in operation_ids:
-                progress = await self.get_progress(operation_id)
-                results[str(operation_id)] = progress
-            
-            return results
+            values = await self.redis.mget([f"{self.progress_key_prefix}{op_id}" for op_id in operation_ids])
+            return {
+                str(operation_id): json.loads(data) if data else None
+                for operation_id, data in zip(operation_ids, values)
+            }
             
         except Exception as e:
             logger.error("Failed to get multiple progress", error=str(e))
             return {}
     
+    async def _scan_progress(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Walk progress entries with SCAN, reading each batch with one MGET"""
+        keys = [key async for key in self.redis.scan_iter(match=f"{self.progress_key_prefix}*", count=1000)]
+        for start in range(0, len(keys), self.scan_batch_size):
+            batch = keys[start:start + self.scan_batch_size]
+            for key, data in zip(batch, await self.redis.mget(batch)):
+                if data:
+                    yield key, json.loads(data)
+    
     async def list_active_operations(self) -> List[Dict[str, Any]]:
         """List all active operations being tracked"""
         try:
-            pattern = f"{self.progress_key_prefix}*"
-            keys = await self.redis.keys(pattern)
-            
             active_operations = []
-            for key in keys:
-                data = await self.redis.get(key)
-                if data:
-                    progress_data = json.loads(data)
-                    if progress_data.get("status") in ["running", "paused"]:
-                        active_operations.append(progress_data)
+            async for _, progress_data in self._scan_progress():
+                if progress_data.get("status") in ["running", "paused"]:
+                    active_operations.append(progress_data)
             
             # Sort by start time (most recent first)
             active_operations.sort(
@@ -258,26 +263,22 @@ class ProgressTracker:
     async def cleanup_expired_progress(self, max_age_hours: int = 24):
         """Clean up expired progress entries"""
         try:
-            pattern = f"{self.progress_key_prefix}*"
-            keys = await self.redis.keys(pattern)
-            
-            cleanup_count = 0
             cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
             
-            for key in keys:
-                data = await self.redis.get(key)
-                if data:
-                    progress_data = json.loads(data)
-                    
-                    # Check if operation is old and completed/failed
-                    last_updated = progress_data.get("last_updated")
-                    status = progress_data.get("status", "")
-                    
-                    if last_updated and status in ["completed", "failed", "cancelled"]:
-                        update_time = datetime.fromisoformat(last_updated)
-                        if update_time < cutoff_time:
-                            await self.redis.delete(key)
-                            cleanup_count += 1
+            expired = []
+            async for key, progress_data in self._scan_progress():
+                # Check if operation is old and completed/failed
+                last_updated = progress_data.get("last_updated")
+                status = progress_data.get("status", "")
+                
+                if last_updated and status in ["completed", "failed", "cancelled"]:
+                    update_time = datetime.fromisoformat(last_updated)
+                    if update_time < cutoff_time:
+                        expired.append(key)
+            
+            cleanup_count = 0
+            for start in range(0, len(expired), self.scan_batch_size):
+                cleanup_count += await self.redis.unlink(*expired[start:start + self.scan_batch_size])
             
             logger.info(f"Cleaned up {cleanup_count} expired progress entries")
             return cleanup_count
@@ -289,11 +290,8 @@ class ProgressTracker:
     async def get_progress_statistics(self) -> Dict[str, Any]:
         """Get statistics about progress tracking"""
         try:
-            pattern = f"{self.progress_key_prefix}*"
-            keys = await self.redis.keys(pattern)
-            
             stats = {
-                "total_operations": len(keys),
+                "total_operations": 0,
                 "status_counts": {
                     "running": 0,
                     "paused": 0,
@@ -307,32 +305,27 @@ class ProgressTracker:
                 "newest_operation": None
             }
             
-            if not keys:
-                return stats
-            
             total_progress = 0
             operation_times = []
             
-            for key in keys:
-                data = await self.redis.get(key)
-                if data:
-                    progress_data = json.loads(data)
-                    
-                    status = progress_data.get("status", "unknown")
-                    if status in stats["status_counts"]:
-                        stats["status_counts"][status] += 1
-                    
-                    progress = progress_data.get("progress_percentage", 0)
-                    total_progress += progress
-                    
-                    if progress_data.get("errors"):
-                        stats["operations_with_errors"] += 1
-                    
-                    if progress_data.get("started_at"):
-                        operation_times.append(progress_data["started_at"])
-            
-            if len(keys) > 0:
-                stats["average_progress"] = total_progress / len(keys)
+            async for _, progress_data in self._scan_progress():
+                stats["total_operations"] += 1
+                
+                status = progress_data.get("status", "unknown")
+                if status in stats["status_counts"]:
+                    stats["status_counts"][status] += 1
+                
+                progress = progress_data.get("progress_percentage", 0)
+                total_progress += progress
+                
+                if progress_data.get("errors"):
+                    stats["operations_with_errors"] += 1
+                
+                if progress_data.get("started_at"):
+                    operation_times.append(progress_data["started_at"])
+            
+            if stats["total_operations"] > 0:
+                stats["average_progress"] = total_progress / stats["total_operations"]
             
             if operation_times:
                 operation_times.sort()
@@ -17,6 +17,7 @@ from models.websocket import (
     WebSocketHeartbeat, WebSocketError, create_error_message, create_notification_message
 )
 from models.webhooks import EventType
+from core.rate_limiter import LocalRateLimiter, Quota
 # from core.security import decode_jwt_token  # Not available
 
 logger = structlog.get_logger(__name__)
@@ -44,8 +45,8 @@ class ConnectionManager:
         # Connection statistics
         self.connection_stats: Dict[UUID, Dict[str, Any]] = defaultdict(dict)
         
-        # Rate limiting: connection_id -> message_timestamps
-        self.rate_limiting: Dict[UUID, List[float]] = defaultdict(list)
+        # Rate limiting: a connection lives on one worker, so its limit is per-process
+        self.rate_limiter = LocalRateLimiter()
     
     async def connect(
         self, 
@@ -141,8 +142,7 @@ class ConnectionManager:
                     del self.room_connections[room_id]
             
             # Cleanup rate limiting
-            if connection_id in self.rate_limiting:
-                del self.rate_limiting[connection_id]
+            self.rate_limiter.forget(str(connection_id))
             
             # Cleanup statistics
             if connection_id in self.connection_stats:
@@ -346,19 +346,8 @@ class ConnectionManager:
     
     def _check_rate_limit(self, connection_id: UUID, max_messages_per_minute: int = 60) -> bool:
         """Check if connection is within rate limits"""
-        now = time.time()
-        timestamps = self.rate_limiting[connection_id]
-        
-        # Remove old timestamps (older than 1 minute)
-        timestamps[:] = [ts for ts in timestamps if now - ts < 60]
-        
-        # Check limit
-        if len(timestamps) >= max_messages_per_minute:
-            return False
-        
-        # Add current timestamp
-        timestamps.append(now)
-        return True
+        quota = Quota(limit=max_messages_per_minute, period=60)
+        return self.rate_limiter.check(str(connection_id), quota).allowed
 
 
 class RealTimeService:
@@ -21,8 +21,9 @@ from models.retrieval import (
     RecommendationType, ContextDepth
 )
 from services.base_service import BaseService
-from services.vector_service import VectorService
+from services.vector_service import VectorService, VectorSearch
 from services.knowledge_service import KnowledgeService
+from services.keyword_search import parse_keyword_query
 
 logger = structlog.get_logger(__name__)
 
@@ -42,16 +43,25 @@ class RetrievalService(BaseService):
             # Generate context embedding for semantic search
             context_text = self._build_context_text(request.current_context)
             
+            # Embed the context once and run every vector search in one batch
+            legs = ["relevant_knowledge", "similar_patterns"]
+            if request.include_cross_project:
+                legs.append("cross_project_insights")
+            if request.context_depth in [ContextDepth.DETAILED, ContextDepth.COMPREHENSIVE]:
+                legs.append("historical_solutions")
+            
+            vector_results = await self._execute_context_searches(request, context_text, legs)
+            
             # Execute parallel searches for different types of knowledge
             tasks = [
-                self._find_relevant_knowledge(request, context_text),
-                self._find_similar_patterns(request, context_text),
-                self._find_cross_project_insights(request, context_text)
+                self._find_relevant_knowledge(request, context_text, vector_results.get("relevant_knowledge")),
+                self._find_similar_patterns(request, context_text, vector_results.get("similar_patterns")),
+                self._find_cross_project_insights(request, context_text, vector_results.get("cross_project_insights"))
             ]
             
             if request.context_depth in [ContextDepth.DETAILED, ContextDepth.COMPREHENSIVE]:
                 tasks.extend([
-                    self._find_historical_solutions(request, context_text),
+                    self._find_historical_solutions(request, context_text, vector_results.get("historical_solutions")),
                     self._find_technology_evolution(request)
                 ])
             
@@ -132,15 +142,72 @@ class RetrievalService(BaseService):
         
         return " ".join(parts)
     
-    async def _find_relevant_knowledge(self, request: ContextLoadRequest, context_text: str) -> List[RelevantKnowledge]:
+    def _context_search(self, request: ContextLoadRequest, leg: str) -> VectorSearch:
+        """Vector search parameters for one leg of the context load"""
+        if leg == "relevant_knowledge":
+            return VectorSearch(limit=min(request.max_items, 50), similarity_threshold=request.similarity_threshold, profile="context")
+        if leg == "similar_patterns":
+            return VectorSearch(limit=20, similarity_threshold=0.6, profile="context")
+        if leg == "cross_project_insights":
+            # Broad, low-threshold sweep; quantized scores are good enough
+            return VectorSearch(limit=30, similarity_threshold=0.5, profile="bulk")
+        if leg == "historical_solutions":
+            return VectorSearch(limit=15, similarity_threshold=0.6, profile="context")
+        raise ValueError(f"Unknown context search leg: {leg}")
+    
+    async def _execute_context_searches(
+        self,
+        request: ContextLoadRequest,
+        context_text: str,
+        legs: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Embed the context once and issue all leg searches as one Qdrant batch"""
+        try:
+            query_vector = await self.vector_service.get_embedding(context_text)
+            
+            batch_results = await self.vector_service.search_batch(
+                [self._context_search(request, leg) for leg in legs],
+                query_vector=query_vector,
+                collection_name="knowledge_items"
+            )
+            
+            return dict(zip(legs, batch_results))
+            
+        except Exception as e:
+            logger.error("Context vector searches failed", legs=legs, error=str(e))
+            return {leg: [] for leg in legs}
+    
+    async def _search_context_leg(
+        self,
+        request: ContextLoadRequest,
+        leg: str,
+        context_text: str,
+        vector_results: Optional[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Use batched results for a leg, or search on its own when called standalone"""
+        if vector_results is not None:
+            return vector_results
+        
+        search = self._context_search(request, leg)
+        return await self.vector_service.search_similar(
+            query=context_text,
+            collection_name="knowledge_items",
+            limit=search.limit,
+            similarity_threshold=search.similarity_threshold,
+            profile=search.profile
+        )
+    
+    async def _find_relevant_knowledge(
+        self,
+        request: ContextLoadRequest,
+        context_text: str,
+        vector_results: Optional[List[Dict[str, Any]]] = None
+    ) -> List[RelevantKnowledge]:
         """Find relevant knowledge items using vector similarity"""
         try:
             # Vector search
-            vector_results = await self.vector_service.search_similar(
-                query=context_text,
-                collection_name="knowledge_items",
-                limit=min(request.max_items, 50),
-                similarity_threshold=request.similarity_threshold
+            vector_results = await self._search_context_leg(
+                request, "relevant_knowledge", context_text, vector_results
             )
             
             if not vector_results:
@@ -193,17 +260,17 @@ class RetrievalService(BaseService):
             logger.error("Failed to find relevant knowledge", error=str(e))
             return []
     
-    async def _find_similar_patterns(self, request: ContextLoadRequest, context_text: str) -> List[PatternUsage]:
+    async def _find_similar_patterns(
+        self,
+        request: ContextLoadRequest,
+        context_text: str,
+        vector_results: Optional[List[Dict[str, Any]]] = None
+    ) -> List[PatternUsage]:
         """Find similar architectural and technical patterns"""
         try:
             # Search for pattern-related knowledge
-            pattern_query = f"pattern architecture solution {context_text}"
-            
-            vector_results = await self.vector_service.search_similar(
-                query=pattern_query,
-                collection_name="knowledge_items",
-                limit=20,
-                similarity_threshold=0.6
+            vector_results = await self._search_context_leg(
+                request, "similar_patterns", context_text, vector_results
             )
             
             if not vector_results:
@@ -266,18 +333,20 @@ class RetrievalService(BaseService):
             logger.error("Failed to find similar patterns", error=str(e))
             return []
     
-    async def _find_cross_project_insights(self, request: ContextLoadRequest, context_text: str) -> List[CrossProjectInsight]:
+    async def _find_cross_project_insights(
+        self,
+        request: ContextLoadRequest,
+        context_text: str,
+        vector_results: Optional[List[Dict[str, Any]]] = None
+    ) -> List[CrossProjectInsight]:
         """Find insights from other projects"""
         try:
             if not request.include_cross_project:
                 return []
             
             # Search across all projects except current
-            vector_results = await self.vector_service.search_similar(
-                query=context_text,
-                collection_name="knowledge_items",
-                limit=30,
-                similarity_threshold=0.5
+            vector_results = await self._search_context_leg(
+                request, "cross_project_insights", context_text, vector_results
             )
             
             if not vector_results:
@@ -323,17 +392,17 @@ class RetrievalService(BaseService):
             logger.error("Failed to find cross-project insights", error=str(e))
             return []
     
-    async def _find_historical_solutions(self, request: ContextLoadRequest, context_text: str) -> List[Dict[str, Any]]:
+    async def _find_historical_solutions(
+        self,
+        request: ContextLoadRequest,
+        context_text: str,
+        vector_results: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
         """Find historical solutions to similar problems"""
         try:
             # Search for solution-type knowledge
-            solution_query = f"solution problem solved fixed {context_text}"
-            
-            vector_results = await self.vector_service.search_similar(
-                query=solution_query,
-                collection_name="knowledge_items",
-                limit=15,
-                similarity_threshold=0.6
+            vector_results = await self._search_context_leg(
+                request, "historical_solutions", context_text, vector_results
             )
             
             if not vector_results:
@@ -408,7 +477,8 @@ class RetrievalService(BaseService):
                 query=search_text,
                 collection_name="knowledge_items",
                 limit=request.max_results * 2,  # Get more to filter
-                similarity_threshold=request.similarity_threshold
+                similarity_threshold=request.similarity_threshold,
+                profile="interactive"
             )
             
             if not vector_results:
@@ -509,7 +579,8 @@ class RetrievalService(BaseService):
                 query=tech_query,
                 collection_name="knowledge_items",
                 limit=50,
-                similarity_threshold=0.4
+                similarity_threshold=0.4,
+                profile="bulk"
             )
             
             if not vector_results:
@@ -685,15 +756,27 @@ class RetrievalService(BaseService):
     async def _get_technology_usage_history(self, technology: str) -> List[Dict[str, Any]]:
         """Get usage history for a specific technology"""
         try:
-            stmt = text("""
+            # Tagged technologies hit the GIN index on technologies; free-text
+            # mentions go through the search_vector GIN index, or the trigram
+            # indexes for names the stemmer would split (Node.js, C++, next/router)
+            keyword_query = parse_keyword_query(technology)
+            match_conditions = ["technologies @> jsonb_build_array(CAST(:tech AS text))"]
+            if keyword_query.has_text_query:
+                match_conditions.append(f"search_vector @@ ({keyword_query.tsquery_sql()})")
+            if keyword_query.identifiers:
+                match_conditions.append(keyword_query.identifier_match_sql(["title", "content"]))
+            
+            stmt = text(f"""
                 SELECT project_id, created_at, metadata, title, content
                 FROM knowledge_items 
                 WHERE valid_until IS NULL 
-                AND (content ILIKE :tech OR title ILIKE :tech OR metadata::text ILIKE :tech)
+                AND ({" OR ".join(match_conditions)})
                 ORDER BY created_at ASC
             """)
             
-            result = await self.postgres.execute(stmt, {"tech": f"%{technology}%"})
+            params = {"tech": technology}
+            params.update(keyword_query.params())
+            result = await self.postgres.execute(stmt, params)
             rows = result.fetchall()
             
             history = []
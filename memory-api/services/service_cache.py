@@ -0,0 +1,211 @@
+# ABOUTME: In-process tier and request coalescing for BaseService read-through caching
+# ABOUTME: Bounded LRU of fresh/stale entries with local tag index, singleflight misses and orjson serialization
+
+import asyncio
+import copy
+import fnmatch
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Set
+
+import orjson
+import structlog
+
+from core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "dict"):
+        return value.dict()
+    return str(value)
+
+def dumps(value: Any) -> bytes:
+    """Serialize for Redis: orjson, with pydantic models as dicts and str() as the fallback"""
+    return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+
+def loads(data: Any) -> Any:
+    return orjson.loads(data)
+
+@dataclass
+class CacheEntry:
+    """A cached value, fresh until ``fresh_until`` and servable until ``stale_until`` (epoch seconds)"""
+    value: Any
+    fresh_until: float
+    stale_until: float
+    tags: FrozenSet[str] = field(default_factory=frozenset)
+    local_until: float = float("inf")
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+class LocalCache:
+    """Bounded in-process LRU in front of Redis
+
+    Entries live here for at most ``ttl`` seconds so writes made by other
+    workers are picked up quickly; invalidations made in this process
+    drop entries immediately, by key or by tag. Values are copied on the
+    way in and out, so a caller mutating what it got cannot change what
+    later callers are served.
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is None or now >= min(entry.local_until, entry.stale_until):
+            if entry is not None:
+                self.invalidate(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return replace(entry, value=copy.deepcopy(entry.value))
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        self.invalidate(key)
+        entry = replace(entry, value=copy.deepcopy(entry.value), local_until=time.time() + self.ttl)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self.invalidate(oldest)
+
+    def invalidate(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self.invalidate(key)
+
+    def invalidate_matching(self, pattern: str) -> None:
+        """Drop entries whose key matches a Redis-style glob"""
+        for key in [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]:
+            self.invalidate(key)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+class SingleFlight:
+    """Runs at most one fetch per key at a time; concurrent callers share its result
+
+    The fetch runs as its own task, so a caller that is cancelled does not
+    cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _start(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Cache fetch failed", key=key, error=str(task.exception()))
+
+    async def do(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        return await asyncio.shield(self._start(key, fetch))
+
+    def refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """Start a background fetch for key unless one is already running"""
+        self._start(key, fetch)
+
+class InvalidationLog:
+    """Generation at which each key, tag and pattern was last invalidated
+
+    A fetch notes the current generation when it starts and only stores its
+    result if nothing covering its key or tags was invalidated since, so an
+    invalidation voids just the fetches it makes stale. The log keeps the
+    most recent max_entries keys and tags; a fetch older than the newest
+    forgotten one is treated as stale.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._floor = 0
+        self._keys: "OrderedDict[str, int]" = OrderedDict()
+        self._tags: "OrderedDict[str, int]" = OrderedDict()
+        self._patterns: "OrderedDict[str, int]" = OrderedDict()
+
+    def record(self, keys: Iterable[str] = (), tags: Iterable[str] = (), pattern: Optional[str] = None) -> None:
+        self.generation += 1
+        for log, names in ((self._keys, keys), (self._tags, tags), (self._patterns, [pattern] if pattern else ())):
+            for name in names:
+                log[name] = self.generation
+                log.move_to_end(name)
+            while len(log) > self.max_entries:
+                _, forgotten = log.popitem(last=False)
+                self._floor = max(self._floor, forgotten)
+
+    def unchanged_since(self, generation: int, key: str, tags: Iterable[str] = ()) -> bool:
+        """Whether nothing covering key or tags was invalidated after generation"""
+        if generation < self._floor or self._keys.get(key, 0) > generation:
+            return False
+        if any(self._tags.get(tag, 0) > generation for tag in tags):
+            return False
+        return not any(
+            invalidated > generation and fnmatch.fnmatchcase(key, pattern)
+            for pattern, invalidated in self._patterns.items()
+        )
+
+@dataclass
+class ServiceCache:
+    """Process-wide state shared by every BaseService instance"""
+    local: LocalCache
+    flights: SingleFlight
+    stale_ttl: float
+    # Local invalidations; a fetch that started before one covering its key or tags does not store its result
+    invalidations: InvalidationLog = field(default_factory=InvalidationLog)
+
+_service_cache_instance: Optional[ServiceCache] = None
+
+def get_service_cache() -> ServiceCache:
+    """Get the process-wide service cache"""
+    global _service_cache_instance
+
+    if _service_cache_instance is None:
+        settings = get_settings()
+        _service_cache_instance = ServiceCache(
+            local=LocalCache(max_entries=settings.cache_l1_max_entries, ttl=settings.cache_l1_ttl),
+            flights=SingleFlight(),
+            stale_ttl=settings.cache_stale_ttl
+        )
+
+    return _service_cache_instance
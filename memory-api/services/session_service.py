@@ -22,10 +22,21 @@ from models.session import (
 )
 from models.base import PaginationParams
 from services.base_service import BaseService
+from services.keyset_pagination import decode_cursor
 from services.vector_service import VectorService
 
 logger = structlog.get_logger(__name__)
 
+MESSAGE_COLUMNS = (
+    "id, session_id, content, role, message_type, function_name, function_args, attachments, "
+    "parent_message_id, context_window, prompt_tokens, completion_tokens, token_count, metadata, "
+    "created_at, updated_at, embedding_id"
+)
+CONTEXT_MESSAGE_COLUMNS = MESSAGE_COLUMNS.replace("context_window, ", "")
+
+# Rows fetched per round trip while walking a session for build_context
+CONTEXT_SCAN_PREFETCH = 100
+
 class SessionService(BaseService):
     """Service for session and message operations"""
     
@@ -75,7 +86,7 @@ class SessionService(BaseService):
                 logger.warning("Failed to create session graph node", error=str(e))
             
             # Invalidate cache
-            await self.invalidate_related_cache("sessions:*")
+            await self.cache_invalidate_tags("sessions:aggregates")
             
             await self.log_operation("create_session", "sessions", str(session_id))
             
@@ -140,21 +151,10 @@ class SessionService(BaseService):
         cache_key = self.generate_cache_key("sessions", "session", str(session_id))
         
         async def fetch_session():
+            # Message counters are maintained on the session row by create_message
             stmt = text("""
-                SELECT s.*, 
-                       COALESCE(m.message_count, 0) as message_count,
-                       COALESCE(m.token_count, 0) as token_count,
-                       COALESCE(m.last_message_at, s.created_at) as last_message_at
+                SELECT s.*
                 FROM sessions s
-                LEFT JOIN (
-                    SELECT session_id,
-                           COUNT(*) as message_count,
-                           SUM(COALESCE(token_count, 0)) as token_count,
-                           MAX(created_at) as last_message_at
-                    FROM messages 
-                    WHERE deleted_at IS NULL
-                    GROUP BY session_id
-                ) m ON s.id = m.session_id
                 WHERE s.id = :id AND s.deleted_at IS NULL
             """)
             
@@ -176,14 +176,21 @@ class SessionService(BaseService):
                 metadata=row.metadata or {},
                 created_at=row.created_at,
                 updated_at=row.updated_at,
-                message_count=row.message_count,
-                token_count=row.token_count,
-                last_message_at=row.last_message_at,
+                message_count=row.message_count or 0,
+                token_count=row.token_count or 0,
+                last_message_at=row.last_message_at or row.created_at,
                 access_count=row.access_count or 0,
                 last_accessed_at=row.last_accessed_at
             )
         
-        return await self.execute_with_cache(cache_key, fetch_session)
+        return await self.execute_with_cache(
+            cache_key,
+            fetch_session,
+            tags=lambda session: [f"sessions:session:{session_id}"] + (
+                [f"sessions:user:{session.user_id}"] if session and session.user_id else []
+            ),
+            model=Session
+        )
     
     async def update_session(
         self,
@@ -234,8 +241,7 @@ class SessionService(BaseService):
                 return None
             
             # Invalidate cache
-            await self.cache_delete(self.generate_cache_key("sessions", "session", str(session_id)))
-            await self.invalidate_related_cache("sessions:*")
+            await self.cache_invalidate_tags(f"sessions:session:{session_id}", "sessions:aggregates")
             
             await self.log_operation("update_session", "sessions", str(session_id))
             
@@ -291,8 +297,7 @@ class SessionService(BaseService):
                 logger.warning("Failed to delete session graph relationships", error=str(e))
             
             # Invalidate cache
-            await self.cache_delete(self.generate_cache_key("sessions", "session", str(session_id)))
-            await self.invalidate_related_cache("sessions:*")
+            await self.cache_invalidate_tags(f"sessions:session:{session_id}", "sessions:aggregates")
             
             await self.log_operation("delete_session", "sessions", str(session_id))
             
@@ -326,9 +331,18 @@ class SessionService(BaseService):
     async def list_sessions(
         self,
         pagination: PaginationParams,
-        filters: Dict[str, Any] = None
+        filters: Dict[str, Any] = None,
+        cursor: Optional[str] = None,
+        approximate_count: bool = False
     ) -> Tuple[List[Session], int]:
-        """List sessions with filtering and pagination"""
+        """List sessions with filtering and pagination
+        
+        Sessions are ordered by (updated_at, id) descending. With a cursor
+        from encode_cursor(last.updated_at, last.id) the page seeks past the
+        previous one instead of using OFFSET; an invalid cursor raises
+        ValueError. approximate_count takes the total from the planner's
+        estimate when it is large.
+        """
         try:
             # Build WHERE conditions
             where_conditions = ["deleted_at IS NULL"]
@@ -357,32 +371,22 @@ class SessionService(BaseService):
             where_clause = " AND ".join(where_conditions)
             
             # Get total count
-            count_stmt = text(f"""
-                SELECT COUNT(*) FROM sessions 
-                WHERE {where_clause}
-            """)
+            count_params = {key: value for key, value in params.items() if key not in ("limit", "offset")}
+            total_count = await self.count_rows("sessions", where_clause, count_params, approximate=approximate_count)
             
-            count_result = await self.postgres.execute(count_stmt, params)
-            total_count = count_result.scalar()
+            # Keyset pagination: seek past the last row of the previous page
+            page_conditions = list(where_conditions)
+            if cursor:
+                params["cursor_updated_at"], params["cursor_id"] = decode_cursor(cursor)
+                page_conditions.append("(updated_at, id) < (:cursor_updated_at, :cursor_id)")
+                params["offset"] = 0
             
-            # Get sessions with message stats
+            # Get sessions; message stats are maintained on the session row
             stmt = text(f"""
-                SELECT s.*, 
-                       COALESCE(m.message_count, 0) as message_count,
-                       COALESCE(m.token_count, 0) as token_count,
-                       COALESCE(m.last_message_at, s.created_at) as last_message_at
+                SELECT s.*
                 FROM sessions s
-                LEFT JOIN (
-                    SELECT session_id,
-                           COUNT(*) as message_count,
-                           SUM(COALESCE(token_count, 0)) as token_count,
-                           MAX(created_at) as last_message_at
-                    FROM messages 
-                    WHERE deleted_at IS NULL
-                    GROUP BY session_id
-                ) m ON s.id = m.session_id
-                WHERE {where_clause}
-                ORDER BY s.updated_at DESC
+                WHERE {" AND ".join(page_conditions)}
+                ORDER BY s.updated_at DESC, s.id DESC
                 LIMIT :limit OFFSET :offset
             """)
             
@@ -403,9 +407,9 @@ class SessionService(BaseService):
                     metadata=row.metadata or {},
                     created_at=row.created_at,
                     updated_at=row.updated_at,
-                    message_count=row.message_count,
-                    token_count=row.token_count,
-                    last_message_at=row.last_message_at,
+                    message_count=row.message_count or 0,
+                    token_count=row.token_count or 0,
+                    last_message_at=row.last_message_at or row.created_at,
                     access_count=row.access_count or 0,
                     last_accessed_at=row.last_accessed_at
                 )
@@ -430,19 +434,30 @@ class SessionService(BaseService):
             index_result = await self.postgres.execute(index_stmt, {"session_id": message_data.session_id})
             message_index = index_result.scalar() or 0
             
+            # Insert the message and bump the session's counters in one statement
             stmt = text("""
-                INSERT INTO messages (
-                    id, session_id, content, role, message_type, function_name,
-                    function_args, attachments, parent_message_id, context_window,
-                    prompt_tokens, completion_tokens, token_count, message_index, metadata,
-                    created_at, updated_at
-                ) VALUES (
-                    :id, :session_id, :content, :role, :message_type, :function_name,
-                    :function_args, :attachments, :parent_message_id, :context_window,
-                    :prompt_tokens, :completion_tokens, :token_count, :message_index, :metadata,
-                    :created_at, :updated_at
+                WITH inserted AS (
+                    INSERT INTO messages (
+                        id, session_id, content, role, message_type, function_name,
+                        function_args, attachments, parent_message_id, context_window,
+                        prompt_tokens, completion_tokens, token_count, message_index, metadata,
+                        created_at, updated_at
+                    ) VALUES (
+                        :id, :session_id, :content, :role, :message_type, :function_name,
+                        :function_args, :attachments, :parent_message_id, :context_window,
+                        :prompt_tokens, :completion_tokens, :token_count, :message_index, :metadata,
+                        :created_at, :updated_at
+                    )
+                    RETURNING *
+                ), counters AS (
+                    UPDATE sessions
+                    SET message_count = COALESCE(message_count, 0) + 1,
+                        token_count = COALESCE(token_count, 0) + :token_count,
+                        last_message_at = GREATEST(last_message_at, :created_at),
+                        updated_at = :updated_at
+                    WHERE id = :session_id
                 )
-                RETURNING *
+                SELECT * FROM inserted
             """)
             
             now = datetime.utcnow()
@@ -469,9 +484,6 @@ class SessionService(BaseService):
             await self.postgres.commit()
             row = result.fetchone()
             
-            # Update session last_message_at
-            await self._update_session_last_message(message_data.session_id, now)
-            
             # Create vector embedding for searchable messages
             if message_data.role in ["user", "assistant"] and len(message_data.content) > 50:
                 try:
@@ -492,8 +504,8 @@ class SessionService(BaseService):
                 except Exception as e:
                     logger.warning("Failed to create message embedding", error=str(e))
             
-            # Invalidate cache
-            await self.invalidate_related_cache("sessions:*")
+            # Invalidate cache: the session's message counts and aggregates
+            await self.cache_invalidate_tags(f"sessions:session:{message_data.session_id}", "sessions:aggregates")
             
             await self.log_operation("create_message", "messages", str(message_id))
             
@@ -521,20 +533,6 @@ class SessionService(BaseService):
             logger.error("Failed to create message", error=str(e))
             raise
     
-    async def _update_session_last_message(self, session_id: UUID, timestamp: datetime) -> None:
-        """Update session's last message timestamp"""
-        stmt = text("""
-            UPDATE sessions 
-            SET last_message_at = :timestamp, updated_at = :timestamp
-            WHERE id = :session_id
-        """)
-        
-        await self.postgres.execute(stmt, {
-            "timestamp": timestamp,
-            "session_id": session_id
-        })
-        await self.postgres.commit()
-    
     async def _update_message_embedding_id(self, message_id: UUID, embedding_id: str) -> None:
         """Update message embedding_id in database"""
         stmt = text("""
@@ -554,32 +552,48 @@ class SessionService(BaseService):
         self,
         session_id: UUID,
         pagination: PaginationParams,
-        include_context: bool = False
+        include_context: bool = False,
+        cursor: Optional[str] = None
     ) -> Tuple[List[Message], int]:
-        """Get messages for a session"""
+        """Get messages for a session in chronological order
+        
+        With a cursor from encode_cursor(last.created_at, last.id) the page
+        seeks past the previous one instead of using OFFSET; an invalid
+        cursor raises ValueError.
+        """
         try:
-            # Get total count
+            # Total comes from the counter maintained by create_message
             count_stmt = text("""
-                SELECT COUNT(*) FROM messages 
-                WHERE session_id = :session_id AND deleted_at IS NULL
+                SELECT message_count FROM sessions 
+                WHERE id = :session_id AND deleted_at IS NULL
             """)
             
             count_result = await self.postgres.execute(count_stmt, {"session_id": session_id})
-            total_count = count_result.scalar()
+            total_count = count_result.scalar() or 0
+            
+            params = {
+                "session_id": session_id,
+                "limit": pagination.limit,
+                "offset": pagination.offset
+            }
+            
+            # Keyset pagination: seek past the last row of the previous page
+            seek_condition = ""
+            if cursor:
+                params["cursor_created_at"], params["cursor_id"] = decode_cursor(cursor)
+                params["offset"] = 0
+                seek_condition = "AND (created_at, id) > (:cursor_created_at, :cursor_id)"
             
             # Get messages
-            stmt = text("""
-                SELECT * FROM messages 
+            stmt = text(f"""
+                SELECT {MESSAGE_COLUMNS} FROM messages 
                 WHERE session_id = :session_id AND deleted_at IS NULL
-                ORDER BY created_at ASC
+                {seek_condition}
+                ORDER BY created_at ASC, id ASC
                 LIMIT :limit OFFSET :offset
             """)
             
-            result = await self.postgres.execute(stmt, {
-                "session_id": session_id,
-                "limit": pagination.limit,
-                "offset": pagination.offset
-            })
+            result = await self.postgres.execute(stmt, params)
             
             rows = result.fetchall()
             
@@ -637,10 +651,10 @@ class SessionService(BaseService):
                 return {"session": None, "messages": [], "total_messages": 0, "total_tokens": 0}
             
             # Get all messages
-            stmt = text("""
-                SELECT * FROM messages 
+            stmt = text(f"""
+                SELECT {MESSAGE_COLUMNS} FROM messages 
                 WHERE session_id = :session_id AND deleted_at IS NULL
-                ORDER BY created_at ASC
+                ORDER BY created_at ASC, id ASC
             """)
             
             result = await self.postgres.execute(stmt, {"session_id": session_id})
@@ -685,64 +699,79 @@ class SessionService(BaseService):
             raise
     
     async def build_context(self, request: ContextRequest) -> Dict[str, Any]:
-        """Build conversation context for AI processing"""
+        """Build conversation context for AI processing
+        
+        Walks the session newest-first over a server-side cursor that reads
+        only ids, roles and token counts from the (session_id, created_at)
+        index and stops as soon as the token budget is spent; only the
+        selected messages are then loaded, in chronological order.
+        """
         try:
-            # Get recent messages within token limit
-            messages = []
+            selected_ids = []
             total_tokens = 0
             truncated = False
             
-            # Get messages in reverse chronological order
-            stmt = text("""
-                SELECT * FROM messages 
-                WHERE session_id = :session_id AND deleted_at IS NULL
-                ORDER BY created_at DESC
-                LIMIT :message_limit
-            """)
-            
-            result = await self.postgres.execute(stmt, {
-                "session_id": request.session_id,
-                "message_limit": request.message_limit
-            })
+            scan_query = """
+                SELECT id, role, token_count
+                FROM messages
+                WHERE session_id = $1 AND deleted_at IS NULL
+                ORDER BY created_at DESC, id DESC
+                LIMIT $2
+            """
             
-            rows = result.fetchall()
+            async with self.postgres.raw_connection() as conn:
+                # asyncpg cursors only exist inside a transaction
+                async with conn.transaction():
+                    async for row in conn.cursor(
+                        scan_query,
+                        request.session_id,
+                        request.message_limit,
+                        prefetch=max(1, min(request.message_limit, CONTEXT_SCAN_PREFETCH))
+                    ):
+                        # Skip system messages if not requested
+                        if row["role"] == "system" and not request.include_system:
+                            continue
+                        
+                        message_tokens = row["token_count"] or 0
+                        if total_tokens + message_tokens > request.token_limit:
+                            truncated = True
+                            break
+                        
+                        selected_ids.append(row["id"])
+                        total_tokens += message_tokens
             
-            # Build context within token limit
-            for row in reversed(rows):  # Reverse to get chronological order
-                message_tokens = row.token_count or 0
-                
-                # Check token limit
-                if total_tokens + message_tokens > request.token_limit:
-                    truncated = True
-                    break
-                
-                # Skip system messages if not requested
-                if row.role == "system" and not request.include_system:
-                    continue
+            messages = []
+            if selected_ids:
+                # context_window snapshots are not part of a built context
+                stmt = text(f"""
+                    SELECT {CONTEXT_MESSAGE_COLUMNS} FROM messages
+                    WHERE id = ANY(:ids)
+                    ORDER BY created_at ASC, id ASC
+                """)
                 
-                message = Message(
-                    id=row.id,
-                    session_id=row.session_id,
-                    content=row.content,
-                    role=row.role,
-                    message_type=row.message_type,
-                    function_name=row.function_name,
-                    function_args=row.function_args,
-                    attachments=row.attachments or [],
-                    parent_message_id=row.parent_message_id,
-                    context_window=row.context_window or [],
-                    prompt_tokens=row.prompt_tokens,
-                    completion_tokens=row.completion_tokens,
-                    token_count=row.token_count or 0,
-                    metadata=row.metadata or {},
-                    created_at=row.created_at,
-                    updated_at=row.updated_at,
-                    embedding_id=row.embedding_id,
-                    children_count=0
-                )
+                result = await self.postgres.execute(stmt, {"ids": selected_ids})
                 
-                messages.append(message)
-                total_tokens += message_tokens
+                for row in result.fetchall():
+                    messages.append(Message(
+                        id=row.id,
+                        session_id=row.session_id,
+                        content=row.content,
+                        role=row.role,
+                        message_type=row.message_type,
+                        function_name=row.function_name,
+                        function_args=row.function_args,
+                        attachments=row.attachments or [],
+                        parent_message_id=row.parent_message_id,
+                        context_window=[],
+                        prompt_tokens=row.prompt_tokens,
+                        completion_tokens=row.completion_tokens,
+                        token_count=row.token_count or 0,
+                        metadata=row.metadata or {},
+                        created_at=row.created_at,
+                        updated_at=row.updated_at,
+                        embedding_id=row.embedding_id,
+                        children_count=0
+                    ))
             
             return {
                 "messages": messages,
@@ -775,14 +804,13 @@ class SessionService(BaseService):
             
             session_row = session_stats.fetchone()
             
-            # Get message stats
+            # Get message stats from the per-session counters
             message_stats = await self.postgres.execute(text(f"""
                 SELECT 
-                    COUNT(*) as total_messages,
-                    SUM(COALESCE(token_count, 0)) as total_tokens
-                FROM messages m
-                JOIN sessions s ON m.session_id = s.id
-                WHERE {user_filter} m.deleted_at IS NULL AND s.deleted_at IS NULL
+                    SUM(COALESCE(message_count, 0))::bigint as total_messages,
+                    SUM(COALESCE(token_count, 0))::bigint as total_tokens
+                FROM sessions 
+                WHERE {user_filter} deleted_at IS NULL
             """), params)
             
             message_row = message_stats.fetchone()
@@ -836,7 +864,8 @@ class SessionService(BaseService):
                 recent_activity=recent_activity
             )
         
-        return await self.execute_with_cache(cache_key, fetch_stats, ttl=600)  # 10 minute cache
+        tags = ["sessions:aggregates"] + ([f"sessions:user:{user_id}"] if user_id else [])
+        return await self.execute_with_cache(cache_key, fetch_stats, ttl=600, tags=tags, model=SessionStats)  # 10 minute cache
     
     async def search_sessions(
         self,
@@ -901,20 +930,8 @@ class SessionService(BaseService):
             order_by = f"ORDER BY {query.sort_by} {query.sort_order.upper()}"
             
             stmt = text(f"""
-                SELECT s.*, 
-                       COALESCE(m.message_count, 0) as message_count,
-                       COALESCE(m.token_count, 0) as token_count,
-                       COALESCE(m.last_message_at, s.created_at) as last_message_at
+                SELECT s.*
                 FROM sessions s
-                LEFT JOIN (
-                    SELECT session_id,
-                           COUNT(*) as message_count,
-                           SUM(COALESCE(token_count, 0)) as token_count,
-                           MAX(created_at) as last_message_at
-                    FROM messages 
-                    WHERE deleted_at IS NULL
-                    GROUP BY session_id
-                ) m ON s.id = m.session_id
                 WHERE {where_clause}
                 {order_by}
                 LIMIT :limit OFFSET :offset
@@ -937,9 +954,9 @@ class SessionService(BaseService):
                     metadata=row.metadata or {},
                     created_at=row.created_at,
                     updated_at=row.updated_at,
-                    message_count=row.message_count,
-                    token_count=row.token_count,
-                    last_message_at=row.last_message_at,
+                    message_count=row.message_count or 0,
+                    token_count=row.token_count or 0,
+                    last_message_at=row.last_message_at or row.created_at,
                     access_count=row.access_count or 0,
                     last_accessed_at=row.last_accessed_at
                 )
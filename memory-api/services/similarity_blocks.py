@@ -0,0 +1,123 @@
+# ABOUTME: Blocked cosine, euclidean and dot-product similarity over embedding matrices
+# ABOUTME: Finds pairs above a threshold or top-k neighbours one row block at a time so memory stays O(block x n) rather than O(n^2)
+
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+DEFAULT_BLOCK_SIZE = 1024
+
+# Euclidean similarity is 1 / (1 + distance); dot product uses the vectors as given
+SIMILARITY_METRICS = ("cosine", "euclidean", "dot_product")
+
+def normalize_rows(vectors) -> np.ndarray:
+    """Contiguous float32 copy of vectors with unit-length rows; zero rows stay zero"""
+    matrix = np.array(vectors, dtype=np.float32, order="C", copy=True)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-d matrix of vectors, got shape {matrix.shape}")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+def prepare_vectors(vectors, metric: str = "cosine") -> np.ndarray:
+    """Vectors ready for the block functions under metric: unit-length rows
+    for cosine and euclidean, a contiguous float32 copy for dot product"""
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"Unsupported similarity metric {metric!r}; expected one of {', '.join(SIMILARITY_METRICS)}")
+    if metric == "dot_product":
+        matrix = np.array(vectors, dtype=np.float32, order="C", copy=True)
+        if matrix.ndim != 2:
+            raise ValueError(f"Expected a 2-d matrix of vectors, got shape {matrix.shape}")
+        return matrix
+    return normalize_rows(vectors)
+
+def _block_scores(block: np.ndarray, metric: str) -> np.ndarray:
+    """Turn a block of dot products into scores under metric"""
+    if metric == "cosine":
+        return np.clip(block, -1.0, 1.0)
+    if metric == "euclidean":
+        # Unit rows: |a - b| = sqrt(2 - 2 cos(a, b))
+        return 1.0 / (1.0 + np.sqrt(np.maximum(2.0 - 2.0 * block, 0.0)))
+    return block
+
+def iter_similar_pairs(
+    normalized: np.ndarray,
+    min_similarity: float,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    metric: str = "cosine"
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield (rows, cols, scores) for pairs i < j whose similarity under metric is >= min_similarity
+
+    Rows must come from prepare_vectors (unit length for cosine, see
+    normalize_rows). Each block of rows is compared only with itself and
+    the rows after it, so every pair is visited once.
+    """
+    count = normalized.shape[0]
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        block = _block_scores(normalized[start:stop] @ normalized[start:].T, metric)
+        # Block-local (r, c) is global (start + r, start + c): the upper triangle is c > r
+        local = np.argwhere(np.triu(block >= min_similarity, k=1))
+        if not len(local):
+            continue
+        scores = block[local[:, 0], local[:, 1]]
+        yield local[:, 0] + start, local[:, 1] + start, scores
+
+def similar_pairs(
+    normalized: np.ndarray,
+    min_similarity: float,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """All pairs from iter_similar_pairs as three aligned arrays"""
+    blocks = list(iter_similar_pairs(normalized, min_similarity, block_size))
+    if not blocks:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+    rows, cols, scores = zip(*blocks)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+def iter_top_k(
+    normalized: np.ndarray,
+    k: int,
+    min_similarity: Optional[float] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    metric: str = "cosine"
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield (rows, cols, scores) for each row's k most similar other rows under metric, best first
+
+    Rows must come from prepare_vectors. A row never lists itself; with
+    min_similarity, neighbours below it are dropped.
+    """
+    count = normalized.shape[0]
+    k = min(k, count - 1)
+    if k <= 0:
+        return
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        block = _block_scores(normalized[start:stop] @ normalized.T, metric)
+        local = np.arange(stop - start)
+        block[local, local + start] = -np.inf
+        top = np.argpartition(block, -k, axis=1)[:, -k:]
+        scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-scores, axis=1, kind="stable")
+        cols = np.take_along_axis(top, order, axis=1).ravel()
+        scores = np.take_along_axis(scores, order, axis=1).ravel()
+        rows = np.repeat(np.arange(start, stop), k)
+        if min_similarity is not None:
+            keep = scores >= min_similarity
+            rows, cols, scores = rows[keep], cols[keep], scores[keep]
+        if len(rows):
+            yield rows, cols, scores
+
+def pairs_to_csr(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    scores: np.ndarray,
+    size: int,
+    symmetric: bool = False
+) -> csr_matrix:
+    """size x size CSR matrix of pair scores; symmetric mirrors i < j pairs below the diagonal"""
+    if symmetric:
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        scores = np.concatenate([scores, scores])
+    return csr_matrix((scores.astype(np.float32, copy=False), (rows, cols)), shape=(size, size))
@@ -0,0 +1,177 @@
+# ABOUTME: Vector collection routing for BETTY Memory System
+# ABOUTME: Maps logical collections to physical Qdrant collections and named per-model vector slots
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+import structlog
+import numpy as np
+from qdrant_client.models import NamedVector
+
+logger = structlog.get_logger(__name__)
+
+ROUTE_KEY_PREFIX = "betty:vector_collections:"
+
+class MissingVectorSlotError(ValueError):
+    """A named-vector collection has no slot for the requested model"""
+
+def vector_slot_name(model_name: str) -> str:
+    """Named vector slot for an embedding model, e.g. 'all-mpnet-base-v2'"""
+    base = model_name.rstrip("/").split("/")[-1]
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", base).strip("-").lower()
+
+@dataclass
+class CollectionLayout:
+    """Vector layout of one physical Qdrant collection"""
+    name: str
+    vector_name: Optional[str]
+    size: int
+
+    @property
+    def is_legacy(self) -> bool:
+        """Unnamed single-vector collection holding zero-padded vectors"""
+        return self.vector_name is None
+
+    def _values(self, embedding: Union[np.ndarray, List[float]]) -> List[float]:
+        values = np.asarray(embedding, dtype=np.float32).tolist()
+        if self.is_legacy and len(values) < self.size:
+            # Legacy collections are fixed at the padded size
+            values.extend([0.0] * (self.size - len(values)))
+        return values
+
+    def point_vector(self, embedding: Union[np.ndarray, List[float]]) -> Union[List[float], Dict[str, List[float]]]:
+        """Vector value for PointStruct in this collection"""
+        values = self._values(embedding)
+        return {self.vector_name: values} if self.vector_name else values
+
+    def query_vector(self, embedding: Union[np.ndarray, List[float]]) -> Union[List[float], NamedVector]:
+        """Query vector for search/search_batch in this collection"""
+        values = self._values(embedding)
+        return NamedVector(name=self.vector_name, vector=values) if self.vector_name else values
+
+    def stored_vector(self, vector: Any) -> Optional[np.ndarray]:
+        """Extract this layout's vector from a retrieved point, without padding"""
+        if isinstance(vector, dict):
+            vector = vector.get(self.vector_name) if self.vector_name else None
+        if vector is None:
+            return None
+        return np.asarray(vector, dtype=np.float32)
+
+@dataclass
+class CollectionRoute:
+    """Where a logical collection lives; target is set while migrating"""
+    logical: str
+    active: str
+    target: Optional[str] = None
+
+    @property
+    def write_collections(self) -> List[str]:
+        """Physical collections every write must reach"""
+        return [self.active, self.target] if self.target else [self.active]
+
+class VectorCollectionRouter:
+    """Resolves logical collection names through a Redis route table
+
+    Routes are cached in-process for route_ttl seconds so the hot path does
+    not pay a Redis round-trip per search. Physical collection layouts never
+    change once created, so they are cached for the life of the process.
+    """
+
+    def __init__(self, route_ttl: float = 5.0):
+        self.route_ttl = route_ttl
+        self._routes: Dict[str, Tuple[float, CollectionRoute]] = {}
+        self._layouts: Dict[Tuple[str, Optional[str]], CollectionLayout] = {}
+
+    async def get_route(self, redis_client, logical: str) -> CollectionRoute:
+        """Get the current route for a logical collection"""
+        cached = self._routes.get(logical)
+        if cached and time.monotonic() - cached[0] < self.route_ttl:
+            return cached[1]
+
+        route = CollectionRoute(logical=logical, active=logical)
+        if redis_client is not None:
+            try:
+                raw = await redis_client.get(ROUTE_KEY_PREFIX + logical)
+                if raw:
+                    data = json.loads(raw)
+                    route = CollectionRoute(
+                        logical=logical,
+                        active=data["active"],
+                        target=data.get("target")
+                    )
+            except Exception as e:
+                # Fall back to the last known route rather than the default
+                logger.warning("Vector route lookup failed", collection=logical, error=str(e))
+                if cached:
+                    return cached[1]
+
+        self._routes[logical] = (time.monotonic(), route)
+        return route
+
+    async def set_route(self, redis_client, route: CollectionRoute) -> None:
+        """Publish a route for all workers"""
+        await redis_client.set(
+            ROUTE_KEY_PREFIX + route.logical,
+            json.dumps({"active": route.active, "target": route.target})
+        )
+        self._routes[route.logical] = (time.monotonic(), route)
+
+        logger.info(
+            "Vector collection route updated",
+            collection=route.logical,
+            active=route.active,
+            target=route.target
+        )
+
+    async def get_layout(self, qdrant, physical: str, preferred_slot: Optional[str] = None) -> CollectionLayout:
+        """Introspect (once) the vector layout of a physical collection
+
+        When preferred_slot is given, a named-vector collection lacking that
+        slot raises MissingVectorSlotError rather than resolving to another
+        model's slot, whose dimension the caller's vectors would not match.
+        When it is None, the first named slot is returned (migration sources).
+        Unnamed collections return their single vector regardless.
+        """
+        layout = self._layouts.get((physical, preferred_slot))
+        if layout is not None:
+            return layout
+
+        info = await asyncio.to_thread(qdrant.get_collection, collection_name=physical)
+        vectors = info.config.params.vectors
+
+        if isinstance(vectors, dict):
+            if preferred_slot is None:
+                slot = next(iter(vectors))
+            elif preferred_slot in vectors:
+                slot = preferred_slot
+            else:
+                raise MissingVectorSlotError(
+                    f"Collection {physical} has no vector slot '{preferred_slot}' "
+                    f"(slots: {', '.join(vectors)}); migrate it to the loaded model first"
+                )
+            layout = CollectionLayout(name=physical, vector_name=slot, size=vectors[slot].size)
+        else:
+            layout = CollectionLayout(name=physical, vector_name=None, size=vectors.size)
+
+        self._layouts[(physical, preferred_slot)] = layout
+        return layout
+
+    def forget_layout(self, physical: str) -> None:
+        """Drop cached layouts (after a collection is dropped or recreated)"""
+        for key in [key for key in self._layouts if key[0] == physical]:
+            del self._layouts[key]
+
+# Router shared by all VectorService instances in this process
+_collection_router_instance: Optional[VectorCollectionRouter] = None
+
+def get_collection_router() -> VectorCollectionRouter:
+    """Get or create the process-wide collection router"""
+    global _collection_router_instance
+
+    if _collection_router_instance is None:
+        _collection_router_instance = VectorCollectionRouter()
+
+    return _collection_router_instance
@@ -0,0 +1,127 @@
+# ABOUTME: Quantization and search profiles for BETTY Memory System vector collections
+# ABOUTME: Maps collections to storage profiles and request classes to HNSW/rescoring search params
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+from qdrant_client.models import (
+    CompressionRatio, HnswConfigDiff, ProductQuantization, ProductQuantizationConfig,
+    QuantizationSearchParams, ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    SearchParams
+)
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage profile for a physical collection
+
+    quantization is "scalar" (INT8, 4x smaller), "product" (PQ, compression
+    times smaller) or "none" (float32 only). Quantized vectors are always
+    kept in RAM; originals_on_disk moves the float32 originals to mmap so
+    they are only read when rescoring.
+    """
+    name: str
+    quantization: str = "scalar"
+    quantile: float = 0.99
+    compression: str = "x16"
+    originals_on_disk: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 200
+
+    def quantization_config(self) -> Optional[Union[ScalarQuantization, ProductQuantization]]:
+        """Qdrant quantization config for this profile"""
+        if self.quantization == "scalar":
+            return ScalarQuantization(scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=self.quantile,
+                always_ram=True
+            ))
+        if self.quantization == "product":
+            return ProductQuantization(product=ProductQuantizationConfig(
+                compression=CompressionRatio(self.compression),
+                always_ram=True
+            ))
+        return None
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        """HNSW graph parameters for this profile"""
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def estimated_ram_bytes(self, points: int, dimension: int) -> int:
+        """Approximate resident vector memory (excluding the HNSW graph)"""
+        originals = 0 if self.originals_on_disk else points * dimension * 4
+        if self.quantization == "scalar":
+            quantized = points * dimension
+        elif self.quantization == "product":
+            quantized = points * dimension * 4 // int(self.compression.lstrip("x"))
+        else:
+            quantized = 0
+        return originals + quantized
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    # INT8 scalar quantization with float32 originals in RAM for rescoring
+    "scalar": CollectionProfile(name="scalar"),
+    # PQ with originals on disk, for collections too large to keep in float32
+    "product": CollectionProfile(name="product", quantization="product", originals_on_disk=True),
+    # Full-precision float32 in RAM, the exact baseline
+    "none": CollectionProfile(name="none", quantization="none")
+}
+
+def logical_collection_name(physical_name: str) -> str:
+    """Logical collection behind a physical (possibly migration target) name"""
+    return physical_name.split("__", 1)[0]
+
+def resolve_collection_profile(collection_name: str, settings) -> CollectionProfile:
+    """Storage profile for a collection from settings"""
+    large_collections = {
+        name.strip() for name in settings.vector_product_quantization_collections.split(",") if name.strip()
+    }
+    if logical_collection_name(collection_name) in large_collections:
+        return COLLECTION_PROFILES["product"]
+    return COLLECTION_PROFILES.get(settings.vector_quantization, COLLECTION_PROFILES["scalar"])
+
+@dataclass(frozen=True)
+class SearchProfile:
+    """Search-time accuracy/latency trade-off for one class of request
+
+    oversampling fetches limit * oversampling candidates from the quantized
+    index and, with rescore, re-ranks them against the float32 originals.
+    ignore_quantization searches the originals directly; exact skips HNSW.
+    """
+    name: str
+    hnsw_ef: Optional[int] = None
+    rescore: bool = True
+    oversampling: Optional[float] = None
+    ignore_quantization: bool = False
+    exact: bool = False
+
+    def search_params(self) -> SearchParams:
+        """Qdrant search params for this profile"""
+        return SearchParams(
+            hnsw_ef=self.hnsw_ef,
+            exact=self.exact,
+            quantization=QuantizationSearchParams(
+                ignore=self.ignore_quantization,
+                rescore=self.rescore,
+                oversampling=self.oversampling
+            )
+        )
+
+SEARCH_PROFILES: Dict[str, SearchProfile] = {
+    # User-facing search: modest beam, rescored top candidates
+    "interactive": SearchProfile(name="interactive", hnsw_ef=64, oversampling=1.5),
+    # Session context loading: wider beam and oversampling, recall matters most
+    "context": SearchProfile(name="context", hnsw_ef=128, oversampling=2.0),
+    # Analytics and duplicate scans: quantized scores only, cheapest path
+    "bulk": SearchProfile(name="bulk", hnsw_ef=32, rescore=False),
+    # Ground truth for benchmarks and audits
+    "exact": SearchProfile(name="exact", exact=True, ignore_quantization=True)
+}
+
+def get_search_profile(profile: Union[str, SearchProfile, None]) -> SearchProfile:
+    """Resolve a search profile by name (defaults to interactive)"""
+    if isinstance(profile, SearchProfile):
+        return profile
+    if profile is None:
+        return SEARCH_PROFILES["interactive"]
+    if profile not in SEARCH_PROFILES:
+        raise ValueError(f"Unknown search profile: {profile}")
+    return SEARCH_PROFILES[profile]
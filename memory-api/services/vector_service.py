@@ -2,79 +2,177 @@
 # ABOUTME: Handles Qdrant vector database operations for semantic search and embeddings
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple, Union
 from uuid import uuid4
 import structlog
 import numpy as np
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
-from sentence_transformers import SentenceTransformer
+from dataclasses import dataclass
+from sqlalchemy import text as sql_text
+from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, SearchRequest
 
 from services.base_service import BaseService
+from services.embedding_engine import get_embedding_engine
+from services.embedding_cache import get_embedding_cache, make_embedding_key, normalize_text
+from services.vector_collections import (
+    CollectionLayout, CollectionRoute, MissingVectorSlotError, get_collection_router, vector_slot_name
+)
+from services.vector_profiles import (
+    CollectionProfile, SearchProfile, get_search_profile, resolve_collection_profile
+)
 
 logger = structlog.get_logger(__name__)
 
+# Postgres tables holding the full text behind each collection's points,
+# used to re-embed points whose stored vectors cannot be reused
+CONTENT_SOURCE_TABLES = {
+    "knowledge_items": "knowledge_items",
+    "messages": "messages"
+}
+
+# Points per Qdrant retrieve when bulk-loading stored vectors
+RETRIEVE_BATCH_SIZE = 256
+
+@dataclass
+class VectorSearch:
+    """One search in a batched vector search request"""
+    limit: int = 20
+    similarity_threshold: float = 0.7
+    filters: Optional[Dict[str, Any]] = None
+    query_vector: Optional[List[float]] = None
+    profile: str = "interactive"
+
 class VectorService(BaseService):
     """Service for vector operations using Qdrant"""
     
     def __init__(self, databases):
         super().__init__(databases)
-        # Initialize sentence transformer model for semantic embeddings
-        # Using OpenAI-compatible dimensions (1536) with appropriate model
-        try:
-            # Try to use a model that matches our Qdrant collection dimensions
-            self.embedding_model = SentenceTransformer('sentence-transformers/all-mpnet-base-v2')  # 768-dimensional
-            self.embedding_dimension = 768
-            logger.info("Sentence transformer model loaded", model="all-mpnet-base-v2", dimensions=768)
-        except Exception as e:
-            # Fallback to smaller model
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')  # 384-dimensional
-            self.embedding_dimension = 384
-            logger.info("Using fallback model", model="all-MiniLM-L6-v2", dimensions=384)
+        # Semantic embeddings come from the shared, process-pooled engine so
+        # every VectorService instance batches into the same model workers
+        self.embedding_engine = get_embedding_engine()
+        self.embedding_cache = get_embedding_cache()
+        self.collection_router = get_collection_router()
+    
+    @property
+    def embedding_dimension(self) -> Optional[int]:
+        """Native dimension of the loaded embedding model (None until started)"""
+        return self.embedding_engine.dimension
+    
+    @property
+    def vector_slot(self) -> str:
+        """Named vector slot for the loaded (or configured) embedding model"""
+        return vector_slot_name(self.embedding_engine.loaded_model_name or self.embedding_engine.model_name)
+    
+    def _zero_embedding(self) -> List[float]:
+        """Zero vector with the model's native dimension"""
+        return np.zeros(self.embedding_dimension or self.settings.vector_dimension).tolist()
+    
+    async def get_collection_route(self, collection_name: str) -> CollectionRoute:
+        """Resolve a logical collection to its physical collection(s)"""
+        return await self.collection_router.get_route(self.redis, collection_name)
+    
+    async def get_collection_layout(self, physical_name: str) -> CollectionLayout:
+        """Vector layout (named slot and size) of a physical collection"""
+        return await self.collection_router.get_layout(self.qdrant, physical_name, self.vector_slot)
+    
+    async def _read_layout(self, collection_name: str) -> CollectionLayout:
+        """Layout of the physical collection currently serving reads"""
+        route = await self.get_collection_route(collection_name)
+        return await self.get_collection_layout(route.active)
+    
+    async def _upsert(
+        self,
+        collection_name: str,
+        points: List[Tuple[str, np.ndarray, Dict[str, Any]]]
+    ) -> None:
+        """Write (id, vector, payload) points to every physical collection on the route"""
+        route = await self.get_collection_route(collection_name)
+        
+        for physical_name in route.write_collections:
+            layout = await self.get_collection_layout(physical_name)
+            await asyncio.to_thread(
+                self.qdrant.upsert,
+                collection_name=physical_name,
+                points=[
+                    PointStruct(id=point_id, vector=layout.point_vector(vector), payload=payload)
+                    for point_id, vector, payload in points
+                ]
+            )
+    
+    async def _embed_cached(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed normalized texts, encoding only content not already cached"""
+        # The model must be resolved first: a fallback model gets its own keys
+        await self.embedding_engine.start()
+        model_name = self.embedding_engine.loaded_model_name
+        
+        keys = [make_embedding_key(model_name, text) for text in texts]
+        found = await self.embedding_cache.get_many(list(dict.fromkeys(keys)))
+        
+        # Encode each distinct missing text once
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            if len(missing) == 1:
+                # Single lookups join the engine's shared micro-batch
+                encoded = [await self.embedding_engine.embed(next(iter(missing.values())))]
+            else:
+                encoded = await self.embedding_engine.embed_many(list(missing.values()))
+            
+            fresh = dict(zip(missing.keys(), encoded))
+            await self.embedding_cache.set_many(fresh)
+            found.update(fresh)
+        
+        return [found[key] for key in keys]
+    
+    async def _embed_one(self, text: str) -> np.ndarray:
+        """Embed one text at native dimension"""
+        embedding, = await self._embed_cached([normalize_text(text) or "empty content"])
+        return embedding
     
     async def get_embedding(self, text: str) -> List[float]:
         """Generate semantic embedding for text using sentence transformers"""
         try:
-            # Sanitize input text
-            if not text or not text.strip():
-                text = "empty content"
+            # Cache misses from concurrent callers are coalesced into one micro-batch
+            embedding = await self._embed_one(text)
             
-            # Generate embedding using sentence transformer
-            embedding = await asyncio.to_thread(
-                self.embedding_model.encode,
-                text.strip(),
-                normalize_embeddings=True
-            )
-            
-            # Pad embedding to 1536 dimensions to match Qdrant collection
-            embedding_list = embedding.tolist()
-            if len(embedding_list) < 1536:
-                # Pad with zeros to reach 1536 dimensions
-                embedding_list.extend([0.0] * (1536 - len(embedding_list)))
-            
-            return embedding_list
+            return embedding.tolist()
             
         except Exception as e:
             logger.error(
                 "Failed to generate embedding",
-                text_preview=text[:100],
+                text_preview=(text or "")[:100],
                 error=str(e)
             )
             # Fallback to zero vector with correct dimensions
-            return np.zeros(1536).tolist()
+            return self._zero_embedding()
+    
+    async def generate_embedding(self, text: str) -> List[float]:
+        """Alias of get_embedding used by the pipeline and extraction services"""
+        return await self.get_embedding(text)
+    
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate semantic embeddings for many texts in full batches"""
+        sanitized = [normalize_text(text) or "empty content" for text in texts]
+        
+        try:
+            embeddings = await self._embed_cached(sanitized)
+            return [embedding.tolist() for embedding in embeddings]
+            
+        except Exception as e:
+            logger.error(
+                "Failed to generate batch embeddings",
+                batch_size=len(texts),
+                error=str(e)
+            )
+            # Fallback to zero vectors with correct dimensions
+            return [self._zero_embedding() for _ in texts]
     
     def _create_simple_embedding(self, text: str) -> List[float]:
         """Create semantic embedding using sentence transformers (synchronous wrapper)"""
-        # This method now delegates to the async version for consistency
-        # but provides synchronous interface where needed
         try:
-            # Use the sentence transformer directly for sync calls
             if not text or not text.strip():
                 text = "empty content"
                 
-            embedding = self.embedding_model.encode(
-                text.strip(),
-                normalize_embeddings=True
-            )
+            embedding = self.embedding_engine.encode_sync([normalize_text(text)])[0]
             
             return embedding.tolist()
             
@@ -85,7 +183,7 @@ class VectorService(BaseService):
                 error=str(e)
             )
             # Fallback to zero vector with correct dimensions
-            return np.zeros(1536).tolist()
+            return self._zero_embedding()
     
     async def create_embedding(
         self,
@@ -97,7 +195,7 @@ class VectorService(BaseService):
         """Create vector embedding for content"""
         try:
             # Generate embedding using semantic model
-            embedding = await self.get_embedding(content)
+            embedding = await self._embed_one(content)
             
             # Generate unique point ID
             point_id = str(uuid4())
@@ -110,19 +208,8 @@ class VectorService(BaseService):
                 **(metadata or {})
             }
             
-            # Create point
-            point = PointStruct(
-                id=point_id,
-                vector=embedding,
-                payload=payload
-            )
-            
             # Insert into Qdrant
-            await asyncio.to_thread(
-                self.qdrant.upsert,
-                collection_name=collection_name,
-                points=[point]
-            )
+            await self._upsert(collection_name, [(point_id, embedding, payload)])
             
             logger.info(
                 "Vector embedding created",
@@ -152,7 +239,7 @@ class VectorService(BaseService):
         """Update existing vector embedding"""
         try:
             # Generate new embedding using semantic model
-            embedding = await self.get_embedding(content)
+            embedding = await self._embed_one(content)
             
             # Prepare updated payload
             payload = {
@@ -162,17 +249,7 @@ class VectorService(BaseService):
             }
             
             # Update point
-            point = PointStruct(
-                id=point_id,
-                vector=embedding,
-                payload=payload
-            )
-            
-            await asyncio.to_thread(
-                self.qdrant.upsert,
-                collection_name=collection_name,
-                points=[point]
-            )
+            await self._upsert(collection_name, [(point_id, embedding, payload)])
             
             logger.info(
                 "Vector embedding updated",
@@ -195,11 +272,14 @@ class VectorService(BaseService):
     ) -> None:
         """Delete vector embedding"""
         try:
-            await asyncio.to_thread(
-                self.qdrant.delete,
-                collection_name=collection_name,
-                points_selector=[point_id]
-            )
+            route = await self.get_collection_route(collection_name)
+            
+            for physical_name in route.write_collections:
+                await asyncio.to_thread(
+                    self.qdrant.delete,
+                    collection_name=physical_name,
+                    points_selector=[point_id]
+                )
             
             logger.info(
                 "Vector embedding deleted",
@@ -215,65 +295,85 @@ class VectorService(BaseService):
             )
             raise
     
+    def _build_search_filter(self, filters: Dict[str, Any] = None) -> Optional[Filter]:
+        """Build a Qdrant payload filter from simple key/value filters"""
+        if not filters:
+            return None
+        
+        conditions = []
+        
+        for key, value in filters.items():
+            if isinstance(value, list):
+                # Handle list values (e.g., tags)
+                for item in value:
+                    conditions.append(
+                        FieldCondition(key=key, match=MatchValue(value=item))
+                    )
+            else:
+                conditions.append(
+                    FieldCondition(key=key, match=MatchValue(value=value))
+                )
+        
+        return Filter(must=conditions) if conditions else None
+    
+    def _format_search_results(self, search_results) -> List[Dict[str, Any]]:
+        """Convert Qdrant scored points to plain result dicts"""
+        return [
+            {
+                "id": result.id,
+                "score": result.score,
+                "payload": result.payload
+            }
+            for result in search_results
+        ]
+    
     async def search_similar(
         self,
-        query: str,
+        query: Optional[str] = None,
         collection_name: str = "knowledge_items",
         limit: int = 20,
         similarity_threshold: float = 0.7,
-        filters: Dict[str, Any] = None
+        filters: Dict[str, Any] = None,
+        query_vector: Optional[List[float]] = None,
+        profile: Union[str, SearchProfile] = "interactive"
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors"""
+        """Search for similar vectors by query text or a precomputed query vector
+        
+        profile selects the HNSW beam width and quantization rescoring for
+        the class of request (interactive, context, bulk or exact).
+        """
+        query_preview = (query or "<vector>")[:50]
+        
         try:
-            # Generate query embedding using semantic model
-            query_embedding = await self.get_embedding(query)
+            search_profile = get_search_profile(profile)
             
-            # Build filter if provided
-            search_filter = None
-            if filters:
-                conditions = []
-                
-                for key, value in filters.items():
-                    if isinstance(value, list):
-                        # Handle list values (e.g., tags)
-                        for item in value:
-                            conditions.append(
-                                FieldCondition(key=key, match=MatchValue(value=item))
-                            )
-                    else:
-                        conditions.append(
-                            FieldCondition(key=key, match=MatchValue(value=value))
-                        )
-                
-                if conditions:
-                    search_filter = Filter(must=conditions)
+            # Generate query embedding only when the caller has not already
+            if query_vector is None:
+                query_vector = await self._embed_one(query)
+            
+            layout = await self._read_layout(collection_name)
             
             # Search
             search_results = await asyncio.to_thread(
                 self.qdrant.search,
-                collection_name=collection_name,
-                query_vector=query_embedding,
+                collection_name=layout.name,
+                query_vector=layout.query_vector(query_vector),
                 limit=limit,
                 score_threshold=similarity_threshold,
-                query_filter=search_filter,
+                query_filter=self._build_search_filter(filters),
+                search_params=search_profile.search_params(),
                 with_payload=True
             )
             
-            # Format results
-            results = []
-            for result in search_results:
-                results.append({
-                    "id": result.id,
-                    "score": result.score,
-                    "payload": result.payload
-                })
+            results = self._format_search_results(search_results)
             
             logger.info(
                 "Vector similarity search completed",
                 collection=collection_name,
-                query_preview=query[:50],
+                query_preview=query_preview,
                 results_count=len(results),
-                threshold=similarity_threshold
+                threshold=similarity_threshold,
+                profile=search_profile.name
             )
             
             return results
@@ -281,31 +381,101 @@ class VectorService(BaseService):
         except Exception as e:
             logger.error(
                 "Vector similarity search failed",
-                query=query[:50],
+                query=query_preview,
                 collection=collection_name,
                 error=str(e)
             )
             raise
     
+    async def search_batch(
+        self,
+        searches: List[VectorSearch],
+        query_vector: Optional[List[float]] = None,
+        collection_name: str = "knowledge_items"
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several vector searches in one Qdrant round-trip
+        
+        Each search uses its own query_vector if set, otherwise the shared
+        query_vector. Results are returned in the same order as searches.
+        """
+        if not searches:
+            return []
+        
+        try:
+            layout = await self._read_layout(collection_name)
+            
+            requests = []
+            for search in searches:
+                vector = search.query_vector if search.query_vector is not None else query_vector
+                if vector is None:
+                    raise ValueError("search_batch requires a query vector for every search")
+                
+                requests.append(SearchRequest(
+                    vector=layout.query_vector(vector),
+                    filter=self._build_search_filter(search.filters),
+                    params=get_search_profile(search.profile).search_params(),
+                    limit=search.limit,
+                    score_threshold=search.similarity_threshold,
+                    with_payload=True
+                ))
+            
+            batch_results = await asyncio.to_thread(
+                self.qdrant.search_batch,
+                collection_name=layout.name,
+                requests=requests
+            )
+            
+            results = [self._format_search_results(search_results) for search_results in batch_results]
+            
+            logger.info(
+                "Vector batch search completed",
+                collection=collection_name,
+                searches=len(searches),
+                results_count=sum(len(r) for r in results)
+            )
+            
+            return results
+            
+        except Exception as e:
+            logger.error(
+                "Vector batch search failed",
+                collection=collection_name,
+                searches=len(searches),
+                error=str(e)
+            )
+            raise
+    
     async def get_embedding_stats(
         self,
         collection_name: str = "knowledge_items"
     ) -> Dict[str, Any]:
         """Get embedding collection statistics"""
         try:
+            route = await self.get_collection_route(collection_name)
             collection_info = await asyncio.to_thread(
                 self.qdrant.get_collection,
-                collection_name=collection_name
+                collection_name=route.active
             )
             
+            vectors = collection_info.config.params.vectors
+            vector_name = None
+            if isinstance(vectors, dict):
+                vector_name = (await self.get_collection_layout(route.active)).vector_name
+                vectors = vectors[vector_name]
+            
             return {
                 "collection_name": collection_name,
+                "physical_collection": route.active,
+                "migrating_to": route.target,
                 "vectors_count": collection_info.vectors_count,
                 "indexed_vectors_count": collection_info.indexed_vectors_count,
                 "points_count": collection_info.points_count,
                 "config": {
-                    "vector_size": collection_info.config.params.vectors.size,
-                    "distance": collection_info.config.params.vectors.distance.value
+                    "vector_name": vector_name,
+                    "vector_size": vectors.size,
+                    "distance": vectors.distance.value,
+                    "on_disk": bool(vectors.on_disk),
+                    "quantization": (vectors.quantization_config or collection_info.config.quantization_config) is not None
                 }
             }
             
@@ -321,9 +491,16 @@ class VectorService(BaseService):
         self,
         collection_name: str,
         vector_size: int = None,
-        distance: str = "Cosine"
+        distance: str = "Cosine",
+        vector_name: Optional[str] = None,
+        profile: Optional[CollectionProfile] = None
     ) -> None:
-        """Create collection if it doesn't exist"""
+        """Create collection if it doesn't exist, with a named vector slot at native dimension
+        
+        The slot is quantized according to the collection's storage profile
+        (INT8 by default, PQ with on-disk originals for configured large
+        collections).
+        """
         try:
             from qdrant_client.models import VectorParams, Distance
             
@@ -339,9 +516,14 @@ class VectorService(BaseService):
                 # Collection doesn't exist, create it
                 pass
             
-            # Determine vector size
+            # Size the slot for the loaded model rather than a padded constant
+            await self.embedding_engine.start()
             if vector_size is None:
-                vector_size = self.settings.vector_dimension
+                vector_size = self.embedding_dimension
+            if vector_name is None:
+                vector_name = self.vector_slot
+            if profile is None:
+                profile = resolve_collection_profile(collection_name, self.settings)
             
             # Map distance string to enum
             distance_map = {
@@ -356,17 +538,25 @@ class VectorService(BaseService):
             await asyncio.to_thread(
                 self.qdrant.create_collection,
                 collection_name=collection_name,
-                vectors_config=VectorParams(
-                    size=vector_size,
-                    distance=distance_enum
-                )
+                vectors_config={
+                    vector_name: VectorParams(
+                        size=vector_size,
+                        distance=distance_enum,
+                        on_disk=profile.originals_on_disk,
+                        hnsw_config=profile.hnsw_config(),
+                        quantization_config=profile.quantization_config()
+                    )
+                }
             )
+            self.collection_router.forget_layout(collection_name)
             
             logger.info(
                 "Vector collection created",
                 collection=collection_name,
+                vector_name=vector_name,
                 vector_size=vector_size,
-                distance=distance
+                distance=distance,
+                profile=profile.name
             )
             
         except Exception as e:
@@ -377,6 +567,45 @@ class VectorService(BaseService):
             )
             raise
     
+    async def apply_collection_profile(
+        self,
+        physical_name: str,
+        profile: Optional[CollectionProfile] = None
+    ) -> CollectionProfile:
+        """Quantize an existing collection in place
+        
+        Qdrant builds the quantized vectors in the background; searches keep
+        running against the float32 vectors until it finishes.
+        """
+        from qdrant_client.models import VectorParamsDiff
+        
+        if profile is None:
+            profile = resolve_collection_profile(physical_name, self.settings)
+        
+        layout = await self.get_collection_layout(physical_name)
+        
+        await asyncio.to_thread(
+            self.qdrant.update_collection,
+            collection_name=physical_name,
+            # Legacy unnamed collections address their single vector as ""
+            vectors_config={
+                layout.vector_name or "": VectorParamsDiff(
+                    on_disk=profile.originals_on_disk,
+                    hnsw_config=profile.hnsw_config(),
+                    quantization_config=profile.quantization_config()
+                )
+            }
+        )
+        
+        logger.info(
+            "Vector collection profile applied",
+            collection=physical_name,
+            vector_name=layout.vector_name,
+            profile=profile.name
+        )
+        
+        return profile
+    
     async def batch_create_embeddings(
         self,
         items: List[Dict[str, Any]],
@@ -392,13 +621,9 @@ class VectorService(BaseService):
                 batch = items[i:i + batch_size]
                 batch_points = []
                 
-                # Generate embeddings for batch using semantic model
-                contents = [item["content"] for item in batch]
-                embeddings = []
-                
-                for content in contents:
-                    embedding = await self.get_embedding(content)
-                    embeddings.append(embedding)
+                # Generate embeddings for the whole batch in one encode call
+                contents = [normalize_text(item["content"]) or "empty content" for item in batch]
+                embeddings = await self._embed_cached(contents)
                 
                 # Create points
                 for j, (item, embedding) in enumerate(zip(batch, embeddings)):
@@ -412,19 +637,10 @@ class VectorService(BaseService):
                         **item.get("metadata", {})
                     }
                     
-                    point = PointStruct(
-                        id=point_id,
-                        vector=embedding,
-                        payload=payload
-                    )
-                    batch_points.append(point)
+                    batch_points.append((point_id, embedding, payload))
                 
                 # Insert batch
-                await asyncio.to_thread(
-                    self.qdrant.upsert,
-                    collection_name=collection_name,
-                    points=batch_points
-                )
+                await self._upsert(collection_name, batch_points)
                 
                 logger.info(
                     "Batch embeddings created",
@@ -449,4 +665,253 @@ class VectorService(BaseService):
                 collection=collection_name,
                 error=str(e)
             )
-            raise
\ No newline at end of file
+            raise
+    
+    # Online collection migration
+    
+    async def count_points(self, physical_name: str) -> int:
+        """Exact point count of a physical collection"""
+        result = await asyncio.to_thread(
+            self.qdrant.count,
+            collection_name=physical_name,
+            exact=True
+        )
+        return result.count
+    
+    async def begin_collection_migration(self, collection_name: str) -> CollectionRoute:
+        """Start (or resume) moving a logical collection to a native-dimension named slot
+        
+        Creates the target collection and publishes a route that makes every
+        worker write to both collections while reads stay on the source.
+        Returns a route with no target if the collection is already native.
+        """
+        await self.embedding_engine.start()
+        route = await self.get_collection_route(collection_name)
+        
+        if route.target:
+            logger.info("Resuming vector collection migration", collection=collection_name, target=route.target)
+            return route
+        
+        try:
+            layout = await self.get_collection_layout(route.active)
+        except MissingVectorSlotError:
+            # Another model's native collection: move it to this model's slot
+            layout = None
+        
+        if layout is not None and not layout.is_legacy and layout.vector_name == self.vector_slot:
+            return route
+        
+        target_name = f"{collection_name}__{self.vector_slot}"
+        
+        await self.create_collection_if_not_exists(target_name, vector_name=self.vector_slot)
+        
+        route = CollectionRoute(logical=collection_name, active=route.active, target=target_name)
+        await self.collection_router.set_route(self.redis, route)
+        
+        # Let every worker's cached route expire so no write misses the target
+        await asyncio.sleep(self.collection_router.route_ttl)
+        
+        return route
+    
+    async def scroll_points(
+        self,
+        physical_name: str,
+        offset: Any = None,
+        limit: int = 256
+    ) -> Tuple[List[Any], Any]:
+        """Read one page of points with payloads and vectors"""
+        records, next_offset = await asyncio.to_thread(
+            self.qdrant.scroll,
+            collection_name=physical_name,
+            offset=offset,
+            limit=limit,
+            with_payload=True,
+            with_vectors=True
+        )
+        return records, next_offset
+    
+    def _reusable_vector(self, vector: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Native vector recovered from a zero-padded one written by the current model"""
+        dimension = self.embedding_dimension
+        if vector is None or len(vector) < dimension:
+            return None
+        
+        # Anything past the native dimension is padding and must be empty
+        if np.any(vector[dimension:]):
+            return None
+        
+        native = vector[:dimension]
+        if not np.all(np.isfinite(native)) or not np.linalg.norm(native) > 0.0:
+            return None
+        
+        return native
+    
+    async def fetch_stored_vectors(
+        self,
+        point_ids: List[Optional[str]],
+        collection_name: str = "knowledge_items",
+        batch_size: int = RETRIEVE_BATCH_SIZE
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Stored vectors for points as one float32 matrix plus a found mask
+        
+        Rows follow point_ids. Points are retrieved batch_size at a time and
+        written straight into the preallocated matrix; ids that are None,
+        absent from the collection or written by another model stay zero
+        with found False, so callers embed only those rows.
+        """
+        await self.embedding_engine.start()
+        matrix = np.zeros((len(point_ids), self.embedding_dimension), dtype=np.float32)
+        found = np.zeros(len(point_ids), dtype=bool)
+        
+        rows_by_id: Dict[str, List[int]] = defaultdict(list)
+        for row, point_id in enumerate(point_ids):
+            if point_id:
+                rows_by_id[str(point_id)].append(row)
+        if not rows_by_id:
+            return matrix, found
+        
+        route = await self.get_collection_route(collection_name)
+        try:
+            layout = await self.get_collection_layout(route.active)
+        except MissingVectorSlotError as e:
+            # Nothing stored is reusable until the collection is migrated
+            logger.warning("No stored vectors for the loaded model", collection=route.active, error=str(e))
+            return matrix, found
+        ids = list(rows_by_id)
+        
+        for start in range(0, len(ids), batch_size):
+            try:
+                records = await asyncio.to_thread(
+                    self.qdrant.retrieve,
+                    collection_name=route.active,
+                    ids=ids[start:start + batch_size],
+                    with_payload=False,
+                    with_vectors=True
+                )
+            except Exception as e:
+                # The rows stay unfound and are embedded by the caller instead
+                logger.warning(
+                    "Stored vector retrieval failed",
+                    collection=route.active,
+                    batch_size=len(ids[start:start + batch_size]),
+                    error=str(e)
+                )
+                continue
+        
+            for record in records:
+                vector = self._reusable_vector(layout.stored_vector(record.vector))
+                rows = rows_by_id.get(str(record.id))
+                if vector is not None and rows:
+                    matrix[rows] = vector
+                    found[rows] = True
+        
+        return matrix, found
+    
+    async def _fetch_source_texts(self, collection_name: str, point_ids: List[str]) -> Dict[str, str]:
+        """Full text behind points, looked up by embedding_id"""
+        table = CONTENT_SOURCE_TABLES.get(collection_name)
+        if not table or not point_ids:
+            return {}
+        
+        result = await self.postgres.execute(
+            sql_text(f"SELECT embedding_id, content FROM {table} WHERE embedding_id = ANY(:ids)"),
+            {"ids": point_ids}
+        )
+        return {row.embedding_id: row.content for row in result.fetchall()}
+    
+    async def copy_points(
+        self,
+        records: List[Any],
+        route: CollectionRoute,
+        reembed: bool = False
+    ) -> Dict[str, int]:
+        """Copy a page of source points into the migration target
+        
+        Stored vectors are sliced back to native size when they are padded
+        vectors from the current model; anything else is re-embedded from its
+        Postgres source text. Points already in the target were dual-written
+        by live traffic after the migration began and are newer, so they are
+        skipped rather than overwritten.
+        """
+        # The source may hold another model's slot; its vectors are only
+        # reused when _reusable_vector accepts them
+        source = await self.collection_router.get_layout(self.qdrant, route.active)
+        target = await self.get_collection_layout(route.target)
+        
+        ids = [record.id for record in records]
+        existing = await asyncio.to_thread(
+            self.qdrant.retrieve,
+            collection_name=route.target,
+            ids=ids,
+            with_payload=False,
+            with_vectors=False
+        )
+        existing_ids = {point.id for point in existing}
+        
+        vectors: Dict[Any, np.ndarray] = {}
+        needs_text: List[Any] = []
+        
+        for record in records:
+            if record.id in existing_ids:
+                continue
+            
+            vector = None if reembed else self._reusable_vector(source.stored_vector(record.vector))
+            if vector is not None:
+                vectors[record.id] = vector
+            else:
+                needs_text.append(record)
+        
+        failed = 0
+        if needs_text:
+            texts = await self._fetch_source_texts(route.logical, [str(record.id) for record in needs_text])
+            
+            to_embed = []
+            for record in needs_text:
+                # Fall back to the payload when the source row is gone
+                content = texts.get(str(record.id)) or (record.payload or {}).get("content") \
+                    or (record.payload or {}).get("content_preview")
+                if content:
+                    to_embed.append((record.id, normalize_text(content) or "empty content"))
+                else:
+                    failed += 1
+            
+            if to_embed:
+                embeddings = await self._embed_cached([content for _, content in to_embed])
+                for (point_id, _), embedding in zip(to_embed, embeddings):
+                    vectors[point_id] = embedding
+        
+        if vectors:
+            payloads = {record.id: record.payload for record in records}
+            await asyncio.to_thread(
+                self.qdrant.upsert,
+                collection_name=route.target,
+                points=[
+                    PointStruct(id=point_id, vector=target.point_vector(vector), payload=payloads[point_id])
+                    for point_id, vector in vectors.items()
+                ]
+            )
+        
+        return {
+            "copied": len(vectors),
+            "reembedded": len(needs_text) - failed,
+            "skipped": len(existing_ids),
+            "failed": failed
+        }
+    
+    async def complete_collection_migration(self, route: CollectionRoute) -> CollectionRoute:
+        """Switch reads and writes to the migration target
+        
+        The source collection is left in place for rollback; workers still
+        holding the migrating route keep dual-writing until it expires.
+        """
+        completed = CollectionRoute(logical=route.logical, active=route.target)
+        await self.collection_router.set_route(self.redis, completed)
+        
+        logger.info(
+            "Vector collection migration completed",
+            collection=route.logical,
+            previous=route.active,
+            active=route.target
+        )
+        
+        return completed
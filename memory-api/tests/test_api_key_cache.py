@@ -0,0 +1,77 @@
+# ABOUTME: Tests for the verified API key cache and buffered authentication writes
+# ABOUTME: Covers TTL and key-expiry bounds, revocation eviction, LRU limits and write coalescing
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from services.api_key_cache import AuthWriteBuffer, VerifiedKeyCache
+
+class TestVerifiedKeyCache:
+    """Test suite for the verified key cache"""
+
+    def test_hit_after_put(self):
+        cache = VerifiedKeyCache(ttl=60)
+        cache.put("hash-a", "user-a", "key-1")
+
+        assert cache.get("hash-a") == "user-a"
+        assert cache.get("hash-b") is None
+        assert cache.stats()["hits"] == 1
+
+    def test_entry_never_outlives_the_key(self):
+        cache = VerifiedKeyCache(ttl=60)
+        cache.put("hash-a", "user-a", "key-1", datetime.now(timezone.utc) - timedelta(seconds=1))
+
+        assert cache.get("hash-a") is None
+
+    def test_entry_ttl_can_be_shortened(self):
+        cache = VerifiedKeyCache(ttl=60)
+        cache.put("hash-a", "user-a", "key-1", ttl=0)
+        cache.put("hash-b", "user-b", "key-2", ttl=600)
+
+        assert cache.get("hash-a") is None
+        assert cache._entries["hash-b"].expires_at <= time.monotonic() + 60
+
+    def test_revocation_evicts_every_entry_for_the_key(self):
+        cache = VerifiedKeyCache(ttl=60)
+        cache.put("hash-a", "user-a", "key-1")
+        cache.put("hash-b", "user-a", "key-1")
+        cache.put("hash-c", "user-c", "key-2")
+
+        assert cache.evict_key("key-1") == 2
+        assert cache.get("hash-a") is None
+        assert cache.get("hash-c") == "user-c"
+
+    def test_least_recently_used_entry_is_dropped(self):
+        cache = VerifiedKeyCache(ttl=60, max_entries=2)
+        cache.put("hash-a", "user-a", "key-1")
+        cache.put("hash-b", "user-b", "key-2")
+        cache.get("hash-a")
+        cache.put("hash-c", "user-c", "key-3")
+
+        assert cache.get("hash-b") is None
+        assert cache.get("hash-a") == "user-a"
+
+class TestAuthWriteBuffer:
+    """Test suite for batched usage and audit writes"""
+
+    def test_usage_coalesces_per_key(self):
+        buffer = AuthWriteBuffer()
+        buffer.record_usage("key-1", "10.0.0.1")
+        buffer.record_usage("key-1", "10.0.0.2")
+        buffer.record_usage("key-2", "testclient")
+
+        usage, events = buffer.drain()
+
+        assert set(usage) == {"key-1", "key-2"}
+        assert usage["key-1"][1] == "10.0.0.2"
+        assert usage["key-2"][1] is None
+        assert events == []
+        assert buffer.pending == 0
+
+    def test_events_are_bounded(self):
+        buffer = AuthWriteBuffer(max_events=2)
+        for _ in range(3):
+            buffer.record_event({"event_type": "api_access", "success": True})
+
+        assert len(buffer.events) == 2
+        assert buffer.dropped_events == 1
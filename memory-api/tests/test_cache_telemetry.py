@@ -0,0 +1,54 @@
+# ABOUTME: Tests for locally aggregated cache telemetry
+# ABOUTME: Covers counter aggregation, history sampling, recency tracking and preload throttling
+
+from services.cache_telemetry import PATTERN_PREFIX, STATS_PREFIX, CacheTelemetry
+
+class TestCacheTelemetry:
+    """Test suite for cache telemetry aggregation"""
+
+    def test_reads_aggregate_into_global_and_user_counters(self):
+        telemetry = CacheTelemetry(sample_rate=0.0)
+        telemetry.record_access(None, "key-a", "user-1", hit=True)
+        telemetry.record_access(None, "key-a", "user-1", hit=True)
+        telemetry.record_access(None, "key-b", "user-2", hit=False)
+
+        counters, frequency, history, _ = telemetry._drain()
+
+        assert counters[f"{STATS_PREFIX}global"] == {"cache_requests": 3, "cache_hits": 2, "cache_misses": 1}
+        assert counters[f"{STATS_PREFIX}user:user-1"]["cache_hits"] == 2
+        assert frequency["user-1"]["key-a"] == 2
+        assert "user-2" not in frequency
+        assert not history
+
+    def test_drain_resets_pending_state(self):
+        telemetry = CacheTelemetry()
+        telemetry.record_set(None, "key-a", "user-1", "context")
+
+        assert telemetry.pending
+        telemetry._drain()
+        assert not telemetry.pending
+
+    def test_history_is_sampled(self):
+        telemetry = CacheTelemetry(sample_rate=1.0)
+        telemetry.record_access(None, "key-a", "user-1", hit=False)
+
+        _, _, history, _ = telemetry._drain()
+        assert len(history[f"{PATTERN_PREFIX}user:user-1"]) == 1
+
+    def test_hits_refresh_recency_of_typed_keys(self):
+        telemetry = CacheTelemetry(sample_rate=0.0)
+        telemetry.record_set(None, "key-a", "user-1", "context")
+        telemetry._drain()
+
+        telemetry.record_access(None, "key-a", "user-1", hit=True, context_type="context")
+        telemetry.record_access(None, "key-b", "user-1", hit=False, context_type="context")
+
+        _, _, _, recency = telemetry._drain()
+        assert list(recency["context"]) == ["key-a"]
+
+    def test_preload_is_throttled_per_user(self):
+        telemetry = CacheTelemetry()
+
+        assert telemetry.should_preload("user-1", interval=60)
+        assert not telemetry.should_preload("user-1", interval=60)
+        assert telemetry.should_preload("user-2", interval=60)
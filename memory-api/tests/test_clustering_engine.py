@@ -0,0 +1,70 @@
+# ABOUTME: Tests for the process-pooled clustering engine
+# ABOUTME: Covers algorithm selection at the large-input threshold, shared PCA projection and pool execution
+
+import numpy as np
+import pytest
+
+from services.clustering_engine import ClusteringEngine, reduce_features, run_clustering
+
+def _blobs(per_cluster: int = 40, dimensions: int = 32, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=10.0, size=(3, dimensions))
+    return np.vstack([
+        center + rng.normal(scale=0.3, size=(per_cluster, dimensions))
+        for center in centers
+    ]).astype(np.float32)
+
+def _same_partition(labels, expected) -> bool:
+    pairs = {(int(a), int(b)) for a, b in zip(labels, expected)}
+    return len(pairs) == len(set(expected)) == len({a for a, _ in pairs})
+
+EXPECTED = np.repeat(np.arange(3), 40)
+
+def test_reduce_features_orders_components_by_variance():
+    reduced, variance = reduce_features(_blobs(), 8)
+
+    assert reduced.shape == (120, 8)
+    assert reduced.dtype == np.float32
+    assert np.all(np.diff(variance) <= 1e-9)
+
+@pytest.mark.parametrize("algorithm", ["kmeans", "hierarchical", "spectral", "gaussian_mixture"])
+def test_small_and_large_paths_recover_separated_clusters(algorithm):
+    features = _blobs()
+    params = {"n_clusters": 3, "auto_clusters": False, "min_cluster_size": 5}
+
+    small = run_clustering(algorithm, features, params, large_threshold=10_000, reduce_components=8)
+    large = run_clustering(algorithm, features, params, large_threshold=10, reduce_components=8)
+
+    assert _same_partition(small.labels, EXPECTED)
+    assert _same_partition(large.labels, EXPECTED)
+    assert small.projection.shape == (120, 2)
+    assert small.reduced_dimensions == 8
+
+def test_large_inputs_switch_to_scalable_methods():
+    features = _blobs()
+    params = {"n_clusters": 3, "min_cluster_size": 5}
+
+    assert run_clustering("kmeans", features, params, 10, 8).method == "minibatch_kmeans"
+    assert run_clustering("dbscan", features, params, 10, 8).method == "hdbscan"
+    assert run_clustering("dbscan", features, params, 10_000, 8).method == "dbscan"
+
+def test_auto_kmeans_picks_cluster_count_by_silhouette():
+    result = run_clustering("kmeans", _blobs(), {"auto_clusters": True, "min_cluster_size": 5}, 10_000, 8)
+
+    assert result.params["n_clusters"] == 3
+    assert _same_partition(result.labels, EXPECTED)
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        run_clustering("affinity_propagation", _blobs(), {}, 10_000, 8)
+
+@pytest.mark.asyncio
+async def test_engine_runs_fits_off_the_event_loop():
+    engine = ClusteringEngine(workers=0, large_threshold=10_000, reduce_components=8)
+    try:
+        result = await engine.cluster("kmeans", _blobs().astype(np.float64), {"n_clusters": 3})
+    finally:
+        await engine.close()
+
+    assert _same_partition(result.labels, EXPECTED)
+    assert engine.get_stats()["fits"] == 1
@@ -0,0 +1,151 @@
+# ABOUTME: Tests for content fingerprints and MinHash/LSH near-duplicate signatures
+# ABOUTME: Covers normalization, signature stability, similarity estimates and bucket sharing
+
+from uuid import uuid4
+
+import pytest
+
+from services.content_fingerprint import (
+    CONFLICTING_ITEM_SQL,
+    DELETE_LSH_BUCKETS_SQL,
+    DuplicateContentError,
+    EXACT_DUPLICATE_SQL,
+    INSERT_LSH_BUCKETS_SQL,
+    LSH_BANDS,
+    MINHASH_PERMUTATIONS,
+    NEAR_DUPLICATE_CANDIDATES_SQL,
+    STORE_SIGNATURE_SQL,
+    compute_content_signature,
+    content_fingerprint,
+    estimate_similarity,
+    find_conflicting_item,
+    find_exact_duplicate,
+    find_near_duplicates,
+    store_content_signature,
+)
+
+BASE_CONTENT = (
+    "Use a connection pool for PostgreSQL in FastAPI. Create the async engine once at startup, "
+    "size the pool to the worker count, and release sessions in a finally block so that long "
+    "requests never exhaust the pool under load. Monitor checkout latency to catch leaks early."
+)
+
+class TestContentFingerprint:
+    """Test suite for exact-duplicate fingerprints"""
+
+    def test_case_and_whitespace_do_not_change_fingerprint(self):
+        assert content_fingerprint("Pool Sizing", BASE_CONTENT) == content_fingerprint(
+            "  pool   sizing ", BASE_CONTENT.upper().replace(" ", "\n  ")
+        )
+
+    def test_title_is_part_of_fingerprint(self):
+        assert content_fingerprint("Pool sizing", BASE_CONTENT) != content_fingerprint("Pool leaks", BASE_CONTENT)
+
+class TestMinHashSignature:
+    """Test suite for near-duplicate signatures"""
+
+    def test_signature_is_deterministic(self):
+        first = compute_content_signature("Pool sizing", BASE_CONTENT)
+        second = compute_content_signature("Pool sizing", BASE_CONTENT)
+
+        assert first == second
+        assert len(first.minhash) == MINHASH_PERMUTATIONS
+        assert len(first.buckets) == LSH_BANDS
+        assert all(0 <= value < 2 ** 31 for value in first.minhash)
+
+    def test_near_duplicate_is_similar_and_shares_a_bucket(self):
+        original = compute_content_signature("Pool sizing", BASE_CONTENT)
+        edited = compute_content_signature("Pool sizing", BASE_CONTENT + " Tune it per environment.")
+
+        assert estimate_similarity(original.minhash, edited.minhash) >= 0.75
+        assert set(zip(original.bands, original.buckets)) & set(zip(edited.bands, edited.buckets))
+
+    def test_unrelated_content_is_dissimilar(self):
+        original = compute_content_signature("Pool sizing", BASE_CONTENT)
+        other = compute_content_signature(
+            "React effects",
+            "Return a cleanup function from useEffect to unsubscribe listeners when the component unmounts."
+        )
+
+        assert estimate_similarity(original.minhash, other.minhash) < 0.2
+
+    def test_mismatched_signatures_have_zero_similarity(self):
+        assert estimate_similarity([1, 2, 3], [1, 2]) == pytest.approx(0.0)
+
+class FakeConnection:
+    """Answers the signature queries from an in-memory items table and bucket index"""
+
+    def __init__(self):
+        self.items = {}
+        self.buckets = set()
+
+    async def execute(self, query, *args):
+        if query == STORE_SIGNATURE_SQL:
+            item_id, fingerprint, minhash = args
+            self.items.setdefault(item_id, {}).update(fingerprint=fingerprint, minhash=minhash)
+        elif query == DELETE_LSH_BUCKETS_SQL:
+            self.buckets = {row for row in self.buckets if row[2] != args[0]}
+        else:
+            assert query == INSERT_LSH_BUCKETS_SQL
+            item_id, project_id, bands, buckets = args
+            self.buckets |= {(band, bucket, item_id, project_id) for band, bucket in zip(bands, buckets)}
+
+    async def fetchval(self, query, project_id, *args):
+        if query == CONFLICTING_ITEM_SQL:
+            content_hash, fingerprint, exclude = args
+            return next(
+                (
+                    item_id for item_id, item in self.items.items()
+                    if item_id != exclude
+                    and (item.get("content_hash") == content_hash or item["fingerprint"] == fingerprint)
+                ),
+                None
+            )
+        assert query == EXACT_DUPLICATE_SQL
+        fingerprint, = args
+        return next((item_id for item_id, item in self.items.items() if item["fingerprint"] == fingerprint), None)
+
+    async def fetch(self, query, project_id, bands, buckets, exclude, limit):
+        assert query == NEAR_DUPLICATE_CANDIDATES_SQL
+        probe = set(zip(bands, buckets))
+        matched = {row[2] for row in self.buckets if (row[0], row[1]) in probe and row[2] not in exclude}
+        return [{"id": item_id, "minhash_signature": self.items[item_id]["minhash"]} for item_id in matched]
+
+class TestStoredSignatures:
+    """Test suite for keeping stored signatures in step with edits"""
+
+    @pytest.mark.asyncio
+    async def test_edited_item_only_matches_its_new_text(self):
+        conn = FakeConnection()
+        item_id, project_id = uuid4(), uuid4()
+        other_content = "Return a cleanup function from useEffect to unsubscribe listeners when the component unmounts."
+        await store_content_signature(conn, item_id, project_id, "Pool sizing", BASE_CONTENT)
+
+        await store_content_signature(conn, item_id, project_id, "React effects", other_content)
+
+        old = compute_content_signature("Pool sizing", BASE_CONTENT)
+        new = compute_content_signature("React effects", other_content)
+        assert await find_exact_duplicate(conn, old, project_id) is None
+        assert await find_near_duplicates(conn, old, project_id) == []
+        assert await find_exact_duplicate(conn, new, project_id) == item_id
+        assert {row[2] for row in conn.buckets} == {item_id}
+        assert len(conn.buckets) == len(set(zip(new.bands, new.buckets)))
+
+    @pytest.mark.asyncio
+    async def test_conflicting_item_excludes_the_edited_item(self):
+        conn = FakeConnection()
+        item_id, other_id, project_id = uuid4(), uuid4(), uuid4()
+        await store_content_signature(conn, item_id, project_id, "Pool sizing", BASE_CONTENT)
+        await store_content_signature(conn, other_id, project_id, "Pool leaks", BASE_CONTENT)
+
+        fingerprint = content_fingerprint("Pool sizing", BASE_CONTENT)
+        assert await find_conflicting_item(conn, project_id, "hash", fingerprint, other_id) == item_id
+        assert await find_conflicting_item(conn, project_id, "hash", fingerprint, item_id) is None
+
+    def test_duplicate_error_names_the_existing_item(self):
+        existing_id = uuid4()
+
+        error = DuplicateContentError(existing_id)
+
+        assert error.existing_id == existing_id
+        assert str(existing_id) in str(error)
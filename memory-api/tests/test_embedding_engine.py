@@ -0,0 +1,169 @@
+# ABOUTME: Tests for the batched embedding engine and content-addressed embedding cache
+# ABOUTME: Covers micro-batch coalescing, bulk chunking, failure propagation and cache tiers
+
+import asyncio
+import pytest
+import pytest_asyncio
+import numpy as np
+from unittest.mock import AsyncMock, MagicMock
+
+import services.embedding_engine as embedding_engine
+from services.embedding_engine import EmbeddingEngine
+from services.embedding_cache import (
+    EmbeddingCache, make_embedding_key, pack_vector, unpack_vector
+)
+
+class FakeModel:
+    """Deterministic stand-in for a SentenceTransformer"""
+
+    def __init__(self, dimension: int = 8):
+        self.dimension = dimension
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([
+            np.full(self.dimension, float(len(text)), dtype=np.float32)
+            for text in texts
+        ])
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Install a fake model so in-process workers skip model loading"""
+    model = FakeModel()
+    monkeypatch.setattr(embedding_engine, "_worker_model", model)
+    monkeypatch.setattr(embedding_engine, "_worker_model_name", "fake-model")
+    return model
+
+@pytest_asyncio.fixture
+async def engine(fake_model):
+    """In-process engine with a generous batching window"""
+    engine = EmbeddingEngine(
+        model_name="fake-model",
+        fallback_model_name="fake-model",
+        workers=0,
+        max_batch_size=16,
+        max_wait_ms=50
+    )
+    yield engine
+    await engine.close()
+
+class TestEmbeddingEngine:
+    """Test suite for micro-batched embedding"""
+
+    @pytest.mark.asyncio
+    async def test_start_resolves_model_dimension(self, engine):
+        await engine.start()
+
+        assert engine.loaded_model_name == "fake-model"
+        assert engine.dimension == 8
+
+    @pytest.mark.asyncio
+    async def test_concurrent_embeds_share_one_batch(self, engine, fake_model):
+        texts = [f"text {i}" * (i + 1) for i in range(10)]
+
+        results = await asyncio.gather(*(engine.embed(text) for text in texts))
+
+        assert len(fake_model.calls) == 1
+        assert fake_model.calls[0] == texts
+        for text, result in zip(texts, results):
+            assert result[0] == float(len(text))
+
+    @pytest.mark.asyncio
+    async def test_batches_are_bounded_by_size(self, engine, fake_model):
+        await asyncio.gather(*(engine.embed(str(i)) for i in range(40)))
+
+        assert all(len(call) <= 16 for call in fake_model.calls)
+        assert sum(len(call) for call in fake_model.calls) == 40
+
+    @pytest.mark.asyncio
+    async def test_embed_many_chunks_by_batch_size(self, engine, fake_model):
+        results = await engine.embed_many([str(i) for i in range(33)])
+
+        assert len(results) == 33
+        assert [len(call) for call in fake_model.calls] == [16, 16, 1]
+        assert engine.get_stats()["items"] == 33
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self, engine, fake_model, monkeypatch):
+        def broken_encode(texts, **kwargs):
+            raise RuntimeError("model crashed")
+
+        monkeypatch.setattr(fake_model, "encode", broken_encode)
+
+        results = await asyncio.gather(
+            engine.embed("a"), engine.embed("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_failed_start_shuts_down_the_executor(self, engine, monkeypatch):
+        def broken_init(*args):
+            raise RuntimeError("model load failed")
+
+        monkeypatch.setattr(embedding_engine, "_init_worker", broken_init)
+
+        with pytest.raises(RuntimeError):
+            await engine.start()
+
+        assert engine._executor is None
+        assert not engine._started
+
+class TestEmbeddingCache:
+    """Test suite for the two-tier embedding cache"""
+
+    def test_key_ignores_whitespace_differences(self):
+        assert make_embedding_key("m", "fix  the\nbug ") == make_embedding_key("m", "fix the bug")
+
+    def test_key_depends_on_model(self):
+        assert make_embedding_key("model-a", "text") != make_embedding_key("model-b", "text")
+
+    def test_pack_roundtrip_is_float32_bytes(self):
+        vector = np.arange(768, dtype=np.float32) / 768
+
+        packed = pack_vector(vector)
+
+        assert len(packed) == 768 * 4
+        np.testing.assert_array_equal(unpack_vector(packed), vector)
+
+    @pytest.mark.asyncio
+    async def test_local_tier_hits_and_misses(self):
+        cache = EmbeddingCache(max_entries=10)
+        await cache.set("a", np.ones(4, dtype=np.float32))
+
+        found = await cache.get_many(["a", "b"])
+
+        assert list(found) == ["a"]
+        stats = cache.get_stats()
+        assert stats["local_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_local_tier_is_bounded(self):
+        cache = EmbeddingCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            await cache.set(key, np.ones(4, dtype=np.float32))
+
+        assert cache.get_stats()["local_entries"] == 2
+        assert await cache.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_hit_is_promoted_locally(self):
+        vector = np.full(4, 0.5, dtype=np.float32)
+        cache = EmbeddingCache(max_entries=10, redis_url="redis://unused")
+        cache._redis = MagicMock()
+        cache._redis.mget = AsyncMock(return_value=[pack_vector(vector), None])
+
+        found = await cache.get_many(["a", "b"])
+
+        np.testing.assert_array_equal(found["a"], vector)
+        assert "b" not in found
+        assert cache.get_stats()["redis_hits"] == 1
+
+        await cache.get("a")
+        assert cache._redis.mget.await_count == 1
@@ -0,0 +1,156 @@
+# ABOUTME: Tests for the graph metrics engine
+# ABOUTME: Checks exact and sampled metrics against networkx, PageRank warm starts, caching and Neo4j persistence
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from services.graph_metrics_engine import (
+    LOAD_NODES_QUERY, LOAD_SUMMARY_QUERY, PERSIST_NODES_QUERY, PERSIST_SUMMARY_QUERY,
+    GraphMetricsEngine, compute_graph_metrics
+)
+from services.knowledge_graph_model import GraphView, KnowledgeGraphModel
+
+def _two_cliques(size=6):
+    """Two cliques joined by a single bridge edge"""
+    graph = nx.barbell_graph(size, 0)
+    sources, targets = zip(*graph.edges())
+    return graph, np.array(sources), np.array(targets), np.ones(len(sources))
+
+def _view(graph):
+    model = KnowledgeGraphModel()
+    model.upsert_edges(
+        {"key": f"r{i}", "source": f"n{a}", "target": f"n{b}", "weight": 1.0}
+        for i, (a, b) in enumerate(graph.edges())
+    )
+    adjacency, nodes = model.adjacency()
+    return GraphView(
+        version=model.version,
+        nodes=nodes,
+        node_ids=list(model.node_ids),
+        adjacency=adjacency,
+        graph=model.to_networkx()
+    )
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        self._iter = iter(self._rows)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def single(self):
+        return self._rows[0] if self._rows else None
+
+    async def consume(self):
+        return None
+
+class FakeNeo4j:
+    """Stores persisted metrics in memory and answers the engine's queries"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.summary = None
+
+    def session(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, **params):
+        if query == PERSIST_NODES_QUERY:
+            for row in params["rows"]:
+                self.nodes[row["id"]] = {**row, "version": params["version"]}
+            return _Result([])
+        if query == PERSIST_SUMMARY_QUERY:
+            self.summary = dict(params)
+            return _Result([])
+        if query == LOAD_SUMMARY_QUERY:
+            return _Result([self.summary] if self.summary else [])
+        assert query == LOAD_NODES_QUERY
+        return _Result(list(self.nodes.values()))
+
+def test_exact_metrics_match_networkx():
+    graph, sources, targets, weights = _two_cliques()
+    metrics = compute_graph_metrics(graph.number_of_nodes(), sources, targets, weights, None, 100, 8, 1.0)
+
+    assert not metrics.approximate
+    expected = nx.betweenness_centrality(graph)
+    np.testing.assert_allclose(metrics.scores["betweenness"], [expected[n] for n in range(12)])
+    expected = nx.pagerank(graph)
+    np.testing.assert_allclose(metrics.scores["pagerank"], [expected[n] for n in range(12)], atol=1e-6)
+    assert len(set(metrics.communities.tolist())) == 2
+    assert metrics.modularity > 0.3
+    assert metrics.structure["is_connected"]
+    assert metrics.structure["network_diameter"] == nx.diameter(graph)
+
+def test_sampled_metrics_rank_the_bridge_highest():
+    graph, sources, targets, weights = _two_cliques(20)
+    metrics = compute_graph_metrics(graph.number_of_nodes(), sources, targets, weights, None, 10, 10, 1.0)
+
+    assert metrics.approximate
+    bridge = set(np.argsort(-metrics.scores["betweenness"])[:2].tolist())
+    assert bridge == {19, 20}
+    assert np.argmax(metrics.scores["closeness"]) in (19, 20)
+    assert 1.0 < metrics.structure["average_path_length"] < 3.0
+
+def test_warm_start_converges_to_the_same_pagerank():
+    graph, sources, targets, weights = _two_cliques()
+    cold = compute_graph_metrics(12, sources, targets, weights, None, 100, 8, 1.0)
+    start = cold.scores["pagerank"].copy()
+    start[3] = np.nan
+    warm = compute_graph_metrics(12, sources, targets, weights, start, 100, 8, 1.0)
+
+    # Both runs stop at PageRank's own convergence tolerance
+    np.testing.assert_allclose(warm.scores["pagerank"], cold.scores["pagerank"], atol=1e-4)
+
+def test_graph_without_edges_has_singleton_communities():
+    metrics = compute_graph_metrics(3, np.array([], dtype=int), np.array([], dtype=int), np.array([]), None, 100, 8, 1.0)
+
+    assert metrics.communities.tolist() == [0, 1, 2]
+    assert metrics.modularity == 0.0
+    assert metrics.structure["connected_components"] == 3
+
+@pytest.mark.asyncio
+async def test_engine_caches_per_corpus_version():
+    engine = GraphMetricsEngine(workers=0)
+    view = _view(_two_cliques()[0])
+
+    first = await engine.metrics(view, "v1", "*")
+    second = await engine.metrics(view, "v1", "*")
+    third = await engine.metrics(view, "v2", "*")
+
+    assert first is second and third is not first
+    assert engine.get_stats()["computations"] == 2
+    assert third.node_ids == view.node_ids
+    await engine.close()
+
+@pytest.mark.asyncio
+async def test_persisted_metrics_are_read_back_by_another_engine():
+    driver = FakeNeo4j()
+    view = _view(_two_cliques()[0])
+    computed = await GraphMetricsEngine(workers=0).metrics(view, "v1", "*", driver)
+
+    reader = GraphMetricsEngine(workers=0)
+    loaded = await reader.metrics(view, "v1", "*", driver)
+
+    assert reader.get_stats()["computations"] == 0
+    assert reader.get_stats()["persisted_hits"] == 1
+    np.testing.assert_allclose(loaded.scores["pagerank"], computed.scores["pagerank"])
+    assert loaded.community_map() == computed.community_map()
+    assert loaded.structure == computed.structure
+
+    await reader.metrics(view, "v2", "*", driver)
+    assert reader.get_stats()["computations"] == 1
+    await reader.close()
@@ -0,0 +1,116 @@
+# ABOUTME: Tests for the bounded-concurrency ingestion scheduler
+# ABOUTME: Covers item and backend budgets, tenant round-robin and the interactive priority lane
+
+import asyncio
+
+import pytest
+
+from services.ingestion_scheduler import FairLimiter, IngestionScheduler, Priority
+
+class TestFairLimiter:
+    """Test suite for the fair, prioritized limiter"""
+
+    @pytest.mark.asyncio
+    async def test_batch_work_leaves_reserved_slots_free(self):
+        limiter = FairLimiter("items", capacity=3, reserved=1)
+
+        await limiter.acquire("a", Priority.BATCH)
+        await limiter.acquire("a", Priority.BATCH)
+        waiting = asyncio.ensure_future(limiter.acquire("a", Priority.BATCH))
+        await asyncio.sleep(0)
+
+        assert not waiting.done()
+        await asyncio.wait_for(limiter.acquire("b", Priority.INTERACTIVE), timeout=1)
+        assert limiter.in_use == 3
+
+        waiting.cancel()
+
+    @pytest.mark.asyncio
+    async def test_waiting_tenants_are_served_round_robin(self):
+        limiter = FairLimiter("items", capacity=1)
+        await limiter.acquire("seed", Priority.BATCH)
+        order = []
+
+        async def take(tenant):
+            await limiter.acquire(tenant, Priority.BATCH)
+            order.append(tenant)
+            limiter.release()
+
+        tasks = [asyncio.ensure_future(take(tenant)) for tenant in ["a", "a", "a", "b", "c"]]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["a", "b", "c", "a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_interactive_waiters_go_first(self):
+        limiter = FairLimiter("items", capacity=1)
+        await limiter.acquire("seed", Priority.BATCH)
+        order = []
+
+        async def take(tenant, priority):
+            await limiter.acquire(tenant, priority)
+            order.append(tenant)
+            limiter.release()
+
+        tasks = [
+            asyncio.ensure_future(take("backfill", Priority.BATCH)),
+            asyncio.ensure_future(take("live", Priority.INTERACTIVE))
+        ]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["live", "backfill"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        limiter = FairLimiter("items", capacity=1)
+        await limiter.acquire("a", Priority.BATCH)
+        waiting = asyncio.ensure_future(limiter.acquire("b", Priority.BATCH))
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        limiter.release()
+
+        assert limiter.in_use == 0
+        assert limiter.stats()["waiting"] == {"interactive": 0, "batch": 0}
+
+class TestIngestionScheduler:
+    """Test suite for item and backend budgets"""
+
+    @pytest.mark.asyncio
+    async def test_backend_budget_bounds_concurrency(self):
+        scheduler = IngestionScheduler(max_items=10, backend_limits={"postgres": 2})
+        active = 0
+        peak = 0
+
+        async def job():
+            nonlocal active, peak
+            async with scheduler.backend("postgres"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+            return True
+
+        results = await asyncio.gather(*[scheduler.run(job, tenant="t") for _ in range(8)])
+
+        assert all(results)
+        assert peak == 2
+        assert scheduler.stats()["backends"]["postgres"]["in_use"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_job_releases_its_slot(self):
+        scheduler = IngestionScheduler(max_items=1, backend_limits={})
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run(failing)
+
+        assert scheduler.items.in_use == 0
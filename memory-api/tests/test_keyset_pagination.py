@@ -0,0 +1,23 @@
+# ABOUTME: Tests for keyset pagination cursors
+# ABOUTME: Covers round trips of timezone-aware sort keys and rejection of malformed cursors
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from services.keyset_pagination import decode_cursor, encode_cursor
+
+def test_cursor_round_trip_preserves_microseconds_and_timezone():
+    row_id = uuid4()
+    updated_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(updated_at, row_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (updated_at, row_id)
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime(2024, 1, 1), uuid4()) + "AAAA"])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,84 @@
+# ABOUTME: Tests for full-text keyword query parsing and hybrid result fusion
+# ABOUTME: Covers websearch passthrough, prefix terms, identifier fallback, RRF and weighted fusion
+
+import pytest
+
+from services.keyword_search import parse_keyword_query
+from services.hybrid_search import fuse_rankings
+
+class TestKeywordQueryParsing:
+    """Test suite for keyword query parsing"""
+
+    def test_phrases_negation_and_or_pass_to_websearch(self):
+        query = parse_keyword_query('jwt "token rotation" -oauth OR session')
+
+        assert query.websearch == 'jwt "token rotation" -oauth OR session'
+        assert query.prefixes == []
+        assert query.identifiers == []
+
+    def test_prefix_terms_become_tsquery_prefixes(self):
+        query = parse_keyword_query("auth* -deprec*")
+
+        assert query.prefixes == ["auth:*", "!(deprec:*)"]
+        assert query.params()["kw_prefix"] == "auth:* & !(deprec:*)"
+        assert "to_tsquery" in query.tsquery_sql()
+
+    def test_identifiers_use_literal_match(self):
+        query = parse_keyword_query("get_user_by_id useEffect cleanup")
+
+        assert query.identifiers == ["get_user_by_id", "useEffect"]
+        assert query.websearch == "cleanup"
+        assert query.params()["kw_ident_0"] == "%get\\_user\\_by\\_id%"
+        assert query.identifier_match_sql(["title", "content"]).count("ILIKE") == 4
+
+    def test_dangling_or_is_dropped(self):
+        assert parse_keyword_query("OR redis OR").websearch == "redis"
+
+    def test_empty_query(self):
+        query = parse_keyword_query("   ")
+
+        assert query.is_empty
+        assert query.tsquery_sql() is None
+
+class TestResultFusion:
+    """Test suite for hybrid rank fusion"""
+
+    def test_rrf_rewards_agreement_between_legs(self):
+        fused = fuse_rankings({
+            "vector": [("a", 0.91), ("b", 0.90), ("c", 0.80)],
+            "keyword": [("c", 2.5), ("d", 1.0)]
+        })
+
+        assert fused[0].id == "c"
+        assert fused[0].ranks == {"vector": 3, "keyword": 1}
+        assert {entry.id for entry in fused} == {"a", "b", "c", "d"}
+
+    def test_rrf_ignores_score_scale(self):
+        small = fuse_rankings({"vector": [("a", 0.9), ("b", 0.1)]})
+        large = fuse_rankings({"vector": [("a", 900.0), ("b", 100.0)]})
+
+        assert [entry.score for entry in small] == [entry.score for entry in large]
+
+    def test_weighted_fusion_normalizes_each_leg(self):
+        fused = fuse_rankings(
+            {
+                "vector": [("a", 0.9), ("b", 0.5)],
+                "keyword": [("b", 40.0), ("a", 10.0)]
+            },
+            method="weighted",
+            weights={"vector": 0.75, "keyword": 0.25}
+        )
+
+        assert fused[0].id == "a"
+        assert fused[0].score == pytest.approx(0.75)
+        assert fused[1].score == pytest.approx(0.25)
+
+    def test_duplicate_ids_keep_best_rank(self):
+        fused = fuse_rankings({"vector": [("a", 0.9), ("a", 0.2)]})
+
+        assert len(fused) == 1
+        assert fused[0].ranks["vector"] == 1
+
+    def test_unknown_method_is_rejected(self):
+        with pytest.raises(ValueError):
+            fuse_rankings({"vector": []}, method="borda")
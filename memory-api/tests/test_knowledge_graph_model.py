@@ -0,0 +1,232 @@
+# ABOUTME: Tests for the in-memory knowledge graph model and its incremental Neo4j loader
+# ABOUTME: Covers CSR compilation, filtered views, paged full loads, watermark deltas and reloads after deletions
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from services.knowledge_graph_model import (
+    COUNT_QUERY, DELTA_EDGES_QUERY, DELTA_NODES_QUERY, FULL_PAGE_QUERY,
+    KnowledgeGraphLoader, KnowledgeGraphModel
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+class _Record:
+    def __init__(self, data):
+        self._data = data
+
+    def data(self):
+        return dict(self._data)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = [_Record(row) for row in rows]
+
+    def __aiter__(self):
+        self._iter = iter(self._rows)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def single(self):
+        return self._rows[0]
+
+class FakeNeo4j:
+    """Just enough of the async driver to answer the loader's queries from memory"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+        self.queries = []
+
+    def add_node(self, node_id, changed_at=T0, **attrs):
+        self.nodes[node_id] = {"id": node_id, "created_at": changed_at, "changed_at": changed_at, **attrs}
+
+    def add_edge(self, key, source, target, weight=0.5, changed_at=T0):
+        self.edges[key] = {"key": key, "source": source, "target": target, "type": "RELATES_TO",
+                           "weight": weight, "changed_at": changed_at}
+
+    def session(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, **params):
+        self.queries.append(query)
+        if query == COUNT_QUERY:
+            return _Result([{"nodes": len(self.nodes), "edges": len(self.edges)}])
+
+        if query == FULL_PAGE_QUERY:
+            ids = sorted(n for n in self.nodes if params["after"] is None or n > params["after"])[:params["limit"]]
+            return _Result([{
+                "id": n, "title": self.nodes[n].get("title"), "knowledge_type": None,
+                "created_at": self.nodes[n]["created_at"], "changed_at": self.nodes[n]["changed_at"],
+                "edges": [
+                    {"key": e["key"], "target": e["target"], "type": e["type"],
+                     "weight": e["weight"], "changed_at": e["changed_at"]}
+                    for e in self.edges.values() if e["source"] == n
+                ]
+            } for n in ids])
+
+        rows, key = (list(self.nodes.values()), "id") if query == DELTA_NODES_QUERY else (list(self.edges.values()), "key")
+        assert query in (DELTA_NODES_QUERY, DELTA_EDGES_QUERY)
+        since, after = params["since"], params["after"]
+        rows = [
+            row for row in rows
+            if since is None or row["changed_at"] > since or (row["changed_at"] == since and row[key] > after)
+        ]
+        rows.sort(key=lambda row: (row["changed_at"], row[key]))
+        return _Result(rows[:params["limit"]])
+
+class TestKnowledgeGraphModel:
+    """Test suite for the compact graph model"""
+
+    def test_parallel_edges_collapse_to_strongest(self):
+        model = KnowledgeGraphModel()
+        model.upsert_nodes([{"id": "a", "title": "A"}, {"id": "b", "title": "B"}])
+        model.upsert_edges([
+            {"key": "r1", "source": "a", "target": "b", "weight": 0.3},
+            {"key": "r2", "source": "a", "target": "b", "weight": 0.9},
+            {"key": "r3", "source": "b", "target": "c", "weight": 0.4}
+        ])
+
+        adjacency, nodes = model.adjacency()
+        assert model.number_of_nodes == 3
+        assert adjacency.nnz == 2
+        assert adjacency[model.index["a"], model.index["b"]] == 0.9
+
+        graph = model.to_networkx()
+        assert graph["a"]["b"]["weight"] == 0.9
+        assert graph.nodes["a"]["concept"] == "A"
+        assert graph.nodes["c"]["concept"] == ""
+
+    def test_subgraph_selection_by_ids_and_time(self):
+        model = KnowledgeGraphModel()
+        model.upsert_nodes([
+            {"id": "a", "created_at": T0},
+            {"id": "b", "created_at": T0 + timedelta(days=2)},
+            {"id": "c", "created_at": T0 + timedelta(days=1)}
+        ])
+        model.upsert_edges([
+            {"key": "r1", "source": "a", "target": "c", "weight": 1.0},
+            {"key": "r2", "source": "c", "target": "b", "weight": 1.0}
+        ])
+
+        nodes = model.select({"a", "c", "missing"})
+        adjacency, nodes = model.adjacency(nodes)
+        assert [model.node_ids[i] for i in nodes] == ["a", "c"]
+        np.testing.assert_array_equal(adjacency.toarray(), [[0, 1], [0, 0]])
+
+        recent = model.select(None, (T0 + timedelta(hours=12), T0 + timedelta(days=3)))
+        graph = model.to_networkx(recent)
+        assert set(graph.nodes) == {"b", "c"}
+        assert list(graph.edges) == [("c", "b")]
+
+    def test_time_selection_mixes_naive_and_aware_datetimes(self):
+        model = KnowledgeGraphModel()
+        model.upsert_nodes([
+            {"id": "aware", "created_at": T0 + timedelta(hours=1)},
+            {"id": "naive", "created_at": datetime(2026, 1, 1, 2)},
+            {"id": "offset", "created_at": datetime(2026, 1, 1, 5, tzinfo=timezone(timedelta(hours=2)))},
+            {"id": "late", "created_at": T0 + timedelta(days=1)}
+        ])
+
+        selected = model.select(None, (datetime(2026, 1, 1), datetime(2026, 1, 1, 4)))
+
+        assert [model.node_ids[i] for i in selected] == ["aware", "naive", "offset"]
+
+    def test_version_changes_only_on_writes(self):
+        model = KnowledgeGraphModel()
+        version = model.version
+        model.upsert_nodes([])
+        assert model.version == version
+        model.upsert_nodes([{"id": "a"}])
+        assert model.version > version
+
+class TestKnowledgeGraphLoader:
+    """Test suite for loading the model from Neo4j"""
+
+    def _driver(self, count=5):
+        driver = FakeNeo4j()
+        for i in range(count):
+            driver.add_node(f"n{i}", title=f"Item {i}")
+        for i in range(count - 1):
+            driver.add_edge(f"r{i}", f"n{i}", f"n{i + 1}")
+        return driver
+
+    @pytest.mark.asyncio
+    async def test_full_load_pages_through_all_nodes(self):
+        driver = self._driver()
+        loader = KnowledgeGraphLoader(batch_size=2)
+
+        model = await loader.refresh(driver)
+
+        assert model.number_of_nodes == 5
+        assert model.number_of_edges == 4
+        assert driver.queries.count(FULL_PAGE_QUERY) == 3
+        assert loader.watermark == T0
+
+    @pytest.mark.asyncio
+    async def test_delta_applies_changes_since_watermark(self):
+        driver = self._driver()
+        loader = KnowledgeGraphLoader(refresh_interval=0)
+        await loader.refresh(driver)
+
+        later = T0 + timedelta(minutes=5)
+        driver.add_node("n5", changed_at=later)
+        driver.add_edge("r9", "n4", "n5", weight=0.8, changed_at=later)
+        driver.queries.clear()
+
+        model = await loader.refresh(driver)
+
+        assert FULL_PAGE_QUERY not in driver.queries
+        assert model.number_of_nodes == 6
+        assert model.to_networkx()["n4"]["n5"]["weight"] == 0.8
+        assert loader.watermark == later
+
+    @pytest.mark.asyncio
+    async def test_deletion_triggers_full_reload(self):
+        driver = self._driver()
+        loader = KnowledgeGraphLoader(refresh_interval=0)
+        await loader.refresh(driver)
+
+        del driver.edges["r0"]
+        model = await loader.refresh(driver)
+
+        assert model.number_of_edges == 3
+        assert loader.get_stats()["full_loads"] == 2
+
+    @pytest.mark.asyncio
+    async def test_views_are_cached_per_filter_until_the_model_changes(self):
+        driver = self._driver()
+        loader = KnowledgeGraphLoader(refresh_interval=0)
+        calls = []
+
+        async def resolve():
+            calls.append(1)
+            return {"n0", "n1"}
+
+        first = await loader.view(driver, "project-a", resolve)
+        second = await loader.view(driver, "project-a", resolve)
+        everything = await loader.view(driver, "*")
+
+        assert first is second and len(calls) == 1
+        assert first.node_ids == ["n0", "n1"] and first.graph.number_of_edges() == 1
+        assert everything.graph.number_of_nodes() == 5
+
+        driver.add_node("n9", changed_at=T0 + timedelta(minutes=1))
+        third = await loader.view(driver, "project-a", resolve)
+        assert third is not first and len(calls) == 2
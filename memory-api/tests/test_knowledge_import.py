@@ -0,0 +1,175 @@
+# ABOUTME: Tests for the set-based bulk knowledge import merge
+# ABOUTME: Runs the staging statements against the dedup migration in a scratch schema for every duplicate mode
+
+import hashlib
+import os
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from services.content_fingerprint import compute_content_signature
+from services.knowledge_import import merge_import_chunk
+
+asyncpg = pytest.importorskip("asyncpg")
+
+# The merge is plain SQL against the unique indexes, so these tests need a real Postgres
+POSTGRES_DSN = os.environ.get("BETTY_TEST_POSTGRES_DSN")
+pytestmark = pytest.mark.skipif(not POSTGRES_DSN, reason="BETTY_TEST_POSTGRES_DSN is not set")
+
+MIGRATION = Path(__file__).resolve().parents[2] / "scripts" / "database" / "fix-knowledge-dedup-schema.sql"
+
+PROJECT = uuid4()
+USER = uuid4()
+
+BASE_CONTENT = (
+    "Use a connection pool for PostgreSQL in FastAPI. Create the async engine once at startup "
+    "and size the pool to the worker count."
+)
+
+@pytest_asyncio.fixture
+async def conn():
+    """Connection whose search path is a scratch schema holding knowledge_items and the dedup migration"""
+    connection = await asyncpg.connect(POSTGRES_DSN)
+    schema = f"import_test_{uuid4().hex}"
+    await connection.execute(f"CREATE SCHEMA {schema}")
+    await connection.execute(f"SET search_path TO {schema}")
+    await connection.execute("""
+        CREATE TABLE schema_version (version VARCHAR(50) PRIMARY KEY, description TEXT);
+        CREATE TABLE knowledge_items (
+            id UUID PRIMARY KEY,
+            project_id UUID NOT NULL,
+            session_id UUID,
+            user_id UUID NOT NULL,
+            title VARCHAR(500) NOT NULL,
+            content TEXT NOT NULL,
+            content_hash VARCHAR(64) NOT NULL,
+            knowledge_type VARCHAR(100) NOT NULL,
+            quality_score REAL DEFAULT 0.5,
+            complexity_level VARCHAR(50) DEFAULT 'medium',
+            embedding_id VARCHAR(255),
+            system_time_until TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            metadata JSONB DEFAULT '{}'::jsonb,
+            UNIQUE(project_id, content_hash)
+        );
+    """)
+    await connection.execute(MIGRATION.read_text())
+    try:
+        yield connection
+    finally:
+        await connection.execute(f"DROP SCHEMA {schema} CASCADE")
+        await connection.close()
+
+def _row(ord, title, content):
+    """A prepared import row, as KnowledgeService._prepare_item_row builds it"""
+    signature = compute_content_signature(title, content)
+    return {
+        "ord": ord,
+        "id": uuid4(),
+        "title": title,
+        "content": content,
+        "content_hash": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        "content_fingerprint": signature.fingerprint,
+        "minhash_signature": signature.minhash,
+        "lsh_bands": signature.bands,
+        "lsh_buckets": signature.buckets,
+        "knowledge_type": "solution",
+        "quality_score": 0.5,
+        "complexity_level": "medium",
+        "session_id": None,
+        "user_id": USER,
+        "project_id": PROJECT,
+        "metadata": {"tags": ["postgres"]}
+    }
+
+async def _existing(conn, title="Pool sizing", content=BASE_CONTENT):
+    """Import one item and return its id"""
+    merge = await merge_import_chunk(conn, [_row(0, title, content)], skip_duplicates=True, update_existing=False)
+    item_id, = merge.inserted_ids
+    await conn.execute("UPDATE knowledge_items SET embedding_id = 'point-1' WHERE id = $1", item_id)
+    return item_id
+
+def _payload():
+    return [
+        _row(0, "Pool leaks", "Release sessions in a finally block so requests never exhaust the pool."),
+        # Same content_hash as the existing item
+        _row(1, "Pool sizing", BASE_CONTENT),
+        # Same fingerprint as the existing item, different content_hash
+        _row(2, "Pool sizing", BASE_CONTENT.upper()),
+        _row(3, "Checkout latency", "Monitor pool checkout latency to catch connection leaks early."),
+        # Same content_hash as row 0
+        _row(4, "Pool leaks", "Release sessions in a finally block so requests never exhaust the pool.")
+    ]
+
+async def _items(conn):
+    return {row["id"]: dict(row) for row in await conn.fetch("SELECT * FROM knowledge_items")}
+
+@pytest.mark.asyncio
+async def test_without_skip_duplicates_rows_fail_individually(conn):
+    existing_id = await _existing(conn)
+    rows = _payload()
+
+    merge = await merge_import_chunk(conn, rows, skip_duplicates=False, update_existing=False)
+
+    assert merge.inserted_ids == {rows[0]["id"], rows[3]["id"]}
+    assert merge.rejected == [(1, existing_id), (2, existing_id), (4, rows[0]["id"])]
+    assert merge.updated == []
+    assert len(await _items(conn)) == 3
+
+@pytest.mark.asyncio
+async def test_skip_duplicates_leaves_existing_items_alone(conn):
+    existing_id = await _existing(conn)
+    rows = _payload()
+
+    merge = await merge_import_chunk(conn, rows, skip_duplicates=True, update_existing=False)
+
+    assert merge.inserted_ids == {rows[0]["id"], rows[3]["id"]}
+    assert merge.rejected == []
+    assert merge.updated == []
+    assert (await _items(conn))[existing_id]["content"] == BASE_CONTENT
+
+@pytest.mark.asyncio
+async def test_update_existing_rewrites_content_and_signature(conn):
+    existing_id = await _existing(conn)
+    rows = _payload()[2:]
+
+    merge = await merge_import_chunk(conn, rows, skip_duplicates=True, update_existing=True)
+
+    assert merge.inserted_ids == {rows[1]["id"], rows[2]["id"]}
+    assert [item["id"] for item in merge.updated] == [existing_id]
+    assert merge.updated[0]["embedding_id"] == "point-1"
+
+    item = (await _items(conn))[existing_id]
+    signature = compute_content_signature("Pool sizing", BASE_CONTENT.upper())
+    assert item["content"] == BASE_CONTENT.upper()
+    assert item["content_hash"] == rows[0]["content_hash"]
+    assert item["metadata"] == '{"tags": ["postgres"]}'
+    assert item["minhash_signature"] == signature.minhash
+    buckets = await conn.fetch("SELECT band, bucket FROM knowledge_lsh_buckets WHERE knowledge_item_id = $1", existing_id)
+    assert {(row["band"], row["bucket"]) for row in buckets} == set(zip(signature.bands, signature.buckets))
+
+@pytest.mark.asyncio
+async def test_update_existing_on_content_hash_collision_keeps_the_existing_title(conn):
+    existing_id = await _existing(conn)
+
+    merge = await merge_import_chunk(
+        conn, [_row(0, "Sizing the pool", BASE_CONTENT)], skip_duplicates=True, update_existing=True
+    )
+
+    assert merge.inserted_ids == set()
+    assert [item["id"] for item in merge.updated] == [existing_id]
+    item = (await _items(conn))[existing_id]
+    assert item["title"] == "Pool sizing"
+    assert item["content_fingerprint"] == compute_content_signature("Pool sizing", BASE_CONTENT).fingerprint
+
+@pytest.mark.asyncio
+async def test_inserted_rows_get_lsh_buckets(conn):
+    rows = _payload()[:1]
+
+    await merge_import_chunk(conn, rows, skip_duplicates=False, update_existing=False)
+
+    count = await conn.fetchval("SELECT count(*) FROM knowledge_lsh_buckets WHERE knowledge_item_id = $1", rows[0]["id"])
+    assert count == len(set(zip(rows[0]["lsh_bands"], rows[0]["lsh_buckets"])))
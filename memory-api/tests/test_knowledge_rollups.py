@@ -0,0 +1,130 @@
+# ABOUTME: Tests for the trigger-maintained knowledge analytics rollups
+# ABOUTME: Runs the rollup migration in a scratch schema and checks inserts, updates, deletes and rebuilds against it
+
+import os
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+asyncpg = pytest.importorskip("asyncpg")
+
+# The rollups are plain SQL, so these tests need a real Postgres
+POSTGRES_DSN = os.environ.get("BETTY_TEST_POSTGRES_DSN")
+pytestmark = pytest.mark.skipif(not POSTGRES_DSN, reason="BETTY_TEST_POSTGRES_DSN is not set")
+
+MIGRATION = Path(__file__).resolve().parents[2] / "scripts" / "database" / "fix-knowledge-rollups-schema.sql"
+
+DAILY_ROLLUP_SQL = """
+    SELECT day::text, project_id, knowledge_type, item_count, scored_count, quality_sum
+    FROM knowledge_daily_rollup ORDER BY day, project_id, knowledge_type
+"""
+PATTERN_ROLLUP_SQL = """
+    SELECT day::text, project_id, pattern, item_count
+    FROM knowledge_pattern_daily_rollup ORDER BY day, project_id, pattern
+"""
+
+PROJECT = uuid4()
+
+@pytest_asyncio.fixture
+async def conn():
+    """Connection whose search path is a scratch schema holding the rollup migration"""
+    connection = await asyncpg.connect(POSTGRES_DSN)
+    schema = f"rollup_test_{uuid4().hex}"
+    await connection.execute(f"CREATE SCHEMA {schema}")
+    await connection.execute(f"SET search_path TO {schema}")
+    await connection.execute("""
+        CREATE TABLE schema_version (version VARCHAR(50) PRIMARY KEY, description TEXT);
+        CREATE TABLE knowledge_items (
+            id UUID PRIMARY KEY,
+            project_id UUID NOT NULL,
+            knowledge_type VARCHAR(100) NOT NULL,
+            patterns JSONB DEFAULT '[]'::jsonb,
+            quality_score REAL DEFAULT 0.5,
+            reusability_score REAL DEFAULT 0.5,
+            success_rate REAL DEFAULT 0.0,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    await connection.execute(MIGRATION.read_text())
+    try:
+        yield connection
+    finally:
+        await connection.execute(f"DROP SCHEMA {schema} CASCADE")
+        await connection.close()
+
+async def _insert(conn, *items):
+    await conn.executemany("""
+        INSERT INTO knowledge_items (id, project_id, knowledge_type, patterns, quality_score, created_at)
+        VALUES ($1, $2, $3, $4::jsonb, $5, $6::text::timestamptz)
+    """, items)
+
+def _item(knowledge_type="solution", patterns='["retry"]', quality=0.8, created_at="2026-03-01 10:00+00"):
+    return (uuid4(), PROJECT, knowledge_type, patterns, quality, created_at)
+
+async def _rollups(conn):
+    return [tuple(row) for row in await conn.fetch(DAILY_ROLLUP_SQL)], [tuple(row) for row in await conn.fetch(PATTERN_ROLLUP_SQL)]
+
+@pytest.mark.asyncio
+async def test_inserts_are_rolled_up_per_day_and_type(conn):
+    await _insert(
+        conn,
+        _item(),
+        _item(quality=0.0),
+        _item(knowledge_type="pattern", patterns='["retry", "backoff"]'),
+        _item(created_at="2026-03-02 23:30+00")
+    )
+
+    daily, patterns = await _rollups(conn)
+
+    assert [(day, kind, count, scored) for day, _, kind, count, scored, _ in daily] == [
+        ("2026-03-01", "pattern", 1, 1),
+        ("2026-03-01", "solution", 2, 1),
+        ("2026-03-02", "solution", 1, 1)
+    ]
+    assert daily[1][5] == pytest.approx(0.8)
+    assert [(day, pattern, count) for day, _, pattern, count in patterns] == [
+        ("2026-03-01", "backoff", 1),
+        ("2026-03-01", "retry", 3),
+        ("2026-03-02", "retry", 1)
+    ]
+
+@pytest.mark.asyncio
+async def test_updates_move_items_and_deletes_drop_empty_rows(conn):
+    first, second = _item(), _item()
+    await _insert(conn, first, second)
+
+    await conn.execute("UPDATE knowledge_items SET knowledge_type = 'pattern', patterns = '[]' WHERE id = $1", first[0])
+    daily, patterns = await _rollups(conn)
+    assert [(kind, count) for _, _, kind, count, _, _ in daily] == [("pattern", 1), ("solution", 1)]
+    assert [(pattern, count) for _, _, pattern, count in patterns] == [("retry", 1)]
+
+    await conn.execute("DELETE FROM knowledge_items WHERE id = ANY($1::uuid[])", [first[0], second[0]])
+    assert await _rollups(conn) == ([], [])
+
+@pytest.mark.asyncio
+async def test_unrelated_updates_leave_rollups_alone(conn):
+    item = _item()
+    await _insert(conn, item)
+    before = await _rollups(conn)
+
+    await conn.execute("UPDATE knowledge_items SET reusability_score = reusability_score WHERE id = $1", item[0])
+
+    assert await _rollups(conn) == before
+
+@pytest.mark.asyncio
+async def test_maintained_rollups_match_a_full_rebuild(conn):
+    await _insert(conn, *(_item(quality=0.1 * i, created_at=f"2026-03-0{1 + i % 3} 12:00+00") for i in range(9)))
+    await conn.execute("UPDATE knowledge_items SET quality_score = 0.0 WHERE quality_score > 0.5")
+    await conn.execute("DELETE FROM knowledge_items WHERE created_at < '2026-03-02'")
+
+    maintained_daily, maintained_patterns = await _rollups(conn)
+    rebuilt = await conn.fetchval("SELECT rebuild_knowledge_rollups()")
+    daily, patterns = await _rollups(conn)
+
+    # Score sums may drift by rounding after many deltas; counts must not
+    assert [row[:5] for row in daily] == [row[:5] for row in maintained_daily]
+    assert [row[5] for row in daily] == pytest.approx([row[5] for row in maintained_daily])
+    assert patterns == maintained_patterns
+    assert rebuilt == sum(row[3] for row in daily)
@@ -0,0 +1,92 @@
+# ABOUTME: Tests for GCRA rate limiting
+# ABOUTME: Covers burst limits, partial token grants, per-key isolation, route policy parsing and headers
+
+import pytest
+
+from core.rate_limiter import LocalRateLimiter, Quota, RateLimiter, gcra, parse_route_policies
+
+class TestGCRA:
+    """Test suite for the in-process GCRA step"""
+
+    def test_full_burst_then_denial(self):
+        quota = Quota(limit=3, period=60)
+        tat = now = 0.0
+        for _ in range(3):
+            tat, granted, _, _, _ = gcra(tat, now, quota)
+            assert granted == 1
+
+        _, granted, remaining, retry_after, _ = gcra(tat, now, quota)
+        assert granted == 0
+        assert remaining == 0
+        assert retry_after == quota.emission_ms
+
+    def test_tokens_replenish_at_the_emission_rate(self):
+        quota = Quota(limit=2, period=60)
+        tat, _, _, _, _ = gcra(0.0, 0.0, quota, quantity=2)
+
+        assert gcra(tat, quota.emission_ms - 1, quota)[1] == 0
+        assert gcra(tat, quota.emission_ms, quota)[1] == 1
+
+    def test_lease_is_capped_by_available_tokens(self):
+        quota = Quota(limit=10, period=10)
+        tat, granted, remaining, _, _ = gcra(0.0, 0.0, quota, quantity=7)
+        assert (granted, remaining) == (7, 3)
+
+        _, granted, remaining, _, _ = gcra(tat, 0.0, quota, quantity=7)
+        assert (granted, remaining) == (3, 0)
+
+class TestLocalRateLimiter:
+    """Test suite for the per-process limiter"""
+
+    def test_keys_are_limited_independently(self):
+        limiter = LocalRateLimiter()
+        quota = Quota(limit=2, period=60)
+
+        assert limiter.check("a", quota).allowed
+        assert limiter.check("a", quota).allowed
+        assert not limiter.check("a", quota).allowed
+        assert limiter.check("b", quota).allowed
+
+    def test_denial_headers(self):
+        limiter = LocalRateLimiter()
+        quota = Quota(limit=1, period=60)
+        limiter.check("a", quota)
+        headers = limiter.check("a", quota).headers()
+
+        assert headers["X-RateLimit-Limit"] == "1"
+        assert headers["X-RateLimit-Remaining"] == "0"
+        assert int(headers["Retry-After"]) == 60
+
+class TestRateLimiter:
+    """Test suite for the shared limiter without Redis"""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_limits(self):
+        limiter = RateLimiter(redis_client=None)
+        quota = Quota(limit=1, period=60)
+
+        assert (await limiter.check("a", quota)).allowed
+        assert not (await limiter.check("a", quota)).allowed
+
+    @pytest.mark.asyncio
+    async def test_check_all_requires_every_quota(self):
+        limiter = RateLimiter(redis_client=None)
+        result = await limiter.check_all([
+            ("user", Quota(limit=100, period=60)),
+            ("route", Quota(limit=1, period=60))
+        ])
+        assert result.allowed and result.remaining == 0
+
+        result = await limiter.check_all([
+            ("user", Quota(limit=100, period=60)),
+            ("route", Quota(limit=1, period=60))
+        ])
+        assert not result.allowed
+
+def test_route_policies_match_longest_prefix_first():
+    policies = parse_route_policies("/api=100/60, POST /api/knowledge/bulk=10/30")
+
+    assert [policy.prefix for policy in policies] == ["/api/knowledge/bulk", "/api"]
+    assert policies[0].method == "POST"
+    assert policies[0].quota == Quota(limit=10, period=30)
+    assert policies[1].method is None
@@ -140,8 +140,12 @@ class TestContextLoading:
     
     async def test_load_context_for_session_success(self, retrieval_service, sample_context_request, sample_vector_results, sample_knowledge_items):
         """Test successful context loading"""
-        # Mock vector service
-        with patch.object(retrieval_service.vector_service, 'search_similar', return_value=sample_vector_results):
+        # Mock vector service: one batched search returns results for every leg
+        async def batch_results(searches, query_vector=None, collection_name="knowledge_items"):
+            return [sample_vector_results for _ in searches]
+        
+        with patch.object(retrieval_service.vector_service, 'get_embedding', return_value=[0.1] * 768), \
+             patch.object(retrieval_service.vector_service, 'search_batch', side_effect=batch_results) as mock_batch:
             # Mock database fetching
             with patch.object(retrieval_service, '_fetch_knowledge_items_by_ids', return_value=sample_knowledge_items):
                 # Mock knowledge count
@@ -156,6 +160,10 @@ class TestContextLoading:
                     assert response.metadata.total_knowledge_items == 1500
                     assert response.metadata.items_returned > 0
                     assert response.metadata.search_time_ms > 0
+                    
+                    # All vector legs share one embedding and one Qdrant round-trip
+                    assert mock_batch.call_count == 1
+                    retrieval_service.vector_service.get_embedding.assert_called_once()
     
     async def test_context_depth_basic(self, retrieval_service, sample_context_request):
         """Test basic context depth loading"""
@@ -563,7 +571,7 @@ class TestErrorHandling:
     async def test_vector_service_failure_graceful_degradation(self, retrieval_service, sample_context_request):
         """Test graceful degradation when vector service fails"""
         # Mock vector service failure
-        with patch.object(retrieval_service.vector_service, 'search_similar', side_effect=Exception("Vector service down")):
+        with patch.object(retrieval_service.vector_service, 'search_batch', side_effect=Exception("Vector service down")):
             with patch.object(retrieval_service, '_find_similar_patterns', return_value=[]):
                 with patch.object(retrieval_service, '_find_cross_project_insights', return_value=[]):
                     with patch.object(retrieval_service, '_get_total_knowledge_count', return_value=100):
@@ -0,0 +1,135 @@
+# ABOUTME: Tests for the in-process read-through cache tier and request coalescing
+# ABOUTME: Covers LRU bounds, tag and pattern invalidation, staleness, invalidation generations, singleflight and serialization
+
+import asyncio
+import time
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from services.service_cache import CacheEntry, InvalidationLog, LocalCache, SingleFlight, dumps, loads
+
+def _entry(value, ttl=60.0, stale=60.0, tags=()):
+    now = time.time()
+    return CacheEntry(value=value, fresh_until=now + ttl, stale_until=now + ttl + stale, tags=frozenset(tags))
+
+class TestLocalCache:
+    """Test suite for the in-process cache tier"""
+
+    def test_least_recently_used_entry_is_dropped(self):
+        cache = LocalCache(max_entries=2)
+        cache.put("a", _entry(1))
+        cache.put("b", _entry(2))
+        cache.get("a")
+        cache.put("c", _entry(3))
+
+        assert cache.get("b") is None
+        assert cache.get("a").value == 1
+
+    def test_invalidate_by_tag_and_pattern(self):
+        cache = LocalCache()
+        cache.put("knowledge:item:1", _entry(1, tags=["knowledge:item:1"]))
+        cache.put("knowledge:item:2", _entry(2, tags=["knowledge:item:2"]))
+        cache.put("sessions:stats:all", _entry(3))
+
+        cache.invalidate_tags(["knowledge:item:1"])
+        assert cache.get("knowledge:item:1") is None
+        assert cache.get("knowledge:item:2") is not None
+
+        cache.invalidate_matching("knowledge:*")
+        assert cache.get("knowledge:item:2") is None
+        assert cache.get("sessions:stats:all") is not None
+
+    def test_stale_entries_are_served_until_stale_deadline(self):
+        cache = LocalCache()
+        cache.put("stale", _entry(1, ttl=-1.0, stale=60.0))
+        cache.put("gone", _entry(2, ttl=-2.0, stale=1.0))
+
+        entry = cache.get("stale")
+        assert entry is not None and not entry.is_fresh
+        assert cache.get("gone") is None
+
+    def test_callers_cannot_mutate_cached_values(self):
+        cache = LocalCache()
+        stored = {"tags": ["postgres"]}
+        cache.put("knowledge:item:1", _entry(stored))
+        stored["tags"].append("stored")
+
+        served = cache.get("knowledge:item:1").value
+        served["tags"].append("served")
+
+        assert cache.get("knowledge:item:1").value == {"tags": ["postgres"]}
+
+class TestInvalidationLog:
+    """Test suite for voiding in-flight fetches"""
+
+    def test_invalidation_only_voids_fetches_it_covers(self):
+        log = InvalidationLog()
+        started = log.generation
+
+        log.record(keys=["knowledge:item:1"], tags=["knowledge:project:a"])
+
+        assert not log.unchanged_since(started, "knowledge:item:1")
+        assert not log.unchanged_since(started, "knowledge:item:2", ["knowledge:project:a"])
+        assert log.unchanged_since(started, "knowledge:item:2", ["knowledge:project:b"])
+        assert log.unchanged_since(log.generation, "knowledge:item:1", ["knowledge:project:a"])
+
+    def test_pattern_invalidation_voids_matching_keys(self):
+        log = InvalidationLog()
+        started = log.generation
+
+        log.record(pattern="sessions:*")
+
+        assert not log.unchanged_since(started, "sessions:stats:all")
+        assert log.unchanged_since(started, "knowledge:item:1")
+
+    def test_forgotten_invalidations_void_older_fetches(self):
+        log = InvalidationLog(max_entries=2)
+        started = log.generation
+
+        for key in ("a", "b", "c"):
+            log.record(keys=[key])
+
+        assert not log.unchanged_since(started, "unrelated")
+        assert log.unchanged_since(log.generation, "unrelated")
+
+class TestSingleFlight:
+    """Test suite for request coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flights.do("key", fetch) for _ in range(10)))
+
+        assert results == ["value"] * 10
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_fetch(self):
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "value"
+
+        first = asyncio.create_task(flights.do("key", fetch))
+        second = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "value"
+
+def test_serializer_handles_datetimes_and_uuids():
+    item_id = uuid4()
+    data = loads(dumps({"id": item_id, "at": datetime(2024, 1, 1), 1: "one"}))
+
+    assert data == {"id": str(item_id), "at": "2024-01-01T00:00:00", "1": "one"}
@@ -0,0 +1,96 @@
+# ABOUTME: Tests for blocked similarity pair extraction
+# ABOUTME: Checks threshold and top-k block boundaries against a dense reference, each metric and normalization edge cases
+
+import numpy as np
+import pytest
+
+from services.similarity_blocks import (
+    iter_similar_pairs, iter_top_k, normalize_rows, pairs_to_csr, prepare_vectors, similar_pairs
+)
+
+def _dense_pairs(normalized, min_similarity):
+    dense = normalized @ normalized.T
+    return {
+        (i, j)
+        for i in range(len(dense))
+        for j in range(i + 1, len(dense))
+        if dense[i, j] >= min_similarity
+    }
+
+def test_blocked_pairs_match_dense_reference_across_block_sizes():
+    rng = np.random.default_rng(7)
+    base = rng.normal(size=(6, 16))
+    vectors = np.repeat(base, 5, axis=0) + rng.normal(scale=0.05, size=(30, 16))
+    normalized = normalize_rows(vectors)
+    expected = _dense_pairs(normalized, 0.9)
+
+    for block_size in (1, 4, 7, 30, 64):
+        rows, cols, scores = similar_pairs(normalized, 0.9, block_size=block_size)
+        assert set(zip(rows.tolist(), cols.tolist())) == expected
+        assert np.all(rows < cols)
+        assert np.all(scores >= 0.9) and np.all(scores <= 1.0)
+
+def test_normalize_rows_keeps_zero_rows_and_copies_input():
+    vectors = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32)
+    normalized = normalize_rows(vectors)
+
+    assert normalized.dtype == np.float32
+    np.testing.assert_allclose(normalized, [[0.6, 0.8], [0.0, 0.0]])
+    assert vectors[0, 0] == 3.0
+
+def test_no_pairs_yields_empty_arrays():
+    rows, cols, scores = similar_pairs(normalize_rows(np.eye(3)), 0.5)
+
+    assert len(rows) == len(cols) == len(scores) == 0
+
+def test_top_k_matches_dense_argsort_and_skips_self():
+    rng = np.random.default_rng(11)
+    normalized = normalize_rows(rng.normal(size=(25, 8)))
+    dense = normalized @ normalized.T
+    np.fill_diagonal(dense, -np.inf)
+
+    for block_size in (1, 6, 25):
+        rows, cols, scores = zip(*iter_top_k(normalized, 3, block_size=block_size))
+        rows, cols, scores = np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+        assert np.array_equal(rows, np.repeat(np.arange(25), 3))
+        assert not np.any(rows == cols)
+        for row in range(25):
+            expected = np.argsort(-dense[row])[:3]
+            np.testing.assert_array_equal(cols[rows == row], expected)
+            assert np.all(np.diff(scores[rows == row]) <= 0)
+
+def test_top_k_respects_min_similarity_and_small_inputs():
+    normalized = normalize_rows(np.eye(4))
+
+    assert list(iter_top_k(normalized, 2, min_similarity=0.5)) == []
+    assert list(iter_top_k(normalize_rows(np.ones((1, 3))), 5)) == []
+
+def test_pairs_to_csr_mirrors_upper_triangle():
+    matrix = pairs_to_csr(np.array([0, 1]), np.array([2, 2]), np.array([0.9, 0.8]), 3, symmetric=True)
+
+    assert matrix.nnz == 4
+    np.testing.assert_allclose(matrix.toarray(), [[0, 0, 0.9], [0, 0, 0.8], [0.9, 0.8, 0]], rtol=1e-6)
+
+def test_euclidean_scores_match_distances_of_unit_vectors():
+    rng = np.random.default_rng(3)
+    vectors = prepare_vectors(rng.normal(size=(12, 8)), "euclidean")
+
+    rows, cols, scores = zip(*iter_similar_pairs(vectors, 0.0, block_size=5, metric="euclidean"))
+    rows, cols, scores = np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+    assert len(rows) == 12 * 11 // 2
+    distances = np.linalg.norm(vectors[rows] - vectors[cols], axis=1)
+    np.testing.assert_allclose(scores, 1.0 / (1.0 + distances), rtol=1e-5)
+
+def test_dot_product_keeps_vector_lengths():
+    vectors = prepare_vectors([[2.0, 0.0], [3.0, 0.0], [1.0, 1.0]], "dot_product")
+
+    rows, cols, scores = next(iter_top_k(vectors, 1, metric="dot_product"))
+
+    assert cols.tolist() == [1, 0, 1]
+    np.testing.assert_allclose(scores, [6.0, 6.0, 3.0])
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError):
+        prepare_vectors(np.eye(2), "manhattan")
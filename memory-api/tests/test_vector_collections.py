@@ -0,0 +1,190 @@
+# ABOUTME: Tests for vector collection routing and native-dimension layouts
+# ABOUTME: Covers named vector slots, legacy padding, route caching and migration vector reuse
+
+import json
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from services.vector_collections import (
+    CollectionLayout, CollectionRoute, MissingVectorSlotError, VectorCollectionRouter,
+    ROUTE_KEY_PREFIX, vector_slot_name
+)
+from services.vector_service import VectorService
+from services.vector_profiles import (
+    COLLECTION_PROFILES, get_search_profile, resolve_collection_profile
+)
+
+class TestCollectionLayout:
+    """Test suite for per-collection vector formatting"""
+
+    def test_slot_name_from_model(self):
+        assert vector_slot_name("sentence-transformers/all-mpnet-base-v2") == "all-mpnet-base-v2"
+        assert vector_slot_name("all-MiniLM-L6-v2") == "all-minilm-l6-v2"
+
+    def test_named_layout_keeps_native_dimension(self):
+        layout = CollectionLayout(name="knowledge_items__all-mpnet-base-v2", vector_name="all-mpnet-base-v2", size=768)
+
+        point_vector = layout.point_vector(np.ones(768, dtype=np.float32))
+
+        assert list(point_vector) == ["all-mpnet-base-v2"]
+        assert len(point_vector["all-mpnet-base-v2"]) == 768
+
+    def test_named_layout_query_vector(self):
+        layout = CollectionLayout(name="c", vector_name="slot", size=4)
+
+        query = layout.query_vector([0.1, 0.2, 0.3, 0.4])
+
+        assert query.name == "slot"
+        assert len(query.vector) == 4
+
+    def test_legacy_layout_pads_to_collection_size(self):
+        layout = CollectionLayout(name="knowledge_items", vector_name=None, size=1536)
+
+        point_vector = layout.point_vector(np.ones(768, dtype=np.float32))
+
+        assert len(point_vector) == 1536
+        assert point_vector[767] == 1.0
+        assert point_vector[768] == 0.0
+
+    def test_stored_vector_reads_named_slot(self):
+        layout = CollectionLayout(name="c", vector_name="slot", size=2)
+
+        assert layout.stored_vector({"slot": [1.0, 2.0]}).tolist() == [1.0, 2.0]
+        assert layout.stored_vector({"other": [1.0, 2.0]}) is None
+
+class TestCollectionRouter:
+    """Test suite for logical-to-physical collection routing"""
+
+    @pytest.mark.asyncio
+    async def test_default_route_is_logical_name(self):
+        router = VectorCollectionRouter()
+        redis_client = AsyncMock()
+        redis_client.get.return_value = None
+
+        route = await router.get_route(redis_client, "knowledge_items")
+
+        assert route.active == "knowledge_items"
+        assert route.write_collections == ["knowledge_items"]
+
+    @pytest.mark.asyncio
+    async def test_migrating_route_writes_to_both(self):
+        router = VectorCollectionRouter()
+        redis_client = AsyncMock()
+        redis_client.get.return_value = json.dumps({"active": "knowledge_items", "target": "knowledge_items__slot"})
+
+        route = await router.get_route(redis_client, "knowledge_items")
+
+        assert route.write_collections == ["knowledge_items", "knowledge_items__slot"]
+        redis_client.get.assert_awaited_once_with(ROUTE_KEY_PREFIX + "knowledge_items")
+
+    @pytest.mark.asyncio
+    async def test_route_is_cached_between_lookups(self):
+        router = VectorCollectionRouter(route_ttl=60)
+        redis_client = AsyncMock()
+        redis_client.get.return_value = None
+
+        await router.get_route(redis_client, "knowledge_items")
+        await router.get_route(redis_client, "knowledge_items")
+
+        assert redis_client.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_layout_introspects_named_vectors_once(self):
+        router = VectorCollectionRouter()
+        qdrant = MagicMock()
+        qdrant.get_collection.return_value = SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(
+            vectors={"all-mpnet-base-v2": SimpleNamespace(size=768)}
+        )))
+
+        layout = await router.get_layout(qdrant, "knowledge_items__all-mpnet-base-v2", "all-mpnet-base-v2")
+        await router.get_layout(qdrant, "knowledge_items__all-mpnet-base-v2", "all-mpnet-base-v2")
+
+        assert layout.vector_name == "all-mpnet-base-v2"
+        assert layout.size == 768
+        assert qdrant.get_collection.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_slot_is_not_replaced_by_another_model(self):
+        router = VectorCollectionRouter()
+        qdrant = MagicMock()
+        qdrant.get_collection.return_value = SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(
+            vectors={"all-mpnet-base-v2": SimpleNamespace(size=768)}
+        )))
+
+        with pytest.raises(MissingVectorSlotError):
+            await router.get_layout(qdrant, "knowledge_items", "all-minilm-l6-v2")
+
+        source = await router.get_layout(qdrant, "knowledge_items")
+        assert source.vector_name == "all-mpnet-base-v2"
+
+def _vector_service(dimension=4):
+    """VectorService over a stub engine, without databases"""
+    service = VectorService.__new__(VectorService)
+    service.embedding_engine = SimpleNamespace(
+        dimension=dimension, loaded_model_name="all-minilm-l6-v2", model_name="all-minilm-l6-v2", start=AsyncMock()
+    )
+    service.collection_router = VectorCollectionRouter()
+    return service
+
+class TestStoredVectorReuse:
+    """Test suite for reusing stored vectors instead of re-encoding"""
+
+    def test_trailing_zero_component_is_reusable(self):
+        service = _vector_service()
+
+        vector = service._reusable_vector(np.array([0.5, 0.5, 0.5, 0.0, 0.0, 0.0], dtype=np.float32))
+
+        assert vector.tolist() == [0.5, 0.5, 0.5, 0.0]
+
+    def test_padding_zero_and_non_finite_vectors_are_rejected(self):
+        service = _vector_service()
+
+        assert service._reusable_vector(np.array([0.5, 0.5, 0.5], dtype=np.float32)) is None
+        assert service._reusable_vector(np.array([0.5, 0.5, 0.5, 0.5, 0.1], dtype=np.float32)) is None
+        assert service._reusable_vector(np.zeros(4, dtype=np.float32)) is None
+        assert service._reusable_vector(np.array([0.5, np.nan, 0.5, 0.5], dtype=np.float32)) is None
+
+    @pytest.mark.asyncio
+    async def test_missing_slot_leaves_every_point_unfound(self):
+        service = _vector_service()
+        service.get_collection_route = AsyncMock(return_value=CollectionRoute(logical="knowledge_items", active="knowledge_items"))
+        service.qdrant = MagicMock()
+        service.qdrant.get_collection.return_value = SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(
+            vectors={"all-mpnet-base-v2": SimpleNamespace(size=768)}
+        )))
+
+        matrix, found = await service.fetch_stored_vectors(["a", None, "b"])
+
+        assert matrix.shape == (3, 4)
+        assert not found.any()
+        service.qdrant.retrieve.assert_not_called()
+
+class TestVectorProfiles:
+    """Test suite for quantization and search profiles"""
+
+    def test_large_collections_use_product_quantization(self):
+        settings = SimpleNamespace(vector_quantization="scalar", vector_product_quantization_collections="knowledge_items")
+
+        assert resolve_collection_profile("knowledge_items__all-mpnet-base-v2", settings).name == "product"
+        assert resolve_collection_profile("messages", settings).name == "scalar"
+
+    def test_product_profile_keeps_originals_on_disk(self):
+        profile = COLLECTION_PROFILES["product"]
+
+        assert profile.originals_on_disk
+        assert profile.quantization_config().product.always_ram
+        assert profile.estimated_ram_bytes(1000, 768) < COLLECTION_PROFILES["scalar"].estimated_ram_bytes(1000, 768)
+
+    def test_search_profile_params(self):
+        params = get_search_profile("context").search_params()
+
+        assert params.hnsw_ef == 128
+        assert params.quantization.rescore
+        assert params.quantization.oversampling == 2.0
+        assert get_search_profile("exact").search_params().exact
+
+    def test_unknown_search_profile_is_rejected(self):
+        with pytest.raises(ValueError):
+            get_search_profile("fastest")
@@ -90,8 +90,10 @@ CREATE TABLE sessions (
     session_title VARCHAR(500),
     session_context TEXT, -- What was Claude working on?
     
-    -- Session metrics
+    -- Session metrics (maintained by SessionService.create_message)
     message_count INTEGER DEFAULT 0,
+    token_count BIGINT DEFAULT 0,
+    last_message_at TIMESTAMP WITH TIME ZONE,
     duration_seconds INTEGER,
     tools_used JSONB DEFAULT '[]'::jsonb, -- ['Read', 'Edit', 'Bash', 'WebSearch']
     files_modified JSONB DEFAULT '[]'::jsonb, -- ['/path/to/file1.py', '/path/to/file2.js']
@@ -160,6 +162,8 @@ CREATE TABLE knowledge_items (
     title VARCHAR(500) NOT NULL,
     content TEXT NOT NULL,
     content_hash VARCHAR(64) NOT NULL, -- SHA-256 hash for deduplication
+    content_fingerprint VARCHAR(64), -- SHA-256 of normalized title + content (case/whitespace-insensitive)
+    minhash_signature INTEGER[], -- MinHash signature for near-duplicate detection
     knowledge_type VARCHAR(100) NOT NULL, -- 'solution', 'pattern', 'decision', 'error_fix', 'architecture'
     
     -- Categorization
@@ -207,10 +211,56 @@ CREATE TABLE knowledge_items (
     -- Additional metadata
     metadata JSONB DEFAULT '{}'::jsonb,
     
+    -- Weighted full-text document: title (A), problem/solution (B), content and summary (C)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(problem_description, '') || ' ' || COALESCE(solution_description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(content, '') || ' ' || COALESCE(metadata->>'summary', '')), 'C')
+    ) STORED,
+    
     -- Ensure content hash uniqueness per project
     UNIQUE(project_id, content_hash)
 );
 
+-- Knowledge LSH Buckets table - MinHash band buckets for near-duplicate lookup
+CREATE TABLE knowledge_lsh_buckets (
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    knowledge_item_id UUID NOT NULL REFERENCES knowledge_items(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL,
+    
+    PRIMARY KEY (band, bucket, knowledge_item_id)
+);
+
+-- Daily counts and score sums per project and knowledge type; score columns cover
+-- items with quality_score > 0, matching the intelligence metrics
+CREATE TABLE knowledge_daily_rollup (
+    day DATE NOT NULL,
+    project_id UUID NOT NULL,
+    knowledge_type VARCHAR(100) NOT NULL,
+    item_count BIGINT NOT NULL DEFAULT 0,
+    scored_count BIGINT NOT NULL DEFAULT 0,
+    quality_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    reusability_count BIGINT NOT NULL DEFAULT 0,
+    reusability_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    success_count BIGINT NOT NULL DEFAULT 0,
+    success_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (day, project_id, knowledge_type)
+);
+
+-- Daily pattern occurrences per project
+CREATE TABLE knowledge_pattern_daily_rollup (
+    day DATE NOT NULL,
+    project_id UUID NOT NULL,
+    pattern TEXT NOT NULL,
+    item_count BIGINT NOT NULL DEFAULT 0,
+    success_count BIGINT NOT NULL DEFAULT 0,
+    success_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (day, project_id, pattern)
+);
+
 -- Knowledge Relationships table - Explicit relationships between knowledge items
 CREATE TABLE knowledge_relationships (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -361,6 +411,9 @@ CREATE INDEX idx_sessions_started_at ON sessions(started_at);
 CREATE INDEX idx_sessions_session_outcome ON sessions(session_outcome);
 CREATE INDEX idx_sessions_tools_used ON sessions USING GIN(tools_used);
 CREATE INDEX idx_sessions_graphiti_session_id ON sessions(graphiti_session_id);
+-- Keyset pagination on (updated_at, id), per user and across all sessions
+CREATE INDEX idx_sessions_user_updated_keyset ON sessions(user_id, updated_at DESC, id DESC);
+CREATE INDEX idx_sessions_updated_keyset ON sessions(updated_at DESC, id DESC);
 
 -- Messages indexes
 CREATE INDEX idx_messages_session_id ON messages(session_id);
@@ -369,6 +422,10 @@ CREATE INDEX idx_messages_message_index ON messages(session_id, message_index);
 CREATE INDEX idx_messages_timestamp ON messages(timestamp);
 CREATE INDEX idx_messages_content_hash ON messages(content_hash);
 CREATE INDEX idx_messages_embedding_id ON messages(embedding_id);
+-- Newest-first build_context scans and (created_at, id) keyset paging; unfiltered and
+-- covering role only because the base table has no deleted_at or token_count column
+CREATE INDEX idx_messages_session_created_keyset ON messages(session_id, created_at DESC, id DESC)
+    INCLUDE (role);
 
 -- Full-text search on message content
 CREATE INDEX idx_messages_content_search ON messages USING GIN(to_tsvector('english', content));
@@ -395,7 +452,18 @@ CREATE INDEX idx_knowledge_items_system_time ON knowledge_items(system_time_from
 -- Full-text search on knowledge content
 CREATE INDEX idx_knowledge_items_title_search ON knowledge_items USING GIN(to_tsvector('english', title));
 CREATE INDEX idx_knowledge_items_content_search ON knowledge_items USING GIN(to_tsvector('english', content));
-CREATE INDEX idx_knowledge_items_combined_search ON knowledge_items USING GIN(to_tsvector('english', title || ' ' || content || ' ' || COALESCE(problem_description, '') || ' ' || COALESCE(solution_description, '')));
+CREATE INDEX idx_knowledge_items_search_vector ON knowledge_items USING GIN(search_vector);
+
+-- Trigram indexes for literal identifier matches (snake_case, dotted paths, C++)
+CREATE INDEX idx_knowledge_items_title_trgm ON knowledge_items USING GIN(title gin_trgm_ops);
+CREATE INDEX idx_knowledge_items_content_trgm ON knowledge_items USING GIN(content gin_trgm_ops);
+
+-- Duplicate detection: one live item per normalized fingerprint, and LSH bucket lookup
+CREATE UNIQUE INDEX idx_knowledge_items_fingerprint_live ON knowledge_items(project_id, content_fingerprint)
+    WHERE system_time_until IS NULL AND content_fingerprint IS NOT NULL;
+CREATE INDEX idx_knowledge_lsh_buckets_item ON knowledge_lsh_buckets(knowledge_item_id);
+CREATE INDEX idx_knowledge_daily_rollup_project ON knowledge_daily_rollup(project_id);
+CREATE INDEX idx_knowledge_pattern_daily_rollup_pattern ON knowledge_pattern_daily_rollup(pattern);
 
 -- Knowledge Relationships indexes
 CREATE INDEX idx_knowledge_relationships_source ON knowledge_relationships(source_knowledge_id);
@@ -445,28 +513,9 @@ CREATE TRIGGER update_sessions_updated_at BEFORE UPDATE ON sessions FOR EACH ROW
 CREATE TRIGGER update_knowledge_items_updated_at BEFORE UPDATE ON knowledge_items FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_knowledge_relationships_updated_at BEFORE UPDATE ON knowledge_relationships FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
--- Automatically update message count in sessions
-CREATE OR REPLACE FUNCTION update_session_message_count()
-RETURNS TRIGGER AS $$
-BEGIN
-    IF TG_OP = 'INSERT' THEN
-        UPDATE sessions 
-        SET message_count = message_count + 1
-        WHERE id = NEW.session_id;
-        RETURN NEW;
-    ELSIF TG_OP = 'DELETE' THEN
-        UPDATE sessions 
-        SET message_count = message_count - 1
-        WHERE id = OLD.session_id;
-        RETURN OLD;
-    END IF;
-    RETURN NULL;
-END;
-$$ language 'plpgsql';
-
-CREATE TRIGGER update_session_message_count_trigger 
-    AFTER INSERT OR DELETE ON messages 
-    FOR EACH ROW EXECUTE FUNCTION update_session_message_count();
+-- Session message_count, token_count and last_message_at are updated by
+-- SessionService.create_message in the same statement as the insert; a
+-- per-row trigger here would count every message twice
 
 -- Automatically update knowledge item usage tracking
 CREATE OR REPLACE FUNCTION update_knowledge_usage()
@@ -478,6 +527,155 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+-- The columns of a knowledge item that feed the rollups
+CREATE TYPE knowledge_rollup_change AS (
+    day DATE,
+    project_id UUID,
+    knowledge_type VARCHAR(100),
+    patterns JSONB,
+    quality_score REAL,
+    reusability_score REAL,
+    success_rate REAL
+);
+
+CREATE OR REPLACE FUNCTION knowledge_rollup_row(item knowledge_items)
+RETURNS knowledge_rollup_change AS $$
+    SELECT ROW(
+        (item.created_at AT TIME ZONE 'UTC')::date,
+        item.project_id,
+        item.knowledge_type,
+        item.patterns,
+        item.quality_score,
+        item.reusability_score,
+        item.success_rate
+    )::knowledge_rollup_change;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add (direction = 1) or remove (direction = -1) a batch of items from the rollups
+CREATE OR REPLACE FUNCTION apply_knowledge_rollup_delta(changes knowledge_rollup_change[], direction INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    IF COALESCE(cardinality(changes), 0) = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Keys are upserted in a fixed order so concurrent writers lock rollup rows consistently
+    INSERT INTO knowledge_daily_rollup AS r (
+        day, project_id, knowledge_type, item_count, scored_count, quality_sum,
+        reusability_count, reusability_sum, success_count, success_sum
+    )
+    SELECT
+        c.day,
+        c.project_id,
+        c.knowledge_type,
+        direction * COUNT(*),
+        direction * COUNT(*) FILTER (WHERE c.quality_score > 0),
+        direction * COALESCE(SUM(c.quality_score) FILTER (WHERE c.quality_score > 0), 0),
+        direction * COUNT(c.reusability_score) FILTER (WHERE c.quality_score > 0),
+        direction * COALESCE(SUM(c.reusability_score) FILTER (WHERE c.quality_score > 0), 0),
+        direction * COUNT(c.success_rate) FILTER (WHERE c.quality_score > 0),
+        direction * COALESCE(SUM(c.success_rate) FILTER (WHERE c.quality_score > 0), 0)
+    FROM unnest(changes) AS c
+    GROUP BY c.day, c.project_id, c.knowledge_type
+    ORDER BY c.day, c.project_id, c.knowledge_type
+    ON CONFLICT (day, project_id, knowledge_type) DO UPDATE SET
+        item_count = r.item_count + EXCLUDED.item_count,
+        scored_count = r.scored_count + EXCLUDED.scored_count,
+        quality_sum = r.quality_sum + EXCLUDED.quality_sum,
+        reusability_count = r.reusability_count + EXCLUDED.reusability_count,
+        reusability_sum = r.reusability_sum + EXCLUDED.reusability_sum,
+        success_count = r.success_count + EXCLUDED.success_count,
+        success_sum = r.success_sum + EXCLUDED.success_sum;
+
+    INSERT INTO knowledge_pattern_daily_rollup AS r (day, project_id, pattern, item_count, success_count, success_sum)
+    SELECT
+        c.day,
+        c.project_id,
+        p.pattern,
+        direction * COUNT(*),
+        direction * COUNT(c.success_rate),
+        direction * COALESCE(SUM(c.success_rate), 0)
+    FROM unnest(changes) AS c
+    CROSS JOIN LATERAL jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(c.patterns) = 'array' THEN c.patterns ELSE '[]'::jsonb END
+    ) AS p(pattern)
+    GROUP BY c.day, c.project_id, p.pattern
+    ORDER BY c.day, c.project_id, p.pattern
+    ON CONFLICT (day, project_id, pattern) DO UPDATE SET
+        item_count = r.item_count + EXCLUDED.item_count,
+        success_count = r.success_count + EXCLUDED.success_count,
+        success_sum = r.success_sum + EXCLUDED.success_sum;
+
+    IF direction < 0 THEN
+        DELETE FROM knowledge_daily_rollup r
+        USING (SELECT DISTINCT day, project_id, knowledge_type FROM unnest(changes)) AS c
+        WHERE r.day = c.day AND r.project_id = c.project_id AND r.knowledge_type = c.knowledge_type
+        AND r.item_count <= 0;
+
+        DELETE FROM knowledge_pattern_daily_rollup r
+        USING (SELECT DISTINCT day, project_id FROM unnest(changes)) AS c
+        WHERE r.day = c.day AND r.project_id = c.project_id
+        AND r.item_count <= 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level maintenance: one delta per INSERT/UPDATE/DELETE statement, so bulk
+-- COPY imports touch each rollup row once. Updates only count rows whose rollup inputs changed.
+CREATE OR REPLACE FUNCTION maintain_knowledge_rollups()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_knowledge_rollup_delta(ARRAY(SELECT knowledge_rollup_row(n) FROM new_rows n), 1);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM apply_knowledge_rollup_delta(ARRAY(SELECT knowledge_rollup_row(o) FROM old_rows o), -1);
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM apply_knowledge_rollup_delta(ARRAY(
+            SELECT knowledge_rollup_row(o)
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE knowledge_rollup_row(o) IS DISTINCT FROM knowledge_rollup_row(n)
+        ), -1);
+        PERFORM apply_knowledge_rollup_delta(ARRAY(
+            SELECT knowledge_rollup_row(n)
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE knowledge_rollup_row(o) IS DISTINCT FROM knowledge_rollup_row(n)
+        ), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER knowledge_rollups_insert AFTER INSERT ON knowledge_items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_knowledge_rollups();
+CREATE TRIGGER knowledge_rollups_update AFTER UPDATE ON knowledge_items
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_knowledge_rollups();
+CREATE TRIGGER knowledge_rollups_delete AFTER DELETE ON knowledge_items
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_knowledge_rollups();
+
+-- Recompute the rollups from knowledge_items; used for the initial backfill and to
+-- reconcile floating point drift. Writers are blocked while it runs.
+CREATE OR REPLACE FUNCTION rebuild_knowledge_rollups()
+RETURNS BIGINT AS $$
+DECLARE
+    rebuilt BIGINT;
+BEGIN
+    LOCK TABLE knowledge_items IN SHARE MODE;
+    LOCK TABLE knowledge_daily_rollup, knowledge_pattern_daily_rollup IN EXCLUSIVE MODE;
+
+    DELETE FROM knowledge_daily_rollup;
+    DELETE FROM knowledge_pattern_daily_rollup;
+    PERFORM apply_knowledge_rollup_delta(ARRAY(SELECT knowledge_rollup_row(ki) FROM knowledge_items ki), 1);
+
+    SELECT COALESCE(SUM(item_count), 0) INTO rebuilt FROM knowledge_daily_rollup;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
 -- =============================================================================
 -- INITIAL DATA SETUP
 -- =============================================================================
@@ -80,6 +80,10 @@ CREATE INDEX knowledge_quality_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.quality
 CREATE INDEX knowledge_usage_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.usage_count);
 CREATE INDEX knowledge_created_at_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.created_at);
 
+// KnowledgeItem Indexes - Paged and incremental graph analytics loads
+CREATE INDEX knowledge_item_id_idx IF NOT EXISTS FOR (k:KnowledgeItem) ON (k.id);
+CREATE INDEX knowledge_item_updated_at_idx IF NOT EXISTS FOR (k:KnowledgeItem) ON (k.updated_at);
+
 // Temporal Indexes - Critical for bi-temporal queries
 CREATE INDEX knowledge_valid_from_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.valid_from);
 CREATE INDEX knowledge_valid_until_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.valid_until);
@@ -36,6 +36,7 @@ from qdrant_client.http.models import (
     HnswConfig,
     QuantizationConfig,
     ScalarQuantization,
+    ScalarQuantizationConfig,
     ScalarType
 )
 
@@ -157,7 +158,7 @@ class QdrantInitializer:
                     wal_segments_ahead=0  # WAL segments ahead
                 ),
                 quantization_config=ScalarQuantization(
-                    scalar=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
                         type=ScalarType.INT8,  # 8-bit quantization for memory efficiency
                         quantile=0.99,  # Quantile for clipping
                         always_ram=True  # Keep quantized vectors in RAM
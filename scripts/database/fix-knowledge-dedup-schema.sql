@@ -0,0 +1,32 @@
+-- BETTY Memory System - Fingerprint and MinHash/LSH duplicate detection for knowledge_items
+-- Replaces title/content equality scans and per-pair TF-IDF comparisons with index probes
+
+ALTER TABLE knowledge_items ADD COLUMN IF NOT EXISTS content_fingerprint VARCHAR(64);
+ALTER TABLE knowledge_items ADD COLUMN IF NOT EXISTS minhash_signature INTEGER[];
+
+-- MinHash band buckets for near-duplicate lookup
+CREATE TABLE IF NOT EXISTS knowledge_lsh_buckets (
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    knowledge_item_id UUID NOT NULL REFERENCES knowledge_items(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL,
+    
+    PRIMARY KEY (band, bucket, knowledge_item_id)
+);
+
+-- One live item per normalized fingerprint; rows without a fingerprint are
+-- filled in by memory-api/scripts/backfill_content_signatures.py
+CREATE UNIQUE INDEX IF NOT EXISTS idx_knowledge_items_fingerprint_live ON knowledge_items(project_id, content_fingerprint)
+    WHERE system_time_until IS NULL AND content_fingerprint IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_knowledge_lsh_buckets_item ON knowledge_lsh_buckets(knowledge_item_id);
+
+-- Update schema version
+INSERT INTO schema_version (version, description)
+VALUES ('1.0.7', 'Added content fingerprint, MinHash signature and LSH bucket table for duplicate detection')
+ON CONFLICT (version) DO NOTHING;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE 'Successfully added knowledge_items duplicate detection columns and knowledge_lsh_buckets';
+END $$;
@@ -0,0 +1,205 @@
+-- BETTY Memory System - Incrementally maintained analytics rollups for knowledge_items
+-- Dashboard and analytics queries read daily per-project aggregates instead of grouping knowledge_items
+
+-- Daily counts and score sums per project and knowledge type; score columns cover
+-- items with quality_score > 0, matching the intelligence metrics
+CREATE TABLE IF NOT EXISTS knowledge_daily_rollup (
+    day DATE NOT NULL,
+    project_id UUID NOT NULL,
+    knowledge_type VARCHAR(100) NOT NULL,
+    item_count BIGINT NOT NULL DEFAULT 0,
+    scored_count BIGINT NOT NULL DEFAULT 0,
+    quality_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    reusability_count BIGINT NOT NULL DEFAULT 0,
+    reusability_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    success_count BIGINT NOT NULL DEFAULT 0,
+    success_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (day, project_id, knowledge_type)
+);
+
+-- Daily pattern occurrences per project
+CREATE TABLE IF NOT EXISTS knowledge_pattern_daily_rollup (
+    day DATE NOT NULL,
+    project_id UUID NOT NULL,
+    pattern TEXT NOT NULL,
+    item_count BIGINT NOT NULL DEFAULT 0,
+    success_count BIGINT NOT NULL DEFAULT 0,
+    success_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (day, project_id, pattern)
+);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_daily_rollup_project ON knowledge_daily_rollup(project_id);
+CREATE INDEX IF NOT EXISTS idx_knowledge_pattern_daily_rollup_pattern ON knowledge_pattern_daily_rollup(pattern);
+
+-- The columns of a knowledge item that feed the rollups
+DO $$
+BEGIN
+    CREATE TYPE knowledge_rollup_change AS (
+        day DATE,
+        project_id UUID,
+        knowledge_type VARCHAR(100),
+        patterns JSONB,
+        quality_score REAL,
+        reusability_score REAL,
+        success_rate REAL
+    );
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION knowledge_rollup_row(item knowledge_items)
+RETURNS knowledge_rollup_change AS $$
+    SELECT ROW(
+        (item.created_at AT TIME ZONE 'UTC')::date,
+        item.project_id,
+        item.knowledge_type,
+        item.patterns,
+        item.quality_score,
+        item.reusability_score,
+        item.success_rate
+    )::knowledge_rollup_change;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add (direction = 1) or remove (direction = -1) a batch of items from the rollups
+CREATE OR REPLACE FUNCTION apply_knowledge_rollup_delta(changes knowledge_rollup_change[], direction INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    IF COALESCE(cardinality(changes), 0) = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Keys are upserted in a fixed order so concurrent writers lock rollup rows consistently
+    INSERT INTO knowledge_daily_rollup AS r (
+        day, project_id, knowledge_type, item_count, scored_count, quality_sum,
+        reusability_count, reusability_sum, success_count, success_sum
+    )
+    SELECT
+        c.day,
+        c.project_id,
+        c.knowledge_type,
+        direction * COUNT(*),
+        direction * COUNT(*) FILTER (WHERE c.quality_score > 0),
+        direction * COALESCE(SUM(c.quality_score) FILTER (WHERE c.quality_score > 0), 0),
+        direction * COUNT(c.reusability_score) FILTER (WHERE c.quality_score > 0),
+        direction * COALESCE(SUM(c.reusability_score) FILTER (WHERE c.quality_score > 0), 0),
+        direction * COUNT(c.success_rate) FILTER (WHERE c.quality_score > 0),
+        direction * COALESCE(SUM(c.success_rate) FILTER (WHERE c.quality_score > 0), 0)
+    FROM unnest(changes) AS c
+    GROUP BY c.day, c.project_id, c.knowledge_type
+    ORDER BY c.day, c.project_id, c.knowledge_type
+    ON CONFLICT (day, project_id, knowledge_type) DO UPDATE SET
+        item_count = r.item_count + EXCLUDED.item_count,
+        scored_count = r.scored_count + EXCLUDED.scored_count,
+        quality_sum = r.quality_sum + EXCLUDED.quality_sum,
+        reusability_count = r.reusability_count + EXCLUDED.reusability_count,
+        reusability_sum = r.reusability_sum + EXCLUDED.reusability_sum,
+        success_count = r.success_count + EXCLUDED.success_count,
+        success_sum = r.success_sum + EXCLUDED.success_sum;
+
+    INSERT INTO knowledge_pattern_daily_rollup AS r (day, project_id, pattern, item_count, success_count, success_sum)
+    SELECT
+        c.day,
+        c.project_id,
+        p.pattern,
+        direction * COUNT(*),
+        direction * COUNT(c.success_rate),
+        direction * COALESCE(SUM(c.success_rate), 0)
+    FROM unnest(changes) AS c
+    CROSS JOIN LATERAL jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(c.patterns) = 'array' THEN c.patterns ELSE '[]'::jsonb END
+    ) AS p(pattern)
+    GROUP BY c.day, c.project_id, p.pattern
+    ORDER BY c.day, c.project_id, p.pattern
+    ON CONFLICT (day, project_id, pattern) DO UPDATE SET
+        item_count = r.item_count + EXCLUDED.item_count,
+        success_count = r.success_count + EXCLUDED.success_count,
+        success_sum = r.success_sum + EXCLUDED.success_sum;
+
+    IF direction < 0 THEN
+        DELETE FROM knowledge_daily_rollup r
+        USING (SELECT DISTINCT day, project_id, knowledge_type FROM unnest(changes)) AS c
+        WHERE r.day = c.day AND r.project_id = c.project_id AND r.knowledge_type = c.knowledge_type
+        AND r.item_count <= 0;
+
+        DELETE FROM knowledge_pattern_daily_rollup r
+        USING (SELECT DISTINCT day, project_id FROM unnest(changes)) AS c
+        WHERE r.day = c.day AND r.project_id = c.project_id
+        AND r.item_count <= 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level maintenance: one delta per INSERT/UPDATE/DELETE statement, so bulk
+-- COPY imports touch each rollup row once. Updates only count rows whose rollup inputs changed.
+CREATE OR REPLACE FUNCTION maintain_knowledge_rollups()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_knowledge_rollup_delta(ARRAY(SELECT knowledge_rollup_row(n) FROM new_rows n), 1);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM apply_knowledge_rollup_delta(ARRAY(SELECT knowledge_rollup_row(o) FROM old_rows o), -1);
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM apply_knowledge_rollup_delta(ARRAY(
+            SELECT knowledge_rollup_row(o)
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE knowledge_rollup_row(o) IS DISTINCT FROM knowledge_rollup_row(n)
+        ), -1);
+        PERFORM apply_knowledge_rollup_delta(ARRAY(
+            SELECT knowledge_rollup_row(n)
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE knowledge_rollup_row(o) IS DISTINCT FROM knowledge_rollup_row(n)
+        ), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS knowledge_rollups_insert ON knowledge_items;
+DROP TRIGGER IF EXISTS knowledge_rollups_update ON knowledge_items;
+DROP TRIGGER IF EXISTS knowledge_rollups_delete ON knowledge_items;
+
+CREATE TRIGGER knowledge_rollups_insert AFTER INSERT ON knowledge_items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_knowledge_rollups();
+CREATE TRIGGER knowledge_rollups_update AFTER UPDATE ON knowledge_items
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_knowledge_rollups();
+CREATE TRIGGER knowledge_rollups_delete AFTER DELETE ON knowledge_items
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_knowledge_rollups();
+
+-- Recompute the rollups from knowledge_items; used for the initial backfill and to
+-- reconcile floating point drift. Writers are blocked while it runs.
+CREATE OR REPLACE FUNCTION rebuild_knowledge_rollups()
+RETURNS BIGINT AS $$
+DECLARE
+    rebuilt BIGINT;
+BEGIN
+    LOCK TABLE knowledge_items IN SHARE MODE;
+    LOCK TABLE knowledge_daily_rollup, knowledge_pattern_daily_rollup IN EXCLUSIVE MODE;
+
+    DELETE FROM knowledge_daily_rollup;
+    DELETE FROM knowledge_pattern_daily_rollup;
+    PERFORM apply_knowledge_rollup_delta(ARRAY(SELECT knowledge_rollup_row(ki) FROM knowledge_items ki), 1);
+
+    SELECT COALESCE(SUM(item_count), 0) INTO rebuilt FROM knowledge_daily_rollup;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_knowledge_rollups();
+
+-- Update schema version
+INSERT INTO schema_version (version, description)
+VALUES ('1.0.8', 'Added trigger-maintained daily knowledge and pattern rollups for analytics')
+ON CONFLICT (version) DO NOTHING;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE 'Successfully added knowledge_daily_rollup and knowledge_pattern_daily_rollup';
+END $$;
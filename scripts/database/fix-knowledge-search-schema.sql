@@ -0,0 +1,34 @@
+-- BETTY Memory System - Weighted full-text search for knowledge_items
+-- Replaces ILIKE scans with an indexed search_vector column and trigram indexes
+
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
+-- Weighted full-text document: title (A), problem/solution (B), content and summary (C)
+-- Note: adding a stored generated column rewrites the table once
+ALTER TABLE knowledge_items ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(problem_description, '') || ' ' || COALESCE(solution_description, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(content, '') || ' ' || COALESCE(metadata->>'summary', '')), 'C')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_items_search_vector ON knowledge_items USING GIN(search_vector);
+
+-- Trigram indexes for literal identifier matches (snake_case, dotted paths, C++)
+CREATE INDEX IF NOT EXISTS idx_knowledge_items_title_trgm ON knowledge_items USING GIN(title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_knowledge_items_content_trgm ON knowledge_items USING GIN(content gin_trgm_ops);
+
+-- The unweighted expression index is superseded by search_vector
+DROP INDEX IF EXISTS idx_knowledge_items_combined_search;
+
+ANALYZE knowledge_items;
+
+-- Update schema version
+INSERT INTO schema_version (version, description)
+VALUES ('1.0.6', 'Added weighted search_vector column and trigram indexes to knowledge_items')
+ON CONFLICT (version) DO NOTHING;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE 'Successfully added knowledge_items.search_vector and trigram search indexes';
+END $$;
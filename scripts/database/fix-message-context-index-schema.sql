@@ -0,0 +1,18 @@
+-- BETTY Memory System - Covering index for newest-first message scans
+-- build_context walks a session newest-first reading only ids, roles and token counts;
+-- message listing pages on (created_at, id) keyset cursors
+
+CREATE INDEX IF NOT EXISTS idx_messages_session_created_keyset ON messages(session_id, created_at DESC, id DESC)
+    INCLUDE (role, token_count)
+    WHERE deleted_at IS NULL;
+
+-- Update schema version
+INSERT INTO schema_version (version, description)
+VALUES ('1.0.10', 'Added covering (session_id, created_at, id) index on live messages')
+ON CONFLICT (version) DO NOTHING;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE 'Successfully added messages session/created_at keyset index';
+END $$;
@@ -0,0 +1,44 @@
+-- BETTY Memory System - Precomputed session message counters and keyset pagination indexes
+-- Session listings read message_count, token_count and last_message_at from sessions instead of
+-- aggregating the messages table; SessionService.create_message maintains them on every insert
+
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS token_count BIGINT DEFAULT 0;
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMP WITH TIME ZONE;
+
+-- create_message updates all three counters in the same statement as the insert; the
+-- per-row trigger would count every message twice
+DROP TRIGGER IF EXISTS update_session_message_count_trigger ON messages;
+
+-- Backfill counters from live messages
+UPDATE sessions s
+SET message_count = COALESCE(m.message_count, 0),
+    token_count = COALESCE(m.token_count, 0),
+    last_message_at = m.last_message_at
+FROM sessions target
+LEFT JOIN (
+    SELECT session_id,
+           COUNT(*) as message_count,
+           SUM(COALESCE(token_count, 0)) as token_count,
+           MAX(created_at) as last_message_at
+    FROM messages
+    WHERE deleted_at IS NULL
+    GROUP BY session_id
+) m ON m.session_id = target.id
+WHERE s.id = target.id;
+
+-- Keyset pagination on (updated_at, id), per user and across all sessions
+CREATE INDEX IF NOT EXISTS idx_sessions_user_updated_keyset ON sessions(user_id, updated_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_keyset ON sessions(updated_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
+
+-- Update schema version
+INSERT INTO schema_version (version, description)
+VALUES ('1.0.9', 'Added maintained session token_count/last_message_at counters and keyset pagination indexes')
+ON CONFLICT (version) DO NOTHING;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE 'Successfully added session counters and keyset pagination indexes';
+END $$;